@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Comparaison de deux exécutions de la suite de benchmarks
+Chaque mesure commune aux deux fichiers est comparée dans son sens (débit :
+plus haut est meilleur, durée et mémoire : plus bas est meilleur). Une
+dégradation au-delà du seuil est signalée comme régression et le code de
+sortie vaut 1, ce qui permet de s'en servir dans un script de vérification.
+
+Usage :
+    python benchmarks/comparer.py reference.json nouveau.json [--seuil 0.10] [--tout]
+"""
+
+import sys
+import json
+import argparse
+
+VERSION_BENCHMARK = 1
+
+
+def charger(chemin):
+    """Charge un rapport JSON produit par benchmarks/suite.py"""
+    with open(chemin, encoding='utf-8') as f:
+        rapport = json.load(f)
+    if rapport.get('version') != VERSION_BENCHMARK:
+        raise ValueError(f"{chemin}: version de rapport non supportée ({rapport.get('version')})")
+    return rapport
+
+
+def variation(reference, nouveau, sens):
+    """Variation relative orientée : positive = amélioration, négative = dégradation"""
+    if reference == 0:
+        return 0.0
+    rapport = (nouveau - reference) / abs(reference)
+    return rapport if sens == 'haut' else -rapport
+
+
+def comparer(reference, nouveau, seuil=0.10):
+    """
+    Lignes de comparaison (clé, référence, nouveau, variation, statut) pour les
+    mesures communes, et clés présentes dans un seul des deux rapports
+    """
+    mesures_ref = reference['mesures']
+    mesures_new = nouveau['mesures']
+    lignes = []
+    for cle in sorted(set(mesures_ref) & set(mesures_new)):
+        ref, new = mesures_ref[cle], mesures_new[cle]
+        delta = variation(ref['valeur'], new['valeur'], new['sens'])
+        if delta < -seuil:
+            statut = 'regression'
+        elif delta > seuil:
+            statut = 'amelioration'
+        else:
+            statut = 'stable'
+        lignes.append({
+            'cle': cle,
+            'reference': ref['valeur'],
+            'nouveau': new['valeur'],
+            'unite': new['unite'],
+            'variation': delta,
+            'statut': statut,
+        })
+    absentes = {
+        'seulement_reference': sorted(set(mesures_ref) - set(mesures_new)),
+        'seulement_nouveau': sorted(set(mesures_new) - set(mesures_ref)),
+    }
+    return lignes, absentes
+
+
+def afficher(lignes, absentes, tout=False):
+    """Affiche régressions et améliorations (toutes les lignes avec `tout`)"""
+    icones = {'regression': '🔴', 'amelioration': '🟢', 'stable': '⚪'}
+    for ligne in lignes:
+        if not tout and ligne['statut'] == 'stable':
+            continue
+        print(f"{icones[ligne['statut']]} {ligne['cle']}: {ligne['reference']:.4g} → {ligne['nouveau']:.4g} "
+              f"{ligne['unite']} ({ligne['variation']:+.1%})")
+
+    comptes = {statut: sum(1 for l in lignes if l['statut'] == statut) for statut in icones}
+    print(f"\n📊 {len(lignes)} mesures comparées: {comptes['regression']} régressions, "
+          f"{comptes['amelioration']} améliorations, {comptes['stable']} stables")
+    for nom, cles in absentes.items():
+        if cles:
+            print(f"   • {len(cles)} mesures {nom.replace('_', ' ')}")
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Compare deux rapports de benchmarks")
+    parser.add_argument('reference', help="rapport JSON de référence")
+    parser.add_argument('nouveau', help="rapport JSON à comparer")
+    parser.add_argument('--seuil', type=float, default=0.10,
+                        help="dégradation relative tolérée avant de signaler une régression (défaut: 0.10)")
+    parser.add_argument('--tout', action='store_true', help="affiche aussi les mesures stables")
+    args = parser.parse_args()
+
+    lignes, absentes = comparer(charger(args.reference), charger(args.nouveau), args.seuil)
+    afficher(lignes, absentes, args.tout)
+    return 1 if any(ligne['statut'] == 'regression' for ligne in lignes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
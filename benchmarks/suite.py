@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks
+Mesure sur les données de data/raw (5 symboles × 6 timeframes) :
+- débit des indicateurs (barres/s par indicateur et par série) ;
+- latence d'un backtest pour chaque fonction de stratégie ;
+- durée d'une génération d'algorithme génétique pour plusieurs tailles de population,
+  et de la sélection NSGA-II sur quelques milliers d'individus ;
+- coût de calculate_metrics et du noyau de métriques par lots pour 1000 trades ;
+- temps jusqu'à la première ligne affichée par les commandes de trading.py ;
+- rejeu barre par barre de la stratégie temps réel (sans affichage) :
+  latence de décision p50 / p99 par barre et débit en barres/s ;
+- pic de mémoire (RSS) après chaque section.
+
+Les résultats sont écrits en JSON (results/benchmarks/ par défaut) et deux
+exécutions se comparent avec benchmarks/comparer.py.
+
+Usage (depuis la racine du dépôt) :
+    python benchmarks/suite.py [--rapide] [--sections indicateurs,backtests,ga,metriques,cli,rejeu]
+                               [--series XAUUSD_D1,EURUSD_H1] [--sortie fichier.json]
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import random
+import timeit
+import argparse
+import platform
+import subprocess
+import contextlib
+import importlib
+from datetime import datetime
+import warnings
+warnings.filterwarnings('ignore')
+
+import numpy as np
+import pandas as pd
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for chemin in ('src', 'src/strategies', 'src/backtesting', 'scripts', ''):
+    sys.path.append(os.path.join(RACINE, chemin))
+
+from indicators import noyaux, ATRStream
+from donnees import store_defaut
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+VERSION_BENCHMARK = 1
+SECTIONS = ('indicateurs', 'backtests', 'ga', 'metriques', 'cli', 'rejeu')
+
+# Séries utilisées en mode rapide
+SERIES_RAPIDES = ('XAUUSD_D1', 'XAUUSD_H1', 'EURUSD_H4', 'GER40.cash_M15')
+SERIES_GA = ('XAUUSD_D1', 'XAUUSD_H1')
+
+# Commandes de trading.py dont on mesure la première sortie (interrompues ensuite)
+COMMANDES_CLI = {
+    'aide': ['--help'],
+    'optimize': ['optimize', 'drawdown', '--generations', '1'],
+    'backtest': ['backtest'],
+    'report': ['report', 'comparaison'],
+    'models': ['models', 'lister'],
+    'live-replay': ['live-replay', '--headless'],
+}
+MODULES_LOURDS = ('pandas', 'numpy', 'plotly', 'deap', 'rich')
+
+INDICATEURS = {
+    'ema': lambda c: noyaux.ema(c['Close'], 20),
+    'atr': lambda c: noyaux.atr(c['High'], c['Low'], c['Close'], 14),
+    'rsi': lambda c: noyaux.rsi(c['Close'], 14),
+    'rolling_mean': lambda c: noyaux.rolling_mean(c['Close'], 20),
+    'rolling_max': lambda c: noyaux.rolling_max(c['High'], 20),
+    'rolling_min': lambda c: noyaux.rolling_min(c['Low'], 20),
+    'adx': lambda c: noyaux.adx(c['High'], c['Low'], c['Close'], 14),
+    'adx_dm': lambda c: noyaux.adx_dm(c['High'], c['Low'], c['Close'], 14),
+}
+
+# (module, fonction, arguments) : 'df', 'symbol', 'timeframe'
+STRATEGIES = (
+    ('strategie_xauusd_sharpe1_simple', 'strategie_xauusd_sharpe1_simple', ('df', 'symbol', 'timeframe')),
+    ('strategie_avancee', 'strategie_avancee', ('df', 'symbol', 'timeframe')),
+    ('strategie_capital_preservation', 'strategie_capital_preservation', ('df', 'symbol', 'timeframe')),
+    ('strategie_finale_simple', 'strategie_finale_simple', ('df', 'symbol', 'timeframe')),
+    ('strategie_multitimeframe_xau_ger40', 'strategie_multitimeframe', ('df', 'symbol', 'timeframe')),
+    ('strategie_xau_ger40_pure', 'strategie_xau_ger40', ('df', 'symbol', 'timeframe')),
+    ('backtest_ema200_adx_breakout', 'backtest_breakout', ('df',)),
+    ('backtest_ema200_adx_breakout_optimized', 'backtest_breakout_optimized', ('df',)),
+    ('backtest_ema200_adx_breakout_v2', 'backtest_breakout_v2', ('df', 'symbol')),
+    ('backtest_ema200_adx_breakout_v3', 'backtest_breakout_v3', ('df', 'symbol')),
+)
+
+OPTIMISEURS_GA = ('drawdown', 'agressif', 'complet')
+
+# Barres de chauffe du rejeu de la stratégie temps réel (comme son main)
+ECHAUFFEMENT_REJEU = 20
+
+
+def rss_pic_mo():
+    """Pic de mémoire résidente du processus (Mo), None si indisponible"""
+    if resource is None:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets sous Linux
+    return pic / (1024 * 1024) if sys.platform == 'darwin' else pic / 1024
+
+
+def chronometrer(fonction, repetitions=3, automatique=True):
+    """
+    Meilleur temps (s) d'un appel sur `repetitions` mesures. En mode automatique,
+    chaque mesure enchaîne assez d'appels pour durer au moins 0,2 s (comme timeit).
+    """
+    minuteur = timeit.Timer(fonction)
+    nombre = minuteur.autorange()[0] if automatique else 1
+    return min(minuteur.repeat(repeat=repetitions, number=nombre)) / nombre
+
+
+def muet():
+    """Coupe la sortie standard des fonctions mesurées"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+class BenchmarkSuite:
+    def __init__(self, series=None, rapide=False, repetitions=None, tailles_population=None):
+        self.store = store_defaut()
+        self.rapide = rapide
+        disponibles = [f"{symbol}_{timeframe}" for symbol, timeframe in self.store.disponibles()]
+        if series is None:
+            series = [s for s in SERIES_RAPIDES if s in disponibles] if rapide else disponibles
+        self.series = list(series)
+        self.repetitions = repetitions or (1 if rapide else 3)
+        self.tailles_population = tailles_population or ((20, 50) if rapide else (20, 50, 100))
+        self.mesures = {}
+
+    def ajouter(self, cle, valeur, unite, sens):
+        """Enregistre une mesure ; `sens` : 'haut' ou 'bas' selon ce qui est meilleur"""
+        self.mesures[cle] = {'valeur': float(valeur), 'unite': unite, 'sens': sens}
+
+    def dataframe(self, serie):
+        symbol, _, timeframe = serie.rpartition('_')
+        return symbol, timeframe, self.store.dataframe(symbol, timeframe)
+
+    def bench_indicateurs(self):
+        """Débit des noyaux d'indicateurs et de l'ATR en flux (barres/s)"""
+        for serie in self.series:
+            symbol, timeframe, _ = self.dataframe(serie)
+            colonnes = {nom: np.array(v) for nom, v in self.store.colonnes(symbol, timeframe).items()}
+            n_barres = len(colonnes['Close'])
+            for nom, calcul in INDICATEURS.items():
+                duree = chronometrer(lambda: calcul(colonnes), self.repetitions)
+                self.ajouter(f"indicateurs/{nom}/{serie}", n_barres / duree, 'barres/s', 'haut')
+
+            barres = list(zip(colonnes['High'].tolist(), colonnes['Low'].tolist(), colonnes['Close'].tolist()))
+
+            def flux_atr():
+                stream = ATRStream(14)
+                for high, low, close in barres:
+                    stream.update(high, low, close)
+
+            duree = chronometrer(flux_atr, self.repetitions, automatique=False)
+            self.ajouter(f"indicateurs/flux_atr/{serie}", n_barres / duree, 'barres/s', 'haut')
+            print(f"   📈 {serie}: {n_barres} barres")
+
+    def bench_backtests(self):
+        """Latence d'un backtest complet par fonction de stratégie (s)"""
+        fonctions = [(nom, getattr(importlib.import_module(module), nom), arguments)
+                     for module, nom, arguments in STRATEGIES]
+        for serie in self.series:
+            symbol, timeframe, df = self.dataframe(serie)
+            for nom, fonction, arguments in fonctions:
+                valeurs = {'symbol': symbol, 'timeframe': timeframe}
+
+                def backtest():
+                    valeurs['df'] = df.copy()
+                    with muet():
+                        fonction(*(valeurs[a] for a in arguments))
+
+                try:
+                    duree = chronometrer(backtest, self.repetitions, automatique=False)
+                except Exception as e:
+                    print(f"   ⚠️ {nom} {serie}: {e}")
+                    continue
+                self.ajouter(f"backtests/{nom}/{serie}", duree, 's', 'bas')
+            print(f"   🔁 {serie}")
+
+    def optimiseur_ga(self, optimiseur, symbol, timeframe):
+        """Optimiseur sans mémo de fitness (chaque individu est réellement évalué)"""
+        from moteur import FitnessCache
+        cache = FitnessCache(capacite=0)
+        with muet():
+            if optimiseur == 'drawdown':
+                from optimisation_genetique_drawdown import GeneticOptimizer
+                return GeneticOptimizer(symbol, timeframe, generations=1, cache_fitness=cache)
+            if optimiseur == 'agressif':
+                from optimisation_agressive_gains import AggressiveOptimizer
+                return AggressiveOptimizer(symbol, timeframe, generations=1, cache_fitness=cache)
+            from systeme_optimisation_complet import CompleteOptimizationSystem
+            return CompleteOptimizationSystem(symbol, timeframe, cache_fitness=cache)
+
+    def bench_ga(self):
+        """Durée d'une génération (création, évaluation, reproduction) par taille de population (s)"""
+        series = [s for s in SERIES_GA if s in self.series] or self.series[:1]
+        for serie in series:
+            symbol, timeframe = serie.rsplit('_', 1)
+            for optimiseur in OPTIMISEURS_GA:
+                instance = self.optimiseur_ga(optimiseur, symbol, timeframe)
+                for taille in self.tailles_population:
+                    def generation():
+                        random.seed(0)
+                        with muet():
+                            if optimiseur == 'complet':
+                                instance.genetic_optimization(taille, 1)
+                            else:
+                                instance.definir_fenetre()
+                                instance.population_size = taille
+                                instance.optimize(enregistrer=False)
+
+                    duree = chronometrer(generation, self.repetitions, automatique=False)
+                    self.ajouter(f"ga/{optimiseur}/{serie}/population_{taille}", duree, 's', 'bas')
+                print(f"   🧬 {optimiseur} {serie}")
+
+        # Tri non dominé de NSGA-II (3 objectifs) sur de grandes populations
+        from moteur import selection_nsga2
+        for taille in (1000, 5000):
+            objectifs = np.random.default_rng(0).normal(size=(taille, 3))
+            duree = chronometrer(lambda: selection_nsga2(objectifs, taille // 2), self.repetitions)
+            self.ajouter(f"ga/nsga2_selection/{taille}_individus", duree, 's', 'bas')
+        print("   🎯 sélection NSGA-II: 1000, 5000 individus")
+
+    def bench_metriques(self, tailles=(1000, 10000), journaux=100):
+        """
+        Coût de calculate_metrics (liste de dicts et TradeLog), de l'ajout trade
+        par trade dans un TradeLog et du noyau par lots sur `journaux` journaux,
+        ramené à 1000 trades (s)
+        """
+        from strategie_xauusd_sharpe1_simple import calculate_metrics
+        from moteur import metriques_lot, journal_optimiseur
+        generateur = np.random.default_rng(0)
+        for taille in tailles:
+            dates = pd.date_range('2000-01-01', periods=taille + 1, freq='h')
+            pnl = generateur.normal(0.2, 1.5, taille)
+            trades = [{
+                'entry_date': dates[k],
+                'exit_date': dates[k + 1],
+                'entry_price': 100.0,
+                'exit_price': 100.0 + pnl[k],
+                'position': 'Long',
+                'pnl': pnl[k],
+                'exit_reason': 'Take_Profit',
+            } for k in range(taille)]
+            duree = chronometrer(lambda: calculate_metrics(trades), self.repetitions)
+            self.ajouter(f"metriques/calculate_metrics/{taille}_trades", duree * 1000 / taille, 's/1000 trades', 'bas')
+
+            def remplir():
+                journal = journal_optimiseur()
+                for trade in trades:
+                    journal.append(trade)
+                return journal
+            duree = chronometrer(remplir, self.repetitions)
+            self.ajouter(f"metriques/tradelog_append/{taille}_trades", duree * 1000 / taille, 's/1000 trades', 'bas')
+            journal = remplir()
+            duree = chronometrer(lambda: calculate_metrics(journal), self.repetitions)
+            self.ajouter(f"metriques/calculate_metrics_tradelog/{taille}_trades", duree * 1000 / taille,
+                         's/1000 trades', 'bas')
+
+            # Lot de journaux de même taille (une population)
+            lot = generateur.normal(0.2, 1.5, taille * journaux)
+            offsets = np.arange(journaux + 1) * taille
+            duree = chronometrer(lambda: metriques_lot(lot, offsets), self.repetitions)
+            self.ajouter(f"metriques/metriques_lot/{journaux}x{taille}_trades", duree * 1000 / (taille * journaux),
+                         's/1000 trades', 'bas')
+        print(f"   📊 calculate_metrics, TradeLog et metriques_lot: {', '.join(str(t) for t in tailles)} trades")
+
+    def bench_cli(self):
+        """
+        Temps entre le lancement de trading.py et sa première ligne (s), pour
+        chaque commande de COMMANDES_CLI, et modules lourds chargés par le parser
+        """
+        import trading
+        for nom, arguments in COMMANDES_CLI.items():
+            def premiere_sortie():
+                processus = subprocess.Popen([sys.executable, os.path.join(RACINE, 'trading.py'), *arguments],
+                                             stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL, cwd=RACINE)
+                processus.stdout.readline()
+                processus.kill()
+                processus.wait()
+                processus.stdout.close()
+
+            duree = chronometrer(premiere_sortie, self.repetitions, automatique=False)
+            self.ajouter(f"cli/premiere_sortie/{nom}", duree, 's', 'bas')
+            alerte = " ⚠️ au-delà du budget" if duree > trading.BUDGET_PREMIERE_SORTIE else ""
+            print(f"   ⌨️ {' '.join(arguments)}: {duree * 1000:.0f} ms{alerte}")
+
+        # Dans un interpréteur neuf : la suite a déjà importé numpy et pandas
+        script = ("import sys; import trading; trading.construire_parser(); "
+                  f"print(sum(m in sys.modules for m in {MODULES_LOURDS!r}))")
+        sortie = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, cwd=RACINE)
+        modules = int(sortie.stdout.strip() or 0)
+        self.ajouter("cli/modules_lourds_parser", modules, 'modules', 'bas')
+        print(f"   📦 modules lourds chargés par le parser: {modules}")
+
+    def bench_rejeu(self):
+        """
+        Rejeu de XAUUSDSharpe1LiveStrategy sur chaque série, sans affichage :
+        latences de décision p50 / p99 (µs, meilleur rejeu) et débit (barres/s).
+        Le maximum, trop bruité pour une comparaison, n'est qu'affiché.
+        """
+        from strategie_xauusd_sharpe1_mt5_live import XAUUSDSharpe1LiveStrategy
+        from moteur import RejeuBarres, evenements_barres
+        for serie in self.series:
+            symbol, timeframe, df = self.dataframe(serie)
+            barres = evenements_barres(df)
+            rapports = []
+            for _ in range(self.repetitions):
+                strategie = XAUUSDSharpe1LiveStrategy(symbol, timeframe, verbose=False)
+                rapports.append(RejeuBarres(strategie, echauffement=ECHAUFFEMENT_REJEU).executer(barres))
+            meilleur = min(rapports, key=lambda rapport: rapport['duree_s'])
+            for cle in ('p50_us', 'p99_us'):
+                self.ajouter(f"rejeu/{cle}/{serie}", min(rapport[cle] for rapport in rapports), 'µs', 'bas')
+            self.ajouter(f"rejeu/barres_par_s/{serie}", meilleur['barres_par_s'], 'barres/s', 'haut')
+            print(f"   🤖 {serie}: {meilleur['barres_par_s']:,.0f} barres/s | p50 {meilleur['p50_us']:.1f} µs | "
+                  f"p99 {meilleur['p99_us']:.1f} µs | max {meilleur['max_us']:.0f} µs")
+
+    def run(self, sections=SECTIONS):
+        """Exécute les sections demandées et renvoie le rapport"""
+        debut = time.perf_counter()
+        for section in sections:
+            print(f"\n⏱️ {section}")
+            getattr(self, f"bench_{section}")()
+            rss = rss_pic_mo()
+            if rss is not None:
+                self.ajouter(f"memoire/rss_pic/{section}", rss, 'Mo', 'bas')
+                print(f"   💾 RSS pic: {rss:.0f} Mo")
+
+        return {
+            'version': VERSION_BENCHMARK,
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'duree_totale': time.perf_counter() - debut,
+            'environnement': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__,
+                'plateforme': platform.platform(),
+                'processeurs': os.cpu_count(),
+            },
+            'parametres': {
+                'sections': list(sections),
+                'series': self.series,
+                'repetitions': self.repetitions,
+                'tailles_population': list(self.tailles_population),
+                'rapide': self.rapide,
+            },
+            'mesures': self.mesures,
+        }
+
+
+def sauvegarder(rapport, chemin=None):
+    """Écrit le rapport JSON (results/benchmarks/benchmark_<date>.json par défaut)"""
+    if chemin is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        chemin = os.path.join(RACINE, 'results', 'benchmarks', f"benchmark_{timestamp}.json")
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(rapport, f, indent=2, ensure_ascii=False)
+    return chemin
+
+
+def main():
+    """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Benchmarks des indicateurs, backtests et optimiseurs")
+    parser.add_argument('--rapide', action='store_true', help="quelques séries, une répétition")
+    parser.add_argument('--sections', default=','.join(SECTIONS), help=f"parmi {', '.join(SECTIONS)}")
+    parser.add_argument('--series', help="ex. XAUUSD_D1,EURUSD_H1 (défaut: toutes les séries de data/raw)")
+    parser.add_argument('--repetitions', type=int, help="mesures par benchmark (le meilleur temps est retenu)")
+    parser.add_argument('--populations', help="tailles de population du GA, ex. 20,50,100")
+    parser.add_argument('--sortie', help="fichier JSON de résultats")
+    args = parser.parse_args()
+
+    sections = [s for s in args.sections.split(',') if s]
+    inconnues = set(sections) - set(SECTIONS)
+    if inconnues:
+        parser.error(f"sections inconnues: {', '.join(sorted(inconnues))}")
+
+    # Les optimiseurs lisent data/raw en chemin relatif
+    os.chdir(RACINE)
+    suite = BenchmarkSuite(
+        series=args.series.split(',') if args.series else None,
+        rapide=args.rapide,
+        repetitions=args.repetitions,
+        tailles_population=[int(t) for t in args.populations.split(',')] if args.populations else None,
+    )
+    print(f"🏁 BENCHMARKS - {len(suite.series)} séries, sections: {', '.join(sections)}")
+    print("=" * 60)
+    rapport = suite.run(sections)
+    chemin = sauvegarder(rapport, args.sortie)
+    print(f"\n✅ Résultats: {chemin} ({len(rapport['mesures'])} mesures, {rapport['duree_totale']:.0f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,15 @@ Point d'entrée pour les démonstrations
 import sys
 import os
 
-# Ajout du chemin des scripts
-sys.path.append('scripts')
+# Commandes exécutées dans ce processus par trading.py (imports lourds à la demande)
+import trading
+
+# Choix du menu -> commande de trading.py
+COMMANDES = {
+    "1": ['backtest', 'demo'],
+    "2": ['backtest', 'timeframes'],
+    "3": ['report', 'multitimeframes'],
+}
 
 def main():
     print("🎯 DÉMONSTRATION DES STRATÉGIES")
@@ -21,12 +28,8 @@ def main():
     
     choice = input("Choisissez une option (1-3): ")
     
-    if choice == "1":
-        os.system("python scripts/demo_strategie_xauusd.py")
-    elif choice == "2":
-        os.system("python scripts/test_all_timeframes_xauusd.py")
-    elif choice == "3":
-        os.system("python scripts/afficher_resultats_multitimeframes.py")
+    if choice in COMMANDES:
+        trading.main(COMMANDES[choice])
     else:
         print("❌ Option invalide")
 
@@ -6,9 +6,11 @@ Script principal pour lancer toutes les optimisations
 
 import os
 import sys
-import subprocess
 from datetime import datetime
 
+# Étapes exécutées dans ce processus par trading.py (imports lourds à la demande)
+import trading
+
 # Rich pour une belle interface
 from rich.console import Console
 from rich.table import Table
@@ -86,17 +88,17 @@ def run_optimization_pipeline():
     steps = [
         {
             'name': 'Système d\'Optimisation Complet',
-            'script': 'scripts/systeme_optimisation_complet.py',
+            'commandes': [['optimize', 'complet', '--mode', 'complet', '--resume']],
             'description': 'Génétique + Agressive + RL + Fusion'
         },
         {
             'name': 'Gestion des Modèles',
-            'script': 'scripts/gestion_modeles_optimaux.py',
+            'commandes': [['models', 'enregistrer'], ['models', 'comparer']],
             'description': 'Enregistrement et comparaison'
         },
         {
             'name': 'Comparaison des Optimisations',
-            'script': 'scripts/comparaison_optimisations.py',
+            'commandes': [['report', 'optimisations']],
             'description': 'Analyse des résultats'
         }
     ]
@@ -116,17 +118,9 @@ def run_optimization_pipeline():
             progress.update(task, description=f"Étape {i}/{len(steps)}: {step['name']}")
             
             try:
-                # Lancer le script
-                result = subprocess.run(['python', step['script']], 
-                                      capture_output=True, text=True, timeout=300)
-                
-                if result.returncode == 0:
-                    progress.console.print(f"   ✅ [green]Succès[/green] - {step['name']}")
-                else:
-                    progress.console.print(f"   ❌ [red]Erreur[/red] - {step['name']}: {result.stderr}")
-                    
-            except subprocess.TimeoutExpired:
-                progress.console.print(f"   ⏰ [yellow]Timeout[/yellow] - {step['name']}")
+                for commande in step['commandes']:
+                    trading.main(commande)
+                progress.console.print(f"   ✅ [green]Succès[/green] - {step['name']}")
             except Exception as e:
                 progress.console.print(f"   ❌ [red]Erreur[/red] - {step['name']}: {e}")
             
@@ -142,16 +136,12 @@ def run_quick_optimization():
     console.print("🎯 [yellow]Optimisation rapide pour test[/yellow]")
     
     try:
-        # Lancer le système complet avec paramètres réduits
-        cmd = [
-            'python', 'scripts/systeme_optimisation_complet.py'
-        ]
-        
+        # Système complet en mode rapide (populations et épisodes réduits)
         console.print("🔄 [blue]Lancement...[/blue]")
-        subprocess.run(cmd, timeout=600)  # 10 minutes max
+        trading.main(['optimize', 'complet', '--mode', 'rapide'])
         
-    except subprocess.TimeoutExpired:
-        console.print("⏰ [yellow]Optimisation interrompue (timeout)[/yellow]")
+    except KeyboardInterrupt:
+        console.print("⏹️ [yellow]Optimisation interrompue[/yellow]")
     except Exception as e:
         console.print(f"❌ [red]Erreur: {e}[/red]")
 
@@ -165,17 +155,13 @@ def run_intensive_optimization():
     console.print("🎯 [yellow]Optimisation intensive pour résultats maximaux[/yellow]")
     
     try:
-        # Lancer le système complet avec paramètres intensifs
-        cmd = [
-            'python', 'scripts/systeme_optimisation_complet.py'
-        ]
-        
+        # Système complet en mode intensif, repris depuis son dernier point de reprise s'il existe
         console.print("🔄 [blue]Lancement de l'optimisation intensive...[/blue]")
         console.print("⏰ [red]Cette optimisation peut prendre 2-4 heures[/red]")
-        subprocess.run(cmd, timeout=14400)  # 4 heures max
+        trading.main(['optimize', 'complet', '--mode', 'intensif', '--resume'])
         
-    except subprocess.TimeoutExpired:
-        console.print("⏰ [yellow]Optimisation interrompue (timeout)[/yellow]")
+    except KeyboardInterrupt:
+        console.print("⏹️ [yellow]Optimisation interrompue (relancer pour reprendre au dernier point de reprise)[/yellow]")
     except Exception as e:
         console.print(f"❌ [red]Erreur: {e}[/red]")
 
@@ -188,10 +174,10 @@ def show_results():
     
     try:
         # Lister les modèles
-        subprocess.run(['python', 'scripts/gestion_modeles_optimaux.py'])
+        trading.main(['models', 'lister'])
         
         # Comparer les optimisations
-        subprocess.run(['python', 'scripts/comparaison_optimisations.py'])
+        trading.main(['report', 'optimisations'])
         
     except Exception as e:
         console.print(f"❌ [red]Erreur: {e}[/red]")
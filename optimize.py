@@ -7,18 +7,31 @@ Point d'entrée pour l'optimisation des stratégies
 import sys
 import os
 
-# Rich pour une belle interface
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
+# Commandes exécutées dans ce processus par trading.py (imports lourds à la demande)
+import trading
 
-console = Console()
-
-# Ajout du chemin des scripts
-sys.path.append('scripts')
+# Choix du menu -> (titre, couleur, commande de trading.py ; None = menu de gestion des modèles)
+COMMANDES = {
+    "1": ("[bold blue]🧬 Optimisation Génétique[/bold blue]", "blue", ['optimize', 'drawdown']),
+    "2": ("[bold red]🔥 Optimisation Agressive[/bold red]", "red", ['optimize', 'agressif']),
+    "3": ("[bold purple]🤖 Reinforcement Learning[/bold purple]", "purple", ['optimize', 'rl']),
+    "4": ("[bold green]🔗 Système d'Optimisation Complet[/bold green]", "green", ['optimize', 'complet']),
+    "5": ("[bold yellow]📊 Comparaison des Méthodes[/bold yellow]", "yellow", ['report', 'comparaison']),
+    "6": ("[bold cyan]⏰ Test Multi-Timeframes[/bold cyan]", "cyan", ['backtest', 'timeframes']),
+    "7": ("[bold magenta]📈 Affichage des Résultats[/bold magenta]", "magenta", ['report', 'multitimeframes']),
+    "8": ("[bold orange]📋 Analyse Automatique[/bold orange]", "orange", ['report', 'auto']),
+    "9": ("[bold violet]💾 Gestion des Modèles[/bold violet]", "violet", None),
+}
 
 def main():
+    # Rich pour une belle interface (importé seulement à l'affichage du menu)
+    from rich.console import Console
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich import box
+
+    console = Console()
+
     console.print(Panel.fit(
         "[bold blue]🚀 SYSTÈME D'OPTIMISATION - MENU PRINCIPAL[/bold blue]\n"
         "[cyan]Point d'entrée pour tous les scripts d'optimisation[/cyan]",
@@ -46,33 +59,15 @@ def main():
     
     choice = console.input("\n[bold green]Choisissez une option (1-9): [/bold green]")
     
-    if choice == "1":
-        console.print(Panel.fit("[bold blue]🧬 Optimisation Génétique[/bold blue]", border_style="blue"))
-        os.system("python scripts/optimisation_genetique_drawdown.py")
-    elif choice == "2":
-        console.print(Panel.fit("[bold red]🔥 Optimisation Agressive[/bold red]", border_style="red"))
-        os.system("python scripts/optimisation_agressive_gains.py")
-    elif choice == "3":
-        console.print(Panel.fit("[bold purple]🤖 Reinforcement Learning[/bold purple]", border_style="purple"))
-        os.system("python scripts/reinforcement_learning_optimizer.py")
-    elif choice == "4":
-        console.print(Panel.fit("[bold green]🔗 Système d'Optimisation Complet[/bold green]", border_style="green"))
-        os.system("python scripts/systeme_optimisation_complet.py")
-    elif choice == "5":
-        console.print(Panel.fit("[bold yellow]📊 Comparaison des Méthodes[/bold yellow]", border_style="yellow"))
-        os.system("python scripts/comparaison_optimisation.py")
-    elif choice == "6":
-        console.print(Panel.fit("[bold cyan]⏰ Test Multi-Timeframes[/bold cyan]", border_style="cyan"))
-        os.system("python scripts/test_all_timeframes_xauusd.py")
-    elif choice == "7":
-        console.print(Panel.fit("[bold magenta]📈 Affichage des Résultats[/bold magenta]", border_style="magenta"))
-        os.system("python scripts/afficher_resultats_multitimeframes.py")
-    elif choice == "8":
-        console.print(Panel.fit("[bold orange]📋 Analyse Automatique[/bold orange]", border_style="orange"))
-        os.system("python scripts/analyse_strategie_auto.py")
-    elif choice == "9":
-        console.print(Panel.fit("[bold violet]💾 Gestion des Modèles[/bold violet]", border_style="violet"))
-        os.system("python scripts/gestion_modeles_optimaux.py")
+    if choice in COMMANDES:
+        titre, couleur, commande = COMMANDES[choice]
+        console.print(Panel.fit(titre, border_style=couleur))
+        if commande is None:
+            trading.preparer_chemins()
+            import gestion_modeles_optimaux
+            gestion_modeles_optimaux.main()
+        else:
+            trading.main(commande)
     else:
         console.print("❌ [red]Option invalide[/red]")
 
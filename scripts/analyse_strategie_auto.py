@@ -8,6 +8,10 @@ import os
 import sys
 from datetime import datetime
 
+# Ajout du chemin pour importer les modules (importés à l'exécution, dans ce processus)
+sys.path.append('src/strategies')
+sys.path.append('src/analysis')
+
 def main():
     """Lance l'analyse automatique de la stratégie"""
     print("🚀 ANALYSE AUTOMATIQUE DE LA STRATÉGIE XAUUSD")
@@ -15,11 +19,13 @@ def main():
     
     # 1. Lancement du backtest
     print("\n📊 Étape 1: Lancement du backtest...")
-    os.system("python src/strategies/strategie_xauusd_sharpe1_simple.py")
+    import strategie_xauusd_sharpe1_simple
+    strategie_xauusd_sharpe1_simple.main()
     
     # 2. Génération de l'analyse détaillée
     print("\n🔍 Étape 2: Génération de l'analyse détaillée...")
-    os.system("python src/analysis/generate_strategy_analysis.py")
+    import generate_strategy_analysis
+    generate_strategy_analysis.main()
     
     # 3. Affichage du résumé
     print("\n✅ ANALYSE TERMINÉE!")
@@ -90,52 +90,28 @@ class ModelManager:
             return False
     
     def calculate_model_score(self, metrics):
-        """Calcule un score pour le modèle"""
-        score = 0
-        
+        """
+        Calcule un score pour le modèle (métriques d'un modèle, ou tableaux
+        d'un lot de métriques : un score par modèle)
+        """
         # Retour (0-40 points)
-        return_val = metrics.get('total_return', 0)
-        if return_val > 500:
-            score += 40
-        elif return_val > 300:
-            score += 35
-        elif return_val > 200:
-            score += 30
-        elif return_val > 100:
-            score += 25
-        elif return_val > 50:
-            score += 20
+        return_val = np.asarray(metrics.get('total_return', 0))
+        score = np.select([return_val > 500, return_val > 300, return_val > 200, return_val > 100, return_val > 50],
+                          [40, 35, 30, 25, 20], 0)
         
         # Drawdown (0-30 points)
-        dd = metrics.get('max_drawdown', 100)
-        if dd < 10:
-            score += 30
-        elif dd < 20:
-            score += 25
-        elif dd < 30:
-            score += 20
-        elif dd < 50:
-            score += 15
+        dd = np.asarray(metrics.get('max_drawdown', 100))
+        score = score + np.select([dd < 10, dd < 20, dd < 30, dd < 50], [30, 25, 20, 15], 0)
         
         # Win Rate (0-20 points)
-        wr = metrics.get('win_rate', 0)
-        if wr > 60:
-            score += 20
-        elif wr > 55:
-            score += 15
-        elif wr > 50:
-            score += 10
+        wr = np.asarray(metrics.get('win_rate', 0))
+        score = score + np.select([wr > 60, wr > 55, wr > 50], [20, 15, 10], 0)
         
         # Profit Factor (0-10 points)
-        pf = metrics.get('profit_factor', 0)
-        if pf > 4:
-            score += 10
-        elif pf > 3:
-            score += 8
-        elif pf > 2:
-            score += 5
-        
-        return score
+        pf = np.asarray(metrics.get('profit_factor', 0))
+        score = score + np.select([pf > 4, pf > 3, pf > 2], [10, 8, 5], 0)
+        
+        return score if score.ndim else score.item()
     
     def get_best_model(self, optimization_type, timeframe):
         """Récupère le meilleur modèle pour un type et timeframe"""
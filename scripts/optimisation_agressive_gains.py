@@ -11,21 +11,39 @@ import numpy as np
 from datetime import datetime
 import random
 import warnings
+from functools import partial
 warnings.filterwarnings('ignore')
 
 # Ajout du chemin pour importer les modules
 sys.path.append('src/strategies')
+sys.path.append('src')
+from indicators import IndicatorCache, rolling_mean
+from donnees import charger_ohlcv
+from moteur import colonnes_par_parametre, vecteur_parametre, simuler_lot, trades_par_individu
+from moteur import ParallelEvaluator, parametres_individus, reporter_resultats
+from moteur import FitnessCache, empreinte_donnees, metriques_journal, metriques_individu
+from moteur import journal_optimiseur, colonne_trades, PointReprise, chemin_reprise
+from moteur import evaluer_avec_elimination, resultats_acquis
 from strategie_xauusd_sharpe1_simple import calculate_metrics
 
 class AggressiveOptimizer:
-    def __init__(self, symbol="XAUUSD", timeframe="D1", population_size=100, generations=50):
+    def __init__(self, symbol="XAUUSD", timeframe="D1", population_size=100, generations=50,
+                 mode_evaluation='serial', workers=None, cache_fitness=None, fenetre=None, reprise=None,
+                 elimination=False):
         self.symbol = symbol
         self.timeframe = timeframe
         self.population_size = population_size
         self.generations = generations
+        self.mode_evaluation = mode_evaluation
+        self.workers = workers
+        self.reprise = reprise  # PointReprise ou None
+        self.elimination = elimination  # élimination successive des nouveaux individus
         
-        # Chargement des données
-        self.df = self.load_data()
+        # Chargement des données (indicateurs calculés une fois sur la série complète)
+        self.df_complet = self.load_data()
+        self.indicateurs_complets = IndicatorCache.depuis_df(self.df_complet)
+        self.definir_fenetre(*(fenetre or (0, None)))
+        self.cache_fitness = cache_fitness if cache_fitness is not None else FitnessCache()
         
         # Paramètres étendus à optimiser
         self.param_ranges = {
@@ -71,9 +89,23 @@ class AggressiveOptimizer:
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"Fichier non trouvé: {csv_path}")
         
-        df = pd.read_csv(csv_path)
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df
+        return charger_ohlcv(self.symbol, self.timeframe)
+    
+    def definir_fenetre(self, debut=0, fin=None):
+        """
+        Restreint l'optimisation aux barres [debut, fin) de la série (walk-forward).
+        Les indicateurs restent ceux de la série complète, servis par le cache partagé.
+        """
+        self.fenetre = (debut, fin)
+        self.df = self.df_complet.iloc[debut:fin].reset_index(drop=True)
+        self.indicateurs = self.indicateurs_complets.fenetre(debut, fin)
+        # L'historique de chauffe fait partie des données évaluées
+        self.empreinte = empreinte_donnees(self.df_complet.iloc[:fin])
+        if debut:
+            self.empreinte += f"/{debut}"
+        self.best_individual = None
+        self.best_fitness = float('-inf')
+        self.history = []
     
     def create_individual(self):
         """Crée un individu avec des paramètres aléatoires"""
@@ -89,47 +121,18 @@ class AggressiveOptimizer:
         """Crée une population initiale"""
         return [self.create_individual() for _ in range(self.population_size)]
     
-    def evaluate_fitness(self, individual):
+    def evaluate_fitness(self, individual, trades=None):
         """Évalue la fitness avec objectifs agressifs"""
         try:
-            trades, df_signals = self.apply_strategy_with_params(individual)
+            if trades is None:
+                trades, df_signals = self.apply_strategy_with_params(individual)
             
             if len(trades) < 20:  # Minimum de trades
                 return float('-inf')
             
             metrics = calculate_metrics(trades)
-            
-            # Critères de fitness agressifs
-            # 1. Gain total (priorité maximale)
-            total_gain = metrics['total_return']
-            
-            # 2. Drawdown (doit rester faible)
-            drawdown_penalty = max(0, metrics['max_drawdown'] - 20) * 15  # Pénalité forte si > 20%
-            
-            # 3. Win rate (bonus pour > 55%)
-            win_rate_bonus = max(0, metrics['win_rate'] - 55) * 2
-            
-            # 4. Profit factor (bonus pour > 3)
-            profit_factor_bonus = max(0, metrics['profit_factor'] - 3) * 10
-            
-            # 5. Taille moyenne des gains
-            avg_win = metrics.get('avg_win', 0)
-            avg_win_bonus = max(0, avg_win - 2) * 5  # Bonus pour gains > 2%
-            
-            # 6. Nombre de trades (bonus pour plus de trades)
-            trades_bonus = min(metrics['total_trades'] / 100, 5)  # Max 5 points
-            
-            # 7. Sharpe ratio
-            sharpe_bonus = max(0, metrics['sharpe_ratio'] - 2) * 2
-            
-            # 8. Pénalité pour trades trop petits
-            small_trades_penalty = 0
-            if len(trades) > 0:
-                small_trades = sum(1 for trade in trades if abs(trade.get('pnl', 0)) < 0.5)
-                small_trades_penalty = (small_trades / len(trades)) * 10
-            
-            # Fitness = gains - pénalités + bonus
-            fitness = (total_gain * 0.3) - drawdown_penalty + win_rate_bonus + profit_factor_bonus + avg_win_bonus + trades_bonus + sharpe_bonus - small_trades_penalty
+            small_trades = int((np.abs(colonne_trades(trades, 'pnl')) < 0.5).sum())
+            fitness = float(self.score_fitness(metrics, small_trades / len(trades)))
             
             # Stockage des métriques
             individual['metrics'] = metrics
@@ -141,14 +144,99 @@ class AggressiveOptimizer:
             print(f"Erreur évaluation: {e}")
             return float('-inf')
     
+    def score_fitness(self, metrics, part_petits_trades):
+        """
+        Fitness agressive à partir des métriques : scalaires d'un individu ou
+        tableaux d'un lot (moteur.metriques_lot), une fitness par individu
+        """
+        # Critères de fitness agressifs
+        # 1. Gain total (priorité maximale)
+        total_gain = metrics['total_return']
+        
+        # 2. Drawdown (doit rester faible)
+        drawdown_penalty = np.fmax(0, metrics['max_drawdown'] - 20) * 15  # Pénalité forte si > 20%
+        
+        # 3. Win rate (bonus pour > 55%)
+        win_rate_bonus = np.fmax(0, metrics['win_rate'] - 55) * 2
+        
+        # 4. Profit factor (bonus pour > 3)
+        profit_factor_bonus = np.fmax(0, metrics['profit_factor'] - 3) * 10
+        
+        # 5. Taille moyenne des gains
+        avg_win = metrics.get('avg_win', 0)
+        avg_win_bonus = np.fmax(0, avg_win - 2) * 5  # Bonus pour gains > 2%
+        
+        # 6. Nombre de trades (bonus pour plus de trades)
+        trades_bonus = np.fmin(metrics['total_trades'] / 100, 5)  # Max 5 points
+        
+        # 7. Sharpe ratio
+        sharpe_bonus = np.fmax(0, metrics['sharpe_ratio'] - 2) * 2
+        
+        # 8. Pénalité pour trades trop petits (|PnL| < 0.5%)
+        small_trades_penalty = part_petits_trades * 10
+        
+        # Fitness = gains - pénalités + bonus
+        return (total_gain * 0.3) - drawdown_penalty + win_rate_bonus + profit_factor_bonus + avg_win_bonus + trades_bonus + sharpe_bonus - small_trades_penalty
+    
+    def evaluer_population(self, population, barres=None):
+        """
+        Fitness et métriques d'une tranche de population, en une passe par lots.
+        Appelée par l'évaluateur (éventuellement dans un worker) : reçoit des
+        paramètres, renvoie des couples (fitness, métriques ou None).
+        Les métriques et fitness de tout le lot sont calculées ensemble sur le journal.
+        `barres` limite le backtest aux premières barres de la fenêtre.
+        """
+        journal = self.journal_population(population, barres)
+        metrics = metriques_journal(journal)
+        total_trades = metrics['total_trades']
+        petits_trades = np.bincount(journal['lot'][np.abs(journal['rendement'] * 100) < 0.5],
+                                    minlength=len(population))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fitness = self.score_fitness(metrics, petits_trades / total_trades)
+        
+        resultats = []
+        for k, individual in enumerate(population):
+            if total_trades[k] < 20:  # Minimum de trades
+                resultats.append((float('-inf'), None))
+                continue
+            individual['metrics'] = metriques_individu(metrics, k)
+            individual['fitness'] = float(fitness[k])
+            resultats.append((individual['fitness'], individual['metrics']))
+        return resultats
+    
+    def creer_evaluateur(self):
+        """Évaluateur des populations ; en mode processus chaque worker recharge ses données une fois"""
+        if self.mode_evaluation == 'process':
+            return ParallelEvaluator('process', self.workers,
+                                     fabrique=partial(AggressiveOptimizer, fenetre=self.fenetre),
+                                     args=(self.symbol, self.timeframe))
+        return ParallelEvaluator(self.mode_evaluation, self.workers, contexte=self)
+    
     def apply_strategy_with_params(self, params):
         """Applique la stratégie avec paramètres optimisés"""
-        return self.strategie_agressive(self.df, self.symbol, self.timeframe, params)
+        return self.strategie_agressive(self.df, self.symbol, self.timeframe, params, self.indicateurs)
+    
+    def apply_strategy_batch(self, population):
+        """Applique la stratégie à toute une population en une passe (un TradeLog par individu)"""
+        return trades_par_individu(self.journal_population(population), self.df['Date'])
+    
+    def journal_population(self, population, barres=None):
+        """
+        Journal en colonnes des trades de toute une population (une passe par
+        lots), sur les `barres` premières barres de la fenêtre si fourni
+        """
+        if barres is None:
+            return self.strategie_agressive_lot(self.df, self.symbol, self.timeframe, population, self.indicateurs)
+        debut = self.fenetre[0]
+        return self.strategie_agressive_lot(self.df.iloc[:barres], self.symbol, self.timeframe, population,
+                                            self.indicateurs_complets.fenetre(debut, debut + barres))
     
-    def strategie_agressive(self, df, symbol, timeframe, params):
+    def strategie_agressive(self, df, symbol, timeframe, params, indicateurs=None):
         """Stratégie agressive avec tous les paramètres optimisés"""
         
         df = df.copy()
+        if indicateurs is None:
+            indicateurs = IndicatorCache.depuis_df(df)
         
         # Paramètres de base
         breakout_period = int(params['breakout_period'])
@@ -181,19 +269,19 @@ class AggressiveOptimizer:
         weekend_filter = bool(params['weekend_filter'])
         
         # Calcul des indicateurs avancés
-        df['ATR'] = self.calculate_atr(df, atr_period)
-        df['RSI'] = self.calculate_rsi(df['Close'], 8)
-        df['EMA_Short'] = df['Close'].ewm(span=ema_short).mean()
-        df['EMA_Long'] = df['Close'].ewm(span=ema_long).mean()
-        df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-        df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+        df['ATR'] = indicateurs.atr(atr_period)
+        df['RSI'] = indicateurs.rsi(8)
+        df['EMA_Short'] = indicateurs.ema(ema_short)
+        df['EMA_Long'] = indicateurs.ema(ema_long)
+        df['High_Break'] = indicateurs.plus_haut(breakout_period)
+        df['Low_Break'] = indicateurs.plus_bas(breakout_period)
         
         # Indicateurs supplémentaires
         df['Volatility'] = df['ATR'] / df['Close'] * 100
         df['Momentum'] = df['Close'].pct_change(periods=3)
         df['Trend_Strength'] = abs(df['EMA_Short'] - df['EMA_Long']) / df['EMA_Long'] * 100
-        df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
-        df['RSI_MA'] = df['RSI'].rolling(window=10).mean()
+        df['Volume_MA'] = rolling_mean(df['Volume'], 20)
+        df['RSI_MA'] = rolling_mean(df['RSI'], 10)
         
         # Filtres avancés
         df['Min_Pips_OK'] = df['ATR'] >= min_pips_filter * 0.0001  # Conversion en pips
@@ -207,19 +295,19 @@ class AggressiveOptimizer:
         df['Hour'] = df['Date'].dt.hour
         df['DayOfWeek'] = df['Date'].dt.dayofweek
         df['Time_OK'] = (df['Hour'] >= time_filter_start) & (df['Hour'] <= time_filter_end)
-        df['Weekend_OK'] = ~weekend_filter | (df['DayOfWeek'] < 5)  # Lundi-Vendredi
+        df['Weekend_OK'] = (not weekend_filter) | (df['DayOfWeek'] < 5)  # Lundi-Vendredi
         
         # Conditions d'entrée améliorées
         df['Breakout_Up'] = (
             (df['High'].shift(1) < df['High_Break'].shift(1)) & 
             (df['High'] >= df['High_Break']) &
-            (df['High'] - df['High_Break'].shift(1)) >= min_pips_filter * 0.0001  # Minimum pips
+            ((df['High'] - df['High_Break'].shift(1)) >= min_pips_filter * 0.0001)  # Minimum pips
         )
         
         df['Breakout_Down'] = (
             (df['Low'].shift(1) > df['Low_Break'].shift(1)) & 
             (df['Low'] <= df['Low_Break']) &
-            (df['Low_Break'].shift(1) - df['Low']) >= min_pips_filter * 0.0001  # Minimum pips
+            ((df['Low_Break'].shift(1) - df['Low']) >= min_pips_filter * 0.0001)  # Minimum pips
         )
         
         # Confirmation du breakout
@@ -230,10 +318,10 @@ class AggressiveOptimizer:
         # Signaux finaux avec tous les filtres
         df['Long_Signal'] = (
             df['Breakout_Up'] &
-            df['EMA_Short'] > df['EMA_Long'] * (1 + trend_strength * 0.001) &
-            df['Close'] > df['EMA_Short'] &
-            df['RSI'] < rsi_overbought &
-            df['RSI'] > rsi_filter &
+            (df['EMA_Short'] > df['EMA_Long'] * (1 + trend_strength * 0.001)) &
+            (df['Close'] > df['EMA_Short']) &
+            (df['RSI'] < rsi_overbought) &
+            (df['RSI'] > rsi_filter) &
             df['Min_Pips_OK'] &
             df['Volatility_OK'] &
             df['Momentum_OK'] &
@@ -246,10 +334,10 @@ class AggressiveOptimizer:
         
         df['Short_Signal'] = (
             df['Breakout_Down'] &
-            df['EMA_Short'] < df['EMA_Long'] * (1 - trend_strength * 0.001) &
-            df['Close'] < df['EMA_Short'] &
-            df['RSI'] > rsi_oversold &
-            df['RSI'] < (100 - rsi_filter) &
+            (df['EMA_Short'] < df['EMA_Long'] * (1 - trend_strength * 0.001)) &
+            (df['Close'] < df['EMA_Short']) &
+            (df['RSI'] > rsi_oversold) &
+            (df['RSI'] < (100 - rsi_filter)) &
             df['Min_Pips_OK'] &
             df['Volatility_OK'] &
             df['Momentum_OK'] &
@@ -261,7 +349,7 @@ class AggressiveOptimizer:
         )
         
         # Simulation des trades avec gestion avancée
-        trades = []
+        trades = journal_optimiseur()
         position = 0
         entry_price = 0
         entry_date = None
@@ -337,7 +425,8 @@ class AggressiveOptimizer:
                         profit_locked = False
                         continue
                     
-                    # Verrouillage des profits
+                    # Verrouillage des profits (sur le gain latent de la position)
+                    pnl = (current_price - entry_price) / entry_price * 100
                     if not profit_locked and pnl >= profit_lock:
                         profit_locked = True
                         trailing_stop = entry_price + (trail_atr * current_atr)
@@ -399,7 +488,8 @@ class AggressiveOptimizer:
                         profit_locked = False
                         continue
                     
-                    # Verrouillage des profits
+                    # Verrouillage des profits (sur le gain latent de la position)
+                    pnl = (entry_price - current_price) / entry_price * 100
                     if not profit_locked and pnl >= profit_lock:
                         profit_locked = True
                         trailing_stop = entry_price - (trail_atr * current_atr)
@@ -452,24 +542,113 @@ class AggressiveOptimizer:
         
         return trades, df
     
-    def calculate_atr(self, df, period):
-        """Calcule l'ATR"""
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        return atr
-    
-    def calculate_rsi(self, prices, period):
-        """Calcule le RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+    def strategie_agressive_lot(self, df, symbol, timeframe, population, indicateurs=None):
+        """
+        Version par lots de strategie_agressive : mêmes filtres et mêmes sorties,
+        évalués pour tous les individus en une seule passe sur les barres.
+        Retourne le journal de lot (colonnes, offsets par individu).
+        """
+        if indicateurs is None:
+            indicateurs = IndicatorCache.depuis_df(df)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+        
+        def vecteur(nom, dtype=np.float64):
+            return vecteur_parametre(population, nom, dtype=dtype)
+        
+        profit_atr = vecteur('profit_atr')
+        rsi_overbought = vecteur('rsi_overbought')
+        rsi_oversold = vecteur('rsi_oversold')
+        trail_atr = vecteur('trail_atr')
+        stop_loss_atr = vecteur('stop_loss_atr')
+        max_positions = vecteur('max_positions', np.int64)
+        min_pips_filter = vecteur('min_pips_filter')
+        momentum_strength = vecteur('momentum_strength')
+        volume_filter = vecteur('volume_filter')
+        trend_strength = vecteur('trend_strength')
+        max_hold_time = vecteur('max_hold_time', np.int64)
+        profit_lock = vecteur('profit_lock')
+        rsi_filter = vecteur('rsi_filter')
+        atr_threshold = vecteur('atr_threshold')
+        time_filter_start = vecteur('time_filter_start', np.int64)
+        time_filter_end = vecteur('time_filter_end', np.int64)
+        weekend_filter = vecteur('weekend_filter', np.int64).astype(bool)
+        
+        # Indicateurs : un calcul par période distincte
+        atr_lot = colonnes_par_parametre([int(p['atr_period']) for p in population], indicateurs.atr)
+        # Banque d'EMA : toutes les périodes courtes et longues en une passe, indexées par individu
+        periodes_ema, indices_ema = np.unique([int(p['ema_short']) for p in population] +
+                                              [int(p['ema_long']) for p in population], return_inverse=True)
+        banque_ema = indicateurs.banque_ema(periodes_ema)
+        ema_short = banque_ema[indices_ema[:len(population)]].T
+        ema_long = banque_ema[indices_ema[len(population):]].T
+        # Canaux de breakout de toutes les périodes en une passe, indexés par individu
+        periodes, indices_breakout = np.unique([int(p['breakout_period']) for p in population],
+                                               return_inverse=True)
+        canal_haut, canal_bas = indicateurs.canal_breakout(periodes)
+        high_break = canal_haut[indices_breakout].T
+        low_break = canal_bas[indices_breakout].T
+        rsi_8 = indicateurs.rsi(8)[:, None]
+        
+        # Indicateurs supplémentaires
+        volatility = atr_lot / close[:, None] * 100
+        momentum = np.full(len(close), np.nan)
+        momentum[3:] = close[3:] / close[:-3] - 1
+        trend = np.abs(ema_short - ema_long) / ema_long * 100
+        volume_ma = indicateurs.moyenne(20, 'Volume')
+        
+        # Filtres avancés
+        min_pips = min_pips_filter * 0.0001
+        filtres = (
+            (atr_lot >= min_pips) &
+            (volatility >= atr_threshold) &
+            (np.abs(momentum)[:, None] >= momentum_strength * 0.001) &
+            (volume[:, None] >= volume_ma[:, None] * volume_filter) &
+            (trend >= trend_strength) &
+            ((rsi_8 > rsi_filter) & (rsi_8 < (100 - rsi_filter)))
+        )
+        
+        # Filtres temporels
+        hour = df['Date'].dt.hour.to_numpy()[:, None]
+        day_of_week = df['Date'].dt.dayofweek.to_numpy()[:, None]
+        filtres &= (hour >= time_filter_start) & (hour <= time_filter_end)
+        filtres &= ~weekend_filter | (day_of_week < 5)
+        
+        # Breakouts avec minimum de pips
+        breakout_up = np.zeros(high_break.shape, dtype=bool)
+        breakout_up[1:] = ((high[:-1, None] < high_break[:-1]) & (high[1:, None] >= high_break[1:]) &
+                           ((high[1:, None] - high_break[:-1]) >= min_pips))
+        breakout_down = np.zeros(low_break.shape, dtype=bool)
+        breakout_down[1:] = ((low[:-1, None] > low_break[:-1]) & (low[1:, None] <= low_break[1:]) &
+                             ((low_break[:-1] - low[1:, None]) >= min_pips))
+        
+        long_signal = (
+            breakout_up &
+            (ema_short > ema_long * (1 + trend_strength * 0.001)) &
+            (close[:, None] > ema_short) &
+            (rsi_8 < rsi_overbought) &
+            (rsi_8 > rsi_filter) &
+            filtres
+        )
+        short_signal = (
+            breakout_down &
+            (ema_short < ema_long * (1 - trend_strength * 0.001)) &
+            (close[:, None] < ema_short) &
+            (rsi_8 > rsi_oversold) &
+            (rsi_8 < (100 - rsi_filter)) &
+            filtres
+        )
+        
+        # Sortie par durée, stop / objectif figés à l'entrée, trailing stop après verrouillage
+        journal = simuler_lot(
+            close, atr_lot, long_signal, short_signal,
+            stop_atr=stop_loss_atr, cible_atr=profit_atr, debut=50,
+            duree_max=max_hold_time, verrou_profit=profit_lock, trail_atr=trail_atr,
+            autorise=max_positions > 0
+        )
+        return journal
     
     def select_parents(self, population, fitness_scores):
         """Sélectionne les parents par tournoi"""
@@ -507,25 +686,38 @@ class AggressiveOptimizer:
         
         return mutated
     
-    def optimize(self):
-        """Lance l'optimisation agressive"""
+    def optimize(self, enregistrer=True):
+        """Lance l'optimisation agressive (`enregistrer=False` : ni fichiers de résultats ni modèle enregistré)"""
         print(f"🔥 OPTIMISATION AGRESSIVE - {self.symbol} {self.timeframe}")
         print(f"Population: {self.population_size}, Générations: {self.generations}")
         print("Objectifs: Gros gains, DD < 20%, minimum 5 pips")
         print("=" * 70)
         
-        # Population initiale
-        population = self.create_population()
+        # Population initiale, ou celle du dernier point de reprise
+        population, debut = self.reprendre()
+        if population is None:
+            population = self.create_population()
+        evaluateur = self.creer_evaluateur()
         
-        for generation in range(self.generations):
+        for generation in range(debut, self.generations):
             print(f"\n🔄 Génération {generation + 1}/{self.generations}")
             
-            # Évaluation de la population
-            fitness_scores = []
-            for individual in population:
-                fitness = self.evaluate_fitness(individual)
-                fitness_scores.append(fitness)
-                
+            # Évaluation de la population (série, threads ou processus)
+            if self.elimination:
+                # Les nouveaux individus passent par les paliers (débuts de série), l'élite garde son
+                # résultat complet ; le cache n'évite que des backtests
+                resultats = evaluer_avec_elimination(
+                    self.cache_fitness, 'agressif', self.empreinte, parametres_individus(population),
+                    lambda individus, barres: evaluateur.evaluer('evaluer_population', individus, barres),
+                    len(self.df), acquis=resultats_acquis(population)
+                )
+            else:
+                resultats = self.cache_fitness.evaluer(
+                    'agressif', self.empreinte, parametres_individus(population),
+                    lambda manquants: evaluateur.evaluer('evaluer_population', manquants)
+                )
+            fitness_scores = reporter_resultats(population, resultats)
+            for individual, fitness in zip(population, fitness_scores):
                 # Mise à jour du meilleur
                 if fitness > self.best_fitness:
                     self.best_fitness = fitness
@@ -536,7 +728,9 @@ class AggressiveOptimizer:
             best_individual = population[best_idx]
             best_metrics = best_individual.get('metrics', {})
             
+            stats_cache = self.cache_fitness.statistiques_generation()
             print(f"📊 Meilleur fitness: {max(fitness_scores):.2f}")
+            print(f"🗄️ Cache: {stats_cache['taux_hit']:.0%} ({stats_cache['hits']} hits, {stats_cache['misses']} backtests)")
             if best_metrics:
                 print(f"   • Trades: {best_metrics.get('total_trades', 0)}")
                 print(f"   • Win Rate: {best_metrics.get('win_rate', 0):.2f}%")
@@ -550,14 +744,15 @@ class AggressiveOptimizer:
                 'generation': generation + 1,
                 'best_fitness': max(fitness_scores),
                 'avg_fitness': np.mean(fitness_scores),
-                'best_metrics': best_metrics
+                'best_metrics': best_metrics,
+                'cache_hit_rate': stats_cache['taux_hit']
             })
             
             # Création de la nouvelle population
             new_population = []
             
-            # Élitisme: garder le meilleur
-            new_population.append(self.best_individual)
+            # Élitisme: garder le meilleur (celui de la génération tant qu'aucun n'est valide)
+            new_population.append(self.best_individual or best_individual)
             
             # Génération des enfants
             while len(new_population) < self.population_size:
@@ -567,6 +762,14 @@ class AggressiveOptimizer:
                 new_population.append(child)
             
             population = new_population
+            self.sauvegarder_reprise(generation + 1, population)
+        
+        evaluateur.fermer()
+        if self.reprise is not None:
+            self.reprise.terminer()
+        
+        if not enregistrer:
+            return self.best_individual
         
         # Résultats finaux
         self.save_results()
@@ -577,6 +780,35 @@ class AggressiveOptimizer:
         
         return self.best_individual
     
+    def signature_reprise(self):
+        """Identité de l'optimisation qu'un point de reprise doit partager"""
+        return ('agressif', self.symbol, self.timeframe, self.empreinte, self.population_size)
+    
+    def reprendre(self):
+        """(population, génération de départ) du point de reprise, (None, 0) sans reprise"""
+        etat = self.reprise.charger(self.signature_reprise()) if self.reprise is not None else None
+        if etat is None:
+            return None, 0
+        self.best_individual = etat['best_individual']
+        self.best_fitness = etat['best_fitness']
+        self.history = etat['history']
+        if 'cache' in etat:
+            self.cache_fitness.restaurer(etat['cache'])
+        print(f"♻️ Reprise à la génération {etat['generation'] + 1}: {self.reprise.chemin}")
+        return etat['population'], etat['generation']
+    
+    def sauvegarder_reprise(self, generation, population):
+        """Point de reprise après `generation` générations (population suivante déjà créée)"""
+        if self.reprise is not None and self.reprise.echeance(generation):
+            self.reprise.sauvegarder({
+                'generation': generation,
+                'population': population,
+                'best_individual': self.best_individual,
+                'best_fitness': self.best_fitness,
+                'history': self.history,
+                'cache': self.cache_fitness.instantane(),
+            }, self.signature_reprise())
+    
     def save_results(self):
         """Sauvegarde les résultats de l'optimisation"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -650,23 +882,23 @@ class AggressiveOptimizer:
         except Exception as e:
             print(f"⚠️ Erreur lors de l'enregistrement du modèle: {e}")
 
-def main():
-    """Fonction principale"""
+def main(symbol="XAUUSD", timeframes=('H4', 'D1'), population_size=80, generations=30,
+         reprendre=False, intervalle_reprise=5, elimination=False):
+    """Fonction principale (paramètres fournis par la CLI `trading.py optimize agressif`)"""
     print("🔥 OPTIMISATION AGRESSIVE POUR MAXIMISER LES GAINS")
     print("=" * 70)
     
-    # Test sur différents timeframes
-    timeframes = ['H4', 'D1']  # Timeframes avec meilleur potentiel
-    
     for timeframe in timeframes:
         print(f"\n🎯 Optimisation Agressive {timeframe}...")
         
         try:
             optimizer = AggressiveOptimizer(
-                symbol="XAUUSD",
+                symbol=symbol,
                 timeframe=timeframe,
-                population_size=80,
-                generations=30
+                population_size=population_size,
+                generations=generations,
+                reprise=PointReprise(chemin_reprise('agressif', symbol, timeframe), intervalle_reprise, reprendre),
+                elimination=elimination
             )
             
             best_params = optimizer.optimize()
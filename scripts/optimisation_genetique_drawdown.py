@@ -11,21 +11,38 @@ import numpy as np
 from datetime import datetime
 import random
 import warnings
+from functools import partial
 warnings.filterwarnings('ignore')
 
 # Ajout du chemin pour importer les modules
 sys.path.append('src/strategies')
+sys.path.append('src')
+from indicators import IndicatorCache, rolling_mean
+from donnees import charger_ohlcv
+from moteur import ParallelEvaluator, parametres_individus, reporter_resultats
+from moteur import FitnessCache, empreinte_donnees, metriques_lot, metriques_individu, offsets_journaux
+from moteur import journal_optimiseur, colonne_trades, PointReprise, chemin_reprise
+from moteur import evaluer_avec_elimination, resultats_acquis
 from strategie_xauusd_sharpe1_simple import strategie_xauusd_sharpe1_simple, calculate_metrics
 
 class GeneticOptimizer:
-    def __init__(self, symbol="XAUUSD", timeframe="D1", population_size=50, generations=30):
+    def __init__(self, symbol="XAUUSD", timeframe="D1", population_size=50, generations=30,
+                 mode_evaluation='serial', workers=None, cache_fitness=None, fenetre=None, reprise=None,
+                 elimination=False):
         self.symbol = symbol
         self.timeframe = timeframe
         self.population_size = population_size
         self.generations = generations
+        self.mode_evaluation = mode_evaluation
+        self.workers = workers
+        self.reprise = reprise  # PointReprise ou None
+        self.elimination = elimination  # élimination successive des nouveaux individus
         
-        # Chargement des données
-        self.df = self.load_data()
+        # Chargement des données (indicateurs calculés une fois sur la série complète)
+        self.df_complet = self.load_data()
+        self.indicateurs_complets = IndicatorCache.depuis_df(self.df_complet)
+        self.definir_fenetre(*(fenetre or (0, None)))
+        self.cache_fitness = cache_fitness if cache_fitness is not None else FitnessCache()
         
         # Paramètres à optimiser avec leurs plages
         self.param_ranges = {
@@ -53,9 +70,23 @@ class GeneticOptimizer:
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"Fichier non trouvé: {csv_path}")
         
-        df = pd.read_csv(csv_path)
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df
+        return charger_ohlcv(self.symbol, self.timeframe)
+    
+    def definir_fenetre(self, debut=0, fin=None):
+        """
+        Restreint l'optimisation aux barres [debut, fin) de la série (walk-forward).
+        Les indicateurs restent ceux de la série complète, servis par le cache partagé.
+        """
+        self.fenetre = (debut, fin)
+        self.df = self.df_complet.iloc[debut:fin].reset_index(drop=True)
+        self.indicateurs = self.indicateurs_complets.fenetre(debut, fin)
+        # L'historique de chauffe fait partie des données évaluées
+        self.empreinte = empreinte_donnees(self.df_complet.iloc[:fin])
+        if debut:
+            self.empreinte += f"/{debut}"
+        self.best_individual = None
+        self.best_fitness = float('-inf')
+        self.history = []
     
     def create_individual(self):
         """Crée un individu avec des paramètres aléatoires"""
@@ -81,15 +112,7 @@ class GeneticOptimizer:
                 return float('-inf')
             
             metrics = calculate_metrics(trades)
-            
-            # Critères de fitness (priorité au drawdown)
-            drawdown_penalty = max(0, metrics['max_drawdown'] - 30) * 10  # Pénalité forte si > 30%
-            win_rate_bonus = max(0, metrics['win_rate'] - 45) * 0.5       # Bonus pour win rate > 45%
-            profit_factor_bonus = max(0, metrics['profit_factor'] - 1.5) * 2  # Bonus pour PF > 1.5
-            return_bonus = max(0, metrics['total_return'] - 50) * 0.1      # Bonus pour retour > 50%
-            
-            # Fitness = bonus - pénalités
-            fitness = (win_rate_bonus + profit_factor_bonus + return_bonus) - drawdown_penalty
+            fitness = float(self.score_fitness(metrics))
             
             # Stockage des métriques pour analyse
             individual['metrics'] = metrics
@@ -101,12 +124,65 @@ class GeneticOptimizer:
             print(f"Erreur évaluation: {e}")
             return float('-inf')
     
-    def apply_strategy_with_params(self, params):
-        """Applique la stratégie avec des paramètres personnalisés"""
+    def score_fitness(self, metrics):
+        """Fitness à partir des métriques : scalaires d'un individu ou tableaux d'un lot (une par individu)"""
+        # Critères de fitness (priorité au drawdown)
+        drawdown_penalty = np.fmax(0, metrics['max_drawdown'] - 30) * 10  # Pénalité forte si > 30%
+        win_rate_bonus = np.fmax(0, metrics['win_rate'] - 45) * 0.5       # Bonus pour win rate > 45%
+        profit_factor_bonus = np.fmax(0, metrics['profit_factor'] - 1.5) * 2  # Bonus pour PF > 1.5
+        return_bonus = np.fmax(0, metrics['total_return'] - 50) * 0.1      # Bonus pour retour > 50%
+        
+        # Fitness = bonus - pénalités
+        return (win_rate_bonus + profit_factor_bonus + return_bonus) - drawdown_penalty
+    
+    def evaluer_population(self, population, barres=None):
+        """
+        Fitness et métriques d'une tranche de population : backtests individu
+        par individu, puis métriques et fitness de toute la tranche en un lot.
+        Appelée par l'évaluateur (éventuellement dans un worker) : reçoit des
+        paramètres, renvoie des couples (fitness, métriques ou None).
+        `barres` limite les backtests aux premières barres de la fenêtre.
+        """
+        journaux = []
+        for individual in population:
+            try:
+                trades, df_signals = self.apply_strategy_with_params(individual, barres)
+            except Exception as e:
+                print(f"Erreur évaluation: {e}")
+                trades = journal_optimiseur()
+            journaux.append(colonne_trades(trades, 'pnl'))
+        
+        metrics = metriques_lot(*offsets_journaux(journaux))
+        fitness = self.score_fitness(metrics)
+        resultats = []
+        for k, individual in enumerate(population):
+            if metrics['total_trades'][k] < 10:  # Pas assez de trades
+                resultats.append((float('-inf'), None))
+                continue
+            individual['metrics'] = metriques_individu(metrics, k)
+            individual['fitness'] = float(fitness[k])
+            resultats.append((individual['fitness'], individual['metrics']))
+        return resultats
+    
+    def creer_evaluateur(self):
+        """Évaluateur des populations ; en mode processus chaque worker recharge ses données une fois"""
+        if self.mode_evaluation == 'process':
+            # Petites tranches : les backtests individuels ont des durées inégales
+            return ParallelEvaluator('process', self.workers,
+                                     fabrique=partial(GeneticOptimizer, fenetre=self.fenetre),
+                                     args=(self.symbol, self.timeframe), tranches_par_worker=4)
+        return ParallelEvaluator(self.mode_evaluation, self.workers, contexte=self, tranches_par_worker=4)
+    
+    def apply_strategy_with_params(self, params, barres=None):
+        """Applique la stratégie avec des paramètres personnalisés (sur les `barres` premières barres si fourni)"""
         # Création d'une version modifiée de la stratégie avec les nouveaux paramètres
-        return self.strategie_optimisee(self.df, self.symbol, self.timeframe, params)
+        if barres is None:
+            return self.strategie_optimisee(self.df, self.symbol, self.timeframe, params, self.indicateurs)
+        debut = self.fenetre[0]
+        return self.strategie_optimisee(self.df.iloc[:barres], self.symbol, self.timeframe, params,
+                                        self.indicateurs_complets.fenetre(debut, debut + barres))
     
-    def strategie_optimisee(self, df, symbol, timeframe, params):
+    def strategie_optimisee(self, df, symbol, timeframe, params, indicateurs=None):
         """Version optimisée de la stratégie avec gestion du risque améliorée"""
         
         # Paramètres de la stratégie
@@ -124,25 +200,27 @@ class GeneticOptimizer:
         
         # Calcul des indicateurs
         df = df.copy()
+        if indicateurs is None:
+            indicateurs = IndicatorCache.depuis_df(df)
         
         # ATR
-        df['ATR'] = self.calculate_atr(df, atr_period)
+        df['ATR'] = indicateurs.atr(atr_period)
         
         # RSI
-        df['RSI'] = self.calculate_rsi(df['Close'], 8)
+        df['RSI'] = indicateurs.rsi(8)
         
         # EMAs
-        df['EMA_Short'] = df['Close'].ewm(span=ema_short).mean()
-        df['EMA_Long'] = df['Close'].ewm(span=ema_long).mean()
+        df['EMA_Short'] = indicateurs.ema(ema_short)
+        df['EMA_Long'] = indicateurs.ema(ema_long)
         
         # Breakout levels
-        df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-        df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+        df['High_Break'] = indicateurs.plus_haut(breakout_period)
+        df['Low_Break'] = indicateurs.plus_bas(breakout_period)
         
         # Filtres
         df['Uptrend'] = (df['EMA_Short'] > df['EMA_Long']) & (df['Close'] > df['EMA_Short'])
         df['Downtrend'] = (df['EMA_Short'] < df['EMA_Long']) & (df['Close'] < df['EMA_Short'])
-        df['Volatility_OK'] = df['ATR'] > df['ATR'].rolling(window=15).mean() * 0.3
+        df['Volatility_OK'] = df['ATR'] > rolling_mean(df['ATR'], 15) * 0.3
         df['Momentum_Up'] = df['Close'] > df['Close'].shift(1)
         df['Momentum_Down'] = df['Close'] < df['Close'].shift(1)
         
@@ -160,7 +238,7 @@ class GeneticOptimizer:
                              df['Momentum_Down'] & df['RSI_OK_Short'])
         
         # Gestion des positions avec limite
-        trades = []
+        trades = journal_optimiseur()
         position = 0
         entry_price = 0
         entry_date = None
@@ -277,25 +355,6 @@ class GeneticOptimizer:
         
         return trades, df
     
-    def calculate_atr(self, df, period):
-        """Calcule l'ATR"""
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        return atr
-    
-    def calculate_rsi(self, prices, period):
-        """Calcule le RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
     def select_parents(self, population, fitness_scores):
         """Sélectionne les parents par tournoi"""
         tournament_size = 3
@@ -332,24 +391,37 @@ class GeneticOptimizer:
         
         return mutated
     
-    def optimize(self):
-        """Lance l'optimisation génétique"""
+    def optimize(self, enregistrer=True):
+        """Lance l'optimisation génétique (`enregistrer=False` : ni fichiers de résultats ni modèle enregistré)"""
         print(f"🚀 OPTIMISATION GÉNÉTIQUE - {self.symbol} {self.timeframe}")
         print(f"Population: {self.population_size}, Générations: {self.generations}")
         print("=" * 60)
         
-        # Population initiale
-        population = self.create_population()
+        # Population initiale, ou celle du dernier point de reprise
+        population, debut = self.reprendre()
+        if population is None:
+            population = self.create_population()
+        evaluateur = self.creer_evaluateur()
         
-        for generation in range(self.generations):
+        for generation in range(debut, self.generations):
             print(f"\n🔄 Génération {generation + 1}/{self.generations}")
             
-            # Évaluation de la population
-            fitness_scores = []
-            for individual in population:
-                fitness = self.evaluate_fitness(individual)
-                fitness_scores.append(fitness)
-                
+            # Évaluation de la population (série, threads ou processus)
+            if self.elimination:
+                # Les nouveaux individus passent par les paliers (débuts de série), l'élite garde son
+                # résultat complet ; le cache n'évite que des backtests
+                resultats = evaluer_avec_elimination(
+                    self.cache_fitness, 'drawdown', self.empreinte, parametres_individus(population),
+                    lambda individus, barres: evaluateur.evaluer('evaluer_population', individus, barres),
+                    len(self.df), acquis=resultats_acquis(population)
+                )
+            else:
+                resultats = self.cache_fitness.evaluer(
+                    'drawdown', self.empreinte, parametres_individus(population),
+                    lambda manquants: evaluateur.evaluer('evaluer_population', manquants)
+                )
+            fitness_scores = reporter_resultats(population, resultats)
+            for individual, fitness in zip(population, fitness_scores):
                 # Mise à jour du meilleur
                 if fitness > self.best_fitness:
                     self.best_fitness = fitness
@@ -360,7 +432,9 @@ class GeneticOptimizer:
             best_individual = population[best_idx]
             best_metrics = best_individual.get('metrics', {})
             
+            stats_cache = self.cache_fitness.statistiques_generation()
             print(f"📊 Meilleur fitness: {max(fitness_scores):.2f}")
+            print(f"🗄️ Cache: {stats_cache['taux_hit']:.0%} ({stats_cache['hits']} hits, {stats_cache['misses']} backtests)")
             if best_metrics:
                 print(f"   • Trades: {best_metrics.get('total_trades', 0)}")
                 print(f"   • Win Rate: {best_metrics.get('win_rate', 0):.2f}%")
@@ -373,7 +447,8 @@ class GeneticOptimizer:
                 'generation': generation + 1,
                 'best_fitness': max(fitness_scores),
                 'avg_fitness': np.mean(fitness_scores),
-                'best_metrics': best_metrics
+                'best_metrics': best_metrics,
+                'cache_hit_rate': stats_cache['taux_hit']
             })
             
             # Création de la nouvelle population
@@ -390,6 +465,14 @@ class GeneticOptimizer:
                 new_population.append(child)
             
             population = new_population
+            self.sauvegarder_reprise(generation + 1, population)
+        
+        evaluateur.fermer()
+        if self.reprise is not None:
+            self.reprise.terminer()
+        
+        if not enregistrer:
+            return self.best_individual
         
         # Résultats finaux
         self.save_results()
@@ -400,6 +483,35 @@ class GeneticOptimizer:
         
         return self.best_individual
     
+    def signature_reprise(self):
+        """Identité de l'optimisation qu'un point de reprise doit partager"""
+        return ('drawdown', self.symbol, self.timeframe, self.empreinte, self.population_size)
+    
+    def reprendre(self):
+        """(population, génération de départ) du point de reprise, (None, 0) sans reprise"""
+        etat = self.reprise.charger(self.signature_reprise()) if self.reprise is not None else None
+        if etat is None:
+            return None, 0
+        self.best_individual = etat['best_individual']
+        self.best_fitness = etat['best_fitness']
+        self.history = etat['history']
+        if 'cache' in etat:
+            self.cache_fitness.restaurer(etat['cache'])
+        print(f"♻️ Reprise à la génération {etat['generation'] + 1}: {self.reprise.chemin}")
+        return etat['population'], etat['generation']
+    
+    def sauvegarder_reprise(self, generation, population):
+        """Point de reprise après `generation` générations (population suivante déjà créée)"""
+        if self.reprise is not None and self.reprise.echeance(generation):
+            self.reprise.sauvegarder({
+                'generation': generation,
+                'population': population,
+                'best_individual': self.best_individual,
+                'best_fitness': self.best_fitness,
+                'history': self.history,
+                'cache': self.cache_fitness.instantane(),
+            }, self.signature_reprise())
+    
     def save_results(self):
         """Sauvegarde les résultats de l'optimisation"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -464,23 +576,23 @@ class GeneticOptimizer:
         except Exception as e:
             print(f"⚠️ Erreur lors de l'enregistrement du modèle: {e}")
 
-def main():
-    """Fonction principale"""
+def main(symbol="XAUUSD", timeframes=('H4', 'D1'), population_size=30, generations=20,
+         reprendre=False, intervalle_reprise=5, elimination=False):
+    """Fonction principale (paramètres fournis par la CLI `trading.py optimize drawdown`)"""
     print("🧬 OPTIMISATION GÉNÉTIQUE POUR RÉDUIRE LE DRAWDOWN")
     print("=" * 60)
     
-    # Test sur différents timeframes
-    timeframes = ['H4', 'D1']  # Commençons par les meilleurs
-    
     for timeframe in timeframes:
         print(f"\n🎯 Optimisation {timeframe}...")
         
         try:
             optimizer = GeneticOptimizer(
-                symbol="XAUUSD",
+                symbol=symbol,
                 timeframe=timeframe,
-                population_size=30,
-                generations=20
+                population_size=population_size,
+                generations=generations,
+                reprise=PointReprise(chemin_reprise('drawdown', symbol, timeframe), intervalle_reprise, reprendre),
+                elimination=elimination
             )
             
             best_params = optimizer.optimize()
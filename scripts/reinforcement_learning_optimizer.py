@@ -15,10 +15,55 @@ warnings.filterwarnings('ignore')
 
 # Ajout du chemin pour importer les modules
 sys.path.append('src/strategies')
+sys.path.append('src')
+from indicators import compute_atr, compute_rsi, compute_ema, rolling_max, rolling_min
+from donnees import charger_ohlcv
+from moteur import FitnessCache, empreinte_donnees, journal_optimiseur, PointReprise, chemin_reprise
 from strategie_xauusd_sharpe1_simple import calculate_metrics
 
+class ActionSpace:
+    """
+    Espace des actions (jeux de paramètres discrets) sans matérialisation :
+    l'indice d'une action s'écrit en base mixte, un chiffre par paramètre
+    (le dernier paramètre varie le plus vite, comme des boucles imbriquées).
+    Les dicts de paramètres sont décodés à la demande.
+    """
+    
+    def __init__(self, grille):
+        self.noms = list(grille.keys())
+        self.valeurs = [list(v) for v in grille.values()]
+        self.bases = [len(v) for v in self.valeurs]
+        self.taille = int(np.prod(self.bases))
+    
+    def __len__(self):
+        return self.taille
+    
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self.taille
+        if not 0 <= idx < self.taille:
+            raise IndexError(f"Action hors de l'espace: {idx}")
+        chiffres = []
+        for base in reversed(self.bases):
+            idx, chiffre = divmod(idx, base)
+            chiffres.append(chiffre)
+        chiffres.reverse()
+        return {nom: valeurs[c] for nom, valeurs, c in zip(self.noms, self.valeurs, chiffres)}
+    
+    def __iter__(self):
+        for idx in range(self.taille):
+            yield self[idx]
+    
+    def indice(self, action):
+        """Indice d'une action (dict de paramètres) dans l'espace"""
+        idx = 0
+        for nom, valeurs, base in zip(self.noms, self.valeurs, self.bases):
+            idx = idx * base + valeurs.index(action[nom])
+        return idx
+
 class RLOptimizer:
-    def __init__(self, symbol="XAUUSD", timeframe="D1", learning_rate=0.1, discount_factor=0.95, epsilon=0.1):
+    def __init__(self, symbol="XAUUSD", timeframe="D1", learning_rate=0.1, discount_factor=0.95, epsilon=0.1,
+                 cache_fitness=None, reprise=None):
         self.symbol = symbol
         self.timeframe = timeframe
         self.learning_rate = learning_rate
@@ -27,13 +72,16 @@ class RLOptimizer:
         
         # Chargement des données
         self.df = self.load_data()
+        self.empreinte = empreinte_donnees(self.df)
+        self.cache_fitness = cache_fitness if cache_fitness is not None else FitnessCache()
+        self.reprise = reprise  # PointReprise ou None
         
         # États et actions
         self.states = self.create_states()
         self.actions = self.create_actions()
         
-        # Q-Table
-        self.q_table = {}
+        # Q-Table dense float32 (états × actions visitées)
+        self.indices_etats = {state: k for k, state in enumerate(self.states)}
         self.initialize_q_table()
         
         # Historique
@@ -48,9 +96,7 @@ class RLOptimizer:
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"Fichier non trouvé: {csv_path}")
         
-        df = pd.read_csv(csv_path)
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df
+        return charger_ohlcv(self.symbol, self.timeframe)
     
     def create_states(self):
         """Crée les états possibles"""
@@ -76,8 +122,6 @@ class RLOptimizer:
     
     def create_actions(self):
         """Crée les actions possibles (paramètres)"""
-        actions = []
-        
         # Paramètres discrets
         breakout_periods = [1, 2, 3, 4, 5]
         profit_atrs = [1.5, 2.0, 2.5, 3.0, 3.5]
@@ -90,39 +134,53 @@ class RLOptimizer:
         stop_loss_atrs = [1.5, 2.0, 2.5, 3.0]
         max_positions = [1, 2, 3]
         
-        # Création des actions
-        for bp in breakout_periods:
-            for pa in profit_atrs:
-                for ro in rsi_overboughts:
-                    for ros in rsi_oversolds:
-                        for es in ema_shorts:
-                            for el in ema_longs:
-                                for ap in atr_periods:
-                                    for ta in trail_atrs:
-                                        for sla in stop_loss_atrs:
-                                            for mp in max_positions:
-                                                action = {
-                                                    'breakout_period': bp,
-                                                    'profit_atr': pa,
-                                                    'rsi_overbought': ro,
-                                                    'rsi_oversold': ros,
-                                                    'ema_short': es,
-                                                    'ema_long': el,
-                                                    'atr_period': ap,
-                                                    'trail_atr': ta,
-                                                    'stop_loss_atr': sla,
-                                                    'max_positions': mp
-                                                }
-                                                actions.append(action)
-        
-        return actions
+        # Espace des actions décodé à la demande (aucun dict matérialisé)
+        return ActionSpace({
+            'breakout_period': breakout_periods,
+            'profit_atr': profit_atrs,
+            'rsi_overbought': rsi_overboughts,
+            'rsi_oversold': rsi_oversolds,
+            'ema_short': ema_shorts,
+            'ema_long': ema_longs,
+            'atr_period': atr_periods,
+            'trail_atr': trail_atrs,
+            'stop_loss_atr': stop_loss_atrs,
+            'max_positions': max_positions
+        })
     
     def initialize_q_table(self):
-        """Initialise la Q-table"""
-        for state in self.states:
-            self.q_table[state] = {}
-            for action_idx in range(len(self.actions)):
-                self.q_table[state][action_idx] = 0.0
+        """
+        Initialise la Q-table : une colonne float32 par action déjà visitée
+        (une action jamais visitée vaut 0), et le maximum de chaque ligne
+        """
+        self.q_table = np.zeros((len(self.states), 64), dtype=np.float32)
+        self.colonnes_actions = {}   # indice d'action -> colonne
+        self.actions_visitees = []   # colonne -> indice d'action
+        self.q_max = np.zeros(len(self.states), dtype=np.float32)
+    
+    def colonne_action(self, action_idx):
+        """Colonne de l'action dans la Q-table, allouée à la première visite"""
+        col = self.colonnes_actions.get(action_idx)
+        if col is None:
+            col = len(self.actions_visitees)
+            if col == self.q_table.shape[1]:
+                self.q_table = np.concatenate([self.q_table, np.zeros_like(self.q_table)], axis=1)
+            self.colonnes_actions[action_idx] = col
+            self.actions_visitees.append(action_idx)
+        return col
+    
+    def best_action(self, state_idx):
+        """Action de Q maximale pour un état (la première en cas d'égalité)"""
+        n = len(self.actions_visitees)
+        meilleur = self.q_max[state_idx]
+        candidats = [self.actions_visitees[c] for c in np.flatnonzero(self.q_table[state_idx, :n] == meilleur)]
+        if meilleur == 0 and n < len(self.actions):
+            # Les actions jamais visitées valent 0 : la première d'entre elles concourt
+            action_idx = 0
+            while action_idx in self.colonnes_actions:
+                action_idx += 1
+            candidats.append(action_idx)
+        return min(candidats)
     
     def get_current_state(self, df, current_idx):
         """Détermine l'état actuel du marché"""
@@ -130,13 +188,12 @@ class RLOptimizer:
             return 'sideways_medium_vol_neutral'
         
         # Calcul des indicateurs
-        close_prices = df['Close'].iloc[current_idx-20:current_idx+1]
-        high_prices = df['High'].iloc[current_idx-20:current_idx+1]
-        low_prices = df['Low'].iloc[current_idx-20:current_idx+1]
+        window = df.iloc[current_idx-20:current_idx+1]
+        close_prices = window['Close']
         
         # Tendance
-        ema_short = close_prices.ewm(span=5).mean().iloc[-1]
-        ema_long = close_prices.ewm(span=15).mean().iloc[-1]
+        ema_short = compute_ema(close_prices, 5, adjust=True).iloc[-1]
+        ema_long = compute_ema(close_prices, 15, adjust=True).iloc[-1]
         current_price = close_prices.iloc[-1]
         
         if ema_short > ema_long * 1.02 and current_price > ema_short:
@@ -151,7 +208,7 @@ class RLOptimizer:
             trend = 'sideways'
         
         # Volatilité
-        atr = self.calculate_atr_simple(high_prices, low_prices, close_prices, 10)
+        atr = compute_atr(window, 10)
         avg_atr = atr.mean()
         current_atr = atr.iloc[-1]
         
@@ -163,7 +220,7 @@ class RLOptimizer:
             volatility = 'medium_vol'
         
         # Momentum (RSI simplifié)
-        rsi = self.calculate_rsi_simple(close_prices, 14)
+        rsi = compute_rsi(close_prices, 14)
         current_rsi = rsi.iloc[-1]
         
         if current_rsi > 70:
@@ -175,25 +232,6 @@ class RLOptimizer:
         
         return f"{trend}_{volatility}_{momentum}"
     
-    def calculate_atr_simple(self, high, low, close, period):
-        """Calcule l'ATR de manière simplifiée"""
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        return atr
-    
-    def calculate_rsi_simple(self, prices, period):
-        """Calcule le RSI de manière simplifiée"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
     def choose_action(self, state):
         """Choisit une action selon la politique epsilon-greedy"""
         if random.random() < self.epsilon:
@@ -201,19 +239,42 @@ class RLOptimizer:
             return random.randint(0, len(self.actions) - 1)
         else:
             # Exploitation
-            if state in self.q_table:
-                q_values = self.q_table[state]
-                return max(q_values, key=q_values.get)
+            if state in self.indices_etats:
+                return self.best_action(self.indices_etats[state])
             else:
                 return random.randint(0, len(self.actions) - 1)
     
+    def update_q(self, action_idx, reward):
+        """
+        Q-Learning sur la colonne de l'action pour tous les états à la fois.
+        Le maximum de chaque ligne est tenu à jour : une ligne n'est reparcourue
+        que si sa valeur maximale vient de baisser.
+        """
+        col = self.colonne_action(action_idx)
+        current_q = self.q_table[:, col].copy()
+        max_future_q = self.q_max
+        
+        new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_future_q - current_q)
+        self.q_table[:, col] = new_q
+        
+        baisse = (current_q >= self.q_max) & (new_q < current_q)
+        self.q_max = np.maximum(self.q_max, new_q)
+        if baisse.any():
+            n = len(self.actions_visitees)
+            q_max = self.q_table[baisse, :n].max(axis=1)
+            if n < len(self.actions):
+                q_max = np.maximum(q_max, 0)
+            self.q_max[baisse] = q_max
+    
     def get_reward(self, trades):
         """Calcule la récompense basée sur les trades"""
-        if len(trades) < 5:
+        return self.recompense(len(trades), calculate_metrics(trades) if len(trades) >= 5 else None)
+    
+    def recompense(self, nb_trades, metrics):
+        """Récompense à partir du nombre de trades et des métriques"""
+        if nb_trades < 5:
             return -100  # Pénalité pour peu de trades
         
-        metrics = calculate_metrics(trades)
-        
         # Récompense basée sur plusieurs critères
         reward = 0
         
@@ -240,6 +301,11 @@ class RLOptimizer:
         
         return reward
     
+    def evaluer_action(self, action):
+        """(nombre de trades, métriques ou None sans trade) d'une action"""
+        trades = self.apply_strategy_with_params(action)
+        return len(trades), (calculate_metrics(trades) if trades else None)
+    
     def apply_strategy_with_params(self, params):
         """Applique la stratégie avec les paramètres donnés"""
         # Version simplifiée de la stratégie pour RL
@@ -262,12 +328,12 @@ class RLOptimizer:
         max_positions = params['max_positions']
         
         # Calcul des indicateurs
-        df['ATR'] = self.calculate_atr_simple(df['High'], df['Low'], df['Close'], atr_period)
-        df['RSI'] = self.calculate_rsi_simple(df['Close'], 8)
-        df['EMA_Short'] = df['Close'].ewm(span=ema_short).mean()
-        df['EMA_Long'] = df['Close'].ewm(span=ema_long).mean()
-        df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-        df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+        df['ATR'] = compute_atr(df, atr_period)
+        df['RSI'] = compute_rsi(df['Close'], 8)
+        df['EMA_Short'] = compute_ema(df['Close'], ema_short, adjust=True)
+        df['EMA_Long'] = compute_ema(df['Close'], ema_long, adjust=True)
+        df['High_Break'] = rolling_max(df['High'], breakout_period)
+        df['Low_Break'] = rolling_min(df['Low'], breakout_period)
         
         # Signaux
         df['Long_Signal'] = (
@@ -289,7 +355,7 @@ class RLOptimizer:
         )
         
         # Simulation des trades
-        trades = []
+        trades = journal_optimiseur()
         position = 0
         entry_price = 0
         entry_date = None
@@ -313,13 +379,13 @@ class RLOptimizer:
                     if current_price <= stop_loss:
                         pnl = (stop_loss - entry_price) / entry_price * 100
                         trades.append({
-                            'Entry_Date': entry_date,
-                            'Exit_Date': current_date,
-                            'Entry_Price': entry_price,
-                            'Exit_Price': stop_loss,
-                            'Position': 'Long',
-                            'PnL': pnl,
-                            'Exit_Reason': 'Stop_Loss'
+                            'entry_date': entry_date,
+                            'exit_date': current_date,
+                            'entry_price': entry_price,
+                            'exit_price': stop_loss,
+                            'position': 'Long',
+                            'pnl': pnl,
+                            'exit_reason': 'Stop_Loss'
                         })
                         position = 0
                         positions_count -= 1
@@ -328,13 +394,13 @@ class RLOptimizer:
                     if current_price >= take_profit:
                         pnl = (take_profit - entry_price) / entry_price * 100
                         trades.append({
-                            'Entry_Date': entry_date,
-                            'Exit_Date': current_date,
-                            'Entry_Price': entry_price,
-                            'Exit_Price': take_profit,
-                            'Position': 'Long',
-                            'PnL': pnl,
-                            'Exit_Reason': 'Take_Profit'
+                            'entry_date': entry_date,
+                            'exit_date': current_date,
+                            'entry_price': entry_price,
+                            'exit_price': take_profit,
+                            'position': 'Long',
+                            'pnl': pnl,
+                            'exit_reason': 'Take_Profit'
                         })
                         position = 0
                         positions_count -= 1
@@ -347,13 +413,13 @@ class RLOptimizer:
                     if current_price >= stop_loss:
                         pnl = (entry_price - stop_loss) / entry_price * 100
                         trades.append({
-                            'Entry_Date': entry_date,
-                            'Exit_Date': current_date,
-                            'Entry_Price': entry_price,
-                            'Exit_Price': stop_loss,
-                            'Position': 'Short',
-                            'PnL': pnl,
-                            'Exit_Reason': 'Stop_Loss'
+                            'entry_date': entry_date,
+                            'exit_date': current_date,
+                            'entry_price': entry_price,
+                            'exit_price': stop_loss,
+                            'position': 'Short',
+                            'pnl': pnl,
+                            'exit_reason': 'Stop_Loss'
                         })
                         position = 0
                         positions_count -= 1
@@ -362,13 +428,13 @@ class RLOptimizer:
                     if current_price <= take_profit:
                         pnl = (entry_price - take_profit) / entry_price * 100
                         trades.append({
-                            'Entry_Date': entry_date,
-                            'Exit_Date': current_date,
-                            'Entry_Price': entry_price,
-                            'Exit_Price': take_profit,
-                            'Position': 'Short',
-                            'PnL': pnl,
-                            'Exit_Reason': 'Take_Profit'
+                            'entry_date': entry_date,
+                            'exit_date': current_date,
+                            'entry_price': entry_price,
+                            'exit_price': take_profit,
+                            'position': 'Short',
+                            'pnl': pnl,
+                            'exit_reason': 'Take_Profit'
                         })
                         position = 0
                         positions_count -= 1
@@ -396,43 +462,33 @@ class RLOptimizer:
         print(f"Épisodes: {episodes}")
         print("=" * 50)
         
-        for episode in range(episodes):
+        for episode in range(self.reprendre(), episodes):
             if episode % 100 == 0:
                 print(f"🔄 Épisode {episode}/{episodes}")
+                if episode:
+                    stats_cache = self.cache_fitness.statistiques_generation()
+                    print(f"🗄️ Cache: {stats_cache['taux_hit']:.0%} ({stats_cache['hits']} hits, {stats_cache['misses']} backtests)")
             
             # Choisir une action aléatoire pour cet épisode
             action_idx = random.randint(0, len(self.actions) - 1)
             action = self.actions[action_idx]
             
-            # Appliquer la stratégie
-            trades = self.apply_strategy_with_params(action)
+            # Appliquer la stratégie (actions discrètes : les backtests déjà faits viennent du cache)
+            nb_trades, metrics = self.cache_fitness.calculer('rl', self.empreinte, action, self.evaluer_action)
             
             # Calculer la récompense
-            reward = self.get_reward(trades)
+            reward = self.recompense(nb_trades, metrics)
             
-            # Mettre à jour la Q-table pour tous les états
-            for state in self.states:
-                if state not in self.q_table:
-                    self.q_table[state] = {}
-                
-                if action_idx not in self.q_table[state]:
-                    self.q_table[state][action_idx] = 0.0
-                
-                # Q-Learning update
-                current_q = self.q_table[state][action_idx]
-                max_future_q = max(self.q_table[state].values()) if self.q_table[state] else 0
-                
-                new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_future_q - current_q)
-                self.q_table[state][action_idx] = new_q
+            # Mettre à jour la Q-table pour tous les états (une colonne)
+            self.update_q(action_idx, reward)
             
             # Stocker l'historique
-            if len(trades) > 0:
-                metrics = calculate_metrics(trades)
+            if nb_trades > 0:
                 self.history.append({
                     'episode': episode,
                     'action_idx': action_idx,
                     'reward': reward,
-                    'trades_count': len(trades),
+                    'trades_count': nb_trades,
                     'total_return': metrics.get('total_return', 0),
                     'win_rate': metrics.get('win_rate', 0),
                     'max_drawdown': metrics.get('max_drawdown', 0),
@@ -443,12 +499,46 @@ class RLOptimizer:
                 if reward > self.best_reward:
                     self.best_reward = reward
                     self.best_params = action.copy()
+            
+            self.sauvegarder_reprise(episode + 1)
+        
+        if self.reprise is not None:
+            self.reprise.terminer()
         
         # Sauvegarder les résultats
         self.save_results()
         
         return self.best_params
     
+    def signature_reprise(self):
+        """Identité de l'entraînement qu'un point de reprise doit partager"""
+        return ('rl', self.symbol, self.timeframe, self.empreinte, self.learning_rate, self.discount_factor)
+    
+    def reprendre(self):
+        """Restaure Q-table, historique et meilleur du point de reprise ; renvoie l'épisode de départ"""
+        etat = self.reprise.charger(self.signature_reprise()) if self.reprise is not None else None
+        if etat is None:
+            return 0
+        for nom in ('q_table', 'q_max', 'colonnes_actions', 'actions_visitees', 'history', 'best_params', 'best_reward'):
+            setattr(self, nom, etat[nom])
+        print(f"♻️ Reprise à l'épisode {etat['episode']}: {self.reprise.chemin}")
+        return etat['episode']
+    
+    def sauvegarder_reprise(self, episode):
+        """Point de reprise après `episode` épisodes"""
+        if self.reprise is not None and self.reprise.echeance(episode):
+            # Les colonnes pas encore allouées sont nulles : la compression les réduit à presque rien
+            self.reprise.sauvegarder({
+                'episode': episode,
+                'q_table': self.q_table,
+                'q_max': self.q_max,
+                'colonnes_actions': self.colonnes_actions,
+                'actions_visitees': self.actions_visitees,
+                'history': self.history,
+                'best_params': self.best_params,
+                'best_reward': self.best_reward,
+            }, self.signature_reprise())
+    
     def save_results(self):
         """Sauvegarde les résultats de l'entraînement"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -474,24 +564,22 @@ class RLOptimizer:
             
             print(f"\n✅ Résultats RL sauvegardés: {results_dir}")
 
-def main():
-    """Fonction principale"""
+def main(symbol="XAUUSD", timeframe='H4', episodes=500, reprendre=False, intervalle_reprise=100):
+    """Fonction principale (paramètres fournis par la CLI `trading.py optimize rl`)"""
     print("🤖 OPTIMISATION PAR REINFORCEMENT LEARNING")
     print("=" * 60)
     
-    # Test sur H4 (meilleur drawdown)
-    timeframe = 'H4'
-    
     try:
         rl_optimizer = RLOptimizer(
-            symbol="XAUUSD",
+            symbol=symbol,
             timeframe=timeframe,
             learning_rate=0.1,
             discount_factor=0.95,
-            epsilon=0.2
+            epsilon=0.2,
+            reprise=PointReprise(chemin_reprise('rl', symbol, timeframe), intervalle_reprise, reprendre)
         )
         
-        best_params = rl_optimizer.train(episodes=500)
+        best_params = rl_optimizer.train(episodes=episodes)
         
         if best_params:
             print(f"\n✅ Entraînement RL terminé!")
@@ -11,6 +11,7 @@ import numpy as np
 from datetime import datetime
 import random
 import warnings
+from functools import partial
 warnings.filterwarnings('ignore')
 
 # Rich pour une belle interface
@@ -28,13 +29,54 @@ console = Console()
 
 # Ajout du chemin pour importer les modules
 sys.path.append('src/strategies')
+sys.path.append('src')
+from indicators import IndicatorCache
+from donnees import charger_ohlcv
+from moteur import colonnes_par_parametre, vecteur_parametre, simuler_lot, trades_par_individu
+from moteur import ParallelEvaluator, parametres_individus, reporter_resultats
+from moteur import FitnessCache, empreinte_donnees, metriques_journal, metriques_individu, empiler_metriques
+from moteur import journal_optimiseur, PointReprise, chemin_reprise, etat_aleatoire, restaurer_aleatoire
+from moteur import Archipel, migrer
+from moteur import OptimiseurSubstitut
+from moteur import Elimine, evaluer_avec_elimination, resultats_acquis
+from moteur import tri_non_domine, distance_encombrement, selection_nsga2, tournoi_encombrement, front_pareto
+
+# Cache des évaluations conservé d'une exécution à l'autre
+CHEMIN_CACHE_FITNESS = 'results/cache/fitness_systeme_complet.pkl'
+
+# Épisodes RL évalués ensemble (une passe par lots)
+TAILLE_LOT_RL = 50
+
+# Optimisation bayésienne : points tirés au hasard avant le premier modèle, backtests par lot
+INITIAUX_BAYESIEN = 20
+LOT_BAYESIEN = 10
+
+# Recherche aléatoire : jeux tirés par cohorte (élimination successive au sein de chaque cohorte)
+COHORTE_ALEATOIRE = 90
+
+# Objectifs de NSGA-II : retour et win rate à maximiser, drawdown à minimiser
+OBJECTIFS_PARETO = ('total_return', 'max_drawdown', 'win_rate')
+
+# Modèle en îles : nombre d'îles, générations entre deux migrations, élites envoyées par île
+ILES = 4
+MIGRATION = 10
+MIGRANTS = 2
 from strategie_xauusd_sharpe1_simple import calculate_metrics
 
 class CompleteOptimizationSystem:
-    def __init__(self, symbol="XAUUSD", timeframe="D1"):
+    def __init__(self, symbol="XAUUSD", timeframe="D1", mode_evaluation='serial', workers=None,
+                 cache_fitness=None, fenetre=None, elimination=False):
         self.symbol = symbol
         self.timeframe = timeframe
-        self.df = self.load_data()
+        self.df_complet = self.load_data()
+        self.indicateurs_complets = IndicatorCache.depuis_df(self.df_complet)
+        self.definir_fenetre(*(fenetre or (0, None)))
+        self.cache_fitness = cache_fitness if cache_fitness is not None else FitnessCache()
+        self.evaluateur = None
+        self.configurer_evaluation(mode_evaluation, workers)
+        self.configurer_reprise(None)
+        # Élimination successive des jeux non mis en cache (GA, agressif, recherche aléatoire)
+        self.elimination = elimination
         
         # Paramètres étendus pour fusion
         self.param_ranges = {
@@ -74,6 +116,7 @@ class CompleteOptimizationSystem:
         
         self.models = {}
         self.best_hybrid = None
+        self.front_pareto = None
         self.history = []
         
     def load_data(self):
@@ -83,9 +126,90 @@ class CompleteOptimizationSystem:
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"Fichier non trouvé: {csv_path}")
         
-        df = pd.read_csv(csv_path)
-        df['Date'] = pd.to_datetime(df['Date'])
-        return df
+        return charger_ohlcv(self.symbol, self.timeframe)
+    
+    def definir_fenetre(self, debut=0, fin=None):
+        """
+        Restreint l'optimisation aux barres [debut, fin) de la série (walk-forward).
+        Les indicateurs restent ceux de la série complète, servis par le cache partagé.
+        """
+        self.fenetre = (debut, fin)
+        self.df = self.df_complet.iloc[debut:fin].reset_index(drop=True)
+        self.indicateurs = self.indicateurs_complets.fenetre(debut, fin)
+        # L'historique de chauffe fait partie des données évaluées
+        self.empreinte = empreinte_donnees(self.df_complet.iloc[:fin])
+        if debut:
+            self.empreinte += f"/{debut}"
+        evaluateur = getattr(self, 'evaluateur', None)
+        if evaluateur is not None and evaluateur.mode == 'process':
+            self.configurer_evaluation('process', evaluateur.workers)
+    
+    def configurer_evaluation(self, mode='serial', workers=None):
+        """Choisit l'évaluation des populations : 'serial', 'thread' ou 'process'"""
+        if self.evaluateur is not None:
+            self.evaluateur.fermer()
+        if mode == 'process':
+            # Chaque worker reconstruit le système une fois (données lues depuis le cache mappé)
+            self.evaluateur = ParallelEvaluator(mode, workers,
+                                                fabrique=partial(CompleteOptimizationSystem, fenetre=self.fenetre),
+                                                args=(self.symbol, self.timeframe))
+        else:
+            self.evaluateur = ParallelEvaluator(mode, workers, contexte=self)
+    
+    def configurer_reprise(self, reprise):
+        """
+        Points de reprise des phases (génétique, agressive, RL, fusion, continu).
+        Les phases sont numérotées dans l'ordre où elles s'exécutent : à la
+        reprise, celles qui précèdent le point de reprise sont sautées (leurs
+        modèles sont restaurés) et celle qui était en cours continue.
+        """
+        self.reprise = reprise
+        self.phase = 0
+        self.etat_reprise = reprise.charger(self.signature_reprise()) if reprise is not None else None
+        if self.etat_reprise is not None:
+            self.models = self.etat_reprise['models']
+            # Le cache de fitness repart de son état au point de reprise
+            if 'cache' in self.etat_reprise:
+                self.cache_fitness.restaurer(self.etat_reprise['cache'])
+            console.print(f"♻️ [cyan]Reprise à la phase {self.etat_reprise['phase'] + 1}:[/cyan] {reprise.chemin}")
+    
+    def signature_reprise(self):
+        """Identité de l'optimisation qu'un point de reprise doit partager"""
+        return ('complet', self.symbol, self.timeframe, self.empreinte)
+    
+    def debut_phase(self):
+        """
+        (numéro de la phase qui commence, état repris) : 'terminee' si le point
+        de reprise est postérieur à la phase, état de sa boucle si elle était
+        en cours, None sinon
+        """
+        phase = self.phase
+        self.phase += 1
+        etat = self.etat_reprise
+        if etat is None:
+            return phase, None
+        if phase < etat['phase']:
+            return phase, 'terminee'
+        self.etat_reprise = None
+        return phase, etat['boucle']
+    
+    def sauvegarder_phase(self, phase, pas=None, boucle=None):
+        """
+        Point de reprise après `pas` pas (génération, lot d'épisodes, itération)
+        de la phase, à l'échéance de l'intervalle ; sans `boucle`, la phase est
+        terminée et la reprise commencera à la suivante. L'instantané du cache
+        de fitness est écrit dans le même fichier (une seule écriture atomique).
+        """
+        if self.reprise is None:
+            return
+        if boucle is None:
+            self.reprise.sauvegarder({'phase': phase + 1, 'boucle': None, 'models': self.models,
+                                      'cache': self.cache_fitness.instantane()},
+                                     self.signature_reprise())
+        elif self.reprise.echeance(pas):
+            self.reprise.sauvegarder({'phase': phase, 'boucle': boucle, 'models': self.models,
+                                      'cache': self.cache_fitness.instantane()},
+                                     self.signature_reprise())
     
     def load_existing_models(self):
         """Charge les modèles existants depuis le gestionnaire"""
@@ -109,14 +233,25 @@ class CompleteOptimizationSystem:
         except Exception as e:
             console.print(f"⚠️ [yellow]Erreur chargement modèles: {e}[/yellow]")
     
-    def genetic_optimization(self, population_size=100, generations=200):
-        """Optimisation génétique classique"""
+    def genetic_optimization(self, population_size=100, generations=200, elimination=None):
+        """
+        Optimisation génétique classique ; avec `elimination` (défaut :
+        self.elimination), les nouveaux individus passent par l'élimination successive
+        """
+        if elimination is None:
+            elimination = self.elimination
         console.print(Panel.fit(
             "[bold blue]🧬 OPTIMISATION GÉNÉTIQUE[/bold blue]",
             border_style="blue"
         ))
         
-        population = self.create_population(population_size)
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get('genetic')
+        if etat is None:
+            population, debut = self.create_population(population_size), 0
+        else:
+            population, debut, fitness_scores = etat['population'], etat['generation'], etat['fitness_scores']
         
         with Progress(
             SpinnerColumn(),
@@ -127,16 +262,14 @@ class CompleteOptimizationSystem:
             console=console
         ) as progress:
             
-            task = progress.add_task("Générations", total=generations)
+            task = progress.add_task("Générations", total=generations, completed=debut)
             
-            for gen in range(generations):
+            for gen in range(debut, generations):
                 progress.update(task, description=f"Génération {gen + 1}/{generations}")
                 
                 # Évaluation
-                fitness_scores = []
-                for individual in population:
-                    fitness = self.evaluate_fitness(individual)
-                    fitness_scores.append(fitness)
+                resultats = self.evaluer_avec_cache(population, False, elimination)
+                fitness_scores = reporter_resultats(population, resultats)
                 
                 # Sélection et reproduction
                 new_population = self.evolutionary_step(population, fitness_scores)
@@ -148,8 +281,12 @@ class CompleteOptimizationSystem:
                 if 'metrics' in best_individual:
                     metrics = best_individual['metrics']
                     progress.console.print(f"   📊 Retour: [green]{metrics.get('total_return', 0):.1f}%[/green] | DD: [red]{metrics.get('max_drawdown', 0):.1f}%[/red]")
+                self.afficher_cache(progress.console)
                 
                 progress.advance(task)
+                self.sauvegarder_phase(phase, gen + 1, {
+                    'population': population, 'generation': gen + 1, 'fitness_scores': fitness_scores
+                })
         
         # Sauvegarder le meilleur
         best_idx = fitness_scores.index(max(fitness_scores))
@@ -159,16 +296,28 @@ class CompleteOptimizationSystem:
             'score': max(fitness_scores)
         }
         
+        self.sauvegarder_phase(phase)
         return self.models['genetic']
     
-    def aggressive_optimization(self, population_size=100, generations=200):
-        """Optimisation agressive pour gains"""
+    def aggressive_optimization(self, population_size=100, generations=200, elimination=None):
+        """
+        Optimisation agressive pour gains ; `elimination` comme pour
+        genetic_optimization
+        """
+        if elimination is None:
+            elimination = self.elimination
         console.print(Panel.fit(
             "[bold red]🔥 OPTIMISATION AGRESSIVE[/bold red]",
             border_style="red"
         ))
         
-        population = self.create_population(population_size)
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get('aggressive')
+        if etat is None:
+            population, debut = self.create_population(population_size), 0
+        else:
+            population, debut, fitness_scores = etat['population'], etat['generation'], etat['fitness_scores']
         
         with Progress(
             SpinnerColumn(),
@@ -179,16 +328,14 @@ class CompleteOptimizationSystem:
             console=console
         ) as progress:
             
-            task = progress.add_task("Générations", total=generations)
+            task = progress.add_task("Générations", total=generations, completed=debut)
             
-            for gen in range(generations):
+            for gen in range(debut, generations):
                 progress.update(task, description=f"Génération {gen + 1}/{generations}")
                 
                 # Évaluation avec objectifs agressifs
-                fitness_scores = []
-                for individual in population:
-                    fitness = self.evaluate_aggressive_fitness(individual)
-                    fitness_scores.append(fitness)
+                resultats = self.evaluer_avec_cache(population, True, elimination)
+                fitness_scores = reporter_resultats(population, resultats)
                 
                 # Sélection et reproduction
                 new_population = self.evolutionary_step(population, fitness_scores)
@@ -200,8 +347,12 @@ class CompleteOptimizationSystem:
                 if 'metrics' in best_individual:
                     metrics = best_individual['metrics']
                     progress.console.print(f"   💰 Retour: [green]{metrics.get('total_return', 0):.1f}%[/green] | PF: [blue]{metrics.get('profit_factor', 0):.2f}[/blue]")
+                self.afficher_cache(progress.console)
                 
                 progress.advance(task)
+                self.sauvegarder_phase(phase, gen + 1, {
+                    'population': population, 'generation': gen + 1, 'fitness_scores': fitness_scores
+                })
         
         # Sauvegarder le meilleur
         best_idx = fitness_scores.index(max(fitness_scores))
@@ -211,8 +362,352 @@ class CompleteOptimizationSystem:
             'score': max(fitness_scores)
         }
         
+        self.sauvegarder_phase(phase)
         return self.models['aggressive']
     
+    def random_search_optimization(self, evaluations=900, cohorte=COHORTE_ALEATOIRE, agressif=False, elimination=True):
+        """
+        Recherche aléatoire : `evaluations` jeux tirés au hasard, par cohortes
+        de `cohorte` ; avec `elimination`, seuls les meilleurs de chaque
+        cohorte sont backtestés sur toute la série (voir moteur.paliers)
+        """
+        cle = 'random_aggressive' if agressif else 'random'
+        console.print(Panel.fit(
+            "[bold yellow]🎲 RECHERCHE ALÉATOIRE[/bold yellow]\n"
+            f"[cyan]{evaluations} jeux, cohortes de {cohorte}"
+            f"{', élimination successive' if elimination else ''}[/cyan]",
+            border_style="yellow"
+        ))
+        
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get(cle)
+        tires, meilleur = (0, None) if etat is None else (etat['tires'], etat['meilleur'])
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+        
+            task = progress.add_task("Cohortes", total=evaluations, completed=tires)
+        
+            while tires < evaluations:
+                n = min(cohorte, evaluations - tires)
+                progress.update(task, description=f"Jeux {tires + 1}-{tires + n}/{evaluations}")
+        
+                population = self.create_population(n)
+                resultats = self.evaluer_avec_cache(population, agressif, elimination)
+                complets = [k for k, resultat in enumerate(resultats) if not isinstance(resultat, Elimine)]
+                for k in complets:
+                    fitness, metrics = resultats[k]
+                    if meilleur is None or fitness > meilleur['score']:
+                        meilleur = {'params': population[k], 'metrics': metrics or {}, 'score': fitness}
+        
+                tires += n
+                if meilleur is not None:
+                    progress.console.print(f"   🎲 {len(complets)}/{n} jeux jusqu'au bout | "
+                                           f"Meilleur score: [green]{meilleur['score']:.2f}[/green]")
+                self.afficher_cache(progress.console)
+                progress.advance(task, n)
+                self.sauvegarder_phase(phase, -(-tires // cohorte), {'tires': tires, 'meilleur': meilleur})
+        
+        self.models[cle] = meilleur
+        
+        self.sauvegarder_phase(phase)
+        return self.models[cle]
+    
+    def island_optimization(self, population_size=200, generations=500, iles=ILES, migration=MIGRATION,
+                            migrants=MIGRANTS, agressif=False, mode='process', transport=None):
+        """
+        Optimisation génétique (agressive avec `agressif`) en îles : la
+        population est répartie en `iles` sous-populations qui évoluent en
+        parallèle et s'envoient leurs `migrants` meilleurs individus toutes
+        les `migration` générations (voir moteur.iles)
+        """
+        cle = 'aggressive' if agressif else 'genetic'
+        console.print(Panel.fit(
+            f"[bold blue]🏝️ OPTIMISATION {'AGRESSIVE' if agressif else 'GÉNÉTIQUE'} EN ÎLES[/bold blue]\n"
+            f"[cyan]{iles} îles × {max(3, population_size // iles)} individus, migration toutes les {migration} générations[/cyan]",
+            border_style="blue"
+        ))
+        
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get(cle)
+        if etat is None:
+            # Une graine par île, tirée par le coordinateur
+            etats = [{'graine': random.randrange(2 ** 32), 'taille': max(3, population_size // iles)}
+                     for _ in range(iles)]
+            generation = 0
+        else:
+            etats, generation = etat['iles'], etat['generation']
+        
+        archipel = Archipel(iles, mode, contexte=self,
+                            fabrique=partial(CompleteOptimizationSystem, fenetre=self.fenetre),
+                            args=(self.symbol, self.timeframe), transport=transport)
+        try:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                TimeElapsedColumn(),
+                console=console
+            ) as progress:
+                
+                task = progress.add_task("Générations", total=generations, completed=generation)
+                
+                while generation < generations:
+                    n = min(migration, generations - generation)
+                    progress.update(task, description=f"Générations {generation + 1}-{generation + n}/{generations}")
+                    
+                    # Migration des élites de l'époque précédente
+                    if 'elites' in etats[0]:
+                        for etat_ile, immigrants in zip(etats, migrer([e['elites'] for e in etats])):
+                            etat_ile['immigrants'] = immigrants
+                    
+                    etats = archipel.epoque('epoque_ile', etats, generations=n, migrants=migrants, agressif=agressif)
+                    generation += n
+                    
+                    scores = " | ".join(f"{e['meilleur']['score']:.1f}" for e in etats)
+                    progress.console.print(f"   🏝️ Génération {generation}: meilleurs par île [green]{scores}[/green]")
+                    progress.advance(task, n)
+                    self.sauvegarder_phase(phase, -(-generation // migration), {'iles': etats, 'generation': generation})
+        finally:
+            archipel.fermer()
+        
+        # Sauvegarder le meilleur de toutes les îles
+        self.models[cle] = max((e['meilleur'] for e in etats), key=lambda m: m['score'])
+        
+        self.sauvegarder_phase(phase)
+        return self.models[cle]
+    
+    def epoque_ile(self, etat, generations, migrants=MIGRANTS, agressif=False):
+        """
+        Fait avancer une île de `generations` générations (appelée par
+        moteur.Archipel, éventuellement dans le processus de l'île). Première
+        époque : population créée depuis la graine de l'île ; ensuite, les
+        immigrants remplacent les derniers enfants de la population.
+        """
+        if 'population' in etat:
+            restaurer_aleatoire(etat['aleatoire'])
+            population = etat['population']
+        else:
+            random.seed(etat['graine'])
+            np.random.seed(etat['graine'])
+            population = self.create_population(etat['taille'])
+        immigrants = [dict(individu) for individu in etat.get('immigrants', ())]
+        if immigrants:
+            population = population[:len(population) - len(immigrants)] + immigrants
+        
+        meilleur = etat.get('meilleur')
+        historique = list(etat.get('historique', ()))
+        for _ in range(generations):
+            resultats = self.evaluer_avec_cache(population, agressif)
+            fitness_scores = reporter_resultats(population, resultats)
+            
+            best_idx = fitness_scores.index(max(fitness_scores))
+            if meilleur is None or fitness_scores[best_idx] > meilleur['score']:
+                meilleur = {
+                    'params': {k: v for k, v in population[best_idx].items() if k not in ['metrics', 'fitness']},
+                    'metrics': population[best_idx].get('metrics', {}),
+                    'score': fitness_scores[best_idx]
+                }
+            historique.append(max(fitness_scores))
+            ordre = sorted(range(len(population)), key=fitness_scores.__getitem__, reverse=True)
+            elites = parametres_individus([population[k] for k in ordre[:migrants]])
+            
+            population = self.evolutionary_step(population, fitness_scores)
+        
+        return {
+            'population': population,
+            'aleatoire': etat_aleatoire(),
+            'meilleur': meilleur,
+            'elites': elites,
+            'historique': historique,
+        }
+    
+    def bayesian_optimization(self, evaluations=200, taille_lot=LOT_BAYESIEN, agressif=False):
+        """
+        Optimisation bayésienne (processus gaussien + amélioration espérée,
+        voir moteur.substitut) de la fitness du GA (agressive avec `agressif`) :
+        chaque lot de `taille_lot` candidats est backtesté en parallèle
+        """
+        cle = 'bayesian_aggressive' if agressif else 'bayesian'
+        console.print(Panel.fit(
+            "[bold cyan]📐 OPTIMISATION BAYÉSIENNE[/bold cyan]\n"
+            f"[cyan]{evaluations} backtests, lots de {taille_lot}[/cyan]",
+            border_style="cyan"
+        ))
+        
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get(cle)
+        optimiseur = OptimiseurSubstitut(self.param_ranges, initiaux=INITIAUX_BAYESIEN)
+        metriques = []
+        if etat is not None:
+            optimiseur.observer(etat['observes'], etat['scores'])
+            metriques = etat['metriques']
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+            
+            task = progress.add_task("Backtests", total=evaluations, completed=len(optimiseur.scores))
+            
+            while len(optimiseur.scores) < evaluations:
+                n = min(taille_lot, evaluations - len(optimiseur.scores))
+                progress.update(task, description=f"Backtests {len(optimiseur.scores) + 1}-{len(optimiseur.scores) + n}/{evaluations}")
+                
+                lot = optimiseur.proposer(n)
+                resultats = self.evaluer_avec_cache(lot, agressif)
+                optimiseur.observer(lot, [fitness for fitness, _ in resultats])
+                metriques.extend(metrics for _, metrics in resultats)
+                
+                params, score = optimiseur.meilleur()
+                progress.console.print(f"   📐 Meilleur score: [green]{score:.2f}[/green]")
+                progress.advance(task, n)
+                self.sauvegarder_phase(phase, len(optimiseur.scores) // taille_lot, {
+                    'observes': optimiseur.observes, 'scores': optimiseur.scores, 'metriques': metriques
+                })
+            
+            self.afficher_cache(progress.console)
+        
+        # Sauvegarder le meilleur
+        k = int(np.argmax(optimiseur.scores))
+        self.models[cle] = {
+            'params': optimiseur.observes[k],
+            'metrics': metriques[k] or {},
+            'score': optimiseur.scores[k]
+        }
+        
+        self.sauvegarder_phase(phase)
+        return self.models[cle]
+    
+    def objectifs_pareto(self, liste_metriques):
+        """Matrice (individus × OBJECTIFS_PARETO) à maximiser ; -inf pour un individu sans métriques"""
+        objectifs = np.full((len(liste_metriques), len(OBJECTIFS_PARETO)), -np.inf)
+        for k, metrics in enumerate(liste_metriques):
+            if metrics is not None:
+                objectifs[k] = [metrics['total_return'], -metrics['max_drawdown'], metrics['win_rate']]
+        return objectifs
+    
+    def pareto_optimization(self, population_size=100, generations=50):
+        """
+        Optimisation multi-objectif NSGA-II (retour, drawdown, win rate) sur
+        les mêmes paramètres, croisement et mutation que le GA : renvoie le
+        front de Pareto (liste de {'params', 'metrics'}) au lieu d'un score
+        """
+        console.print(Panel.fit(
+            "[bold magenta]🎯 OPTIMISATION MULTI-OBJECTIF (NSGA-II)[/bold magenta]\n"
+            "[cyan]Retour ↑ · Drawdown ↓ · Win rate ↑[/cyan]",
+            border_style="magenta"
+        ))
+        
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return None
+        if etat is None:
+            population = self.create_population(population_size)
+            metriques = self.metriques_lot_avec_cache(population)
+            debut = 0
+        else:
+            population, metriques, debut = etat['population'], etat['metriques'], etat['generation']
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
+            
+            task = progress.add_task("Générations", total=generations, completed=debut)
+            
+            for gen in range(debut, generations):
+                progress.update(task, description=f"Génération {gen + 1}/{generations}")
+                
+                # Enfants par tournoi binaire (rang, puis encombrement)
+                objectifs = self.objectifs_pareto(metriques)
+                rangs = tri_non_domine(objectifs)
+                distances = distance_encombrement(objectifs, rangs)
+                enfants = []
+                while len(enfants) < population_size:
+                    parent1 = population[tournoi_encombrement(rangs, distances)]
+                    parent2 = population[tournoi_encombrement(rangs, distances)]
+                    enfants.append(self.mutate(self.crossover(parent1, parent2)))
+                
+                # Survivants parmi parents et enfants
+                union = population + enfants
+                metriques_union = metriques + self.metriques_lot_avec_cache(enfants)
+                survivants, rangs, _ = selection_nsga2(self.objectifs_pareto(metriques_union), population_size)
+                population = [union[k] for k in survivants]
+                metriques = [metriques_union[k] for k in survivants]
+                
+                progress.console.print(f"   🎯 Front de Pareto: [green]{int((rangs[survivants] == 0).sum())}[/green] individus")
+                self.afficher_cache(progress.console)
+                
+                progress.advance(task)
+                self.sauvegarder_phase(phase, gen + 1, {
+                    'population': population, 'metriques': metriques, 'generation': gen + 1
+                })
+        
+        # Front final, sans doublons, du plus fort retour au plus faible
+        front = []
+        vus = set()
+        for k in front_pareto(self.objectifs_pareto(metriques)):
+            cle = tuple(sorted(population[k].items()))
+            if metriques[k] is not None and cle not in vus:
+                vus.add(cle)
+                front.append({'params': population[k], 'metrics': metriques[k]})
+        front.sort(key=lambda individu: individu['metrics']['total_return'], reverse=True)
+        self.front_pareto = front
+        
+        table = Table(title=f"🎯 Front de Pareto ({len(front)} jeux de paramètres)")
+        table.add_column("Retour", style="green")
+        table.add_column("Drawdown", style="red")
+        table.add_column("Win Rate", style="yellow")
+        table.add_column("Profit Factor", style="blue")
+        table.add_column("Trades", style="cyan")
+        for individu in front:
+            metrics = individu['metrics']
+            table.add_row(
+                f"{metrics['total_return']:.1f}%",
+                f"{metrics['max_drawdown']:.1f}%",
+                f"{metrics['win_rate']:.1f}%",
+                f"{metrics['profit_factor']:.2f}",
+                str(metrics['total_trades'])
+            )
+        console.print(table)
+        self.save_pareto_front(front)
+        
+        self.sauvegarder_phase(phase)
+        return front
+    
+    def save_pareto_front(self, front):
+        """Sauvegarde le front de Pareto (une ligne par jeu de paramètres, objectifs et paramètres)"""
+        if not front:
+            return None
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_dir = f"results/optimization/pareto_{self.symbol}_{self.timeframe}_{timestamp}"
+        os.makedirs(results_dir, exist_ok=True)
+        
+        lignes = [dict(individu['metrics'], **individu['params']) for individu in front]
+        pd.DataFrame(lignes).to_csv(f"{results_dir}/front_pareto.csv", index=False)
+        
+        console.print(f"✅ [green]Front de Pareto sauvegardé:[/green] {results_dir}")
+        return results_dir
+    
     def reinforcement_learning_optimization(self, episodes=1000):
         """Optimisation par Reinforcement Learning"""
         console.print(Panel.fit(
@@ -220,10 +715,20 @@ class CompleteOptimizationSystem:
             border_style="purple"
         ))
         
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get('rl')
+        
         # Q-Learning simplifié
         q_table = {}
         best_reward = float('-inf')
         best_params = None
+        best_metrics = None
+        depart = 0
+        if etat is not None:
+            q_table, best_reward, best_params, best_metrics = (etat['q_table'], etat['best_reward'],
+                                                               etat['best_params'], etat['best_metrics'])
+            depart = etat['episodes']
         
         with Progress(
             SpinnerColumn(),
@@ -234,19 +739,22 @@ class CompleteOptimizationSystem:
             console=console
         ) as progress:
             
-            task = progress.add_task("Épisodes", total=episodes)
+            task = progress.add_task("Épisodes", total=episodes, completed=depart)
             
-            for episode in range(episodes):
-                progress.update(task, description=f"Épisode {episode + 1}/{episodes}")
+            for debut in range(depart, episodes, TAILLE_LOT_RL):
+                fin = min(debut + TAILLE_LOT_RL, episodes)
+                progress.update(task, description=f"Épisodes {debut + 1}-{fin}/{episodes}")
                 
-                # Action aléatoire
-                params = self.create_random_params()
+                # Actions aléatoires, évaluées en un lot
+                lot_params = [self.create_random_params() for _ in range(fin - debut)]
+                lot_metrics = self.metriques_lot_avec_cache(lot_params)
+                evalues = [k for k, metrics in enumerate(lot_metrics) if metrics is not None]
+                rewards = []
+                if evalues:
+                    rewards = self.calculate_rl_reward(empiler_metriques([lot_metrics[k] for k in evalues])).tolist()
                 
-                # Évaluation
-                trades = self.apply_strategy(params)
-                if len(trades) > 10:
-                    metrics = calculate_metrics(trades)
-                    reward = self.calculate_rl_reward(metrics)
+                for k, reward in zip(evalues, rewards):
+                    params, metrics = lot_params[k], lot_metrics[k]
                     
                     # Mise à jour Q-table
                     state_key = self.get_state_key(params)
@@ -263,7 +771,13 @@ class CompleteOptimizationSystem:
                         
                         progress.console.print(f"   🎯 Nouveau meilleur: [green]{reward:.2f}[/green]")
                 
-                progress.advance(task)
+                progress.advance(task, fin - debut)
+                self.sauvegarder_phase(phase, fin // TAILLE_LOT_RL, {
+                    'q_table': q_table, 'best_reward': best_reward, 'best_params': best_params,
+                    'best_metrics': best_metrics, 'episodes': fin
+                })
+            
+            self.afficher_cache(progress.console)
         
         # Sauvegarder le meilleur
         if best_params:
@@ -273,6 +787,7 @@ class CompleteOptimizationSystem:
                 'score': best_reward
             }
         
+        self.sauvegarder_phase(phase)
         return self.models.get('rl')
     
     def fusion_models(self):
@@ -282,6 +797,10 @@ class CompleteOptimizationSystem:
             border_style="green"
         ))
         
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get('fusion')
+        
         if len(self.models) < 2:
             console.print("❌ [red]Pas assez de modèles pour la fusion[/red]")
             return None
@@ -368,6 +887,7 @@ class CompleteOptimizationSystem:
             
             console.print(result_table)
         
+        self.sauvegarder_phase(phase)
         return best_fusion
     
     def fusion_average(self):
@@ -504,6 +1024,10 @@ class CompleteOptimizationSystem:
             border_style="yellow"
         ))
         
+        phase, etat = self.debut_phase()
+        if etat == 'terminee':
+            return self.models.get('continuous')
+        
         if not self.models:
             console.print("❌ [red]Aucun modèle à améliorer[/red]")
             return
@@ -511,6 +1035,9 @@ class CompleteOptimizationSystem:
         best_model = max(self.models.values(), key=lambda x: x['score'])
         current_params = best_model['params'].copy()
         current_score = best_model['score']
+        depart = 0
+        if etat is not None:
+            current_params, current_score, depart = etat['params'], etat['score'], etat['iteration']
         
         console.print(f"🎯 [cyan]Modèle de base:[/cyan] Score [green]{current_score:.2f}[/green]")
         
@@ -523,18 +1050,17 @@ class CompleteOptimizationSystem:
             console=console
         ) as progress:
             
-            task = progress.add_task("Itérations d'amélioration", total=iterations)
+            task = progress.add_task("Itérations d'amélioration", total=iterations, completed=depart)
             
-            for iteration in range(iterations):
+            for iteration in range(depart, iterations):
                 progress.update(task, description=f"Itération {iteration + 1}/{iterations}")
                 
                 # Créer des variations du meilleur modèle
                 improved_params = self.improve_params(current_params)
                 
                 # Tester les améliorations
-                trades = self.apply_strategy(improved_params)
-                if len(trades) > 10:
-                    metrics = calculate_metrics(trades)
+                metrics = self.metriques_avec_cache(improved_params)
+                if metrics is not None:
                     new_score = self.calculate_fusion_score(metrics)
                     
                     progress.console.print(f"   📊 Nouveau score: [green]{new_score:.2f}[/green] | Retour: [blue]{metrics.get('total_return', 0):.1f}%[/blue]")
@@ -548,6 +1074,11 @@ class CompleteOptimizationSystem:
                         progress.console.print(f"   ❌ [red]Amélioration rejetée[/red]")
                 
                 progress.advance(task)
+                self.sauvegarder_phase(phase, iteration + 1, {
+                    'params': current_params, 'score': current_score, 'iteration': iteration + 1
+                })
+            
+            self.afficher_cache(progress.console)
         
         # Sauvegarder le modèle amélioré
         self.models['continuous'] = {
@@ -557,6 +1088,7 @@ class CompleteOptimizationSystem:
         }
         
         console.print(f"🏆 [bold green]Modèle final:[/bold green] Score [green]{current_score:.2f}[/green]")
+        self.sauvegarder_phase(phase)
         return self.models['continuous']
     
     def improve_params(self, params):
@@ -594,23 +1126,17 @@ class CompleteOptimizationSystem:
                 params[param] = round(random.uniform(min_val, max_val), 2)
         return params
     
-    def evaluate_fitness(self, individual):
+    def evaluate_fitness(self, individual, trades=None):
         """Évalue la fitness d'un individu"""
         try:
-            trades = self.apply_strategy(individual)
+            if trades is None:
+                trades = self.apply_strategy(individual)
             
             if len(trades) < 10:
                 return float('-inf')
             
             metrics = calculate_metrics(trades)
-            
-            # Critères de fitness équilibrés
-            drawdown_penalty = max(0, metrics['max_drawdown'] - 30) * 10
-            win_rate_bonus = max(0, metrics['win_rate'] - 45) * 0.5
-            profit_factor_bonus = max(0, metrics['profit_factor'] - 1.5) * 2
-            return_bonus = max(0, metrics['total_return'] - 50) * 0.1
-            
-            fitness = (win_rate_bonus + profit_factor_bonus + return_bonus) - drawdown_penalty
+            fitness = float(self.score_fitness(metrics))
             
             individual['metrics'] = metrics
             individual['fitness'] = fitness
@@ -620,24 +1146,17 @@ class CompleteOptimizationSystem:
         except Exception as e:
             return float('-inf')
     
-    def evaluate_aggressive_fitness(self, individual):
+    def evaluate_aggressive_fitness(self, individual, trades=None):
         """Évalue la fitness pour optimisation agressive"""
         try:
-            trades = self.apply_strategy(individual)
+            if trades is None:
+                trades = self.apply_strategy(individual)
             
             if len(trades) < 10:
                 return float('-inf')
             
             metrics = calculate_metrics(trades)
-            
-            # Critères agressifs
-            total_gain = metrics['total_return']
-            drawdown_penalty = max(0, metrics['max_drawdown'] - 20) * 15
-            win_rate_bonus = max(0, metrics['win_rate'] - 55) * 2
-            profit_factor_bonus = max(0, metrics['profit_factor'] - 3) * 10
-            avg_win_bonus = max(0, metrics.get('avg_win', 0) - 2) * 5
-            
-            fitness = (total_gain * 0.3) - drawdown_penalty + win_rate_bonus + profit_factor_bonus + avg_win_bonus
+            fitness = float(self.score_fitness_agressive(metrics))
             
             individual['metrics'] = metrics
             individual['fitness'] = fitness
@@ -647,72 +1166,141 @@ class CompleteOptimizationSystem:
         except Exception as e:
             return float('-inf')
     
+    def score_fitness(self, metrics):
+        """Fitness équilibrée (scalaires d'un individu ou tableaux d'un lot de métriques)"""
+        # Critères de fitness équilibrés
+        drawdown_penalty = np.fmax(0, metrics['max_drawdown'] - 30) * 10
+        win_rate_bonus = np.fmax(0, metrics['win_rate'] - 45) * 0.5
+        profit_factor_bonus = np.fmax(0, metrics['profit_factor'] - 1.5) * 2
+        return_bonus = np.fmax(0, metrics['total_return'] - 50) * 0.1
+        
+        return (win_rate_bonus + profit_factor_bonus + return_bonus) - drawdown_penalty
+    
+    def score_fitness_agressive(self, metrics):
+        """Fitness agressive (scalaires d'un individu ou tableaux d'un lot de métriques)"""
+        # Critères agressifs
+        total_gain = metrics['total_return']
+        drawdown_penalty = np.fmax(0, metrics['max_drawdown'] - 20) * 15
+        win_rate_bonus = np.fmax(0, metrics['win_rate'] - 55) * 2
+        profit_factor_bonus = np.fmax(0, metrics['profit_factor'] - 3) * 10
+        avg_win_bonus = np.fmax(0, metrics.get('avg_win', 0) - 2) * 5
+        
+        return (total_gain * 0.3) - drawdown_penalty + win_rate_bonus + profit_factor_bonus + avg_win_bonus
+    
+    def evaluer_avec_cache(self, population, agressif=False, elimination=False):
+        """
+        (fitness, métriques) de la population : seuls les individus absents du
+        cache sont backtestés ; avec `elimination`, la population passe par
+        l'élimination successive, cache ou non (les éliminés valent -inf et ne
+        sont pas mis en cache), sauf l'élite qui garde son résultat complet
+        """
+        strategie = 'complet/agressif' if agressif else 'complet/genetique'
+        if elimination:
+            return evaluer_avec_elimination(
+                self.cache_fitness, strategie, self.empreinte, parametres_individus(population),
+                lambda individus, barres: self.evaluateur.evaluer('evaluer_population', individus, agressif, barres),
+                len(self.df), acquis=resultats_acquis(population)
+            )
+        return self.cache_fitness.evaluer(
+            strategie, self.empreinte, parametres_individus(population),
+            lambda manquants: self.evaluateur.evaluer('evaluer_population', manquants, agressif)
+        )
+    
+    def metriques_strategie(self, params):
+        """Métriques de la stratégie pour un jeu de paramètres (None si 10 trades ou moins)"""
+        trades = self.apply_strategy(params)
+        return calculate_metrics(trades) if len(trades) > 10 else None
+    
+    def metriques_avec_cache(self, params):
+        """metriques_strategie via le cache de fitness"""
+        return self.cache_fitness.calculer('complet/metriques', self.empreinte, params, self.metriques_strategie)
+    
+    def metriques_population(self, population):
+        """metriques_strategie de toute une tranche de paramètres, en une passe par lots"""
+        metrics = metriques_journal(self.journal_population(population))
+        return [metriques_individu(metrics, k) if metrics['total_trades'][k] > 10 else None
+                for k in range(len(population))]
+    
+    def metriques_lot_avec_cache(self, population):
+        """metriques_population via le cache de fitness (mêmes entrées que metriques_avec_cache)"""
+        return self.cache_fitness.evaluer(
+            'complet/metriques', self.empreinte, population,
+            lambda manquants: self.evaluateur.evaluer('metriques_population', manquants)
+        )
+    
+    def afficher_cache(self, console_sortie=console):
+        """Taux de hit du cache de fitness depuis le dernier affichage"""
+        stats = self.cache_fitness.statistiques_generation()
+        console_sortie.print(f"   🗄️ Cache: [cyan]{stats['taux_hit']:.0%}[/cyan] ({stats['hits']} hits, {stats['misses']} backtests)")
+    
+    def evaluer_population(self, population, agressif=False, barres=None):
+        """
+        Fitness et métriques d'une tranche de population, en une passe par lots.
+        Appelée par l'évaluateur (éventuellement dans un worker) : reçoit des
+        paramètres, renvoie des couples (fitness, métriques ou None).
+        Les métriques et fitness de tout le lot sont calculées ensemble sur le journal.
+        `barres` limite le backtest aux premières barres de la fenêtre.
+        """
+        metrics = metriques_journal(self.journal_population(population, barres))
+        score = self.score_fitness_agressive if agressif else self.score_fitness
+        fitness = score(metrics)
+        resultats = []
+        for k, individual in enumerate(population):
+            if metrics['total_trades'][k] < 10:
+                resultats.append((float('-inf'), None))
+                continue
+            individual['metrics'] = metriques_individu(metrics, k)
+            individual['fitness'] = float(fitness[k])
+            resultats.append((individual['fitness'], individual['metrics']))
+        return resultats
+    
     def calculate_rl_reward(self, metrics):
-        """Calcule la récompense pour le RL"""
-        reward = 0
+        """
+        Calcule la récompense pour le RL (métriques d'un individu, ou tableaux
+        d'un lot de métriques : une récompense par individu)
+        """
+        win_rate = np.asarray(metrics['win_rate'], dtype=np.float64)
+        profit_factor = np.asarray(metrics['profit_factor'], dtype=np.float64)
+        max_drawdown = np.asarray(metrics['max_drawdown'], dtype=np.float64)
         
         # Récompense pour le retour
-        reward += metrics['total_return'] * 0.1
+        reward = np.asarray(metrics['total_return'], dtype=np.float64) * 0.1
         
         # Récompense pour le win rate
-        if metrics['win_rate'] > 50:
-            reward += (metrics['win_rate'] - 50) * 0.5
+        reward = reward + np.where(win_rate > 50, (win_rate - 50) * 0.5, 0)
         
         # Récompense pour le profit factor
-        if metrics['profit_factor'] > 1.5:
-            reward += (metrics['profit_factor'] - 1.5) * 10
+        reward = reward + np.where(profit_factor > 1.5, (profit_factor - 1.5) * 10, 0)
         
         # Pénalité pour le drawdown
-        if metrics['max_drawdown'] > 30:
-            reward -= (metrics['max_drawdown'] - 30) * 5
-        elif metrics['max_drawdown'] < 20:
-            reward += (20 - metrics['max_drawdown']) * 2
+        reward = reward + np.where(max_drawdown > 30, -(max_drawdown - 30) * 5,
+                                   np.where(max_drawdown < 20, (20 - max_drawdown) * 2, 0))
         
-        return reward
+        return reward if reward.ndim else reward.item()
     
     def calculate_fusion_score(self, metrics):
-        """Calcule le score pour la fusion"""
-        score = 0
-        
+        """
+        Calcule le score pour la fusion (métriques d'un individu, ou tableaux
+        d'un lot de métriques : un score par individu)
+        """
         # Retour (0-40 points)
-        return_val = metrics.get('total_return', 0)
-        if return_val > 500:
-            score += 40
-        elif return_val > 300:
-            score += 35
-        elif return_val > 200:
-            score += 30
-        elif return_val > 100:
-            score += 25
+        return_val = np.asarray(metrics.get('total_return', 0))
+        score = np.select([return_val > 500, return_val > 300, return_val > 200, return_val > 100],
+                          [40, 35, 30, 25], 0)
         
         # Drawdown (0-30 points)
-        dd = metrics.get('max_drawdown', 100)
-        if dd < 10:
-            score += 30
-        elif dd < 20:
-            score += 25
-        elif dd < 30:
-            score += 20
+        dd = np.asarray(metrics.get('max_drawdown', 100))
+        score = score + np.select([dd < 10, dd < 20, dd < 30], [30, 25, 20], 0)
         
         # Win Rate (0-20 points)
-        wr = metrics.get('win_rate', 0)
-        if wr > 60:
-            score += 20
-        elif wr > 55:
-            score += 15
-        elif wr > 50:
-            score += 10
+        wr = np.asarray(metrics.get('win_rate', 0))
+        score = score + np.select([wr > 60, wr > 55, wr > 50], [20, 15, 10], 0)
         
         # Profit Factor (0-10 points)
-        pf = metrics.get('profit_factor', 0)
-        if pf > 4:
-            score += 10
-        elif pf > 3:
-            score += 8
-        elif pf > 2:
-            score += 5
-        
-        return score
+        pf = np.asarray(metrics.get('profit_factor', 0))
+        score = score + np.select([pf > 4, pf > 3, pf > 2], [10, 8, 5], 0)
+        
+        return score if score.ndim else score.item()
     
     def evolutionary_step(self, population, fitness_scores):
         """Étape d'évolution"""
@@ -771,11 +1359,28 @@ class CompleteOptimizationSystem:
     def apply_strategy(self, params):
         """Applique la stratégie avec les paramètres donnés"""
         # Version simplifiée de la stratégie
-        return self.strategie_complete(self.df, params)
+        return self.strategie_complete(self.df, params, self.indicateurs)
+    
+    def apply_strategy_batch(self, population):
+        """Applique la stratégie à toute une population en une passe (un TradeLog par individu)"""
+        return trades_par_individu(self.journal_population(population), self.df['Date'])
     
-    def strategie_complete(self, df, params):
+    def journal_population(self, population, barres=None):
+        """
+        Journal en colonnes des trades de toute une population (une passe par
+        lots), sur les `barres` premières barres de la fenêtre si fourni
+        """
+        if barres is None:
+            return self.strategie_complete_lot(self.df, population, self.indicateurs)
+        debut = self.fenetre[0]
+        return self.strategie_complete_lot(self.df.iloc[:barres], population,
+                                           self.indicateurs_complets.fenetre(debut, debut + barres))
+    
+    def strategie_complete(self, df, params, indicateurs=None):
         """Stratégie complète avec tous les paramètres"""
         df = df.copy()
+        if indicateurs is None:
+            indicateurs = IndicatorCache.depuis_df(df)
         
         # Paramètres de base
         breakout_period = int(params.get('breakout_period', 2))
@@ -790,12 +1395,12 @@ class CompleteOptimizationSystem:
         max_positions = int(params.get('max_positions', 1))
         
         # Calcul des indicateurs
-        df['ATR'] = self.calculate_atr(df, atr_period)
-        df['RSI'] = self.calculate_rsi(df['Close'], 8)
-        df['EMA_Short'] = df['Close'].ewm(span=ema_short).mean()
-        df['EMA_Long'] = df['Close'].ewm(span=ema_long).mean()
-        df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-        df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+        df['ATR'] = indicateurs.atr(atr_period)
+        df['RSI'] = indicateurs.rsi(8)
+        df['EMA_Short'] = indicateurs.ema(ema_short)
+        df['EMA_Long'] = indicateurs.ema(ema_long)
+        df['High_Break'] = indicateurs.plus_haut(breakout_period)
+        df['Low_Break'] = indicateurs.plus_bas(breakout_period)
         
         # Signaux
         df['Long_Signal'] = (
@@ -817,7 +1422,7 @@ class CompleteOptimizationSystem:
         )
         
         # Simulation des trades
-        trades = []
+        trades = journal_optimiseur()
         position = 0
         entry_price = 0
         entry_date = None
@@ -918,24 +1523,70 @@ class CompleteOptimizationSystem:
         
         return trades
     
-    def calculate_atr(self, df, period):
-        """Calcule l'ATR"""
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = true_range.rolling(window=period).mean()
-        return atr
-    
-    def calculate_rsi(self, prices, period):
-        """Calcule le RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+    def strategie_complete_lot(self, df, population, indicateurs=None):
+        """
+        Version par lots de strategie_complete : mêmes signaux et mêmes sorties,
+        évalués pour tous les individus en une seule passe sur les barres.
+        Retourne le journal de lot (colonnes, offsets par individu).
+        """
+        if indicateurs is None:
+            indicateurs = IndicatorCache.depuis_df(df)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        
+        # Indicateurs : un calcul par période distincte
+        breakout_period = [int(p.get('breakout_period', 2)) for p in population]
+        ema_short = [int(p.get('ema_short', 4)) for p in population]
+        ema_long = [int(p.get('ema_long', 12)) for p in population]
+        atr_period = [int(p.get('atr_period', 8)) for p in population]
+        rsi_overbought = vecteur_parametre(population, 'rsi_overbought', 85)
+        rsi_oversold = vecteur_parametre(population, 'rsi_oversold', 15)
+        profit_atr = vecteur_parametre(population, 'profit_atr', 2.5)
+        stop_loss_atr = vecteur_parametre(population, 'stop_loss_atr', 2.0)
+        max_positions = vecteur_parametre(population, 'max_positions', 1).astype(int)
+        
+        atr_lot = colonnes_par_parametre(atr_period, indicateurs.atr)
+        # Banque d'EMA : toutes les périodes courtes et longues en une passe, indexées par individu
+        periodes_ema, indices_ema = np.unique(ema_short + ema_long, return_inverse=True)
+        banque_ema = indicateurs.banque_ema(periodes_ema)
+        ema_short_lot = banque_ema[indices_ema[:len(population)]].T
+        ema_long_lot = banque_ema[indices_ema[len(population):]].T
+        # Canaux de breakout de toutes les périodes en une passe, indexés par individu
+        periodes, indices_breakout = np.unique(breakout_period, return_inverse=True)
+        canal_haut, canal_bas = indicateurs.canal_breakout(periodes)
+        high_break = canal_haut[indices_breakout].T
+        low_break = canal_bas[indices_breakout].T
+        rsi_8 = indicateurs.rsi(8)[:, None]
+        
+        # Signaux (barres × individus)
+        breakout_up = np.zeros(high_break.shape, dtype=bool)
+        breakout_up[1:] = (high[:-1, None] < high_break[:-1]) & (high[1:, None] >= high_break[1:])
+        breakout_down = np.zeros(low_break.shape, dtype=bool)
+        breakout_down[1:] = (low[:-1, None] > low_break[:-1]) & (low[1:, None] <= low_break[1:])
+        
+        long_signal = (
+            breakout_up &
+            (ema_short_lot > ema_long_lot) &
+            (close[:, None] > ema_short_lot) &
+            (rsi_8 < rsi_overbought) &
+            (rsi_8 > 20)
+        )
+        short_signal = (
+            breakout_down &
+            (ema_short_lot < ema_long_lot) &
+            (close[:, None] < ema_short_lot) &
+            (rsi_8 > rsi_oversold) &
+            (rsi_8 < 80)
+        )
+        
+        # Stop et objectif recalculés à chaque barre avec l'ATR courant
+        journal = simuler_lot(
+            close, atr_lot, long_signal, short_signal,
+            stop_atr=stop_loss_atr, cible_atr=profit_atr,
+            debut=50, stops_dynamiques=True, autorise=max_positions > 0
+        )
+        return journal
     
     def get_state_key(self, params):
         """Génère une clé d'état pour le RL"""
@@ -979,58 +1630,34 @@ class CompleteOptimizationSystem:
         console.print(f"✅ [green]Modèle final sauvegardé:[/green] {results_dir}")
         return results_dir
 
-def main():
-    """Fonction principale"""
-    console.print(Panel.fit(
-        "[bold blue]🚀 SYSTÈME D'OPTIMISATION COMPLET[/bold blue]\n"
-        "[cyan]Optimisation génétique + RL + Fusion + Apprentissage continu[/cyan]",
-        border_style="blue",
-        box=box.DOUBLE
-    ))
-    
-    # Configuration
-    symbol = "XAUUSD"
-    timeframe = "D1"
-    
-    console.print(f"🎯 [yellow]Configuration:[/yellow] {symbol} {timeframe}")
-    console.print()
-    
-    # Création du système
-    system = CompleteOptimizationSystem(symbol, timeframe)
-    
-    # Chargement des modèles existants
-    system.load_existing_models()
-    
-    # Menu avec Rich
-    menu_table = Table(title="🎯 Options d'Optimisation", box=box.ROUNDED)
-    menu_table.add_column("Option", style="cyan", no_wrap=True)
-    menu_table.add_column("Description", style="white")
-    menu_table.add_column("Durée", style="yellow")
-    
-    menu_table.add_row("1", "Optimisation Génétique", "10-20 min")
-    menu_table.add_row("2", "Optimisation Agressive", "10-20 min")
-    menu_table.add_row("3", "Reinforcement Learning", "15-30 min")
-    menu_table.add_row("4", "Fusion des Modèles", "2-5 min")
-    menu_table.add_row("5", "Apprentissage Continu", "5-10 min")
-    menu_table.add_row("6", "Optimisation Complète (Tout)", "45-90 min")
-    menu_table.add_row("7", "Optimisation Rapide (Test)", "5-10 min")
-    menu_table.add_row("8", "Optimisation Intensive", "2-4 heures")
-    
-    console.print(menu_table)
-    
-    choice = console.input("\n[bold green]Choisissez une option (1-8): [/bold green]")
-    
-    if choice == "1":
+# Choix du menu -> mode (nom utilisé par la CLI `trading.py optimize complet --mode`)
+MODES_SYSTEME = {
+    '1': 'genetique',
+    '2': 'agressive',
+    '3': 'rl',
+    '4': 'fusion',
+    '5': 'continu',
+    '6': 'complet',
+    '7': 'rapide',
+    '8': 'intensif',
+    '9': 'pareto',
+    '10': 'bayesien',
+    '11': 'aleatoire',
+}
+
+def executer_mode(system, mode):
+    """Exécute une option du menu (voir MODES_SYSTEME) sur le système"""
+    if mode == 'genetique':
         system.genetic_optimization()
-    elif choice == "2":
+    elif mode == 'agressive':
         system.aggressive_optimization()
-    elif choice == "3":
+    elif mode == 'rl':
         system.reinforcement_learning_optimization()
-    elif choice == "4":
+    elif mode == 'fusion':
         system.fusion_models()
-    elif choice == "5":
+    elif mode == 'continu':
         system.continuous_learning()
-    elif choice == "6":
+    elif mode == 'complet':
         console.print(Panel.fit(
             "[bold green]🔄 OPTIMISATION COMPLÈTE[/bold green]",
             border_style="green"
@@ -1058,7 +1685,7 @@ def main():
             "[bold green]🎉 OPTIMISATION COMPLÈTE TERMINÉE![/bold green]",
             border_style="green"
         ))
-    elif choice == "7":
+    elif mode == 'rapide':
         console.print(Panel.fit(
             "[bold cyan]⚡ OPTIMISATION RAPIDE (TEST)[/bold cyan]",
             border_style="cyan"
@@ -1075,15 +1702,17 @@ def main():
             "[bold cyan]✅ OPTIMISATION RAPIDE TERMINÉE![/bold cyan]",
             border_style="cyan"
         ))
-    elif choice == "8":
+    elif mode == 'intensif':
         console.print(Panel.fit(
             "[bold red]🔥 OPTIMISATION INTENSIVE[/bold red]",
             border_style="red"
         ))
         
-        # Optimisation intensive
-        system.genetic_optimization(population_size=200, generations=500)
-        system.aggressive_optimization(population_size=200, generations=500)
+        # Optimisation intensive : GA en îles (un processus par île), puis
+        # populations évaluées sur tous les cœurs
+        system.island_optimization(population_size=200, generations=500)
+        system.island_optimization(population_size=200, generations=500, agressif=True)
+        system.configurer_evaluation('process')
         system.reinforcement_learning_optimization(episodes=2000)
         system.fusion_models()
         system.continuous_learning(iterations=100)
@@ -1092,8 +1721,74 @@ def main():
             "[bold red]🏆 OPTIMISATION INTENSIVE TERMINÉE![/bold red]",
             border_style="red"
         ))
+    elif mode == 'pareto':
+        system.pareto_optimization()
+    elif mode == 'bayesien':
+        system.bayesian_optimization()
+    elif mode == 'aleatoire':
+        system.random_search_optimization()
     else:
+        raise ValueError(f"Mode inconnu: {mode} (attendu: {', '.join(MODES_SYSTEME.values())})")
+    
+    if system.reprise is not None:
+        system.reprise.terminer()
+
+def main(symbol="XAUUSD", timeframe="D1", mode=None, reprendre=False, intervalle_reprise=5, elimination=False):
+    """
+    Fonction principale : menu interactif, ou `mode` fourni par la CLI.
+    Chaque mode a son point de reprise ; `reprendre` continue depuis le dernier.
+    `elimination` : élimination successive dans les phases génétique et agressive.
+    """
+    console.print(Panel.fit(
+        "[bold blue]🚀 SYSTÈME D'OPTIMISATION COMPLET[/bold blue]\n"
+        "[cyan]Optimisation génétique + RL + Fusion + Apprentissage continu[/cyan]",
+        border_style="blue",
+        box=box.DOUBLE
+    ))
+    
+    console.print(f"🎯 [yellow]Configuration:[/yellow] {symbol} {timeframe}")
+    console.print()
+    
+    # Création du système
+    system = CompleteOptimizationSystem(symbol, timeframe, cache_fitness=FitnessCache(chemin=CHEMIN_CACHE_FITNESS),
+                                        elimination=elimination)
+    
+    # Chargement des modèles existants
+    system.load_existing_models()
+    
+    if mode is None:
+        # Menu avec Rich
+        menu_table = Table(title="🎯 Options d'Optimisation", box=box.ROUNDED)
+        menu_table.add_column("Option", style="cyan", no_wrap=True)
+        menu_table.add_column("Description", style="white")
+        menu_table.add_column("Durée", style="yellow")
+    
+        menu_table.add_row("1", "Optimisation Génétique", "10-20 min")
+        menu_table.add_row("2", "Optimisation Agressive", "10-20 min")
+        menu_table.add_row("3", "Reinforcement Learning", "15-30 min")
+        menu_table.add_row("4", "Fusion des Modèles", "2-5 min")
+        menu_table.add_row("5", "Apprentissage Continu", "5-10 min")
+        menu_table.add_row("6", "Optimisation Complète (Tout)", "45-90 min")
+        menu_table.add_row("7", "Optimisation Rapide (Test)", "5-10 min")
+        menu_table.add_row("8", "Optimisation Intensive", "2-4 heures")
+        menu_table.add_row("9", "Front de Pareto (NSGA-II)", "10-20 min")
+        menu_table.add_row("10", "Optimisation Bayésienne", "2-5 min")
+        menu_table.add_row("11", "Recherche Aléatoire (élimination successive)", "2-5 min")
+    
+        console.print(menu_table)
+    
+        choice = console.input("\n[bold green]Choisissez une option (1-11): [/bold green]")
+    
+        mode = MODES_SYSTEME.get(choice)
+    
+    if mode is None:
         console.print("❌ [red]Option invalide[/red]")
+    else:
+        system.configurer_reprise(PointReprise(chemin_reprise(f"complet_{mode}", symbol, timeframe),
+                                               intervalle_reprise, reprendre))
+        executer_mode(system, mode)
+    
+    system.cache_fitness.sauvegarder()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -15,15 +15,21 @@ warnings.filterwarnings('ignore')
 # Ajout du chemin pour importer les modules
 sys.path.append('src/strategies')
 sys.path.append('src/analysis')
+sys.path.append('src')
 
 from strategie_xauusd_sharpe1_simple import strategie_xauusd_sharpe1_simple, calculate_metrics
 from generate_strategy_analysis import create_detailed_analysis
+from donnees import charger_ohlcv, StoreReechantillonne
 
-def test_all_timeframes_xauusd():
-    """Teste la stratégie sur tous les timeframes XAUUSD disponibles"""
+def test_all_timeframes_xauusd(aligne=False):
+    """
+    Teste la stratégie sur tous les timeframes XAUUSD disponibles. `aligne` :
+    chaque timeframe est rééchantillonné depuis M5 (même historique pour tous)
+    """
     
     print("🚀 TEST MULTI-TIMEFRAMES XAUUSD")
     print("=" * 50)
+    store = StoreReechantillonne(source='M5') if aligne else None
     
     # Timeframes disponibles
     timeframes = ['M5', 'M15', 'M30', 'H1', 'H4', 'D1']
@@ -36,7 +42,7 @@ def test_all_timeframes_xauusd():
         print(f"\n📊 Test {timeframe}...")
         
         # Vérification du fichier de données
-        csv_path = f"data/raw/XAUUSD_{timeframe}_mt5.csv"
+        csv_path = f"data/raw/XAUUSD_{'M5' if aligne else timeframe}_mt5.csv"
         
         if not os.path.exists(csv_path):
             print(f"❌ Fichier non trouvé: {csv_path}")
@@ -44,8 +50,7 @@ def test_all_timeframes_xauusd():
         
         try:
             # Chargement des données
-            df = pd.read_csv(csv_path)
-            df['Date'] = pd.to_datetime(df['Date'])
+            df = store.dataframe('XAUUSD', timeframe) if aligne else charger_ohlcv('XAUUSD', timeframe)
             
             print(f"✅ {len(df)} bougies chargées")
             print(f"📅 Période: {df['Date'].min()} à {df['Date'].max()}")
@@ -251,13 +256,13 @@ def calculate_score(row):
     
     return score
 
-def main():
+def main(aligne=False):
     """Fonction principale"""
     print("🚀 TEST MULTI-TIMEFRAMES XAUUSD COMPLET")
     print("=" * 60)
     
     # Test de tous les timeframes
-    summary_results, all_results = test_all_timeframes_xauusd()
+    summary_results, all_results = test_all_timeframes_xauusd(aligne)
     
     if summary_results:
         print(f"\n✅ ANALYSE TERMINÉE!")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Optimisation Walk-Forward
+Chaque série (symbole, timeframe) est découpée en folds glissants ou ancrés :
+l'optimiseur est entraîné sur la fenêtre d'entraînement, ses meilleurs
+paramètres sont évalués sur la fenêtre de test qui suit, et les trades de
+test sont mis bout à bout en une équité hors échantillon.
+
+Les folds sont répartis sur des processus : chaque worker charge la série et
+calcule ses indicateurs une seule fois, puis enchaîne des folds contigus dont
+les fenêtres se chevauchent en réutilisant le même cache d'indicateurs.
+"""
+
+import os
+import sys
+import copy
+import random
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from functools import partial
+import warnings
+warnings.filterwarnings('ignore')
+
+# Ajout du chemin pour importer les modules
+sys.path.append('scripts')
+sys.path.append('src/strategies')
+sys.path.append('src')
+from moteur import ParallelEvaluator, FitnessCache, fenetres_walk_forward, assembler_hors_echantillon
+from moteur import journal_optimiseur, dataframe_trades
+from strategie_xauusd_sharpe1_simple import calculate_metrics
+from optimisation_genetique_drawdown import GeneticOptimizer
+from optimisation_agressive_gains import AggressiveOptimizer
+from systeme_optimisation_complet import CompleteOptimizationSystem
+
+OPTIMISEURS = ('drawdown', 'agressif', 'complet')
+
+
+class WalkForwardOptimizer:
+    def __init__(self, symbol="XAUUSD", timeframe="D1", optimiseur='drawdown', n_folds=10,
+                 ratio_train=3.0, ancre=False, population_size=30, generations=20, chauffe=50,
+                 mode_evaluation='process', workers=None, graine=None):
+        if optimiseur not in OPTIMISEURS:
+            raise ValueError(f"Optimiseur inconnu: {optimiseur} (attendu: {', '.join(OPTIMISEURS)})")
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.optimiseur = optimiseur
+        self.n_folds = n_folds
+        self.ratio_train = ratio_train
+        self.ancre = ancre
+        self.population_size = population_size
+        self.generations = generations
+        self.chauffe = chauffe  # Barres d'historique rejouées avant chaque test (positions et filtres)
+        self.mode_evaluation = mode_evaluation
+        self.workers = workers
+        self.graine = graine
+
+        # Optimiseur de base (données, cache d'indicateurs) construit une fois par processus
+        self._base = None
+        self.resultats = []
+        self.trades_oos = []
+        self.equite_oos = np.array([])
+
+    def optimiseur_base(self):
+        """Optimiseur sur la série complète ; ses copies partagent données et indicateurs"""
+        if self._base is None:
+            cache = FitnessCache()
+            if self.optimiseur == 'drawdown':
+                self._base = GeneticOptimizer(self.symbol, self.timeframe, self.population_size,
+                                              self.generations, cache_fitness=cache)
+            elif self.optimiseur == 'agressif':
+                self._base = AggressiveOptimizer(self.symbol, self.timeframe, self.population_size,
+                                                 self.generations, cache_fitness=cache)
+            else:
+                self._base = CompleteOptimizationSystem(self.symbol, self.timeframe, cache_fitness=cache)
+        return self._base
+
+    def copie_optimiseur(self):
+        """Copie légère de l'optimiseur de base : fenêtre et résultats propres, données et indicateurs partagés"""
+        optimiseur = copy.copy(self.optimiseur_base())
+        if self.optimiseur == 'complet':
+            optimiseur.models = {}
+            optimiseur.evaluateur = None
+            optimiseur.configurer_evaluation('serial')
+        return optimiseur
+
+    def creer_folds(self):
+        """Folds entraînement / test sur toute la série"""
+        n_barres = len(self.optimiseur_base().df_complet)
+        return fenetres_walk_forward(n_barres, self.n_folds, self.ratio_train, ancre=self.ancre)
+
+    def entrainer(self, optimiseur):
+        """Optimise sur la fenêtre courante : (paramètres, score, métriques d'entraînement)"""
+        if self.optimiseur == 'complet':
+            modele = optimiseur.genetic_optimization(self.population_size, self.generations)
+            return modele['params'], modele['score'], modele['metrics']
+
+        best = optimiseur.optimize(enregistrer=False)
+        if not best:
+            return None, optimiseur.best_fitness, {}
+        params = {k: v for k, v in best.items() if k not in ['metrics', 'fitness']}
+        return params, optimiseur.best_fitness, best.get('metrics', {})
+
+    def trades_test(self, optimiseur, params, fold):
+        """Trades ouverts pendant la fenêtre de test (précédée de `chauffe` barres rejouées)"""
+        debut_test, fin_test = fold['test']
+        optimiseur.definir_fenetre(max(0, debut_test - self.chauffe), fin_test)
+        if self.optimiseur == 'complet':
+            trades = optimiseur.apply_strategy(params)
+        else:
+            trades, _ = optimiseur.apply_strategy_with_params(params)
+        date_debut = optimiseur.df_complet['Date'].iloc[debut_test]
+        return trades[trades.colonne('entry_date') >= date_debut.value]
+
+    def optimiser_fold(self, fold):
+        """Entraînement puis test d'un fold"""
+        if self.graine is not None:
+            random.seed(self.graine + fold['fold'])
+            np.random.seed(self.graine + fold['fold'])
+
+        optimiseur = self.copie_optimiseur()
+        dates = optimiseur.df_complet['Date']
+        optimiseur.definir_fenetre(*fold['train'])
+        params, score_train, metrics_train = self.entrainer(optimiseur)
+
+        trades = self.trades_test(optimiseur, params, fold) if params else journal_optimiseur()
+        return {
+            'fold': fold['fold'],
+            'train': fold['train'],
+            'test': fold['test'],
+            'debut_train': str(dates.iloc[fold['train'][0]]),
+            'fin_train': str(dates.iloc[fold['train'][1] - 1]),
+            'debut_test': str(dates.iloc[fold['test'][0]]),
+            'fin_test': str(dates.iloc[fold['test'][1] - 1]),
+            'params': params,
+            'score_train': score_train,
+            'metrics_train': metrics_train,
+            'metrics_test': calculate_metrics(trades),
+            'trades_test': trades,
+        }
+
+    def optimiser_folds(self, folds):
+        """Tranche de folds traitée par un worker (méthode appelée par l'évaluateur)"""
+        return [self.optimiser_fold(fold) for fold in folds]
+
+    def creer_evaluateur(self):
+        """Évaluateur des folds ; en mode processus chaque worker recharge ses données une fois"""
+        if self.mode_evaluation == 'process':
+            fabrique = partial(WalkForwardOptimizer, optimiseur=self.optimiseur, n_folds=self.n_folds,
+                               ratio_train=self.ratio_train, ancre=self.ancre,
+                               population_size=self.population_size, generations=self.generations,
+                               chauffe=self.chauffe, mode_evaluation='serial', graine=self.graine)
+            return ParallelEvaluator('process', self.workers, fabrique=fabrique,
+                                     args=(self.symbol, self.timeframe))
+        return ParallelEvaluator(self.mode_evaluation, self.workers, contexte=self)
+
+    def run(self):
+        """Lance le walk-forward complet"""
+        folds = self.creer_folds()
+        print(f"🚶 WALK-FORWARD {self.optimiseur.upper()} - {self.symbol} {self.timeframe}")
+        print(f"Folds: {len(folds)} ({'ancrés' if self.ancre else 'glissants'}), "
+              f"Population: {self.population_size}, Générations: {self.generations}")
+        print("=" * 60)
+
+        with self.creer_evaluateur() as evaluateur:
+            self.resultats = evaluateur.evaluer('optimiser_folds', folds)
+
+        self.trades_oos, self.equite_oos = assembler_hors_echantillon(self.resultats)
+        self.afficher_resultats()
+        return self.resultats
+
+    def afficher_resultats(self):
+        """Résumé par fold et métriques hors échantillon"""
+        for resultat in self.resultats:
+            metrics = resultat['metrics_test']
+            print(f"📅 Fold {resultat['fold']}: test {resultat['debut_test'][:10]} → {resultat['fin_test'][:10]} | "
+                  f"Trades: {metrics['total_trades']} | Retour: {metrics['total_return']:.2f}% | "
+                  f"DD: {metrics['max_drawdown']:.2f}%")
+
+        metrics = calculate_metrics(self.trades_oos)
+        print(f"\n📊 Hors échantillon: {metrics['total_trades']} trades")
+        print(f"   • Win Rate: {metrics['win_rate']:.2f}%")
+        print(f"   • Retour: {metrics['total_return']:.2f}%")
+        print(f"   • Drawdown: {metrics['max_drawdown']:.2f}%")
+        print(f"   • Profit Factor: {metrics['profit_factor']:.2f}")
+
+    def save_results(self):
+        """Sauvegarde le résumé des folds et l'équité hors échantillon"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_dir = f"results/walk_forward/{self.optimiseur}_{self.symbol}_{self.timeframe}_{timestamp}"
+        os.makedirs(results_dir, exist_ok=True)
+
+        lignes = []
+        for resultat in self.resultats:
+            ligne = {k: resultat[k] for k in ('fold', 'debut_train', 'fin_train', 'debut_test', 'fin_test', 'score_train')}
+            ligne.update({f"test_{k}": v for k, v in resultat['metrics_test'].items()})
+            ligne['params'] = resultat['params']
+            lignes.append(ligne)
+        pd.DataFrame(lignes).to_csv(f"{results_dir}/folds.csv", index=False)
+
+        trades = dataframe_trades(self.trades_oos)
+        if len(trades):
+            trades['rendement_cumule'] = self.equite_oos
+        trades.to_csv(f"{results_dir}/equite_hors_echantillon.csv", index=False)
+
+        metrics = calculate_metrics(self.trades_oos)
+        with open(f"{results_dir}/walk_forward.md", 'w', encoding='utf-8') as f:
+            f.write(f"# Walk-Forward {self.optimiseur} - {self.symbol} {self.timeframe}\n\n")
+            f.write(f"**Date**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write(f"- **Folds**: {len(self.resultats)} ({'ancrés' if self.ancre else 'glissants'})\n")
+            f.write(f"- **Ratio entraînement / test**: {self.ratio_train}\n\n")
+            f.write("## Résultats Hors Échantillon\n\n")
+            f.write(f"- **Total Trades**: {metrics['total_trades']}\n")
+            f.write(f"- **Win Rate**: {metrics['win_rate']:.2f}%\n")
+            f.write(f"- **Total Return**: {metrics['total_return']:.2f}%\n")
+            f.write(f"- **Max Drawdown**: {metrics['max_drawdown']:.2f}%\n")
+            f.write(f"- **Profit Factor**: {metrics['profit_factor']:.2f}\n")
+            f.write(f"- **Sharpe Ratio**: {metrics['sharpe_ratio']:.2f}\n")
+
+        print(f"\n✅ Résultats sauvegardés: {results_dir}")
+        return results_dir
+
+def main(symbol="XAUUSD", timeframes=('H4', 'D1'), optimiseur='drawdown', n_folds=10,
+         population_size=30, generations=20):
+    """Fonction principale (paramètres fournis par la CLI `trading.py optimize walk-forward`)"""
+    print("🚶 OPTIMISATION WALK-FORWARD")
+    print("=" * 60)
+
+    for timeframe in timeframes:
+        try:
+            walk_forward = WalkForwardOptimizer(
+                symbol=symbol,
+                timeframe=timeframe,
+                optimiseur=optimiseur,
+                n_folds=n_folds,
+                population_size=population_size,
+                generations=generations
+            )
+            walk_forward.run()
+            walk_forward.save_results()
+
+        except Exception as e:
+            print(f"❌ Erreur pour {timeframe}: {e}")
+            continue
+
+    print(f"\n🎉 Walk-forward terminé!")
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,21 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
-def compute_rsi(df, window=14):
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_adx, compute_rsi, compute_ema, rolling_max, rolling_min
 
 def analyze_all_signals(df, symbol, timeframe):
     """Analyse complète de tous les signaux possibles"""
     
     # Calcul des indicateurs
-    df['EMA20'] = df['Close'].ewm(span=20).mean()
-    df['EMA50'] = df['Close'].ewm(span=50).mean()
-    df['EMA200'] = df['Close'].ewm(span=200).mean()
+    df['EMA20'] = compute_ema(df['Close'], 20, adjust=True)
+    df['EMA50'] = compute_ema(df['Close'], 50, adjust=True)
+    df['EMA200'] = compute_ema(df['Close'], 200, adjust=True)
     df['ATR'] = compute_atr(df, 14)
     df['ADX'] = compute_adx(df, 14)
     df['RSI'] = compute_rsi(df, 14)
@@ -52,8 +29,8 @@ def analyze_all_signals(df, symbol, timeframe):
                                    np.where(df['ADX'] > 20, 'Medium', 'Weak'))
     
     # Breakouts
-    df['High_10'] = df['High'].rolling(10).max()
-    df['Low_10'] = df['Low'].rolling(10).min()
+    df['High_10'] = rolling_max(df['High'], 10)
+    df['Low_10'] = rolling_min(df['Low'], 10)
     df['Breakout_Up'] = (df['High'] >= df['High_10'].shift(1)) & (df['High'].shift(1) < df['High_10'].shift(2))
     df['Breakout_Down'] = (df['Low'] <= df['Low_10'].shift(1)) & (df['Low'].shift(1) > df['Low_10'].shift(2))
     
@@ -66,8 +43,8 @@ def analyze_all_signals(df, symbol, timeframe):
     df['RSI_Lower_Low'] = (df['RSI'] < df['RSI'].shift(1)) & (df['Close'] > df['Close'].shift(1))
     
     # Support/Résistance
-    df['Resistance'] = df['High'].rolling(20).max()
-    df['Support'] = df['Low'].rolling(20).min()
+    df['Resistance'] = rolling_max(df['High'], 20)
+    df['Support'] = rolling_min(df['Low'], 20)
     df['Near_Resistance'] = (df['Close'] > df['Resistance'] * 0.98) & (df['Close'] < df['Resistance'])
     df['Near_Support'] = (df['Close'] < df['Support'] * 1.02) & (df['Close'] > df['Support'])
     
@@ -11,7 +11,9 @@ warnings.filterwarnings('ignore')
 
 # Ajout du chemin pour importer les stratégies
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'strategies'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from strategie_xauusd_sharpe1_simple import strategie_xauusd_sharpe1_simple, calculate_metrics
+from moteur import dataframe_trades
 
 def create_detailed_analysis(symbol="XAUUSD", timeframe="D1"):
     """Génère une analyse détaillée de la stratégie"""
@@ -109,7 +111,7 @@ def generate_text_report(trades, metrics, df_signals, output_dir, symbol, timefr
         # Analyse temporelle
         f.write("## 📅 ANALYSE TEMPORELLE\n\n")
         if trades:
-            df_trades = pd.DataFrame(trades)
+            df_trades = dataframe_trades(trades)
             df_trades['entry_date'] = pd.to_datetime(df_trades['entry_date'])
             df_trades['year'] = df_trades['entry_date'].dt.year
             df_trades['month'] = df_trades['entry_date'].dt.month
@@ -181,7 +183,7 @@ def generate_analysis_charts(trades, df_signals, output_dir, symbol, timeframe):
     if not trades:
         return
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     df_trades['entry_date'] = pd.to_datetime(df_trades['entry_date'])
     
     # 1. Évolution du capital
@@ -295,7 +297,7 @@ def generate_trade_analysis(trades, output_dir, symbol, timeframe):
     if not trades:
         return
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     
     # Sauvegarde des trades
     trades_file = f"{output_dir}/trades_detailles.csv"
@@ -334,7 +336,7 @@ def generate_advanced_metrics(trades, metrics, output_dir, symbol, timeframe):
     if not trades:
         return
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     
     # Calculs avancés
     advanced_metrics = {}
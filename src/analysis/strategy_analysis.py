@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -6,6 +7,9 @@ from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_adx, compute_ema, rolling_max, rolling_min
+
 def analyze_market_conditions(df, symbol, timeframe):
     """Analyse les conditions de marché pour comprendre pourquoi la stratégie échoue"""
     
@@ -13,8 +17,8 @@ def analyze_market_conditions(df, symbol, timeframe):
     print("=" * 60)
     
     # Calcul des indicateurs
-    df['EMA50'] = df['Close'].ewm(span=50).mean()
-    df['EMA200'] = df['Close'].ewm(span=200).mean()
+    df['EMA50'] = compute_ema(df['Close'], 50, adjust=True)
+    df['EMA200'] = compute_ema(df['Close'], 200, adjust=True)
     df['ATR'] = compute_atr(df, 14)
     df['ADX'] = compute_adx(df, 14)
     
@@ -27,8 +31,8 @@ def analyze_market_conditions(df, symbol, timeframe):
     trend_changes = df['Trend'].diff().abs().sum()
     
     # Analyse des breakouts
-    df['High_10'] = df['High'].rolling(10).max()
-    df['Low_10'] = df['Low'].rolling(10).min()
+    df['High_10'] = rolling_max(df['High'], 10)
+    df['Low_10'] = rolling_min(df['Low'], 10)
     df['Breakout_Up'] = (df['High'] >= df['High_10'].shift(1)) & (df['High'].shift(1) < df['High_10'].shift(2))
     df['Breakout_Down'] = (df['Low'] <= df['Low_10'].shift(1)) & (df['Low'].shift(1) > df['Low_10'].shift(2))
     
@@ -80,25 +84,6 @@ def analyze_market_conditions(df, symbol, timeframe):
         'weak_trend_periods': weak_trend_periods
     }
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
 def suggest_improvements(analysis_results):
     """Suggère des améliorations basées sur l'analyse"""
     
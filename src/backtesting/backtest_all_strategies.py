@@ -5,6 +5,7 @@ Script de backtest automatisé pour toutes les stratégies Sharpe 1 Optimized
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -12,6 +13,10 @@ import yfinance as yf
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from moteur import TradeLog
+from indicators import atr, rsi, ema, rolling_max, rolling_min, rolling_mean
+
 # Configuration des actifs et timeframes
 ASSETS = {
     "XAUUSD": "GC=F",      # Or (Gold Futures)
@@ -35,7 +40,7 @@ class SharpeStrategyBacktest:
         self.start_date = start_date
         self.end_date = end_date
         self.data = None
-        self.trades = []
+        self.trades = TradeLog()
         self.equity_curve = []
         
     def download_data(self):
@@ -78,14 +83,14 @@ class SharpeStrategyBacktest:
         atr_period = 6
         
         # Calcul des indicateurs
-        self.data['ATR'] = self.calculate_atr(self.data, atr_period)
-        self.data['RSI'] = self.calculate_rsi(self.data['Close'], 6)
-        self.data['EMA_short'] = self.data['Close'].ewm(span=ema_short).mean()
-        self.data['EMA_long'] = self.data['Close'].ewm(span=ema_long).mean()
+        self.data['ATR'] = atr(self.data['High'], self.data['Low'], self.data['Close'], atr_period)
+        self.data['RSI'] = rsi(self.data['Close'], 6)
+        self.data['EMA_short'] = ema(self.data['Close'], ema_short)
+        self.data['EMA_long'] = ema(self.data['Close'], ema_long)
         
         # Breakouts
-        self.data['High_break'] = self.data['High'].rolling(breakout_period).max()
-        self.data['Low_break'] = self.data['Low'].rolling(breakout_period).min()
+        self.data['High_break'] = rolling_max(self.data['High'], breakout_period)
+        self.data['Low_break'] = rolling_min(self.data['Low'], breakout_period)
         
         # Filtres
         self.data['Uptrend'] = (self.data['EMA_short'] > self.data['EMA_long']) & \
@@ -93,7 +98,7 @@ class SharpeStrategyBacktest:
                                (self.data['EMA_short'] > self.data['EMA_short'].shift(1))
         
         # Volatilité contrôlée
-        atr_sma = self.data['ATR'].rolling(12).mean()
+        atr_sma = rolling_mean(self.data['ATR'], 12)
         self.data['Volatility_ok'] = (self.data['ATR'] > atr_sma * 0.4) & \
                                     (self.data['ATR'] < atr_sma * 1.8)
         
@@ -102,7 +107,7 @@ class SharpeStrategyBacktest:
                                   (self.data['Close'].shift(1) > self.data['Close'].shift(2))
         
         # Volume confirmé
-        volume_sma = self.data['Volume'].rolling(8).mean()
+        volume_sma = rolling_mean(self.data['Volume'], 8)
         self.data['Volume_ok'] = self.data['Volume'] > volume_sma * 0.7
         
         # Conditions RSI
@@ -119,32 +124,6 @@ class SharpeStrategyBacktest:
         
         return True
     
-    def calculate_atr(self, data, period):
-        """Calcule l'ATR (Average True Range)"""
-        high = data['High']
-        low = data['Low']
-        close = data['Close']
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = tr.rolling(period).mean()
-        
-        return atr
-    
-    def calculate_rsi(self, prices, period):
-        """Calcule le RSI (Relative Strength Index)"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
-    
     def run_backtest(self, initial_capital=10000):
         """Exécute le backtest de la stratégie"""
         if self.data is None or 'Signal' not in self.data.columns:
@@ -263,8 +242,8 @@ class SharpeStrategyBacktest:
         
         # Calcul du Max Drawdown
         equity_series = pd.Series(self.equity_curve)
-        rolling_max = equity_series.expanding().max()
-        drawdown = (equity_series - rolling_max) / rolling_max * 100
+        sommet = equity_series.expanding().max()
+        drawdown = (equity_series - sommet) / sommet * 100
         max_drawdown = abs(drawdown.min())
         
         # Calcul du Profit Factor
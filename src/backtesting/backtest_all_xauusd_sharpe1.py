@@ -8,7 +8,9 @@ warnings.filterwarnings('ignore')
 
 # Ajout du chemin pour importer les stratégies
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'strategies'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from strategie_xauusd_sharpe1_simple import strategie_xauusd_sharpe1_simple, calculate_metrics
+from donnees import charger_ohlcv
 
 def test_all_timeframes(symbol="XAUUSD"):
     """Teste la stratégie sur tous les timeframes disponibles"""
@@ -31,8 +33,7 @@ def test_all_timeframes(symbol="XAUUSD"):
         
         try:
             # Chargement des données
-            df = pd.read_csv(csv_path)
-            df['Date'] = pd.to_datetime(df['Date'])
+            df = charger_ohlcv(symbol, timeframe)
             
             print(f"[green]Données chargées: {len(df)} bougies[/green]")
             print(f"Période: {df['Date'].min()} à {df['Date'].max()}")
@@ -132,8 +133,7 @@ def test_all_symbols(timeframe="D1"):
         
         try:
             # Chargement des données
-            df = pd.read_csv(csv_path)
-            df['Date'] = pd.to_datetime(df['Date'])
+            df = charger_ohlcv(symbol, timeframe)
             
             print(f"[green]Données chargées: {len(df)} bougies[/green]")
             print(f"Période: {df['Date'].min()} à {df['Date'].max()}")
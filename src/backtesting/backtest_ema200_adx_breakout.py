@@ -1,8 +1,13 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from rich import print
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_ema, compute_atr, compute_adx, rolling_max, rolling_min, shift
+from moteur import TradeLog, dataframe_trades
+
 
 # === Paramètres de la stratégie ===
 PERIODE_EMA = 50  # plus court
@@ -17,29 +22,6 @@ TIMEFRAMES = ['M15', 'M30', 'H1', 'H4', 'D1']
 
 SUP_RES_WINDOW = 20  # fenêtre pour support/résistance
 
-# === Fonctions indicateurs ===
-def compute_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
-
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
 FIB_EXTENSIONS = [1.618, 2.618]
 
 def calc_fib_extensions(entry, swing_high, swing_low, direction):
@@ -60,17 +42,17 @@ def backtest_breakout(df):
     df['EMA'] = compute_ema(df['Close'], PERIODE_EMA)
     df['ATR'] = compute_atr(df, PERIODE_ATR)
     df['ADX'] = compute_adx(df, PERIODE_ADX)
-    df['High_Break'] = df['High'].rolling(window=PERIODE_BREAKOUT).max()
-    df['Low_Break'] = df['Low'].rolling(window=PERIODE_BREAKOUT).min()
+    df['High_Break'] = rolling_max(df['High'], PERIODE_BREAKOUT)
+    df['Low_Break'] = rolling_min(df['Low'], PERIODE_BREAKOUT)
     # Support/résistance
-    df['Resistance'] = df['High'].shift(1).rolling(window=SUP_RES_WINDOW).max()
-    df['Support'] = df['Low'].shift(1).rolling(window=SUP_RES_WINDOW).min()
+    df['Resistance'] = rolling_max(shift(df['High']), SUP_RES_WINDOW)
+    df['Support'] = rolling_min(shift(df['Low']), SUP_RES_WINDOW)
     df = df.dropna().reset_index(drop=True)
 
     position = 0  # 1=long, -1=short, 0=flat
     entry_price = 0
     stop_loss = 0
-    trades = []
+    trades = TradeLog()
     # Debug : compteurs de conditions
     count_long_cond = 0
     count_short_cond = 0
@@ -224,7 +206,7 @@ def backtest_breakout(df):
 def rapport_detaille(trades, nom_fichier):
     if not trades:
         return f"## {nom_fichier}\nAucun trade détecté.\n"
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     perf = (np.prod([1 + pnl for pnl in df_trades['PnL']]) - 1) * 100
     n_trades = len(df_trades)
     n_gagnants = (df_trades['PnL'] > 0).sum()
@@ -1,8 +1,13 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from rich import print
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_ema, compute_atr, compute_adx, rolling_max, rolling_min, shift
+from moteur import TradeLog, dataframe_trades
+
 # === Paramètres optimisés pour XAUUSD et US30.cash ===
 PERIODE_EMA = 50
 PERIODE_ADX = 14
@@ -22,29 +27,6 @@ TIMEFRAMES = ['M15', 'M30', 'H1', 'H4', 'D1']
 
 SUP_RES_WINDOW = 20
 
-# === Fonctions indicateurs ===
-def compute_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
-
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
 def compute_volume_atr(df, window):
     """Calcule le volume en termes d'ATR pour filtrer les signaux faibles"""
     atr = compute_atr(df, window)
@@ -73,10 +55,10 @@ def backtest_breakout_optimized(df):
     df['ATR'] = compute_atr(df, PERIODE_ATR)
     df['ADX'] = compute_adx(df, PERIODE_ADX)
     df['Volume_ATR'] = compute_volume_atr(df, PERIODE_ATR)
-    df['High_Break'] = df['High'].rolling(window=PERIODE_BREAKOUT).max()
-    df['Low_Break'] = df['Low'].rolling(window=PERIODE_BREAKOUT).min()
-    df['Resistance'] = df['High'].shift(1).rolling(window=SUP_RES_WINDOW).max()
-    df['Support'] = df['Low'].shift(1).rolling(window=SUP_RES_WINDOW).min()
+    df['High_Break'] = rolling_max(df['High'], PERIODE_BREAKOUT)
+    df['Low_Break'] = rolling_min(df['Low'], PERIODE_BREAKOUT)
+    df['Resistance'] = rolling_max(shift(df['High']), SUP_RES_WINDOW)
+    df['Support'] = rolling_min(shift(df['Low']), SUP_RES_WINDOW)
     df = df.dropna().reset_index(drop=True)
 
     position = 0
@@ -84,7 +66,7 @@ def backtest_breakout_optimized(df):
     stop_loss = 0
     profit_target = 0
     trailing_stop = 0
-    trades = []
+    trades = TradeLog()
 
     for i in range(1, len(df)):
         # Conditions de base
@@ -301,7 +283,7 @@ def rapport_detaille(trades, nom_fichier):
         print(f"Aucun trade pour {nom_fichier}")
         return
 
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     total_pnl = df_trades['PnL'].sum()
     performance = (1 + total_pnl) ** (252 / len(trades)) - 1 if len(trades) > 0 else 0
     
@@ -356,7 +338,7 @@ def main():
                     f.write(f"## {symbol}_{timeframe}_mt5.csv\n")
                     
                     if trades:
-                        df_trades = pd.DataFrame(trades)
+                        df_trades = dataframe_trades(trades)
                         total_pnl = df_trades['PnL'].sum()
                         performance = (1 + total_pnl) ** (252 / len(trades)) - 1
                         returns = df_trades['PnL']
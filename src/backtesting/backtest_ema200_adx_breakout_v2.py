@@ -1,8 +1,13 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from rich import print
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_ema, compute_atr, compute_adx, compute_rsi, rolling_max, rolling_min, rolling_mean, shift
+from moteur import TradeLog, dataframe_trades
+
 # === Paramètres V2 - Plus équilibrés ===
 PERIODE_EMA = 50
 PERIODE_ADX = 14
@@ -48,41 +53,9 @@ TIMEFRAMES = ['M15', 'M30', 'H1', 'H4', 'D1']
 
 SUP_RES_WINDOW = 20
 
-# === Fonctions indicateurs ===
-def compute_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
-
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
-def compute_rsi(df, window=14):
-    """Ajout du RSI pour confirmation supplémentaire"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
 def compute_volume_filter(df, window=20):
     """Filtre de volume basé sur la moyenne mobile"""
-    volume_ma = df['High'].rolling(window=window).mean()
+    volume_ma = rolling_mean(df['High'], window)
     current_volume = df['High'] - df['Low']
     return current_volume > volume_ma * 0.8
 
@@ -121,10 +94,10 @@ def backtest_breakout_v2(df, symbol):
     profit_target = settings['PROFIT_TARGET']
     use_trend_filter = settings['USE_TREND_FILTER']
     
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
-    df['Resistance'] = df['High'].shift(1).rolling(window=SUP_RES_WINDOW).max()
-    df['Support'] = df['Low'].shift(1).rolling(window=SUP_RES_WINDOW).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
+    df['Resistance'] = rolling_max(shift(df['High']), SUP_RES_WINDOW)
+    df['Support'] = rolling_min(shift(df['Low']), SUP_RES_WINDOW)
     df = df.dropna().reset_index(drop=True)
 
     position = 0
@@ -132,7 +105,7 @@ def backtest_breakout_v2(df, symbol):
     stop_loss = 0
     profit_target_price = 0
     trailing_stop = 0
-    trades = []
+    trades = TradeLog()
 
     for i in range(1, len(df)):
         # Conditions de base
@@ -359,7 +332,7 @@ def rapport_detaille(trades, nom_fichier):
         print(f"Aucun trade pour {nom_fichier}")
         return
 
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     total_pnl = df_trades['PnL'].sum()
     performance = (1 + total_pnl) ** (252 / len(trades)) - 1 if len(trades) > 0 else 0
     
@@ -414,7 +387,7 @@ def main():
                     f.write(f"## {symbol}_{timeframe}_mt5.csv\n")
                     
                     if trades:
-                        df_trades = pd.DataFrame(trades)
+                        df_trades = dataframe_trades(trades)
                         total_pnl = df_trades['PnL'].sum()
                         performance = (1 + total_pnl) ** (252 / len(trades)) - 1
                         returns = df_trades['PnL']
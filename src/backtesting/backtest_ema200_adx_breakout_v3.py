@@ -1,8 +1,14 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 from rich import print
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_ema, compute_atr, compute_adx, compute_rsi, rolling_max, rolling_min, shift
+from moteur import LONG, OPPOSE_INVERSION, simuler_positions, croisement_haussier, croisement_baissier
+from moteur import TradeLog, dataframe_trades, dates_ns
+
 # === Paramètres V3 - Plus équilibrés ===
 PERIODE_EMA = 50
 PERIODE_ADX = 14
@@ -50,51 +56,28 @@ TIMEFRAMES = ['M15', 'M30', 'H1', 'H4', 'D1']
 
 SUP_RES_WINDOW = 20
 
-# === Fonctions indicateurs ===
-def compute_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
-
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
-def compute_rsi(df, window=14):
-    """RSI simplifié"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
 FIB_EXTENSIONS = [1.618, 2.618]
 
+# Journal de trades du backtest V3 (BOS : code 0 / 1 lu False / True)
+COLONNES_V3 = {
+    'Type': 'sens',
+    'Entry': 'reel',
+    'Exit': 'reel',
+    'PnL': 'reel',
+    'EntryDate': 'date',
+    'ExitDate': 'date',
+    'Support': 'reel',
+    'Resistance': 'reel',
+    'BOS': 'code',
+    **{f'Fib_{ext}': 'reel' for ext in FIB_EXTENSIONS},
+}
+
 def calc_fib_extensions(entry, swing_high, swing_low, direction):
-    fibs = {}
-    if direction == 'Long':
-        range_ = swing_high - swing_low
-        for ext in FIB_EXTENSIONS:
-            fibs[f'Fib_{ext}'] = swing_high + ext * range_
-    else:
-        range_ = swing_high - swing_low
-        for ext in FIB_EXTENSIONS:
-            fibs[f'Fib_{ext}'] = swing_low - ext * range_
-    return fibs
+    """Extensions de Fibonacci du swing (scalaires, ou tableaux avec une direction par trade)"""
+    long = np.asarray(direction) == 'Long'
+    range_ = swing_high - swing_low
+    return {f'Fib_{ext}': np.where(long, swing_high + ext * range_, swing_low - ext * range_)
+            for ext in FIB_EXTENSIONS}
 
 # === Backtest V3 - Conditions simplifiées ===
 def backtest_breakout_v3(df, symbol):
@@ -116,267 +99,81 @@ def backtest_breakout_v3(df, symbol):
     profit_target = settings['PROFIT_TARGET']
     use_trend_filter = settings['USE_TREND_FILTER']
     
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
-    df['Resistance'] = df['High'].shift(1).rolling(window=SUP_RES_WINDOW).max()
-    df['Support'] = df['Low'].shift(1).rolling(window=SUP_RES_WINDOW).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
+    df['Resistance'] = rolling_max(shift(df['High']), SUP_RES_WINDOW)
+    df['Support'] = rolling_min(shift(df['Low']), SUP_RES_WINDOW)
     df = df.dropna().reset_index(drop=True)
 
-    position = 0
-    entry_price = 0
-    stop_loss = 0
-    profit_target_price = 0
-    trailing_stop = 0
-    trades = []
+    close = df['Close'].to_numpy()
+    high = df['High'].to_numpy()
+    low = df['Low'].to_numpy()
+    high_break = df['High_Break'].to_numpy()
+    low_break = df['Low_Break'].to_numpy()
 
-    # Compteurs de debug
-    count_ema_long = 0
-    count_ema_short = 0
-    count_breakout_long = 0
-    count_breakout_short = 0
-    count_adx = 0
-    count_trend_long = 0
-    count_trend_short = 0
-    count_rsi_long = 0
-    count_rsi_short = 0
+    # Conditions de base
+    ema_long = close > df['EMA'].to_numpy()
+    ema_short = close < df['EMA'].to_numpy()
 
-    for i in range(1, len(df)):
-        # Conditions de base
-        ema_long = df.loc[i, 'Close'] > df.loc[i, 'EMA']
-        ema_short = df.loc[i, 'Close'] < df.loc[i, 'EMA']
-        
-        if ema_long:
-            count_ema_long += 1
-        if ema_short:
-            count_ema_short += 1
-        
-        # Filtre de tendance conditionnel
-        if use_trend_filter:
-            trend_long = df.loc[i, 'Close'] > df.loc[i, 'EMA200']
-            trend_short = df.loc[i, 'Close'] < df.loc[i, 'EMA200']
-            if trend_long:
-                count_trend_long += 1
-            if trend_short:
-                count_trend_short += 1
-        else:
-            trend_long = True
-            trend_short = True
-        
-        breakout_long = (df.loc[i-1, 'High'] < df.loc[i-1, 'High_Break'] and 
-                        df.loc[i, 'High'] >= df.loc[i, 'High_Break'])
-        breakout_short = (df.loc[i-1, 'Low'] > df.loc[i-1, 'Low_Break'] and 
-                         df.loc[i, 'Low'] <= df.loc[i, 'Low_Break'])
-        
-        if breakout_long:
-            count_breakout_long += 1
-        if breakout_short:
-            count_breakout_short += 1
-        
-        adx_ok = df.loc[i, 'ADX'] > adx_threshold
-        if adx_ok:
-            count_adx += 1
-        
-        # Filtres RSI plus permissifs
-        rsi_ok_long = df.loc[i, 'RSI'] < 75  # Plus permissif (70 -> 75)
-        rsi_ok_short = df.loc[i, 'RSI'] > 25  # Plus permissif (30 -> 25)
-        
-        if rsi_ok_long:
-            count_rsi_long += 1
-        if rsi_ok_short:
-            count_rsi_short += 1
-        
-        # Conditions V3 - Plus simples
-        long_cond = (ema_long and trend_long and breakout_long and 
-                    adx_ok and rsi_ok_long)
-        short_cond = (ema_short and trend_short and breakout_short and 
-                     adx_ok and rsi_ok_short)
+    # Filtre de tendance conditionnel
+    if use_trend_filter:
+        trend_long = close > df['EMA200'].to_numpy()
+        trend_short = close < df['EMA200'].to_numpy()
+    else:
+        trend_long = np.ones(len(df), dtype=bool)
+        trend_short = np.ones(len(df), dtype=bool)
 
-        if position == 0:
-            if long_cond:
-                position = 1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price - risk_atr * df.loc[i, 'ATR']
-                profit_target_price = entry_price + profit_target * df.loc[i, 'ATR']
-                trailing_stop = entry_price - TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Long')
-                resistance = df.loc[i, 'Resistance']
-                support = df.loc[i, 'Support']
-                bos = df.loc[i, 'High'] > df.loc[i-1, 'High_Break']
-                
-            elif short_cond:
-                position = -1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price + risk_atr * df.loc[i, 'ATR']
-                profit_target_price = entry_price - profit_target * df.loc[i, 'ATR']
-                trailing_stop = entry_price + TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Short')
-                resistance = df.loc[i, 'Resistance']
-                support = df.loc[i, 'Support']
-                bos = df.loc[i, 'Low'] < df.loc[i-1, 'Low_Break']
+    breakout_long = croisement_haussier(high, high_break)
+    breakout_short = croisement_baissier(low, low_break)
+    adx_ok = df['ADX'].to_numpy() > adx_threshold
+
+    # Filtres RSI plus permissifs
+    rsi_ok_long = df['RSI'].to_numpy() < 75  # Plus permissif (70 -> 75)
+    rsi_ok_short = df['RSI'].to_numpy() > 25  # Plus permissif (30 -> 25)
 
-        elif position == 1:  # Position Long
-            # Mise à jour du trailing stop
-            new_trailing_stop = df.loc[i, 'Close'] - TRAILING_STOP * df.loc[i, 'ATR']
-            if new_trailing_stop > trailing_stop:
-                trailing_stop = new_trailing_stop
-            
-            # Sortie par stop loss
-            if df.loc[i, 'Low'] <= stop_loss:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': stop_loss,
-                    'PnL': (stop_loss - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 0
-            # Sortie par profit target
-            elif df.loc[i, 'High'] >= profit_target_price:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': profit_target_price,
-                    'PnL': (profit_target_price - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 0
-            # Sortie par trailing stop
-            elif df.loc[i, 'Low'] <= trailing_stop:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': trailing_stop,
-                    'PnL': (trailing_stop - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 0
-            # Inversion de position
-            elif short_cond:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': df.loc[i, 'Close'],
-                    'PnL': (df.loc[i, 'Close'] - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = -1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price + risk_atr * df.loc[i, 'ATR']
-                profit_target_price = entry_price - profit_target * df.loc[i, 'ATR']
-                trailing_stop = entry_price + TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Short')
-                resistance = df.loc[i, 'Resistance']
-                support = df.loc[i, 'Support']
-                bos = df.loc[i, 'Low'] < df.loc[i-1, 'Low_Break']
+    # Conditions V3 - Plus simples
+    long_cond = ema_long & trend_long & breakout_long & adx_ok & rsi_ok_long
+    short_cond = ema_short & trend_short & breakout_short & adx_ok & rsi_ok_short
 
-        elif position == -1:  # Position Short
-            # Mise à jour du trailing stop
-            new_trailing_stop = df.loc[i, 'Close'] + TRAILING_STOP * df.loc[i, 'ATR']
-            if new_trailing_stop < trailing_stop:
-                trailing_stop = new_trailing_stop
-            
-            # Sortie par stop loss
-            if df.loc[i, 'High'] >= stop_loss:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': stop_loss,
-                    'PnL': (entry_price - stop_loss) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 0
-            # Sortie par profit target
-            elif df.loc[i, 'Low'] <= profit_target_price:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': profit_target_price,
-                    'PnL': (entry_price - profit_target_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 0
-            # Sortie par trailing stop
-            elif df.loc[i, 'High'] >= trailing_stop:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': trailing_stop,
-                    'PnL': (entry_price - trailing_stop) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 0
-            # Inversion de position
-            elif long_cond:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': df.loc[i, 'Close'],
-                    'PnL': (entry_price - df.loc[i, 'Close']) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    'Support': support,
-                    'Resistance': resistance,
-                    'BOS': bos,
-                    **fibs
-                })
-                position = 1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price - risk_atr * df.loc[i, 'ATR']
-                profit_target_price = entry_price + profit_target * df.loc[i, 'ATR']
-                trailing_stop = entry_price - TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Long')
-                resistance = df.loc[i, 'Resistance']
-                support = df.loc[i, 'Support']
-                bos = df.loc[i, 'High'] > df.loc[i-1, 'High_Break']
+    # Compteurs de debug (barres 1..n-1 comme la boucle d'origine)
+    count_ema_long = int(ema_long[1:].sum())
+    count_ema_short = int(ema_short[1:].sum())
+    count_breakout_long = int(breakout_long.sum())
+    count_breakout_short = int(breakout_short.sum())
+    count_adx = int(adx_ok[1:].sum())
+    count_trend_long = int(trend_long[1:].sum()) if use_trend_filter else 0
+    count_trend_short = int(trend_short[1:].sum()) if use_trend_filter else 0
+    count_rsi_long = int(rsi_ok_long[1:].sum())
+    count_rsi_short = int(rsi_ok_short[1:].sum())
+
+    # Stop fixe + trailing stop séparé testés sur les extrêmes, inversion sur signal opposé
+    journal = simuler_positions(
+        close, high, low, df['ATR'], long_cond, short_cond,
+        stop_atr=risk_atr, cible_atr=profit_target, trailing_atr=TRAILING_STOP,
+        signal_oppose=OPPOSE_INVERSION
+    )
+
+    if 'Date' in df.columns:
+        dates, type_date = dates_ns(df['Date']), 'date'
+    else:
+        dates, type_date = np.arange(len(df)), 'entier'
+    entree = journal['entree_idx']
+    long = journal['sens'] == LONG
+    bos = np.where(long, high[entree] > high_break[entree - 1], low[entree] < low_break[entree - 1])
+    fibs = calc_fib_extensions(journal['prix_entree'], high_break[entree - 1], low_break[entree - 1],
+                               np.where(long, 'Long', 'Short'))
+    trades = TradeLog.depuis_colonnes({
+        'Type': journal['sens'],
+        'Entry': journal['prix_entree'],
+        'Exit': journal['prix_sortie'],
+        'PnL': journal['rendement'],
+        'EntryDate': dates[entree],
+        'ExitDate': dates[journal['sortie_idx']],
+        'Support': df['Support'].to_numpy()[entree],
+        'Resistance': df['Resistance'].to_numpy()[entree],
+        'BOS': bos,
+        **fibs
+    }, dict(COLONNES_V3, EntryDate=type_date, ExitDate=type_date), {'BOS': {0: False, 1: True}})
 
     # Debug info
     print(f"\n🔍 Debug {symbol}:")
@@ -393,7 +190,7 @@ def rapport_detaille(trades, nom_fichier):
         print(f"Aucun trade pour {nom_fichier}")
         return
 
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     total_pnl = df_trades['PnL'].sum()
     performance = (1 + total_pnl) ** (252 / len(trades)) - 1 if len(trades) > 0 else 0
     
@@ -448,7 +245,7 @@ def main():
                     f.write(f"## {symbol}_{timeframe}_mt5.csv\n")
                     
                     if trades:
-                        df_trades = pd.DataFrame(trades)
+                        df_trades = dataframe_trades(trades)
                         total_pnl = df_trades['PnL'].sum()
                         performance = (1 + total_pnl) ** (252 / len(trades)) - 1
                         returns = df_trades['PnL']
@@ -1,6 +1,11 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_ema, compute_rsi
+
 # Paramètres de la stratégie
 ema_fast_len = 9
 ema_slow_len = 21
@@ -17,16 +22,6 @@ assets = [
     ("EURUSD", ["M15", "H1"])
 ]
 
-def compute_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
-
-def compute_rsi(series, window):
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
-
 def backtest(df):
     df['ema_fast'] = compute_ema(df['Close'], ema_fast_len)
     df['ema_slow'] = compute_ema(df['Close'], ema_slow_len)
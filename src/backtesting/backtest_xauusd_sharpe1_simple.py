@@ -8,7 +8,10 @@ warnings.filterwarnings('ignore')
 
 # Ajout du chemin pour importer les stratégies
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'strategies'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from strategie_xauusd_sharpe1_simple import strategie_xauusd_sharpe1_simple, calculate_metrics
+from donnees import charger_ohlcv
+from moteur import dataframe_trades
 
 def load_data_from_csv(symbol, timeframe):
     """Charge les données depuis un fichier CSV"""
@@ -19,8 +22,7 @@ def load_data_from_csv(symbol, timeframe):
         return None
     
     try:
-        df = pd.read_csv(csv_path)
-        df['Date'] = pd.to_datetime(df['Date'])
+        df = charger_ohlcv(symbol, timeframe)
         
         # Vérification des colonnes requises
         required_columns = ['Date', 'Open', 'High', 'Low', 'Close', 'Volume']
@@ -158,7 +160,7 @@ def save_results(results, symbol, timeframe):
     
     # Sauvegarde des trades
     if results['trades']:
-        trades_df = pd.DataFrame(results['trades'])
+        trades_df = dataframe_trades(results['trades'])
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         trades_file = f"results/backtests/{symbol}_{timeframe}_trades_{timestamp}.csv"
         trades_df.to_csv(trades_file, index=False)
@@ -199,15 +201,10 @@ def save_results(results, symbol, timeframe):
     
     print(f"[green]Rapport sauvegardé: {report_file}[/green]")
 
-def main():
-    """Fonction principale"""
+def main(symbol="XAUUSD", timeframe="D1", data_source="csv"):
+    """Fonction principale (data_source : "csv" ou "mt5")"""
     print("[bold blue]🤖 Backtesting XAUUSD Sharpe 1 Simple[/bold blue]")
     
-    # Configuration
-    symbol = "XAUUSD"
-    timeframe = "D1"
-    data_source = "csv"  # ou "mt5"
-    
     # Exécution du backtest
     results = run_backtest(symbol, timeframe, data_source)
     
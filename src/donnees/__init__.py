@@ -0,0 +1,36 @@
+"""
+Accès aux données de marché
+- stockage : MarketDataStore, cache binaire mappable des CSV OHLCV de data/raw
+- ticks : agrégation d'un flux de ticks en barres M5 ... D1 simultanées
+  (clôtures émises aux stratégies) et ticks synthétiques tirés des barres M5
+- reechantillonnage : timeframes longs construits depuis la série la plus
+  fine d'un symbole (réduction par segments), historique aligné
+- alignement : indicateurs d'un timeframe long rattachés aux barres fines
+  (dernière barre longue close, searchsorted puis gather), sans lookahead
+"""
+
+from .stockage import (
+    COLONNES_OHLCV,
+    DOSSIER_RAW,
+    MarketDataStore,
+    store_defaut,
+    charger_ohlcv,
+)
+from .ticks import (
+    DUREES_TIMEFRAMES,
+    TIMEFRAMES_AGREGES,
+    AgregateurTicks,
+    duree_ns,
+    horodatages_ns,
+    ticks_synthetiques,
+)
+from .reechantillonnage import (
+    StoreReechantillonne,
+    reechantillonner,
+    segments_periodes,
+)
+from .alignement import (
+    index_dernier_cloture,
+    rassembler,
+    aligner,
+)
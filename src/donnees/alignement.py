@@ -0,0 +1,50 @@
+"""
+Alignement multi-timeframe sans biais de lookahead
+Une décision prise à la clôture d'une barre fine (M15) ne peut utiliser que
+les barres longues (H4, D1) déjà clôturées à cet instant. Une fusion sur les
+dates d'ouverture (merge / merge_asof) associe au contraire la barre longue
+encore en cours, dont le high, le low et le close sont futurs.
+
+- une barre est datée de son ouverture et se clôt une durée plus tard
+  (donnees.DUREES_TIMEFRAMES) : la barre longue visible depuis une barre
+  fine est la dernière dont la clôture précède ou égale celle de la barre
+  fine, trouvée par un seul `np.searchsorted` sur toute la série ;
+- l'index est calculé une fois ; chaque indicateur long s'attache ensuite
+  aux barres fines par un `np.take` (NaN tant qu'aucune barre longue n'est
+  close), sans fusion de DataFrames ni boucle Python.
+"""
+
+import numpy as np
+
+from .ticks import duree_ns, horodatages_ns
+
+
+def index_dernier_cloture(dates_fines, timeframe_fin, dates_longues, timeframe_long):
+    """
+    Pour chaque barre fine, position de la dernière barre longue close à sa
+    clôture (-1 : aucune). Dates d'ouverture triées, toute unité datetime64.
+    """
+    clotures_fines = horodatages_ns(dates_fines) + duree_ns(timeframe_fin)
+    clotures_longues = horodatages_ns(dates_longues) + duree_ns(timeframe_long)
+    return np.searchsorted(clotures_longues, clotures_fines, side='right') - 1
+
+
+def rassembler(valeurs, index):
+    """Valeurs longues vues depuis les barres fines (NaN pour l'index -1) ; 2-D : une ligne par série"""
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    # La colonne NaN ajoutée en fin de tableau est celle que désigne l'index -1
+    etendues = np.concatenate([valeurs, np.full(valeurs.shape[:-1] + (1,), np.nan)], axis=-1)
+    return np.take(etendues, index, axis=-1)
+
+
+def aligner(dates_fines, timeframe_fin, dates_longues, timeframe_long, valeurs):
+    """
+    {nom: valeurs longues} rattachées aux barres fines (un index, puis un
+    seul gather pour toutes les séries)
+    """
+    index = index_dernier_cloture(dates_fines, timeframe_fin, dates_longues, timeframe_long)
+    noms = list(valeurs)
+    if not noms:
+        return {}
+    matrice = rassembler(np.vstack([np.asarray(valeurs[nom], dtype=np.float64) for nom in noms]), index)
+    return dict(zip(noms, matrice))
@@ -0,0 +1,125 @@
+"""
+Rééchantillonnage des séries OHLCV
+Les timeframes longs sont reconstruits depuis la série la plus fine d'un
+symbole (M5) au lieu d'être lus dans leurs propres CSV : tous les timeframes
+partagent alors le même historique, aligné barre à barre, et un seul fichier
+est chargé par symbole.
+
+- réduction par segments vectorisée : une barre longue regroupe les barres
+  fines de sa période (début multiple de sa durée, comme
+  donnees.AgregateurTicks) ; open = premier, high = max, low = min,
+  close = dernier, volume = somme (`np.*.reduceat`) ;
+- seules les périodes qui contiennent au moins une barre fine existent
+  (week-ends et fermetures sans barre) ;
+- `StoreReechantillonne` s'utilise comme un MarketDataStore (colonnes,
+  dataframe, disponibles) ; les séries calculées sont gardées par (symbole,
+  timeframe) et recalculées si le CSV source change ;
+- l'historique M5 de data/raw est bien plus court que celui des CSV H4 / D1 :
+  rééchantillonner aligne les timeframes au prix de l'historique long.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .stockage import COLONNES_OHLCV, store_defaut
+from .ticks import DUREES_TIMEFRAMES, duree_ns, horodatages_ns
+
+
+def segments_periodes(dates, timeframe):
+    """(début de chaque segment de barres fines, début ns de sa période) pour des dates triées"""
+    horodatages = horodatages_ns(dates)
+    periodes = horodatages - horodatages % duree_ns(timeframe)
+    debuts = np.flatnonzero(np.r_[True, periodes[1:] != periodes[:-1]]) if len(periodes) else np.zeros(0, np.int64)
+    return debuts, periodes[debuts]
+
+
+def reechantillonner(colonnes, timeframe):
+    """
+    Colonnes ('Timestamp', 'Date', 'Open', 'High', 'Low', 'Close', 'Volume')
+    des barres `timeframe` construites depuis des colonnes plus fines (mêmes
+    clés, DataFrame accepté) ; les dates gardent l'unité de la source
+    """
+    dates = np.asarray(colonnes['Date'])
+    debuts, periodes = segments_periodes(dates, timeframe)
+    fins = np.r_[debuts[1:], len(dates)] - 1
+    sortie = {}
+    dates_sortie = periodes.astype('datetime64[ns]').astype(dates.dtype)
+    sortie['Timestamp'] = dates_sortie.view(np.int64)
+    sortie['Date'] = dates_sortie
+    if len(debuts):
+        sortie['Open'] = np.asarray(colonnes['Open'], dtype=np.float64)[debuts]
+        sortie['High'] = np.maximum.reduceat(np.asarray(colonnes['High'], dtype=np.float64), debuts)
+        sortie['Low'] = np.minimum.reduceat(np.asarray(colonnes['Low'], dtype=np.float64), debuts)
+        sortie['Close'] = np.asarray(colonnes['Close'], dtype=np.float64)[fins]
+        sortie['Volume'] = np.add.reduceat(np.asarray(colonnes['Volume'], dtype=np.float64), debuts)
+    else:
+        for nom in COLONNES_OHLCV:
+            sortie[nom] = np.zeros(0)
+    for valeurs in sortie.values():
+        valeurs.flags.writeable = False
+    return sortie
+
+
+class StoreReechantillonne:
+    """
+    Couche de rééchantillonnage sur un MarketDataStore : chaque timeframe
+    d'un symbole est construit depuis `source` (par défaut la série
+    disponible la plus fine dont la durée divise celle du timeframe)
+    """
+
+    def __init__(self, store=None, source=None):
+        self.store = store or store_defaut()
+        self.source_imposee = source
+        self._sources = {}
+        self._series = {}
+
+    def source(self, symbol, timeframe):
+        """Timeframe lu pour construire (symbol, timeframe)"""
+        if self.source_imposee is not None:
+            return self.source_imposee
+        if (symbol, timeframe) in self._sources:
+            return self._sources[(symbol, timeframe)]
+        cible = duree_ns(timeframe)
+        candidats = [tf for s, tf in self.store.disponibles()
+                     if s == symbol and tf in DUREES_TIMEFRAMES and cible % duree_ns(tf) == 0]
+        if not candidats:
+            raise FileNotFoundError(f"Aucune série source pour {symbol} {timeframe}")
+        self._sources[(symbol, timeframe)] = min(candidats, key=duree_ns)
+        return self._sources[(symbol, timeframe)]
+
+    def existe(self, symbol, timeframe):
+        try:
+            return self.store.existe(symbol, self.source(symbol, timeframe))
+        except (FileNotFoundError, ValueError):
+            return False
+
+    def disponibles(self):
+        """Couples (symbole, timeframe) constructibles depuis les séries sources"""
+        couples = []
+        for symbol in sorted({s for s, _ in self.store.disponibles()}):
+            couples.extend((symbol, tf) for tf in DUREES_TIMEFRAMES if self.existe(symbol, tf))
+        return couples
+
+    def colonnes(self, symbol, timeframe):
+        """Colonnes en lecture seule, comme MarketDataStore.colonnes"""
+        source = self.source(symbol, timeframe)
+        if duree_ns(source) > duree_ns(timeframe) or duree_ns(timeframe) % duree_ns(source):
+            raise ValueError(f"{timeframe} ne se construit pas depuis {source}")
+        colonnes_source = self.store.colonnes(symbol, source)
+        if source == timeframe:
+            return colonnes_source
+        cle = (symbol, timeframe)
+        serie = self._series.get(cle)
+        # Les colonnes du stockage changent d'identité quand le CSV source est rechargé
+        if serie is None or serie[0] is not colonnes_source:
+            serie = (colonnes_source, reechantillonner(colonnes_source, timeframe))
+            self._series[cle] = serie
+        return serie[1]
+
+    def dataframe(self, symbol, timeframe):
+        """DataFrame modifiable, comme MarketDataStore.dataframe"""
+        colonnes = self.colonnes(symbol, timeframe)
+        donnees = {'Date': colonnes['Date']}
+        for nom in COLONNES_OHLCV:
+            donnees[nom] = colonnes[nom]
+        return pd.DataFrame(donnees, copy=True)
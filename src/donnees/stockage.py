@@ -0,0 +1,179 @@
+"""
+Stockage des données de marché OHLCV
+Chaque CSV `{symbol}_{timeframe}_mt5.csv` est converti une seule fois en un
+cache binaire mappable en mémoire :
+- `{symbol}_{timeframe}_dates.npy` : horodatages int64 (epoch, unité d'origine)
+- `{symbol}_{timeframe}_ohlcv.npy` : matrice float64 (5 × barres), une ligne par colonne
+- `{symbol}_{timeframe}_meta.json` : signature du CSV source (mtime, taille)
+
+Le cache est reconstruit dès que la signature du CSV change. Les colonnes sont
+servies comme des vues NumPy en lecture seule sur le fichier mappé : pas de
+copie, et des workers parallèles partagent les mêmes pages mémoire.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+RACINE = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DOSSIER_RAW = os.path.join(RACINE, 'data', 'raw')
+
+COLONNES_OHLCV = ('Open', 'High', 'Low', 'Close', 'Volume')
+VERSION_CACHE = 1
+
+
+class MarketDataStore:
+    """Accès aux séries OHLCV par (symbole, timeframe) via un cache binaire"""
+
+    def __init__(self, dossier_raw=DOSSIER_RAW, dossier_cache=None, suffixe='_mt5.csv'):
+        self.dossier_raw = os.path.abspath(dossier_raw)
+        self.dossier_cache = os.path.abspath(dossier_cache or os.path.join(self.dossier_raw, '.cache'))
+        self.suffixe = suffixe
+        self._series = {}
+
+    def chemin_csv(self, symbol, timeframe):
+        """Chemin du CSV source"""
+        return os.path.join(self.dossier_raw, f"{symbol}_{timeframe}{self.suffixe}")
+
+    def existe(self, symbol, timeframe):
+        """Indique si le CSV source est présent"""
+        return os.path.exists(self.chemin_csv(symbol, timeframe))
+
+    def disponibles(self):
+        """Liste des couples (symbole, timeframe) présents dans le dossier source"""
+        couples = []
+        if not os.path.isdir(self.dossier_raw):
+            return couples
+        for nom in sorted(os.listdir(self.dossier_raw)):
+            if nom.endswith(self.suffixe):
+                base = nom[:-len(self.suffixe)]
+                symbol, _, timeframe = base.rpartition('_')
+                if symbol:
+                    couples.append((symbol, timeframe))
+        return couples
+
+    def colonnes(self, symbol, timeframe):
+        """
+        Colonnes en vues lecture seule (sans copie) :
+        'Timestamp' (int64), 'Date' (datetime64), 'Open', 'High', 'Low', 'Close', 'Volume' (float64)
+        """
+        return self._charger(symbol, timeframe)['colonnes']
+
+    def dataframe(self, symbol, timeframe):
+        """
+        DataFrame équivalent à `pd.read_csv(...)` suivi de `pd.to_datetime(df['Date'])`.
+        Les colonnes sont copiées depuis le cache : le DataFrame est modifiable.
+        """
+        serie = self._charger(symbol, timeframe)
+        colonnes = serie['colonnes']
+        donnees = {'Date': colonnes['Date']}
+        for nom in COLONNES_OHLCV:
+            donnees[nom] = colonnes[nom]
+        if serie['meta']['volume_entier']:
+            donnees['Volume'] = colonnes['Volume'].astype(np.int64)
+        return pd.DataFrame(donnees, copy=True)
+
+    def convertir(self, symbol, timeframe):
+        """(Re)construit le cache binaire d'une série depuis son CSV"""
+        chemin = self.chemin_csv(symbol, timeframe)
+        signature = self._signature(chemin)
+
+        df = pd.read_csv(chemin)
+        dates = pd.to_datetime(df['Date']).to_numpy()
+        unite = np.datetime_data(dates.dtype)[0]
+        ohlcv = np.ascontiguousarray(
+            np.vstack([df[nom].to_numpy(dtype=np.float64) for nom in COLONNES_OHLCV]))
+        meta = {
+            'version': VERSION_CACHE,
+            'source_mtime_ns': signature[0],
+            'source_taille': signature[1],
+            'lignes': len(df),
+            'unite_date': unite,
+            'volume_entier': bool(pd.api.types.is_integer_dtype(df['Volume'])),
+        }
+
+        # Écriture atomique (fichiers temporaires puis renommage), méta en dernier
+        os.makedirs(self.dossier_cache, exist_ok=True)
+        base = self._base_cache(symbol, timeframe)
+        temporaire = f".{os.getpid()}.tmp"
+        with open(base + '_dates.npy' + temporaire, 'wb') as f:
+            np.save(f, dates.view(np.int64), allow_pickle=False)
+        with open(base + '_ohlcv.npy' + temporaire, 'wb') as f:
+            np.save(f, ohlcv, allow_pickle=False)
+        with open(base + '_meta.json' + temporaire, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        for suffixe in ('_dates.npy', '_ohlcv.npy', '_meta.json'):
+            os.replace(base + suffixe + temporaire, base + suffixe)
+
+        self._series.pop((symbol, timeframe), None)
+        return meta
+
+    def _base_cache(self, symbol, timeframe):
+        return os.path.join(self.dossier_cache, f"{symbol}_{timeframe}")
+
+    @staticmethod
+    def _signature(chemin):
+        stat = os.stat(chemin)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _lire_meta(self, symbol, timeframe):
+        try:
+            with open(self._base_cache(symbol, timeframe) + '_meta.json', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _a_jour(meta, signature):
+        return (meta is not None and
+                meta.get('version') == VERSION_CACHE and
+                meta.get('source_mtime_ns') == signature[0] and
+                meta.get('source_taille') == signature[1])
+
+    def _charger(self, symbol, timeframe):
+        """Vues mémoire d'une série, reconstruites si le CSV a changé"""
+        chemin = self.chemin_csv(symbol, timeframe)
+        try:
+            signature = self._signature(chemin)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Fichier non trouvé: {chemin}")
+
+        serie = self._series.get((symbol, timeframe))
+        if serie is not None and serie['signature'] == signature:
+            return serie
+
+        meta = self._lire_meta(symbol, timeframe)
+        if not self._a_jour(meta, signature):
+            meta = self.convertir(symbol, timeframe)
+
+        base = self._base_cache(symbol, timeframe)
+        timestamps = np.load(base + '_dates.npy', mmap_mode='r')
+        ohlcv = np.load(base + '_ohlcv.npy', mmap_mode='r')
+        colonnes = {
+            'Timestamp': timestamps,
+            'Date': timestamps.view(f"datetime64[{meta['unite_date']}]"),
+        }
+        for k, nom in enumerate(COLONNES_OHLCV):
+            colonnes[nom] = ohlcv[k]
+
+        serie = {'signature': signature, 'meta': meta, 'colonnes': colonnes}
+        self._series[(symbol, timeframe)] = serie
+        return serie
+
+
+_store_defaut = None
+
+
+def store_defaut():
+    """Instance partagée sur data/raw (une par processus)"""
+    global _store_defaut
+    if _store_defaut is None:
+        _store_defaut = MarketDataStore()
+    return _store_defaut
+
+
+def charger_ohlcv(symbol, timeframe):
+    """Raccourci : DataFrame OHLCV de data/raw via le cache binaire"""
+    return store_defaut().dataframe(symbol, timeframe)
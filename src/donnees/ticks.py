@@ -0,0 +1,188 @@
+"""
+Agrégation de ticks en barres
+Un flux de ticks (horodatage, bid, ask, volume) alimente en même temps les
+barres ouvertes de plusieurs timeframes (M5 ... D1). Chaque clôture de barre
+est émise aux stratégies abonnées avec les arguments de `on_bar(date, open,
+high, low, close, volume)` (voir moteur.rejeu) :
+
+- horodatages en nanosecondes depuis l'epoch ; une barre commence à un
+  multiple de sa durée (H4 à 0h, 4h, 8h..., D1 à minuit), la date émise est
+  son ouverture, comme dans les CSV MT5 ;
+- coût O(1) par tick : seule la barre du plus petit timeframe est mise à
+  jour ; à sa clôture, elle est reportée dans les barres plus longues (leurs
+  durées en sont des multiples) ;
+- une barre est clôturée par le premier tick de la période suivante, ou par
+  `cloturer()` en fin de flux ;
+- `ticks_synthetiques` fabrique un flux de test depuis des barres M5 : quatre
+  ticks par barre (open, extrêmes, close) qui redonnent exactement les barres.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Timeframes agrégés et leur durée (secondes)
+DUREES_TIMEFRAMES = {
+    'M1': 60,
+    'M5': 300,
+    'M15': 900,
+    'M30': 1800,
+    'H1': 3600,
+    'H4': 14400,
+    'D1': 86400,
+}
+TIMEFRAMES_AGREGES = ('M5', 'M15', 'M30', 'H1', 'H4', 'D1')
+
+NS_PAR_SECONDE = 1_000_000_000
+
+
+def duree_ns(timeframe):
+    """Durée d'une barre du timeframe en nanosecondes"""
+    try:
+        return DUREES_TIMEFRAMES[timeframe] * NS_PAR_SECONDE
+    except KeyError:
+        raise ValueError(f"Timeframe inconnu: {timeframe}")
+
+
+def horodatages_ns(dates):
+    """Dates (datetime64 de toute unité, Series ou liste) en int64 nanosecondes"""
+    return np.asarray(dates, dtype='datetime64[ns]').view(np.int64)
+
+
+class AgregateurTicks:
+    """
+    Barres ouvertes de `timeframes` construites tick par tick. `prix` :
+    'bid' (comme les barres MT5) ou 'mid'. Les clôtures sont renvoyées par
+    `ajouter` / `cloturer` sous forme de (timeframe, barre) et passées aux
+    fonctions abonnées par `abonner` ; leurs décisions non nulles sont
+    gardées dans `decisions` (timeframe, date, décision).
+    """
+
+    def __init__(self, timeframes=TIMEFRAMES_AGREGES, prix='bid'):
+        if prix not in ('bid', 'mid'):
+            raise ValueError(f"Prix inconnu: {prix}")
+        self.timeframes = sorted(timeframes, key=duree_ns)
+        self.durees = [duree_ns(tf) for tf in self.timeframes]
+        if any(duree % self.durees[0] for duree in self.durees):
+            raise ValueError("Les durées des timeframes doivent être des multiples de la plus courte")
+        self.mid = prix == 'mid'
+        # Barre ouverte par timeframe : [début ns, open, high, low, close, volume] ou None
+        self.ouvertes = [None] * len(self.timeframes)
+        self.abonnes = {tf: [] for tf in self.timeframes}
+        self.decisions = []
+        self.ticks = 0
+
+    def abonner(self, timeframe, rappel):
+        """`rappel(date, open, high, low, close, volume)` à chaque clôture (ex: strategie.on_bar)"""
+        if timeframe not in self.abonnes:
+            raise ValueError(f"Timeframe non agrégé: {timeframe}")
+        self.abonnes[timeframe].append(rappel)
+
+    def ajouter(self, horodatage, bid, ask=None, volume=0.0):
+        """Intègre un tick ; renvoie les barres clôturées par ce tick (du plus court au plus long)"""
+        self.ticks += 1
+        prix = (bid + ask) * 0.5 if self.mid and ask is not None else bid
+        courte = self.ouvertes[0]
+        debut = horodatage - horodatage % self.durees[0]
+        if courte is not None and courte[0] == debut:
+            if prix > courte[2]:
+                courte[2] = prix
+            elif prix < courte[3]:
+                courte[3] = prix
+            courte[4] = prix
+            courte[5] += volume
+            return []
+        clotures = self._reporter(horodatage) if courte is not None else []
+        self.ouvertes[0] = [debut, prix, prix, prix, prix, volume]
+        return clotures
+
+    def _reporter(self, horodatage):
+        """Clôt la barre courte et la reporte dans les plus longues (clôturées si la période change)"""
+        courte = self.ouvertes[0]
+        clotures = [self._emettre(0, courte)]
+        for k in range(1, len(self.timeframes)):
+            ouverte = self.ouvertes[k]
+            if ouverte is not None and courte[0] - courte[0] % self.durees[k] != ouverte[0]:
+                # La barre courte appartient déjà à la période suivante
+                clotures.append(self._emettre(k, ouverte))
+                ouverte = None
+            if ouverte is None:
+                self.ouvertes[k] = [courte[0] - courte[0] % self.durees[k]] + courte[1:]
+            else:
+                ouverte[2] = max(ouverte[2], courte[2])
+                ouverte[3] = min(ouverte[3], courte[3])
+                ouverte[4] = courte[4]
+                ouverte[5] += courte[5]
+            if horodatage is not None and horodatage - horodatage % self.durees[k] != self.ouvertes[k][0]:
+                clotures.append(self._emettre(k, self.ouvertes[k]))
+                self.ouvertes[k] = None
+        return clotures
+
+    def _emettre(self, k, ouverte):
+        timeframe = self.timeframes[k]
+        barre = (pd.Timestamp(ouverte[0]),) + tuple(ouverte[1:])
+        for rappel in self.abonnes[timeframe]:
+            decision = rappel(*barre)
+            if decision is not None:
+                self.decisions.append((timeframe, barre[0], decision))
+        return timeframe, barre
+
+    def cloturer(self):
+        """Fin de flux : clôt toutes les barres ouvertes"""
+        if self.ouvertes[0] is None:
+            return []
+        clotures = self._reporter(None)
+        clotures += [self._emettre(k, ouverte) for k, ouverte in enumerate(self.ouvertes) if k and ouverte is not None]
+        self.ouvertes = [None] * len(self.timeframes)
+        return clotures
+
+    def barre_ouverte(self, timeframe):
+        """Barre en cours (date, open, high, low, close, volume) du timeframe, ou None"""
+        k = self.timeframes.index(timeframe)
+        courte = self.ouvertes[0]
+        if courte is None:
+            return None
+        ouverte = self.ouvertes[k] if k else None
+        if ouverte is None or courte[0] - courte[0] % self.durees[k] != ouverte[0]:
+            ouverte = [courte[0] - courte[0] % self.durees[k]] + courte[1:]
+        else:
+            ouverte = [ouverte[0], ouverte[1], max(ouverte[2], courte[2]), min(ouverte[3], courte[3]),
+                       courte[4], ouverte[5] + courte[5]]
+        return (pd.Timestamp(ouverte[0]),) + tuple(ouverte[1:])
+
+    def traiter(self, horodatages, bids, asks=None, volumes=None):
+        """Intègre des tableaux de ticks ; renvoie toutes les clôtures (sans `cloturer`)"""
+        n = len(horodatages)
+        asks = [None] * n if asks is None else np.asarray(asks).tolist()
+        volumes = [0.0] * n if volumes is None else np.asarray(volumes).tolist()
+        ajouter = self.ajouter
+        clotures = []
+        for tick in zip(np.asarray(horodatages).tolist(), np.asarray(bids).tolist(), asks, volumes):
+            fermees = ajouter(*tick)
+            if fermees:
+                clotures.extend(fermees)
+        return clotures
+
+
+def ticks_synthetiques(colonnes, timeframe='M5', ecart=0.0):
+    """
+    Ticks (horodatages ns, bid, ask, volume) reconstitués depuis des barres
+    OHLCV (DataFrame ou colonnes du stockage) : open, puis low et high (high
+    et low pour une barre baissière), puis close, répartis sur la durée de la
+    barre ; le volume est partagé en quatre. `ecart` : spread ajouté au bid.
+    """
+    debuts = horodatages_ns(colonnes['Date'])
+    ouvertures = np.asarray(colonnes['Open'], dtype=np.float64)
+    hauts = np.asarray(colonnes['High'], dtype=np.float64)
+    bas = np.asarray(colonnes['Low'], dtype=np.float64)
+    clotures = np.asarray(colonnes['Close'], dtype=np.float64)
+    haussiere = clotures >= ouvertures
+
+    bids = np.empty((len(debuts), 4))
+    bids[:, 0] = ouvertures
+    bids[:, 1] = np.where(haussiere, bas, hauts)
+    bids[:, 2] = np.where(haussiere, hauts, bas)
+    bids[:, 3] = clotures
+    horodatages = debuts[:, None] + np.arange(4, dtype=np.int64) * (duree_ns(timeframe) // 4)
+    volumes = np.repeat(np.asarray(colonnes['Volume'], dtype=np.float64) / 4.0, 4)
+    bids = bids.ravel()
+    return horodatages.ravel(), bids, bids + ecart, volumes
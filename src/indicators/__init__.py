@@ -0,0 +1,41 @@
+"""
+Bibliothèque d'indicateurs partagée
+- noyaux : fonctions NumPy sur tableaux float64 (utilisées par les optimiseurs)
+- series : enveloppes pandas compatibles avec les anciennes fonctions compute_*
+- flux : versions en flux (O(1) par barre) pour le trading temps réel
+- cache : mémo des indicateurs d'une série, servis par fenêtre de barres
+"""
+
+from .noyaux import (
+    as_float_array,
+    shift,
+    rolling_sum,
+    rolling_mean,
+    rolling_max,
+    rolling_min,
+    rolling_max_multi,
+    rolling_min_multi,
+    breakout_channels,
+    ema,
+    ema_bank,
+    true_range,
+    atr,
+    rsi,
+    adx,
+    adx_dm,
+)
+from .series import (
+    compute_ema,
+    compute_atr,
+    compute_rsi,
+    compute_adx,
+    compute_adx_dm,
+)
+from .flux import (
+    RollingMeanStream,
+    RollingExtremeStream,
+    EMAStream,
+    ATRStream,
+    RSIStream,
+)
+from .cache import IndicatorCache
@@ -0,0 +1,127 @@
+"""
+Cache d'indicateurs par série
+Les indicateurs sont calculés une seule fois sur la série complète, pour une
+clé (indicateur, paramètres), puis servis en vues NumPy (sans copie) sur une
+fenêtre de barres [debut, fin). Tous les indicateurs étant causaux, la vue est
+exactement la valeur qu'aurait vue la stratégie en temps réel, historique de
+chauffe compris. Les fenêtres d'une même série (générations successives,
+folds de walk-forward qui se chevauchent) partagent ainsi le même cache.
+"""
+
+import copy
+from collections import OrderedDict
+
+import numpy as np
+
+from . import noyaux
+
+
+class IndicatorCache:
+    """Mémo LRU des indicateurs d'une série OHLCV, servis sur une fenêtre de barres"""
+
+    def __init__(self, colonnes, capacite=256):
+        self.colonnes = {nom: noyaux.as_float_array(valeurs) for nom, valeurs in colonnes.items()}
+        self.capacite = capacite
+        self.debut = 0
+        self.fin = None
+        self._memo = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    @classmethod
+    def depuis_df(cls, df, capacite=256):
+        """Cache sur les colonnes de prix (et de volume) d'un DataFrame de marché ou des colonnes du stockage"""
+        noms = [nom for nom in ('Open', 'High', 'Low', 'Close', 'Volume') if nom in df]
+        return cls({nom: np.asarray(df[nom], dtype=np.float64) for nom in noms}, capacite)
+
+    def fenetre(self, debut=0, fin=None):
+        """Vue du même cache restreinte aux barres [debut, fin) de la série complète"""
+        vue = copy.copy(self)
+        vue.debut, vue.fin = debut, fin
+        return vue
+
+    def __len__(self):
+        return len(self.colonne('Close'))
+
+    def colonne(self, nom):
+        """Colonne brute sur la fenêtre"""
+        return self.colonnes[nom][self.debut:self.fin]
+
+    def serie(self, cle, calcul):
+        """
+        Indicateur `cle` sur la fenêtre ; `calcul(colonnes)` n'est appelé
+        qu'en l'absence de la clé et reçoit les colonnes de la série complète
+        """
+        memo = self._memo
+        if cle in memo:
+            memo.move_to_end(cle)
+            self._stats['hits'] += 1
+            valeurs = memo[cle]
+        else:
+            self._stats['misses'] += 1
+            valeurs = np.asarray(calcul(self.colonnes), dtype=np.float64)
+            valeurs.setflags(write=False)
+            memo[cle] = valeurs
+            while len(memo) > self.capacite:
+                memo.popitem(last=False)
+        return valeurs[self.debut:self.fin]
+
+    def atr(self, window):
+        return self.serie(('atr', window), lambda c: noyaux.atr(c['High'], c['Low'], c['Close'], window))
+
+    def rsi(self, window=14):
+        return self.serie(('rsi', window), lambda c: noyaux.rsi(c['Close'], window))
+
+    def ema(self, span, adjust=True, colonne='Close'):
+        return self.serie(('ema', colonne, span, adjust), lambda c: noyaux.ema(c[colonne], span, adjust=adjust))
+
+    def adx(self, window):
+        return self.serie(('adx', window), lambda c: noyaux.adx(c['High'], c['Low'], c['Close'], window))
+
+    def plus_haut(self, window):
+        """Plus haut glissant des High (niveau de breakout haussier)"""
+        return self.serie(('plus_haut', window), lambda c: noyaux.rolling_max(c['High'], window))
+
+    def plus_bas(self, window):
+        """Plus bas glissant des Low (niveau de breakout baissier)"""
+        return self.serie(('plus_bas', window), lambda c: noyaux.rolling_min(c['Low'], window))
+
+    def _precharger(self, cles, calcul_lot):
+        """Calcule en un seul lot (`calcul_lot(manquantes)` -> une ligne par clé) les clés absentes du cache"""
+        manquantes = [cle for cle in dict.fromkeys(cles) if cle not in self._memo]
+        if manquantes:
+            for cle, ligne in zip(manquantes, calcul_lot(manquantes)):
+                self.serie(cle, lambda c: ligne)
+
+    def canal_breakout(self, fenetres):
+        """
+        Canaux de breakout pour plusieurs périodes : matrices (fenêtres × barres)
+        des plus hauts et des plus bas. Les périodes absentes du cache sont
+        calculées ensemble, en une seule passe (table creuse partagée).
+        """
+        fenetres = [int(w) for w in fenetres]
+        self._precharger([('plus_haut', w) for w in fenetres],
+                         lambda cles: noyaux.rolling_max_multi(self.colonnes['High'], [c[1] for c in cles]))
+        self._precharger([('plus_bas', w) for w in fenetres],
+                         lambda cles: noyaux.rolling_min_multi(self.colonnes['Low'], [c[1] for c in cles]))
+        return (np.stack([self.plus_haut(w) for w in fenetres]),
+                np.stack([self.plus_bas(w) for w in fenetres]))
+
+    def banque_ema(self, spans, adjust=True, colonne='Close'):
+        """
+        EMA de plusieurs périodes : matrice (périodes × barres). Les périodes
+        absentes du cache sont calculées ensemble, en une seule passe.
+        """
+        spans = [int(s) for s in spans]
+        self._precharger([('ema', colonne, s, adjust) for s in spans],
+                         lambda cles: noyaux.ema_bank(self.colonnes[colonne], [c[2] for c in cles], adjust))
+        return np.stack([self.ema(s, adjust, colonne) for s in spans])
+
+    def moyenne(self, window, colonne='Close'):
+        return self.serie(('moyenne', colonne, window), lambda c: noyaux.rolling_mean(c[colonne], window))
+
+    def statistiques(self):
+        """Hits, misses (partagés par toutes les fenêtres) et nombre d'indicateurs en mémoire"""
+        return dict(self._stats, entrees=len(self._memo))
+
+    def vider(self):
+        self._memo.clear()
@@ -0,0 +1,147 @@
+"""
+Indicateurs en flux (streaming)
+Chaque indicateur garde un état de taille fixe (buffer circulaire, deque
+monotone, récurrence exacte) et se met à jour en O(1) par nouvelle barre,
+quelle que soit la longueur de l'historique déjà reçu. Les valeurs et les
+périodes de chauffe (NaN) sont celles des noyaux NumPy de `noyaux`.
+"""
+
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+class RollingMeanStream:
+    """Moyenne glissante (rolling(window).mean()) ; NaN tant que la fenêtre contient un NaN"""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = [0.0] * window
+        self.position = 0
+        self.compte = 0
+        self.nans = 0
+        self.somme = 0.0
+        self.value = NAN
+
+    def update(self, x):
+        x = float(x)
+        ancien = self.buffer[self.position]
+        if self.compte >= self.window:
+            if math.isnan(ancien):
+                self.nans -= 1
+            else:
+                self.somme -= ancien
+        else:
+            self.compte += 1
+        if math.isnan(x):
+            self.nans += 1
+        else:
+            self.somme += x
+        self.buffer[self.position] = x
+        self.position += 1
+        if self.position == self.window:
+            self.position = 0
+            # Resommation exacte une fois par tour de buffer : pas de dérive d'arrondi
+            self.somme = math.fsum(v for v in self.buffer if not math.isnan(v))
+
+        if self.compte < self.window or self.nans:
+            self.value = NAN
+        else:
+            self.value = self.somme / self.window
+        return self.value
+
+
+class RollingExtremeStream:
+    """Maximum (ou minimum) glissant par deque monotone ; suppose une série sans NaN"""
+
+    def __init__(self, window, maximum=True):
+        self.window = window
+        self.maximum = maximum
+        self.candidats = deque()  # (indice, valeur), valeurs monotones
+        self.indice = -1
+        self.value = NAN
+
+    def update(self, x):
+        x = float(x)
+        self.indice += 1
+        candidats = self.candidats
+        if self.maximum:
+            while candidats and candidats[-1][1] <= x:
+                candidats.pop()
+        else:
+            while candidats and candidats[-1][1] >= x:
+                candidats.pop()
+        candidats.append((self.indice, x))
+        if candidats[0][0] <= self.indice - self.window:
+            candidats.popleft()
+        self.value = candidats[0][1] if self.indice >= self.window - 1 else NAN
+        return self.value
+
+
+class EMAStream:
+    """
+    Moyenne mobile exponentielle (ewm(span, adjust).mean()) par récurrence exacte :
+    adjust=True : numérateur et somme des poids (1 - alpha)**k tenus séparément.
+    """
+
+    def __init__(self, span, adjust=True):
+        self.alpha = 2.0 / (span + 1.0)
+        self.decay = 1.0 - self.alpha
+        self.adjust = adjust
+        self.numerateur = 0.0
+        self.poids = 0.0
+        self.value = NAN
+
+    def update(self, x):
+        x = float(x)
+        if self.adjust:
+            self.numerateur = self.decay * self.numerateur + x
+            self.poids = self.decay * self.poids + 1.0
+            self.value = self.numerateur / self.poids
+        elif math.isnan(self.value):
+            self.value = x
+        else:
+            self.value = self.decay * self.value + self.alpha * x
+        return self.value
+
+
+class ATRStream:
+    """Average True Range (moyenne simple du True Range, première barre = High - Low)"""
+
+    def __init__(self, window):
+        self.moyenne = RollingMeanStream(window)
+        self.close_precedent = None
+        self.value = NAN
+
+    def update(self, high, low, close):
+        tr = high - low
+        if self.close_precedent is not None:
+            tr = max(tr, abs(high - self.close_precedent), abs(low - self.close_precedent))
+        self.close_precedent = close
+        self.value = self.moyenne.update(tr)
+        return self.value
+
+
+class RSIStream:
+    """Relative Strength Index (moyennes simples des gains / pertes, variation nulle en première barre)"""
+
+    def __init__(self, window=14):
+        self.gains = RollingMeanStream(window)
+        self.pertes = RollingMeanStream(window)
+        self.close_precedent = None
+        self.value = NAN
+
+    def update(self, close):
+        delta = 0.0 if self.close_precedent is None else close - self.close_precedent
+        self.close_precedent = close
+        gain = self.gains.update(delta if delta > 0 else 0.0)
+        perte = self.pertes.update(-delta if delta < 0 else 0.0)
+        if math.isnan(gain) or math.isnan(perte):
+            self.value = NAN
+        elif perte == 0:
+            # Même convention que la division NumPy : gain / 0 -> inf -> 100, 0 / 0 -> NaN
+            self.value = 100.0 if gain > 0 else NAN
+        else:
+            self.value = 100 - (100 / (1 + gain / perte))
+        return self.value
@@ -0,0 +1,338 @@
+"""
+Noyaux NumPy des indicateurs techniques
+Travaillent sur des tableaux float64 contigus, sans DataFrame intermédiaire.
+Les conventions de NaN (périodes de chauffe) reproduisent celles de pandas
+(`rolling(window).mean()`, `ewm(span).mean()`) utilisées jusqu'ici.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Taille des blocs pour le filtre récursif des EMA
+TAILLE_BLOC_EMA = 64
+
+
+def as_float_array(values):
+    """Convertit une série / liste en tableau float64 contigu (sans copie si possible)"""
+    return np.ascontiguousarray(np.asarray(values, dtype=np.float64))
+
+
+def shift(values, periods=1):
+    """Décale un tableau de `periods` barres en complétant par NaN (équivalent de Series.shift)"""
+    values = as_float_array(values)
+    out = np.empty_like(values)
+    if periods >= 0:
+        out[:periods] = np.nan
+        out[periods:] = values[:len(values) - periods]
+    else:
+        out[periods:] = np.nan
+        out[:periods] = values[-periods:]
+    return out
+
+
+def rolling_sum(values, window):
+    """
+    Somme glissante, NaN tant que la fenêtre n'est pas pleine ou contient un NaN.
+
+    La fenêtre est décomposée en blocs de tailles 2**k (écriture binaire de
+    `window`) : O(n log window) et une précision de sommation par paires, sans la
+    dérive d'une somme cumulée sur toute la série.
+    """
+    values = as_float_array(values)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window <= 0 or n < window:
+        return out
+
+    blocs = [values]
+    taille = 1
+    while taille * 2 <= window:
+        precedent = blocs[-1]
+        blocs.append(precedent[:-taille] + precedent[taille:])
+        taille *= 2
+
+    n_out = n - window + 1
+    total = None
+    decalage = 0
+    for k in range(len(blocs) - 1, -1, -1):
+        if window & (1 << k):
+            morceau = blocs[k][decalage:decalage + n_out]
+            total = morceau.copy() if total is None else total + morceau
+            decalage += 1 << k
+    out[window - 1:] = total
+    return out
+
+
+def rolling_mean(values, window):
+    """Moyenne glissante (équivalent de rolling(window).mean())"""
+    return rolling_sum(values, window) / window
+
+
+def _table_creuse(values, taille_max, ufunc):
+    """
+    Table creuse (sparse table) : niveaux[k][i] = extrême de values[i:i + 2**k],
+    pour toutes les puissances de deux 2**k <= taille_max (O(n) par niveau)
+    """
+    niveaux = [values]
+    taille = 1
+    while taille * 2 <= taille_max:
+        bloc = niveaux[-1]
+        niveaux.append(ufunc(bloc[:-taille], bloc[taille:]))
+        taille *= 2
+    return niveaux
+
+
+def _rolling_extremes(values, windows, ufunc):
+    """
+    Extrêmes glissants pour plusieurs fenêtres en une passe : la table creuse
+    est construite une fois jusqu'à la plus grande fenêtre, puis chaque fenêtre
+    [i, i+window) est couverte par deux blocs recouvrants de taille 2**k <= window.
+    Retourne une matrice (fenêtres × barres).
+    """
+    values = as_float_array(values)
+    n = len(values)
+    windows = [int(w) for w in windows]
+    out = np.full((len(windows), n), np.nan)
+    valides = [w for w in windows if 0 < w <= n]
+    if not valides:
+        return out
+
+    niveaux = _table_creuse(values, max(valides), ufunc)
+    for j, window in enumerate(windows):
+        if window <= 0 or window > n:
+            continue
+        k = window.bit_length() - 1
+        taille = 1 << k
+        bloc = niveaux[k]
+        n_out = n - window + 1
+        ufunc(bloc[:n_out], bloc[window - taille:window - taille + n_out], out=out[j, window - 1:])
+    return out
+
+
+def rolling_max(values, window):
+    """Maximum glissant (équivalent de rolling(window).max())"""
+    return _rolling_extremes(values, (window,), np.maximum)[0]
+
+
+def rolling_min(values, window):
+    """Minimum glissant (équivalent de rolling(window).min())"""
+    return _rolling_extremes(values, (window,), np.minimum)[0]
+
+
+def rolling_max_multi(values, windows):
+    """Maximums glissants pour toutes les fenêtres demandées, matrice (fenêtres × barres)"""
+    return _rolling_extremes(values, windows, np.maximum)
+
+
+def rolling_min_multi(values, windows):
+    """Minimums glissants pour toutes les fenêtres demandées, matrice (fenêtres × barres)"""
+    return _rolling_extremes(values, windows, np.minimum)
+
+
+def breakout_channels(high, low, windows):
+    """Canaux de breakout (plus hauts des High, plus bas des Low) pour toutes les fenêtres"""
+    return rolling_max_multi(high, windows), rolling_min_multi(low, windows)
+
+
+@lru_cache(maxsize=64)
+def _poids_bloc(decay, gain, bloc):
+    """Matrice triangulaire poids[j, k] = gain * decay**(j-k) (k <= j) et facteurs de report"""
+    exposants = np.arange(bloc)
+    ecarts = exposants[:, None] - exposants[None, :]
+    with np.errstate(under='ignore'):
+        poids = np.where(ecarts >= 0, gain * decay ** np.maximum(ecarts, 0), 0.0)
+        report = decay ** (exposants + 1)
+    return poids.T.copy(), report
+
+
+def _filtre_recursif(x, decay, gain, initial=0.0):
+    """
+    Calcule y[t] = decay * y[t-1] + gain * x[t] avec y[-1] = initial.
+
+    La récurrence est résolue par blocs : à l'intérieur d'un bloc, une matrice
+    triangulaire de poids donne toutes les sorties en un seul produit matriciel ;
+    seule la valeur de fin de chaque bloc est ensuite propagée séquentiellement.
+    """
+    n = len(x)
+    if n == 0:
+        return np.empty(0)
+
+    bloc = min(TAILLE_BLOC_EMA, n)
+    n_blocs = -(-n // bloc)
+    padded = np.zeros(n_blocs * bloc)
+    padded[:n] = x
+
+    poids_t, report = _poids_bloc(float(decay), float(gain), bloc)
+    y = padded.reshape(n_blocs, bloc) @ poids_t
+
+    # Valeur entrante de chaque bloc (scalaires uniquement dans la boucle)
+    fins_locales = y[:, -1]
+    report_bloc = report[-1]
+    entrees = np.empty(n_blocs)
+    precedent = initial
+    for b in range(n_blocs):
+        entrees[b] = precedent
+        precedent = report_bloc * precedent + fins_locales[b]
+
+    y += entrees[:, None] * report[None, :]
+    return y.reshape(-1)[:n]
+
+
+def ema(values, span, adjust=True):
+    """
+    Moyenne mobile exponentielle (équivalent de ewm(span=span, adjust=...).mean()).
+    Suppose une série sans NaN (prix de clôture).
+    """
+    values = as_float_array(values)
+    if len(values) == 0:
+        return values.copy()
+
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+
+    if not adjust:
+        # y[0] = x[0] puis y[t] = (1 - alpha) * y[t-1] + alpha * x[t]
+        return _filtre_recursif(values, decay, alpha, initial=values[0])
+
+    # adjust=True : somme pondérée normalisée par la somme des poids
+    # (au-delà de `horizon` barres, decay**k est négligeable : on évite les dénormaux)
+    numerateur = _filtre_recursif(values, decay, 1.0)
+    horizon = int(np.ceil(np.log(1e-20) / np.log(decay))) if decay > 0 else 1
+    exposants = np.minimum(np.arange(1, len(values) + 1), horizon)
+    poids = (1.0 - decay ** exposants) / alpha
+    return numerateur / poids
+
+
+def _filtre_recursif_multi(x, decays, gains, initiaux):
+    """
+    Version multi-coefficients de _filtre_recursif : y[s, t] = decays[s] * y[s, t-1]
+    + gains[s] * x[t]. Les matrices de poids de tous les coefficients sont
+    concaténées : un seul produit matriciel par passe, et la propagation entre
+    blocs avance tous les coefficients à la fois. Retourne (coefficients × barres).
+    """
+    n = len(x)
+    n_coef = len(decays)
+    if n == 0 or n_coef == 0:
+        return np.empty((n_coef, n))
+
+    bloc = min(TAILLE_BLOC_EMA, n)
+    n_blocs = -(-n // bloc)
+    padded = np.zeros(n_blocs * bloc)
+    padded[:n] = x
+
+    poids = [_poids_bloc(float(d), float(g), bloc) for d, g in zip(decays, gains)]
+    poids_t = np.concatenate([p for p, _ in poids], axis=1)
+    report = np.stack([r for _, r in poids])
+    y = (padded.reshape(n_blocs, bloc) @ poids_t).reshape(n_blocs, n_coef, bloc)
+
+    fins_locales = y[:, :, -1]
+    report_bloc = report[:, -1]
+    entrees = np.empty((n_blocs, n_coef))
+    precedent = np.array(initiaux, dtype=np.float64)
+    for b in range(n_blocs):
+        entrees[b] = precedent
+        precedent = report_bloc * precedent + fins_locales[b]
+
+    y += entrees[:, :, None] * report[None, :, :]
+    return y.transpose(1, 0, 2).reshape(n_coef, -1)[:, :n]
+
+
+def ema_bank(values, spans, adjust=True):
+    """
+    Banque d'EMA : toutes les périodes demandées en une passe, matrice
+    (périodes × barres) ; chaque ligne équivaut à ema(values, span, adjust)
+    """
+    values = as_float_array(values)
+    spans = np.asarray(spans, dtype=np.float64)
+    n = len(values)
+    if n == 0 or len(spans) == 0:
+        return np.empty((len(spans), n))
+
+    alphas = 2.0 / (spans + 1.0)
+    decays = 1.0 - alphas
+
+    if not adjust:
+        return _filtre_recursif_multi(values, decays, alphas, np.full(len(spans), values[0]))
+
+    numerateurs = _filtre_recursif_multi(values, decays, np.ones(len(spans)), np.zeros(len(spans)))
+    rangs = np.arange(1, n + 1)
+    for k, (alpha, decay) in enumerate(zip(alphas, decays)):
+        horizon = int(np.ceil(np.log(1e-20) / np.log(decay))) if decay > 0 else 1
+        numerateurs[k] /= (1.0 - decay ** np.minimum(rangs, horizon)) / alpha
+    return numerateurs
+
+
+def true_range(high, low, close):
+    """True Range ; la première barre vaut High - Low (comme pd.concat(...).max(axis=1))"""
+    high = as_float_array(high)
+    low = as_float_array(low)
+    close = as_float_array(close)
+
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        np.maximum(tr[1:], np.abs(high[1:] - prev_close), out=tr[1:])
+        np.maximum(tr[1:], np.abs(low[1:] - prev_close), out=tr[1:])
+    return tr
+
+
+def atr(high, low, close, window):
+    """Average True Range (moyenne simple du True Range)"""
+    return rolling_mean(true_range(high, low, close), window)
+
+
+def rsi(close, window=14):
+    """Relative Strength Index (moyennes simples des gains / pertes)"""
+    close = as_float_array(close)
+    delta = np.zeros_like(close)
+    delta[1:] = np.diff(close)
+
+    gain = rolling_mean(np.where(delta > 0, delta, 0.0), window)
+    loss = rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+def adx(high, low, close, window):
+    """
+    ADX simplifié des stratégies breakout EMA200/ADX :
+    +DM = hausse des plus hauts, -DM = variation absolue des plus bas.
+    """
+    high = as_float_array(high)
+    low = as_float_array(low)
+
+    plus_dm = np.full(len(high), np.nan)
+    minus_dm = np.full(len(low), np.nan)
+    plus_dm[1:] = np.maximum(np.diff(high), 0.0)
+    minus_dm[1:] = np.abs(np.diff(low))
+
+    trur = atr(high, low, close, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * (rolling_sum(plus_dm, window) / trur)
+        minus_di = 100 * (rolling_sum(minus_dm, window) / trur)
+        dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
+    return rolling_mean(dx, window)
+
+
+def adx_dm(high, low, close, window=14):
+    """ADX à mouvements directionnels classiques (+DM / -DM exclusifs)"""
+    high = as_float_array(high)
+    low = as_float_array(low)
+
+    up_move = np.zeros_like(high)
+    down_move = np.zeros_like(low)
+    up_move[1:] = np.diff(high)
+    down_move[1:] = -np.diff(low)
+
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    tr_smooth = atr(high, low, close, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = 100 * rolling_mean(plus_dm, window) / tr_smooth
+        minus_di = 100 * rolling_mean(minus_dm, window) / tr_smooth
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return rolling_mean(dx, window)
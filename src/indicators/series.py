@@ -0,0 +1,46 @@
+"""
+Interface pandas des indicateurs
+Mêmes signatures que les anciennes fonctions compute_* recopiées dans chaque
+module ; le calcul est délégué aux noyaux NumPy et l'index d'origine est conservé.
+"""
+
+import pandas as pd
+
+from . import noyaux
+
+
+def _ohlc(df):
+    return df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy()
+
+
+def _close(data):
+    """Accepte un DataFrame (colonne Close) ou directement une série de prix"""
+    if isinstance(data, pd.DataFrame):
+        return data['Close']
+    return data
+
+
+def compute_ema(series, window, adjust=False):
+    """EMA d'une série (adjust=False par défaut, comme dans les backtests breakout)"""
+    return pd.Series(noyaux.ema(series.to_numpy(), window, adjust=adjust), index=series.index)
+
+
+def compute_atr(df, window=14):
+    """Calcule l'Average True Range (ATR)"""
+    return pd.Series(noyaux.atr(*_ohlc(df), window), index=df.index)
+
+
+def compute_rsi(data, window=14):
+    """Calcule le Relative Strength Index (RSI) à partir d'un DataFrame ou d'une série de prix"""
+    close = _close(data)
+    return pd.Series(noyaux.rsi(close.to_numpy(), window), index=close.index)
+
+
+def compute_adx(df, window=14):
+    """Calcule l'ADX simplifié des stratégies breakout EMA200/ADX"""
+    return pd.Series(noyaux.adx(*_ohlc(df), window), index=df.index)
+
+
+def compute_adx_dm(df, window=14):
+    """Calcule l'ADX (Average Directional Index) à mouvements directionnels classiques"""
+    return pd.Series(noyaux.adx_dm(*_ohlc(df), window), index=df.index)
@@ -0,0 +1,138 @@
+"""
+Moteur de backtest sur tableaux NumPy
+- positions : machine à états des positions (entrées, stops, objectifs,
+  trailing stop, signal opposé) et journal de trades en colonnes
+- balayage : évaluation de N jeux de paramètres en une passe (matrices barres × N)
+- parallele : évaluation des populations en série, en threads ou en processus
+- cache_fitness : mémo LRU (persistable) des évaluations déjà calculées
+- walk_forward : folds entraînement / test et assemblage hors échantillon
+- metriques : métriques de performance d'un ou de plusieurs journaux de PnL
+- journal_trades : journal de trades en colonnes typées (TradeLog), format
+  commun des trades renvoyés par les stratégies
+- iles : algorithme génétique en îles (sous-populations en série ou en
+  processus, migration des élites en anneau, transport enfichable)
+- pareto : NSGA-II (tri non dominé vectorisé, distance d'encombrement,
+  sélection des survivants)
+- paliers : élimination successive (cohortes évaluées sur des préfixes de
+  plus en plus longs, seuls les meilleurs passent au palier suivant)
+- substitut : optimisation bayésienne (processus gaussien en NumPy,
+  amélioration espérée, propositions par lots)
+- rejeu : rejeu barre par barre des stratégies temps réel (interface
+  on_bar), histogramme des latences de décision et débit
+- temps_reel : moteur asyncio multi-symboles (une file par instance de
+  stratégie, délai par décision, lots d'intentions d'ordre par tick, flux
+  local rejouant les séries du stockage ou agrégeant des ticks)
+- reprise : points de reprise périodiques des optimisations longues (état de
+  la boucle et des générateurs aléatoires)
+"""
+
+from .positions import (
+    LONG,
+    SHORT,
+    SORTIE_STOP,
+    SORTIE_CIBLE,
+    SORTIE_SUIVEUR,
+    SORTIE_SIGNAL,
+    SORTIE_FIN,
+    SORTIE_DUREE,
+    OPPOSE_IGNORE,
+    OPPOSE_SORTIE,
+    OPPOSE_INVERSION,
+    COLONNES_JOURNAL,
+    simuler_positions,
+    croisement_haussier,
+    croisement_baissier,
+)
+from .balayage import (
+    colonnes_par_parametre,
+    vecteur_parametre,
+    simuler_lot,
+    trades_par_individu,
+)
+from .parallele import (
+    MODES_EVALUATION,
+    ParallelEvaluator,
+    decouper,
+    parametres_individus,
+    reporter_resultats,
+    resultats_acquis,
+)
+from .cache_fitness import (
+    FitnessCache,
+    empreinte_donnees,
+)
+from .walk_forward import (
+    fenetres_walk_forward,
+    assembler_hors_echantillon,
+)
+from .metriques import (
+    CLES_METRIQUES,
+    metriques_lot,
+    metriques_individu,
+    metriques_pnl,
+    metriques_journal,
+    empiler_metriques,
+    offsets_journaux,
+)
+from .journal_trades import (
+    COLONNES_OPTIMISEUR,
+    RAISONS_OPTIMISEUR,
+    NAT,
+    Trade,
+    TradeLog,
+    journal_optimiseur,
+    colonne_trades,
+    dataframe_trades,
+    dates_ns,
+)
+from .rejeu import (
+    PERCENTILES_LATENCE,
+    RejeuBarres,
+    evenements_barres,
+    histogramme_latences,
+    statistiques_latence,
+)
+from .temps_reel import (
+    DELAI_DECISION,
+    CAPACITE_REJEU,
+    FluxRejeu,
+    FluxTicks,
+    InstanceStrategie,
+    MoteurTempsReel,
+)
+from .reprise import (
+    DOSSIER_REPRISE,
+    PointReprise,
+    chemin_reprise,
+    etat_aleatoire,
+    restaurer_aleatoire,
+)
+from .iles import (
+    MODES_ILES,
+    Archipel,
+    TransportPipe,
+    migrer,
+    servir_ile,
+)
+from .pareto import (
+    matrice_domination,
+    tri_non_domine,
+    distance_encombrement,
+    selection_nsga2,
+    tournoi_encombrement,
+    front_pareto,
+)
+from .paliers import (
+    ETA,
+    PALIERS,
+    Elimine,
+    paliers_geometriques,
+    barres_paliers,
+    elimination_successive,
+    evaluer_avec_elimination,
+)
+from .substitut import (
+    ProcessusGaussien,
+    OptimiseurSubstitut,
+    amelioration_esperee,
+)
@@ -0,0 +1,242 @@
+"""
+Balayage de paramètres par lots
+Évalue N jeux de paramètres en une seule passe sur les barres : les indicateurs
+sont calculés une fois par longueur de fenêtre distincte, les signaux forment des
+matrices (barres × N) et les positions, stops et PnL sont suivis sous forme de
+vecteurs de taille N. Une génération complète d'algorithme génétique coûte ainsi
+une passe vectorisée au lieu de N boucles Python.
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+from .positions import (
+    LONG,
+    SHORT,
+    SORTIE_STOP,
+    SORTIE_CIBLE,
+    SORTIE_SUIVEUR,
+    SORTIE_DUREE,
+)
+from .journal_trades import COLONNES_OPTIMISEUR, RAISONS_OPTIMISEUR, TradeLog, dates_ns
+
+
+def colonnes_par_parametre(valeurs, calcul):
+    """
+    Matrice (barres × N) dont la colonne j vaut calcul(valeurs[j]).
+    `calcul` n'est appelé qu'une fois par valeur distincte (ex. une période d'EMA).
+    """
+    valeurs = list(valeurs)
+    distinctes = sorted(set(valeurs))
+    cache = np.column_stack([calcul(v) for v in distinctes])
+    position = {v: k for k, v in enumerate(distinctes)}
+    return cache[:, [position[v] for v in valeurs]]
+
+
+def vecteur_parametre(population, nom, defaut=None, dtype=np.float64):
+    """Extrait un paramètre de chaque individu sous forme de vecteur (taille N)"""
+    if defaut is None:
+        return np.array([individu[nom] for individu in population], dtype=dtype)
+    return np.array([individu.get(nom, defaut) for individu in population], dtype=dtype)
+
+
+def simuler_lot(close, atr, signal_long, signal_short, stop_atr, cible_atr,
+                debut=0, stops_dynamiques=False, duree_max=None,
+                verrou_profit=None, trail_atr=None, autorise=None):
+    """
+    Simule N stratégies à une position en parallèle sur les mêmes barres.
+
+    - `close` : prix de clôture (barres,)
+    - `atr`, `signal_long`, `signal_short` : matrices (barres × N)
+    - `stop_atr`, `cible_atr` : vecteurs (N,) en multiples d'ATR
+
+    Les sorties sont testées sur la clôture, dans l'ordre : durée maximale
+    (`duree_max`, en barres), stop, objectif, puis trailing stop activé une fois
+    le gain latent (en %) au-dessus de `verrou_profit`. Avec `stops_dynamiques`,
+    stop et objectif sont recalculés à chaque barre avec l'ATR courant au lieu
+    d'être figés à l'entrée. Pas de nouvelle entrée sur la barre d'une sortie ;
+    `autorise` (N,) permet d'interdire toute entrée à certains individus.
+
+    Retourne un journal en colonnes trié par individu puis par date de sortie,
+    avec la colonne 'lot' (indice de l'individu) et `offsets` (N + 1,) pour
+    découper le journal par individu. Les positions encore ouvertes à la fin
+    ne sont pas journalisées.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+    signal_long = np.asarray(signal_long, dtype=bool)
+    signal_short = np.asarray(signal_short, dtype=bool)
+    n_barres, n = atr.shape
+    stop_atr = np.asarray(stop_atr, dtype=np.float64)
+    cible_atr = np.asarray(cible_atr, dtype=np.float64)
+    if autorise is None:
+        autorise = np.ones(n, dtype=bool)
+    avec_duree = duree_max is not None
+    avec_verrou = verrou_profit is not None
+    if avec_duree:
+        duree_max = np.asarray(duree_max, dtype=np.int64)
+    if avec_verrou:
+        verrou_profit = np.asarray(verrou_profit, dtype=np.float64)
+        trail_atr = np.asarray(trail_atr, dtype=np.float64)
+
+    position = np.zeros(n, dtype=np.int8)
+    entree_idx = np.zeros(n, dtype=np.int64)
+    prix_entree = np.zeros(n)
+    stop = np.zeros(n)
+    cible = np.zeros(n)
+    suiveur = np.zeros(n)
+    verrouille = np.zeros(n, dtype=bool)
+
+    # Barres où au moins un individu a un signal : saut direct quand tout le lot est à plat
+    candidats = np.flatnonzero((signal_long | signal_short).any(axis=1))
+    candidats = candidats[candidats >= debut].tolist()
+
+    morceaux = []
+    t = debut
+    while t < n_barres:
+        en_position = position != 0
+        if not en_position.any():
+            k = bisect_left(candidats, t)
+            if k == len(candidats):
+                break
+            t = candidats[k]
+            en_position = None
+
+        prix = close[t]
+        a = atr[t]
+        sortie = np.zeros(n, dtype=bool)
+
+        if en_position is not None:
+            code = np.zeros(n, dtype=np.int8)
+            prix_sortie = np.zeros(n)
+            est_long = position == LONG
+            est_short = position == SHORT
+
+            if stops_dynamiques:
+                stop = np.where(est_long, prix_entree - (stop_atr * a), prix_entree + (stop_atr * a))
+                cible = np.where(est_long, prix_entree + (cible_atr * a), prix_entree - (cible_atr * a))
+
+            if avec_duree:
+                par_duree = en_position & (t - entree_idx >= duree_max)
+                code[par_duree] = SORTIE_DUREE
+                prix_sortie[par_duree] = prix
+                est_long &= ~par_duree
+                est_short &= ~par_duree
+
+            par_stop = (est_long & (prix <= stop)) | (est_short & (prix >= stop))
+            code[par_stop] = SORTIE_STOP
+            prix_sortie[par_stop] = stop[par_stop]
+
+            restant = ~par_stop
+            par_cible = restant & ((est_long & (prix >= cible)) | (est_short & (prix <= cible)))
+            code[par_cible] = SORTIE_CIBLE
+            prix_sortie[par_cible] = cible[par_cible]
+
+            if avec_verrou:
+                restant &= ~par_cible
+                reste_long = est_long & restant
+                reste_short = est_short & restant
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    latent = np.where(reste_long,
+                                      (prix - prix_entree) / prix_entree * 100,
+                                      (prix_entree - prix) / prix_entree * 100)
+
+                nouveau_verrou = (reste_long | reste_short) & ~verrouille & (latent >= verrou_profit)
+                suiveur = np.where(nouveau_verrou & reste_long, prix_entree + (trail_atr * a), suiveur)
+                suiveur = np.where(nouveau_verrou & reste_short, prix_entree - (trail_atr * a), suiveur)
+                verrouille |= nouveau_verrou
+
+                actif_long = reste_long & verrouille
+                actif_short = reste_short & verrouille
+                nouveau_long = prix - (trail_atr * a)
+                nouveau_short = prix + (trail_atr * a)
+                maj_long = actif_long & (nouveau_long > suiveur)
+                maj_short = actif_short & ((nouveau_short < suiveur) | (suiveur == 0))
+                par_suiveur = ((actif_long & ~maj_long & (prix <= suiveur)) |
+                               (actif_short & ~maj_short & (prix >= suiveur)))
+                suiveur = np.where(maj_long, nouveau_long, np.where(maj_short, nouveau_short, suiveur))
+                code[par_suiveur] = SORTIE_SUIVEUR
+                prix_sortie[par_suiveur] = suiveur[par_suiveur]
+
+            sortie = code != 0
+            if sortie.any():
+                lots = np.flatnonzero(sortie)
+                morceaux.append((lots, np.full(len(lots), t, dtype=np.int64), entree_idx[lots],
+                                 position[lots], prix_entree[lots], prix_sortie[lots], code[lots]))
+                position[sortie] = 0
+                verrouille[sortie] = False
+
+        # Nouvelles entrées (individus à plat, hors barre de sortie)
+        libre = (position == 0) & ~sortie & autorise
+        entre_long = libre & signal_long[t]
+        entre_short = libre & ~entre_long & signal_short[t]
+        entre = entre_long | entre_short
+        if entre.any():
+            position[entre_long] = LONG
+            position[entre_short] = SHORT
+            entree_idx[entre] = t
+            prix_entree[entre] = prix
+            if not stops_dynamiques:
+                stop = np.where(entre_long, prix - (stop_atr * a), np.where(entre_short, prix + (stop_atr * a), stop))
+                cible = np.where(entre_long, prix + (cible_atr * a), np.where(entre_short, prix - (cible_atr * a), cible))
+            if avec_verrou:
+                suiveur = np.where(entre_long, prix - (trail_atr * a), np.where(entre_short, prix + (trail_atr * a), suiveur))
+                verrouille[entre] = False
+
+        t += 1
+
+    return _journal_lot(morceaux, n)
+
+
+def _journal_lot(morceaux, n):
+    """Assemble les sorties de chaque barre en un journal trié par individu"""
+    if morceaux:
+        lot, sortie_idx, entree_idx, sens, prix_entree, prix_sortie, code = (
+            np.concatenate(colonne) for colonne in zip(*morceaux))
+    else:
+        lot = sortie_idx = entree_idx = np.zeros(0, dtype=np.int64)
+        sens = code = np.zeros(0, dtype=np.int8)
+        prix_entree = prix_sortie = np.zeros(0)
+
+    ordre = np.lexsort((sortie_idx, lot))
+    lot = lot[ordre]
+    sens = sens[ordre]
+    prix_entree = prix_entree[ordre]
+    prix_sortie = prix_sortie[ordre]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rendement = np.where(sens == LONG,
+                             (prix_sortie - prix_entree) / prix_entree,
+                             (prix_entree - prix_sortie) / prix_entree)
+    return {
+        'lot': lot,
+        'entree_idx': entree_idx[ordre],
+        'sortie_idx': sortie_idx[ordre],
+        'sens': sens,
+        'prix_entree': prix_entree,
+        'prix_sortie': prix_sortie,
+        'code_sortie': code[ordre],
+        'rendement': rendement,
+        'offsets': np.searchsorted(lot, np.arange(n + 1)),
+    }
+
+
+def trades_par_individu(journal, dates, raisons=RAISONS_OPTIMISEUR):
+    """
+    Découpe un journal de lot en journaux de trades (TradeLog au format des
+    optimiseurs : entry_date, exit_date, entry_price, exit_price, position,
+    pnl en %, exit_reason), un par individu. Les journaux des individus sont
+    des vues d'un même TradeLog, sans copie.
+    """
+    dates = dates_ns(dates)
+    tous = TradeLog.depuis_colonnes({
+        'entry_date': dates[journal['entree_idx']],
+        'exit_date': dates[journal['sortie_idx']],
+        'entry_price': journal['prix_entree'],
+        'exit_price': journal['prix_sortie'],
+        'position': journal['sens'],
+        'pnl': journal['rendement'] * 100,
+        'exit_reason': journal['code_sortie'],
+    }, COLONNES_OPTIMISEUR, {'exit_reason': raisons})
+    offsets = journal['offsets'].tolist()
+    return [tous.vue(offsets[k], offsets[k + 1]) for k in range(len(offsets) - 1)]
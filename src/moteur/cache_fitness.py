@@ -0,0 +1,212 @@
+"""
+Cache des évaluations de fitness
+Les populations génétiques reportent à l'identique élites et vainqueurs de
+tournoi, et croisement / mutation arrondissent les paramètres : les dernières
+générations contiennent beaucoup de doublons exacts. Chaque évaluation étant
+déterministe, son résultat (fitness, métriques...) est mémorisé sous la clé
+(identifiant de stratégie, empreinte des données, paramètres canonisés).
+
+- éviction LRU au-delà de `capacite` entrées ;
+- persistance optionnelle sur disque (pickle) d'une exécution à l'autre, et
+  instantané inclus dans les points de reprise (moteur.reprise) ;
+- statistiques de hits / misses cumulées et par génération.
+"""
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from numbers import Integral, Real
+
+import numpy as np
+
+VERSION_CACHE_FITNESS = 2
+
+
+def empreinte_donnees(df):
+    """
+    Empreinte (hex) des dates et prix OHLC d'un DataFrame de marché ou des
+    colonnes du stockage (MarketDataStore.colonnes, hachées sans copie)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    lignes = len(df) if hasattr(df, 'columns') else len(next(iter(df.values()), ()))
+    h.update(str(lignes).encode())
+    if 'Date' in df:
+        h.update(np.ascontiguousarray(np.asarray(df['Date']).astype('datetime64[ns]').view(np.int64)))
+    for colonne in ('Open', 'High', 'Low', 'Close'):
+        if colonne in df:
+            h.update(np.ascontiguousarray(np.asarray(df[colonne], dtype=np.float64)))
+    return h.hexdigest()
+
+
+def _canonique(valeur, decimales):
+    """Valeur hashable et stable : nombres quantifiés, conteneurs triés / figés"""
+    if isinstance(valeur, (bool, np.bool_)):
+        return int(valeur)
+    if isinstance(valeur, (Integral, Real)):
+        return round(float(valeur), decimales) + 0.0
+    if isinstance(valeur, dict):
+        return tuple(sorted((k, _canonique(v, decimales)) for k, v in valeur.items()))
+    if isinstance(valeur, (list, tuple, np.ndarray)):
+        return tuple(_canonique(v, decimales) for v in valeur)
+    return valeur
+
+
+class FitnessCache:
+    """
+    Mémo LRU des évaluations, clé (stratégie, empreinte des données, paramètres).
+    `decimales` : quantification des nombres de la clé. Par défaut 2, la
+    granularité des paramètres tirés et mutés par les optimiseurs génétiques
+    (round(..., 2)) : 1.2 et 1.2000000001 issu d'une moyenne partagent une
+    entrée. Les paramètres continus non arrondis (gènes DEAP dans [0, 1])
+    demandent plus de décimales.
+    """
+
+    def __init__(self, capacite=100000, chemin=None, decimales=2,
+                 exclus=('metrics', 'fitness')):
+        self.capacite = capacite
+        self.chemin = chemin
+        self.decimales = decimales
+        self.exclus = set(exclus)
+        self._entrees = OrderedDict()
+        self.hits = self.misses = 0
+        self._hits_generation = self._misses_generation = 0
+        if chemin and os.path.exists(chemin):
+            self.charger()
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def cle(self, strategie, empreinte, params):
+        """Clé canonique ; pour un dict, les champs de `exclus` sont ignorés"""
+        if isinstance(params, dict):
+            params = {k: v for k, v in params.items() if k not in self.exclus}
+        return strategie, empreinte, _canonique(params, self.decimales)
+
+    def _lire(self, cle):
+        if cle in self._entrees:
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+            self._hits_generation += 1
+            return True, self._entrees[cle]
+        self.misses += 1
+        self._misses_generation += 1
+        return False, None
+
+    def _ecrire(self, cle, valeur):
+        self._entrees[cle] = valeur
+        self._entrees.move_to_end(cle)
+        while len(self._entrees) > self.capacite:
+            self._entrees.popitem(last=False)
+
+    def calculer(self, strategie, empreinte, params, fonction):
+        """Résultat de `fonction(params)`, calculé seulement en cas d'absence du cache"""
+        cle = self.cle(strategie, empreinte, params)
+        trouve, valeur = self._lire(cle)
+        if not trouve:
+            valeur = fonction(params)
+            self._ecrire(cle, valeur)
+        return valeur
+
+    def evaluer(self, strategie, empreinte, population, evaluer_lot):
+        """
+        Résultats d'une population, dans l'ordre. Seuls les paramètres absents
+        du cache (dédoublonnés) sont transmis à `evaluer_lot(manquants)`, qui
+        doit renvoyer une liste de résultats alignée (ex. ParallelEvaluator.evaluer).
+        """
+        population = list(population)
+        cles = [self.cle(strategie, empreinte, params) for params in population]
+        resultats = [None] * len(population)
+        a_calculer = OrderedDict()
+        for k, cle in enumerate(cles):
+            if cle in a_calculer:
+                # Doublon dans la même génération : compté comme hit, calculé une fois
+                a_calculer[cle].append(k)
+                self.hits += 1
+                self._hits_generation += 1
+                continue
+            trouve, valeur = self._lire(cle)
+            if trouve:
+                resultats[k] = valeur
+            else:
+                a_calculer[cle] = [k]
+
+        if a_calculer:
+            indices = list(a_calculer.values())
+            calcules = evaluer_lot([population[positions[0]] for positions in indices])
+            for cle, positions, valeur in zip(a_calculer, indices, calcules):
+                self._ecrire(cle, valeur)
+                for k in positions:
+                    resultats[k] = valeur
+        return resultats
+
+    def statistiques(self):
+        """Hits, misses et taux de hit cumulés"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'taux_hit': self.hits / total if total else 0.0,
+            'entrees': len(self._entrees),
+        }
+
+    def statistiques_generation(self):
+        """Hits, misses et taux de hit depuis le dernier appel (une génération), puis remise à zéro"""
+        total = self._hits_generation + self._misses_generation
+        stats = {
+            'hits': self._hits_generation,
+            'misses': self._misses_generation,
+            'taux_hit': self._hits_generation / total if total else 0.0,
+        }
+        self._hits_generation = self._misses_generation = 0
+        return stats
+
+    def vider(self):
+        self._entrees.clear()
+
+    def instantane(self):
+        """
+        État du cache (entrées dans l'ordre LRU, compteurs cumulés) à écrire
+        dans un point de reprise : repris avec `restaurer`, le cache est celui
+        de l'instant du point de reprise
+        """
+        return {'version': VERSION_CACHE_FITNESS, 'entrees': OrderedDict(self._entrees),
+                'hits': self.hits, 'misses': self.misses}
+
+    def restaurer(self, instantane):
+        """Remplace le contenu du cache par un instantané (ignoré s'il est d'une autre version)"""
+        if not isinstance(instantane, dict) or instantane.get('version') != VERSION_CACHE_FITNESS:
+            return False
+        self._entrees = OrderedDict(instantane['entrees'])
+        self.hits = instantane.get('hits', 0)
+        self.misses = instantane.get('misses', 0)
+        self._hits_generation = self._misses_generation = 0
+        return True
+
+    def sauvegarder(self, chemin=None):
+        """Écrit le cache sur disque (écriture atomique)"""
+        chemin = chemin or self.chemin
+        if not chemin:
+            return None
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, 'wb') as f:
+            pickle.dump(self.instantane(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaire, chemin)
+        return chemin
+
+    def charger(self, chemin=None):
+        """Recharge un cache sauvegardé (ignoré s'il est illisible ou d'une autre version)"""
+        chemin = chemin or self.chemin
+        try:
+            with open(chemin, 'rb') as f:
+                contenu = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False
+        if not isinstance(contenu, dict) or contenu.get('version') != VERSION_CACHE_FITNESS:
+            return False
+        for cle, valeur in contenu['entrees'].items():
+            self._ecrire(cle, valeur)
+        return True
@@ -0,0 +1,145 @@
+"""
+Algorithme génétique en îles
+K sous-populations (îles) évoluent chacune avec la sélection, le croisement et
+la mutation de leur optimiseur. Toutes les M générations (une époque), chaque
+île envoie ses meilleurs individus à sa voisine sur un anneau, où ils
+remplacent les derniers enfants de la population.
+
+Une île est un état (population, générateurs aléatoires, meilleur individu...)
+que le contexte d'évaluation fait avancer d'une époque. Les générateurs de
+l'île sont restaurés avant l'époque et sauvegardés après : une île suit
+exactement le même chemin qu'elle tourne dans le processus principal
+('serial') ou dans un processus dédié ('process'), et l'état des îles entre
+deux époques sert de point de reprise.
+
+En mode 'process', chaque île est un processus durable (contexte et données
+construits une fois) qui reçoit ses époques par un canal. Le transport est
+enfichable : `TransportPipe` lance des îles locales reliées par
+multiprocessing.Pipe ; un transport TCP n'a qu'à fournir la même méthode
+`ouvrir` et des extrémités send / recv / close (par exemple
+multiprocessing.connection.Client vers un `servir_ile` distant).
+"""
+
+import multiprocessing
+import traceback
+
+from .reprise import etat_aleatoire, restaurer_aleatoire
+
+MODES_ILES = ('serial', 'process')
+
+
+def migrer(elites):
+    """Migration en anneau : l'île k reçoit les élites de l'île k - 1"""
+    return [elites[k - 1] for k in range(len(elites))]
+
+
+def servir_ile(fabrique, args, canal):
+    """
+    Boucle d'une île distante : construit le contexte une fois, puis exécute
+    les messages (méthode, état, options) jusqu'à None. Chaque réponse est
+    (True, résultat) ou (False, trace de l'exception).
+    """
+    contexte = fabrique(*args)
+    try:
+        while True:
+            message = canal.recv()
+            if message is None:
+                break
+            methode, etat, options = message
+            try:
+                canal.send((True, getattr(contexte, methode)(etat, **options)))
+            except Exception:
+                canal.send((False, traceback.format_exc()))
+    except EOFError:
+        pass
+    finally:
+        canal.close()
+
+
+class TransportPipe:
+    """Îles locales : un processus par île, relié au coordinateur par multiprocessing.Pipe"""
+
+    def __init__(self, methode_demarrage=None):
+        self._mp = multiprocessing.get_context(methode_demarrage)
+        self.processus = []
+
+    def ouvrir(self, fabrique, args):
+        """Lance une île et renvoie l'extrémité coordinateur de son canal"""
+        local, distant = self._mp.Pipe()
+        processus = self._mp.Process(target=servir_ile, args=(fabrique, tuple(args), distant), daemon=True)
+        processus.start()
+        distant.close()
+        self.processus.append(processus)
+        return local
+
+    def fermer(self):
+        for processus in self.processus:
+            processus.join(timeout=5)
+            if processus.is_alive():
+                processus.terminate()
+        self.processus = []
+
+
+class Archipel:
+    """
+    Coordinateur des îles : fait avancer tous les états d'une époque avec
+    `contexte.<methode>(etat, **options)`.
+
+    - 'serial' : les îles tournent l'une après l'autre sur `contexte` ;
+    - 'process' : une île par canal ouvert par `transport` (TransportPipe par
+      défaut), construite par `fabrique(*args)` ; les époques des îles
+      s'exécutent en parallèle.
+    """
+
+    def __init__(self, iles, mode='serial', contexte=None, fabrique=None, args=(), transport=None):
+        if mode not in MODES_ILES:
+            raise ValueError(f"Mode d'îles inconnu: {mode} (attendu: {', '.join(MODES_ILES)})")
+        self.iles = iles
+        self.mode = mode
+        self.contexte = contexte
+        self.transport = None
+        self.canaux = []
+        if mode == 'process':
+            self.transport = transport if transport is not None else TransportPipe()
+            self.canaux = [self.transport.ouvrir(fabrique, args) for _ in range(iles)]
+        elif self.contexte is None:
+            self.contexte = fabrique(*args)
+
+    def epoque(self, methode, etats, **options):
+        """Nouveaux états des îles après une époque, dans l'ordre des îles"""
+        if self.mode == 'serial':
+            # Les îles utilisent les générateurs globaux : ceux du coordinateur sont mis de côté
+            aleatoire = etat_aleatoire()
+            try:
+                return [getattr(self.contexte, methode)(etat, **options) for etat in etats]
+            finally:
+                restaurer_aleatoire(aleatoire)
+
+        for canal, etat in zip(self.canaux, etats):
+            canal.send((methode, etat, options))
+        resultats = []
+        for k, canal in enumerate(self.canaux):
+            succes, valeur = canal.recv()
+            if not succes:
+                raise RuntimeError(f"Île {k}: {valeur}")
+            resultats.append(valeur)
+        return resultats
+
+    def fermer(self):
+        """Arrête les îles distantes"""
+        for canal in self.canaux:
+            try:
+                canal.send(None)
+                canal.close()
+            except OSError:
+                pass
+        self.canaux = []
+        if self.transport is not None:
+            self.transport.fermer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+        return False
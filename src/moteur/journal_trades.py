@@ -0,0 +1,411 @@
+"""
+Journal de trades en colonnes
+TradeLog remplace les listes de dicts (un dict par trade) renvoyées par les
+stratégies : chaque champ est une colonne NumPy typée, préallouée et agrandie
+par doublement (struct-of-arrays) :
+- date : horodatage int64 en ns (NaT = absent) ;
+- reel : float64 (prix, PnL, niveaux) ;
+- entier : int64 (indices de barres, quantités) ;
+- sens : int8 (LONG / SHORT, lus 'Long' / 'Short') ;
+- code : int8 (raison de sortie, symbole, booléen... ; un libellé par code).
+
+Le journal se lit encore comme l'ancienne liste de dicts (len, itération,
+trades[i]['pnl'], trades[-1]['exit_date'] = ...), mais les calculs passent
+par les colonnes (colonne('pnl')) et dataframe() le convertit en DataFrame
+sans copier les colonnes numériques.
+"""
+
+from collections.abc import Mapping
+from datetime import date as _date
+from numbers import Integral, Real
+
+import numpy as np
+import pandas as pd
+
+from .positions import LONG, SHORT, SORTIE_STOP, SORTIE_CIBLE, SORTIE_SUIVEUR, SORTIE_DUREE
+
+TYPES_COLONNES = {
+    'date': np.int64,
+    'reel': np.float64,
+    'entier': np.int64,
+    'sens': np.int8,
+    'code': np.int8,
+}
+
+# Valeur stockée pour un champ absent du trade
+NAT = np.iinfo(np.int64).min
+CODE_ABSENT = np.iinfo(np.int8).min
+ABSENTS = {
+    'date': NAT,
+    'reel': np.nan,
+    'entier': NAT,
+    'sens': CODE_ABSENT,
+    'code': CODE_ABSENT,
+}
+
+LIBELLES_SENS = {LONG: 'Long', SHORT: 'Short'}
+
+# Format des trades des optimiseurs (scripts/) et de la stratégie Sharpe 1
+COLONNES_OPTIMISEUR = {
+    'entry_date': 'date',
+    'exit_date': 'date',
+    'entry_price': 'reel',
+    'exit_price': 'reel',
+    'position': 'sens',
+    'pnl': 'reel',
+    'exit_reason': 'code',
+}
+
+# Libellés des sorties dans les trades des optimiseurs
+RAISONS_OPTIMISEUR = {
+    SORTIE_STOP: 'Stop_Loss',
+    SORTIE_CIBLE: 'Take_Profit',
+    SORTIE_SUIVEUR: 'Trailing_Stop',
+    SORTIE_DUREE: 'Time_Exit',
+}
+
+
+def type_valeur(valeur):
+    """Type de colonne déduit d'une valeur de trade"""
+    if isinstance(valeur, (pd.Timestamp, _date, np.datetime64)):
+        return 'date'
+    if isinstance(valeur, str):
+        return 'sens' if valeur in LIBELLES_SENS.values() else 'code'
+    if isinstance(valeur, (bool, np.bool_)):
+        return 'code'
+    if isinstance(valeur, Integral):
+        return 'entier'
+    if isinstance(valeur, Real):
+        return 'reel'
+    raise TypeError(f"Valeur de trade non supportée: {valeur!r} ({type(valeur).__name__})")
+
+
+def dates_ns(dates):
+    """Dates (Series, DatetimeIndex, liste...) en horodatages int64 (ns)"""
+    return np.asarray(dates, dtype='datetime64[ns]').view(np.int64)
+
+
+class Trade(Mapping):
+    """Un trade du journal, lu et modifié comme un dict (les champs absents n'y figurent pas)"""
+
+    __slots__ = ('journal', 'indice')
+
+    def __init__(self, journal, indice):
+        self.journal = journal
+        self.indice = indice
+
+    def __getitem__(self, nom):
+        return self.journal._lire(nom, self.indice)
+
+    def __setitem__(self, nom, valeur):
+        self.journal._ecrire(nom, self.indice, valeur)
+
+    def update(self, valeurs=(), **autres):
+        for nom, valeur in dict(valeurs, **autres).items():
+            self[nom] = valeur
+
+    def __iter__(self):
+        for nom in self.journal.types:
+            if not self.journal._absent(nom, self.indice):
+                yield nom
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class TradeLog:
+    """Journal de trades en colonnes typées, agrandi par doublement"""
+
+    def __init__(self, colonnes=None, libelles=None, capacite=64):
+        """
+        `colonnes` : {nom: type} (TYPES_COLONNES) ; sans schéma, les colonnes
+        sont déduites du premier trade ajouté (et des champs nouveaux ensuite).
+        `libelles` : {nom: {code: libellé}} des colonnes sens / code.
+        """
+        self.types = {}
+        self.libelles = {}
+        self._codes = {}
+        self._colonnes = {}
+        self._n = 0
+        self._capacite = max(int(capacite), 1)
+        self._vue = False
+        for nom, type_colonne in (colonnes or {}).items():
+            self._ajouter_colonne(nom, type_colonne, (libelles or {}).get(nom))
+
+    @classmethod
+    def depuis_colonnes(cls, colonnes, types, libelles=None):
+        """Journal sur des tableaux existants (même longueur), sans copie"""
+        journal = cls(types, libelles, capacite=1)
+        longueurs = {len(valeurs) for valeurs in colonnes.values()}
+        if len(longueurs) > 1:
+            raise ValueError(f"Colonnes de longueurs différentes: {sorted(longueurs)}")
+        journal._n = longueurs.pop() if longueurs else 0
+        journal._capacite = journal._n
+        for nom in journal.types:
+            if nom in colonnes:
+                journal._colonnes[nom] = np.asarray(colonnes[nom], dtype=TYPES_COLONNES[journal.types[nom]])
+            else:
+                journal._colonnes[nom] = np.full(journal._n, ABSENTS[journal.types[nom]],
+                                                 dtype=TYPES_COLONNES[journal.types[nom]])
+        journal._vue = True
+        return journal
+
+    @classmethod
+    def concatener(cls, journaux):
+        """Journal unique (copie) des trades de plusieurs journaux, dans l'ordre"""
+        journaux = list(journaux)
+        resultat = cls()
+        for journal in journaux:
+            for nom, type_colonne in journal.types.items():
+                if nom not in resultat.types:
+                    resultat._ajouter_colonne(nom, type_colonne, journal.libelles.get(nom))
+        total = sum(len(journal) for journal in journaux)
+        resultat._reserver(total)
+        for journal in journaux:
+            debut, fin = resultat._n, resultat._n + len(journal)
+            for nom in journal.types:
+                valeurs = journal.colonne(nom)
+                if nom in resultat._codes:
+                    valeurs = resultat._recoder(nom, journal, valeurs)
+                resultat._colonnes[nom][debut:fin] = valeurs
+            resultat._n = fin
+        return resultat
+
+    # --- Écriture ---
+
+    def _ajouter_colonne(self, nom, type_colonne, libelles=None):
+        if type_colonne not in TYPES_COLONNES:
+            raise ValueError(f"Type de colonne inconnu: {type_colonne} (attendu: {', '.join(TYPES_COLONNES)})")
+        self.types[nom] = type_colonne
+        self._colonnes[nom] = np.full(self._capacite, ABSENTS[type_colonne], dtype=TYPES_COLONNES[type_colonne])
+        if type_colonne in ('sens', 'code'):
+            self.libelles[nom] = dict(libelles if libelles is not None else
+                                      (LIBELLES_SENS if type_colonne == 'sens' else {}))
+            self._codes[nom] = {libelle: code for code, libelle in self.libelles[nom].items()}
+
+    def _detacher(self):
+        """Copie propre des colonnes et du schéma avant toute écriture dans une vue"""
+        if self._vue:
+            self._capacite = max(self._n, 1)
+            self._colonnes = {nom: valeurs[:self._n].copy() for nom, valeurs in self._colonnes.items()}
+            self.types = dict(self.types)
+            self.libelles = {nom: dict(libelles) for nom, libelles in self.libelles.items()}
+            self._codes = {nom: dict(codes) for nom, codes in self._codes.items()}
+            self._vue = False
+
+    def _reserver(self, n):
+        self._detacher()
+        if n <= self._capacite:
+            return
+        capacite = max(n, 2 * self._capacite)
+        for nom, valeurs in self._colonnes.items():
+            agrandi = np.full(capacite, ABSENTS[self.types[nom]], dtype=valeurs.dtype)
+            agrandi[:self._n] = valeurs[:self._n]
+            self._colonnes[nom] = agrandi
+        self._capacite = capacite
+
+    def _code(self, nom, valeur):
+        """Code int8 d'un libellé (nouveau code pour un libellé inconnu)"""
+        codes = self._codes[nom]
+        if valeur in codes:
+            return codes[valeur]
+        if isinstance(valeur, Integral) and not isinstance(valeur, bool) and valeur in self.libelles[nom]:
+            return valeur
+        code = max([*self.libelles[nom], -1]) + 1
+        if code > np.iinfo(np.int8).max:
+            raise ValueError(f"Trop de libellés distincts pour la colonne {nom}")
+        self.libelles[nom][code] = valeur
+        codes[valeur] = code
+        return code
+
+    def _recoder(self, nom, journal, valeurs):
+        """Codes d'un autre journal traduits dans le vocabulaire de celui-ci"""
+        if journal.libelles[nom] == self.libelles[nom]:
+            return valeurs
+        table = {code: self._code(nom, libelle) for code, libelle in journal.libelles[nom].items()}
+        table[CODE_ABSENT] = CODE_ABSENT
+        return np.array([table[int(code)] for code in valeurs], dtype=np.int8)
+
+    def _encoder(self, nom, valeur):
+        type_colonne = self.types[nom]
+        if valeur is None:
+            return ABSENTS[type_colonne]
+        if type_colonne == 'date':
+            return NAT if pd.isna(valeur) else pd.Timestamp(valeur).value
+        if type_colonne == 'reel':
+            return float(valeur)
+        if type_colonne == 'entier':
+            if not isinstance(valeur, Integral):
+                # Valeur non entière : la colonne passe en réels
+                self.types[nom] = 'reel'
+                valeurs = self._colonnes[nom].astype(np.float64)
+                valeurs[self._colonnes[nom] == NAT] = np.nan
+                self._colonnes[nom] = valeurs
+                return float(valeur)
+            return int(valeur)
+        return self._code(nom, valeur)
+
+    def _ecrire(self, nom, indice, valeur):
+        self._detacher()
+        if nom not in self.types:
+            if valeur is None:
+                return
+            self._ajouter_colonne(nom, type_valeur(valeur))
+        self._colonnes[nom][indice] = self._encoder(nom, valeur)
+
+    def append(self, trade):
+        """Ajoute un trade (dict champ -> valeur), comme list.append"""
+        self._reserver(self._n + 1)
+        indice = self._n
+        self._n += 1
+        for nom, valeur in trade.items():
+            self._ecrire(nom, indice, valeur)
+
+    def ajouter(self, **champs):
+        """Ajoute un trade donné champ par champ"""
+        self.append(champs)
+
+    # --- Lecture ---
+
+    def __len__(self):
+        return self._n
+
+    def _indice(self, indice):
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError("indice de trade hors du journal")
+        return indice
+
+    def _absent(self, nom, indice):
+        valeur = self._colonnes[nom][indice]
+        return self.types[nom] != 'reel' and valeur == ABSENTS[self.types[nom]]
+
+    def _lire(self, nom, indice):
+        if nom not in self.types or self._absent(nom, indice):
+            raise KeyError(nom)
+        valeur = self._colonnes[nom][indice]
+        type_colonne = self.types[nom]
+        if type_colonne == 'date':
+            return pd.Timestamp(int(valeur))
+        if type_colonne in ('sens', 'code'):
+            return self.libelles[nom][int(valeur)]
+        return valeur.item()
+
+    def __getitem__(self, cle):
+        """Trade (int), vue sans copie (slice) ou sélection copiée (masque / indices)"""
+        if isinstance(cle, slice):
+            debut, fin, pas = cle.indices(self._n)
+            if pas != 1:
+                return self.selection(np.arange(debut, fin, pas))
+            return self.vue(debut, fin)
+        if isinstance(cle, (Integral, np.integer)):
+            return Trade(self, self._indice(int(cle)))
+        return self.selection(cle)
+
+    def __iter__(self):
+        for indice in range(self._n):
+            yield Trade(self, indice)
+
+    def __repr__(self):
+        return f"TradeLog({self._n} trades, colonnes={list(self.types)})"
+
+    def colonne(self, nom):
+        """Colonne brute (vue NumPy sans copie) : int64 ns pour les dates, int8 pour sens et codes"""
+        return self._colonnes[nom][:self._n]
+
+    def valeurs(self, nom):
+        """Colonne lisible : datetime64[ns] pour les dates, libellés pour sens et codes"""
+        type_colonne = self.types[nom]
+        valeurs = self.colonne(nom)
+        if type_colonne == 'date':
+            return valeurs.view('datetime64[ns]')
+        if type_colonne in ('sens', 'code'):
+            libelles = self.libelles[nom]
+            return np.array([libelles.get(int(code)) for code in valeurs], dtype=object)
+        if type_colonne == 'entier' and (valeurs == NAT).any():
+            return np.where(valeurs == NAT, np.nan, valeurs)
+        return valeurs
+
+    def dataframe(self, libelles=False):
+        """
+        DataFrame des trades. Les colonnes numériques et les dates (datetime64)
+        sont des vues sans copie ; sens et codes restent en int8, ou sont
+        convertis en libellés avec `libelles` (format des anciennes listes de dicts).
+        """
+        colonnes = {}
+        for nom, type_colonne in self.types.items():
+            if type_colonne == 'date':
+                colonnes[nom] = self.colonne(nom).view('datetime64[ns]')
+            elif libelles:
+                colonnes[nom] = self.valeurs(nom)
+            else:
+                colonnes[nom] = self.colonne(nom)
+        return pd.DataFrame(colonnes, copy=False)
+
+    def vue(self, debut=0, fin=None):
+        """Trades [debut, fin) sans copie (copiés à la première écriture)"""
+        fin = self._n if fin is None else min(fin, self._n)
+        vue = TradeLog.__new__(TradeLog)
+        # Schéma propre : un élargissement ou une colonne ajoutée d'un côté ne touche pas l'autre
+        vue.types = dict(self.types)
+        vue.libelles = self.libelles
+        vue._codes = self._codes
+        vue._colonnes = {nom: valeurs[debut:fin] for nom, valeurs in self._colonnes.items()}
+        vue._n = max(fin - debut, 0)
+        vue._capacite = vue._n
+        vue._vue = True
+        return vue
+
+    def selection(self, indices):
+        """Trades désignés par un masque booléen ou des indices (copie)"""
+        indices = np.asarray(indices)
+        selection = TradeLog.__new__(TradeLog)
+        selection.types = dict(self.types)
+        selection.libelles = {nom: dict(libelles) for nom, libelles in self.libelles.items()}
+        selection._codes = {nom: dict(codes) for nom, codes in self._codes.items()}
+        selection._colonnes = {nom: self.colonne(nom)[indices] for nom in self.types}
+        selection._n = len(next(iter(selection._colonnes.values()))) if selection._colonnes else 0
+        selection._capacite = max(selection._n, 1)
+        selection._vue = False
+        return selection
+
+    def __getstate__(self):
+        # Seuls les trades écrits sont sérialisés (pas la capacité réservée)
+        return {
+            'types': self.types,
+            'libelles': self.libelles,
+            'colonnes': {nom: self.colonne(nom).copy() for nom in self.types},
+        }
+
+    def __setstate__(self, etat):
+        self.types = dict(etat['types'])
+        self.libelles = {nom: dict(libelles) for nom, libelles in etat['libelles'].items()}
+        self._codes = {nom: {libelle: code for code, libelle in libelles.items()}
+                       for nom, libelles in self.libelles.items()}
+        self._colonnes = etat['colonnes']
+        self._n = len(next(iter(self._colonnes.values()))) if self._colonnes else 0
+        self._capacite = max(self._n, 1)
+        self._vue = False
+
+
+def journal_optimiseur(capacite=64):
+    """TradeLog vide au format des trades des optimiseurs"""
+    return TradeLog(COLONNES_OPTIMISEUR, {'exit_reason': RAISONS_OPTIMISEUR}, capacite)
+
+
+def colonne_trades(trades, nom, dtype=np.float64):
+    """Colonne `nom` d'un TradeLog (sans copie) ou d'une liste de dicts de trades"""
+    if isinstance(trades, TradeLog):
+        return trades.colonne(nom)
+    return np.array([trade[nom] for trade in trades], dtype=dtype)
+
+
+def dataframe_trades(trades):
+    """DataFrame (format des dicts de trades) d'un TradeLog ou d'une liste de dicts"""
+    if isinstance(trades, TradeLog):
+        return trades.dataframe(libelles=True)
+    return pd.DataFrame(trades)
@@ -0,0 +1,119 @@
+"""
+Métriques de performance sur tableaux de PnL
+Un journal de trades se réduit à sa colonne de PnL (en %). Un lot de journaux
+(un par individu d'une population) est un tableau de PnL concaténés découpé
+par `offsets` (N + 1,), comme le journal de `simuler_lot` : toutes les
+métriques du lot sont calculées ensemble, sans DataFrame ni boucle Python.
+
+Définitions (identiques à calculate_metrics) :
+- drawdown : plus forte baisse relative (%) du PnL cumulé sous son plus haut ;
+- sharpe (simplifié) : PnL total / écart-type des PnL ;
+- profit factor : gains / pertes (infini sans perte) ;
+- calmar : PnL total / drawdown maximum.
+"""
+
+import numpy as np
+
+# Métriques d'un journal, dans l'ordre des dicts de calculate_metrics
+CLES_METRIQUES = (
+    'total_trades',
+    'winning_trades',
+    'losing_trades',
+    'win_rate',
+    'total_return',
+    'avg_win',
+    'avg_loss',
+    'profit_factor',
+    'max_drawdown',
+    'sharpe_ratio',
+    'calmar_ratio',
+)
+
+CLES_ENTIERES = ('total_trades', 'winning_trades', 'losing_trades')
+
+
+def metriques_lot(pnl, offsets):
+    """
+    Métriques de chaque journal du lot : dict {métrique: tableau (N,)}.
+    Le journal k est pnl[offsets[k]:offsets[k + 1]] ; un journal vide a
+    toutes ses métriques à zéro. Contient aussi l'écart-type des PnL
+    ('ecart_type', NaN sous deux trades).
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n_lots = len(offsets) - 1
+    longueurs = np.diff(offsets)
+    lot = np.repeat(np.arange(n_lots), longueurs)
+    non_vide = longueurs > 0
+
+    def somme(valeurs):
+        return np.bincount(lot, weights=valeurs, minlength=n_lots)
+
+    gagnants = pnl > 0
+    perdants = pnl < 0
+    winning = np.bincount(lot[gagnants], minlength=n_lots)
+    losing = np.bincount(lot[perdants], minlength=n_lots)
+    gains = somme(np.where(gagnants, pnl, 0.0))
+    pertes = somme(np.where(perdants, pnl, 0.0))
+
+    # PnL cumulé par journal : une ligne par journal, complétée au-delà de sa longueur
+    largeur = int(longueurs.max()) if n_lots and len(pnl) else 1
+    valides = np.arange(largeur) < longueurs[:, None]
+    matrice = np.zeros((n_lots, largeur))
+    matrice[valides] = pnl
+    cumul = np.cumsum(matrice, axis=1)
+    sommet = np.maximum.accumulate(cumul, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(valides, (cumul - sommet) / sommet * 100, np.nan)
+        max_drawdown = np.where(non_vide, np.abs(np.fmin.reduce(drawdown, axis=1)), 0.0)
+
+        total = np.where(non_vide, cumul[np.arange(n_lots), np.maximum(longueurs - 1, 0)], 0.0)
+        moyenne = total / longueurs
+        ecarts = pnl - moyenne[lot]
+        ecart_type = np.sqrt(somme(ecarts * ecarts) / (longueurs - 1))
+        ecart_type[longueurs < 2] = np.nan
+
+        return {
+            'total_trades': longueurs,
+            'winning_trades': winning,
+            'losing_trades': losing,
+            'win_rate': np.where(non_vide, winning / longueurs * 100, 0.0),
+            'total_return': total,
+            'avg_win': np.where(winning > 0, gains / winning, 0.0),
+            'avg_loss': np.where(losing > 0, pertes / losing, 0.0),
+            'profit_factor': np.where(pertes < 0, gains / -pertes, np.where(non_vide, np.inf, 0.0)),
+            'max_drawdown': max_drawdown,
+            'sharpe_ratio': np.where(ecart_type > 0, total / ecart_type, 0.0),
+            'calmar_ratio': np.where(max_drawdown > 0, total / max_drawdown, 0.0),
+            'ecart_type': ecart_type,
+        }
+
+
+def metriques_individu(metriques, k):
+    """Dict de métriques (scalaires Python, clés CLES_METRIQUES) du journal k d'un lot"""
+    return {cle: (int if cle in CLES_ENTIERES else float)(metriques[cle][k]) for cle in CLES_METRIQUES}
+
+
+def metriques_pnl(pnl):
+    """Métriques d'un seul journal de PnL"""
+    return metriques_individu(metriques_lot(pnl, [0, len(pnl)]), 0)
+
+
+def metriques_journal(journal, pnl_pct=True):
+    """Métriques de chaque individu d'un journal de lot (`simuler_lot`), PnL en % par défaut"""
+    rendement = journal['rendement'] * 100 if pnl_pct else journal['rendement']
+    return metriques_lot(rendement, journal['offsets'])
+
+
+def empiler_metriques(liste_metriques):
+    """Dicts de métriques (un par individu) réunis en un dict de tableaux, comme metriques_lot"""
+    return {cle: np.array([metriques[cle] for metriques in liste_metriques]) for cle in liste_metriques[0]}
+
+
+def offsets_journaux(journaux):
+    """(PnL concaténés, offsets) d'une liste de journaux de PnL"""
+    longueurs = [len(pnl) for pnl in journaux]
+    offsets = np.concatenate(([0], np.cumsum(longueurs, dtype=np.int64)))
+    pnl = np.concatenate(journaux) if journaux else np.zeros(0)
+    return np.asarray(pnl, dtype=np.float64), offsets
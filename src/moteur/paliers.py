@@ -0,0 +1,110 @@
+"""
+Élimination successive (successive halving) des jeux de paramètres
+La plupart des candidats tirés au hasard sont mauvais dès le début de la
+série : au lieu de backtester chacun sur toutes les barres, la cohorte est
+évaluée sur des préfixes de plus en plus longs (les paliers) et seul le
+meilleur 1 / `eta` de chaque palier passe au suivant. Avec eta = 3 et les
+paliers 1/9, 1/3, 1, une cohorte coûte environ le tiers de son évaluation
+complète.
+
+- un palier est une fraction de la fenêtre évaluée ; le dernier vaut 1 :
+  les survivants reçoivent leur vrai résultat (fitness, métriques) ;
+- les éliminés reçoivent un résultat `Elimine` (fitness -inf, pas de
+  métriques) : un optimiseur les traite comme des individus invalides, et un
+  cache ne doit pas le mémoriser (il dépend de la cohorte) ;
+- les individus dont le résultat complet est déjà connu (élites recopiés)
+  sont exemptés : un préfixe bruité ne peut pas écarter le meilleur connu ;
+- les indicateurs étant causaux, un préfixe est évalué exactement comme le
+  début de la série complète (aucune information future).
+"""
+
+import numpy as np
+
+# Facteur d'élimination et fractions de la série évaluées à chaque palier
+ETA = 3
+PALIERS = (1 / 9, 1 / 3, 1.0)
+
+# Barres minimales d'un palier partiel (chauffe des indicateurs et quelques trades)
+MIN_BARRES_PALIER = 200
+
+
+class Elimine(tuple):
+    """Résultat (fitness, métriques) d'un individu éliminé avant le dernier palier"""
+
+    def __new__(cls):
+        return super().__new__(cls, (float('-inf'), None))
+
+    def __getnewargs__(self):
+        return ()
+
+
+def paliers_geometriques(n_paliers=3, eta=ETA):
+    """Fractions 1/eta^(n-1), ..., 1/eta, 1"""
+    return tuple(float(eta) ** -k for k in range(n_paliers - 1, -1, -1))
+
+
+def barres_paliers(n_barres, paliers=PALIERS, minimum=MIN_BARRES_PALIER):
+    """
+    Barres évaluées à chaque palier (None pour la série complète) ; les paliers
+    partiels trop courts ou qui couvrent déjà toute la série sont omis
+    """
+    barres = []
+    for fraction in paliers[:-1]:
+        n = int(n_barres * fraction)
+        if minimum <= n < n_barres and (not barres or n > barres[-1]):
+            barres.append(n)
+    return barres + [None]
+
+
+def elimination_successive(population, evaluer, barres, eta=ETA, acquis=None):
+    """
+    Résultats de la population, dans l'ordre, et palier atteint par chaque
+    individu. `evaluer(individus, n_barres)` renvoie la liste alignée des
+    (fitness, métriques) sur les `n_barres` premières barres (None : toutes) ;
+    après chaque palier partiel, les max(1, ⌈n / eta⌉) meilleurs continuent.
+    `acquis` : {position: résultat complet} des individus exemptés, qui gardent
+    ce résultat sans passer par les paliers ; les autres forment la cohorte.
+    """
+    population = list(population)
+    acquis = acquis or {}
+    resultats = [acquis[k] if k in acquis else Elimine() for k in range(len(population))]
+    atteints = np.zeros(len(population), dtype=np.int64)
+    atteints[list(acquis)] = len(barres) - 1
+    indices = np.array([k for k in range(len(population)) if k not in acquis], dtype=np.int64)
+    for palier, n_barres in enumerate(barres):
+        if not len(indices):
+            break
+        scores = evaluer([population[k] for k in indices], n_barres)
+        atteints[indices] = palier
+        if palier == len(barres) - 1:
+            for k, resultat in zip(indices, scores):
+                resultats[k] = resultat
+            break
+        fitness = np.array([resultat[0] for resultat in scores], dtype=np.float64)
+        gardes = max(1, -(-len(indices) // eta))
+        # Tri stable : à égalité, l'ordre de la population départage
+        meilleurs = np.argsort(-np.nan_to_num(fitness, nan=-np.inf), kind='stable')[:gardes]
+        indices = np.sort(indices[meilleurs])
+    return resultats, atteints
+
+
+def evaluer_avec_elimination(cache, strategie, empreinte, population, evaluer_barres, n_barres,
+                             paliers=PALIERS, eta=ETA, acquis=None):
+    """
+    Résultats de `population` par élimination successive de la cohorte, le
+    cache de fitness (clé stratégie / empreinte) ne servant qu'à éviter des
+    backtests : un individu dont le résultat complet est en cache est classé
+    aux paliers partiels comme les autres, si bien que le résultat ne dépend
+    pas du contenu du cache (même graine, même sortie, cache vide ou
+    persisté). Seuls les individus de `acquis` (résultats reportés par
+    l'optimiseur, voir resultats_acquis) sont exemptés des paliers.
+    `evaluer_barres(individus, barres)` backteste sur les `barres` premières
+    des `n_barres` barres (None : toutes). Les paliers partiels ont leur
+    propre empreinte dans le cache ; seuls les survivants du dernier palier y
+    ont leur résultat complet, les éliminés n'y sont pas écrits.
+    """
+    def evaluer(individus, barres):
+        cle = empreinte if barres is None else f"{empreinte}/{barres}b"
+        return cache.evaluer(strategie, cle, individus, lambda manquants: evaluer_barres(manquants, barres))
+
+    return elimination_successive(population, evaluer, barres_paliers(n_barres, paliers), eta, acquis)[0]
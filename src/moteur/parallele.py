@@ -0,0 +1,156 @@
+"""
+Évaluation parallèle des populations
+Un optimiseur évalue ses individus en série, dans un pool de threads ou dans un
+pool de processus sans changer son code : il passe par `ParallelEvaluator`.
+
+En mode processus, chaque worker construit une seule fois son contexte
+d'évaluation (typiquement l'optimiseur lui-même, dont les données sont servies
+par le cache mappé de `donnees`), puis ne reçoit que des jeux de paramètres et
+ne renvoie que fitness et métriques. Les tirages aléatoires restent dans le
+processus principal et l'ordre des résultats est conservé : pour une graine
+donnée, les résultats sont identiques au mode série.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+MODES_EVALUATION = ('serial', 'thread', 'process')
+
+# Contexte d'évaluation propre à chaque processus worker
+_contexte_worker = None
+
+
+def _installer_contexte(fabrique, args):
+    """Initialiseur des workers : construit le contexte (chargement des données)"""
+    global _contexte_worker
+    _contexte_worker = fabrique(*args)
+
+
+def _identite(objet):
+    return objet
+
+
+def _appeler_contexte(methode, tranche, args):
+    return getattr(_contexte_worker, methode)(tranche, *args)
+
+
+def decouper(elements, n_tranches):
+    """Découpe une liste en au plus `n_tranches` tranches contiguës de tailles équilibrées"""
+    elements = list(elements)
+    n_tranches = max(1, min(n_tranches, len(elements)))
+    taille, reste = divmod(len(elements), n_tranches)
+    tranches = []
+    debut = 0
+    for k in range(n_tranches):
+        fin = debut + taille + (1 if k < reste else 0)
+        tranches.append(elements[debut:fin])
+        debut = fin
+    return tranches
+
+
+def parametres_individus(population, exclus=('metrics', 'fitness')):
+    """Copies des individus (dicts) réduites à leurs paramètres : seules données envoyées aux workers"""
+    return [{k: v for k, v in individu.items() if k not in exclus} for individu in population]
+
+
+def resultats_acquis(population):
+    """
+    Résultats complets déjà reportés sur les individus (élites recopiés d'une
+    génération à l'autre) : {position: (fitness, métriques)}
+    """
+    return {k: (individu['fitness'], individu['metrics'])
+            for k, individu in enumerate(population) if 'metrics' in individu and 'fitness' in individu}
+
+
+def reporter_resultats(population, resultats):
+    """
+    Reporte les couples (fitness, métriques) renvoyés par les workers sur les
+    individus, comme le faisait l'évaluation en place (métriques et fitness
+    ne sont écrites que pour une évaluation réussie). Retourne les fitness.
+    """
+    fitness_scores = []
+    for individu, (fitness, metrics) in zip(population, resultats):
+        if metrics is not None:
+            individu['metrics'] = dict(metrics)
+            individu['fitness'] = fitness
+        fitness_scores.append(fitness)
+    return fitness_scores
+
+
+class ParallelEvaluator:
+    """
+    Évaluateur de population enfichable : 'serial', 'thread' ou 'process'.
+
+    - `contexte` : objet d'évaluation déjà construit (utilisé tel quel en série
+      et en threads, copié une fois par worker en mode processus) ;
+    - `fabrique`, `args` : alternative picklable pour construire le contexte
+      directement dans chaque worker (préchargement des données côté worker).
+    """
+
+    def __init__(self, mode='serial', workers=None, contexte=None, fabrique=None, args=(),
+                 tranches_par_worker=1):
+        if mode not in MODES_EVALUATION:
+            raise ValueError(f"Mode d'évaluation inconnu: {mode} (attendu: {', '.join(MODES_EVALUATION)})")
+        self.mode = mode
+        self.workers = 1 if mode == 'serial' else max(1, workers or os.cpu_count() or 1)
+        self.tranches_par_worker = tranches_par_worker
+        self.contexte = contexte
+        self._pool = None
+
+        if mode == 'process':
+            if fabrique is None and contexte is not None:
+                fabrique, args = _identite, (contexte,)
+            initialisation = {}
+            if fabrique is not None:
+                initialisation = {'initializer': _installer_contexte, 'initargs': (fabrique, tuple(args))}
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, **initialisation)
+        else:
+            if self.contexte is None and fabrique is not None:
+                self.contexte = fabrique(*args)
+            if mode == 'thread':
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def map(self, fonction, elements):
+        """Équivalent ordonné de `map` (compatible `toolbox.register("map", ...)` de DEAP)"""
+        elements = list(elements)
+        if self._pool is None:
+            return [fonction(element) for element in elements]
+        taille = max(1, len(elements) // (self.workers * 4))
+        return list(self._pool.map(fonction, elements, chunksize=taille))
+
+    def evaluer(self, methode, population, *args):
+        """
+        Appelle `contexte.<methode>(tranche, *args)` sur des tranches contiguës de
+        la population et concatène les listes renvoyées, dans l'ordre.
+        En série, la population entière forme une seule tranche.
+        """
+        population = list(population)
+        if not population:
+            return []
+        if self._pool is None:
+            return list(getattr(self.contexte, methode)(population, *args))
+
+        tranches = decouper(population, self.workers * self.tranches_par_worker)
+        if self.mode == 'thread':
+            fonction = getattr(self.contexte, methode)
+            futures = [self._pool.submit(fonction, tranche, *args) for tranche in tranches]
+        else:
+            futures = [self._pool.submit(_appeler_contexte, methode, tranche, args) for tranche in tranches]
+
+        resultats = []
+        for future in futures:
+            resultats.extend(future.result())
+        return resultats
+
+    def fermer(self):
+        """Arrête le pool de workers"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+        return False
@@ -0,0 +1,261 @@
+"""
+Machine à états des positions sur colonnes NumPy
+Remplace les boucles `for i in range(1, len(df))` à base de `df.loc[i, ...]` :
+les signaux sont calculés une fois de façon vectorisée, puis une seule boucle
+parcourt des listes Python de floats (accès O(1) sans indexation pandas) et
+saute directement au prochain signal quand aucune position n'est ouverte.
+
+Le résultat est un journal de trades en colonnes (dict de tableaux NumPy).
+"""
+
+from bisect import bisect_left
+
+import numpy as np
+
+# Sens de la position
+LONG = 1
+SHORT = -1
+
+# Codes de sortie
+SORTIE_STOP = 1      # stop loss (fixe ou suiveur selon `stop_suiveur`)
+SORTIE_CIBLE = 2     # objectif de profit
+SORTIE_SUIVEUR = 3   # trailing stop séparé du stop loss
+SORTIE_SIGNAL = 4    # signal opposé
+SORTIE_FIN = 5       # position clôturée sur la dernière barre
+SORTIE_DUREE = 6     # durée de détention maximale atteinte
+
+# Traitement du signal opposé en position
+OPPOSE_IGNORE = 0    # le signal opposé n'a aucun effet
+OPPOSE_SORTIE = 1    # sortie au prix de clôture, retour à plat
+OPPOSE_INVERSION = 2 # sortie au prix de clôture et entrée inverse sur la même barre
+
+COLONNES_JOURNAL = (
+    'entree_idx', 'sortie_idx', 'sens', 'prix_entree', 'prix_sortie',
+    'stop_initial', 'cible', 'suiveur_initial', 'code_sortie', 'rendement'
+)
+
+
+def _journal(colonnes):
+    """Convertit les listes accumulées en colonnes typées"""
+    entree_idx, sortie_idx, sens, prix_entree, prix_sortie, stop_initial, cible, suiveur, code = colonnes
+    prix_entree = np.array(prix_entree, dtype=np.float64)
+    prix_sortie = np.array(prix_sortie, dtype=np.float64)
+    sens = np.array(sens, dtype=np.int8)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rendement = np.where(sens == LONG,
+                             (prix_sortie - prix_entree) / prix_entree,
+                             (prix_entree - prix_sortie) / prix_entree)
+    return {
+        'entree_idx': np.array(entree_idx, dtype=np.int64),
+        'sortie_idx': np.array(sortie_idx, dtype=np.int64),
+        'sens': sens,
+        'prix_entree': prix_entree,
+        'prix_sortie': prix_sortie,
+        'stop_initial': np.array(stop_initial, dtype=np.float64),
+        'cible': np.array(cible, dtype=np.float64),
+        'suiveur_initial': np.array(suiveur, dtype=np.float64),
+        'code_sortie': np.array(code, dtype=np.int8),
+        'rendement': rendement,
+    }
+
+
+def _identifiants_periodes(cles):
+    """Numérote les périodes successives (jour, semaine...) : +1 à chaque changement de clé"""
+    cles = np.asarray(cles)
+    ids = np.zeros(len(cles), dtype=np.int64)
+    if len(cles) > 1:
+        ids[1:] = np.cumsum(cles[1:] != cles[:-1])
+    return ids
+
+
+def simuler_positions(close, high, low, atr, signal_long, signal_short,
+                      stop_atr, cible_atr, stop_suiveur=False, trailing_atr=None,
+                      sur_cloture=False, signal_oppose=OPPOSE_IGNORE,
+                      cloturer_fin=False, debut=1,
+                      jours=None, semaines=None, max_perte_jour=None,
+                      max_perte_semaine=None, max_pertes_consecutives=None):
+    """
+    Simule une stratégie à une position (long / short / plat) barre par barre.
+
+    À plat, on entre au prix de clôture sur `signal_long` (prioritaire) ou
+    `signal_short` avec un stop à `stop_atr` ATR et un objectif à `cible_atr` ATR.
+    En position, dans l'ordre :
+    - mise à jour du stop (si `stop_suiveur`) et du trailing stop séparé
+      (si `trailing_atr`) à partir du prix de clôture ;
+    - sortie sur stop, puis objectif, puis trailing stop : testés sur la clôture
+      (`sur_cloture=True`) ou sur les extrêmes High / Low de la barre ;
+    - signal opposé selon `signal_oppose` (ignoré, sortie ou inversion).
+
+    Garde de risque optionnelle (préservation du capital) : `jours` / `semaines`
+    sont des clés de période par barre ; une barre est ignorée entièrement tant
+    que la perte cumulée du jour / de la semaine dépasse son plafond ou que le
+    nombre de stops consécutifs atteint `max_pertes_consecutives`.
+
+    Retourne un journal en colonnes (voir COLONNES_JOURNAL), rendements en fraction.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    atr_l = np.asarray(atr, dtype=np.float64).tolist()
+    close_l = close.tolist()
+    if sur_cloture:
+        high_l = low_l = close_l
+    else:
+        high_l = np.asarray(high, dtype=np.float64).tolist()
+        low_l = np.asarray(low, dtype=np.float64).tolist()
+    long_l = np.asarray(signal_long, dtype=bool).tolist()
+    short_l = np.asarray(signal_short, dtype=bool).tolist()
+
+    # Barres candidates à une entrée : permet de sauter les zones sans signal
+    candidats = np.flatnonzero(np.asarray(signal_long, dtype=bool) | np.asarray(signal_short, dtype=bool))
+    candidats = candidats[candidats >= debut].tolist()
+
+    garde = jours is not None or semaines is not None or max_pertes_consecutives is not None
+    id_jour = _identifiants_periodes(jours).tolist() if jours is not None else None
+    id_semaine = _identifiants_periodes(semaines).tolist() if semaines is not None else None
+    plafond_jour = max_perte_jour if max_perte_jour is not None else float('inf')
+    plafond_semaine = max_perte_semaine if max_perte_semaine is not None else float('inf')
+    plafond_pertes = max_pertes_consecutives if max_pertes_consecutives is not None else float('inf')
+    pnl_jour = pnl_semaine = 0.0
+    jour_courant = semaine_courante = None
+    pertes_consecutives = 0
+
+    colonnes = tuple([] for _ in range(9))
+    (c_entree, c_sortie, c_sens, c_prix_entree, c_prix_sortie,
+     c_stop, c_cible, c_suiveur, c_code) = colonnes
+
+    position = 0
+    entry_price = stop = cible = trailing = 0.0
+    i = debut
+    while i < n:
+        if position == 0 and not garde:
+            # Saut direct au prochain signal d'entrée
+            k = bisect_left(candidats, i)
+            if k == len(candidats):
+                break
+            i = candidats[k]
+
+        if garde:
+            if id_jour is not None and id_jour[i] != jour_courant:
+                pnl_jour = 0.0
+                jour_courant = id_jour[i]
+            if id_semaine is not None and id_semaine[i] != semaine_courante:
+                pnl_semaine = 0.0
+                semaine_courante = id_semaine[i]
+            if (abs(pnl_jour) > plafond_jour or abs(pnl_semaine) > plafond_semaine or
+                    pertes_consecutives >= plafond_pertes):
+                i += 1
+                continue
+
+        prix = close_l[i]
+        entree = 0
+        if position == 0:
+            if long_l[i]:
+                entree = LONG
+            elif short_l[i]:
+                entree = SHORT
+        else:
+            a = atr_l[i]
+            code = 0
+            if position == LONG:
+                if stop_suiveur:
+                    nouveau = prix - stop_atr * a
+                    if nouveau > stop:
+                        stop = nouveau
+                if trailing_atr is not None:
+                    nouveau = prix - trailing_atr * a
+                    if nouveau > trailing:
+                        trailing = nouveau
+                if low_l[i] <= stop:
+                    code, sortie = SORTIE_STOP, stop
+                elif high_l[i] >= cible:
+                    code, sortie = SORTIE_CIBLE, cible
+                elif trailing_atr is not None and low_l[i] <= trailing:
+                    code, sortie = SORTIE_SUIVEUR, trailing
+                elif signal_oppose and short_l[i]:
+                    code, sortie = SORTIE_SIGNAL, prix
+                    if signal_oppose == OPPOSE_INVERSION:
+                        entree = SHORT
+            else:
+                if stop_suiveur:
+                    nouveau = prix + stop_atr * a
+                    if nouveau < stop:
+                        stop = nouveau
+                if trailing_atr is not None:
+                    nouveau = prix + trailing_atr * a
+                    if nouveau < trailing:
+                        trailing = nouveau
+                if high_l[i] >= stop:
+                    code, sortie = SORTIE_STOP, stop
+                elif low_l[i] <= cible:
+                    code, sortie = SORTIE_CIBLE, cible
+                elif trailing_atr is not None and high_l[i] >= trailing:
+                    code, sortie = SORTIE_SUIVEUR, trailing
+                elif signal_oppose and long_l[i]:
+                    code, sortie = SORTIE_SIGNAL, prix
+                    if signal_oppose == OPPOSE_INVERSION:
+                        entree = LONG
+
+            if code:
+                c_sortie.append(i)
+                c_prix_sortie.append(sortie)
+                c_code.append(code)
+                if garde:
+                    pnl = ((sortie - entry_price) if position == LONG else (entry_price - sortie)) / entry_price
+                    pnl_jour += pnl
+                    pnl_semaine += pnl
+                    if code == SORTIE_STOP:
+                        pertes_consecutives += 1
+                    else:
+                        pertes_consecutives = 0
+                position = 0
+
+        if entree:
+            a = atr_l[i]
+            position = entree
+            entry_price = prix
+            if entree == LONG:
+                stop = entry_price - stop_atr * a
+                cible = entry_price + cible_atr * a
+                trailing = entry_price - trailing_atr * a if trailing_atr is not None else np.nan
+            else:
+                stop = entry_price + stop_atr * a
+                cible = entry_price - cible_atr * a
+                trailing = entry_price + trailing_atr * a if trailing_atr is not None else np.nan
+            c_entree.append(i)
+            c_sens.append(entree)
+            c_prix_entree.append(entry_price)
+            c_stop.append(stop)
+            c_cible.append(cible)
+            c_suiveur.append(trailing)
+
+        i += 1
+
+    if position != 0:
+        if cloturer_fin:
+            c_sortie.append(n - 1)
+            c_prix_sortie.append(close_l[n - 1])
+            c_code.append(SORTIE_FIN)
+        else:
+            # Position encore ouverte non journalisée (comme les boucles d'origine)
+            for colonne in (c_entree, c_sens, c_prix_entree, c_stop, c_cible, c_suiveur):
+                colonne.pop()
+
+    return _journal(colonnes)
+
+
+def croisement_haussier(valeurs, niveau):
+    """valeurs[i-1] < niveau[i-1] et valeurs[i] >= niveau[i] (cassure par le haut, False en 0)"""
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    niveau = np.asarray(niveau, dtype=np.float64)
+    out = np.zeros(len(valeurs), dtype=bool)
+    out[1:] = (valeurs[:-1] < niveau[:-1]) & (valeurs[1:] >= niveau[1:])
+    return out
+
+
+def croisement_baissier(valeurs, niveau):
+    """valeurs[i-1] > niveau[i-1] et valeurs[i] <= niveau[i] (cassure par le bas, False en 0)"""
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    niveau = np.asarray(niveau, dtype=np.float64)
+    out = np.zeros(len(valeurs), dtype=bool)
+    out[1:] = (valeurs[:-1] > niveau[:-1]) & (valeurs[1:] <= niveau[1:])
+    return out
@@ -0,0 +1,113 @@
+"""
+Rejeu de barres pour les stratégies temps réel
+Une stratégie « live » reçoit les barres clôturées une à une par l'interface
+à événements `on_bar(date, open, high, low, close, volume)`, qui renvoie sa
+décision (trade ouvert ou fermé) ou None. Le rejeu lui envoie les barres d'une
+série aussi vite que possible et chronomètre chaque décision :
+
+- histogramme des latences par barre (compartiments de puissances de 2 µs) et
+  percentiles p50 / p99 / max ;
+- débit du rejeu complet en barres/s (alimentation comprise) ;
+- les barres de chauffe passent par `update_indicators` (mêmes arguments),
+  sans décision de trading ni chronométrage ;
+- aucun affichage : une stratégie construite en mode silencieux se mesure
+  sans le coût des sorties console (benchmarks/suite.py, section rejeu).
+"""
+
+import time
+
+import numpy as np
+
+# Percentiles rapportés pour les latences par barre
+PERCENTILES_LATENCE = (50, 99)
+
+
+def evenements_barres(df):
+    """Arguments de `on_bar` de chaque barre d'un DataFrame OHLCV (colonnes converties une fois)"""
+    volume = df['Volume'].tolist() if 'Volume' in df else [0.0] * len(df)
+    return list(zip(df['Date'].tolist(), df['Open'].tolist(), df['High'].tolist(),
+                    df['Low'].tolist(), df['Close'].tolist(), volume))
+
+
+def histogramme_latences(latences_ns):
+    """
+    (bornes supérieures en µs, effectifs) : compartiment k pour une latence
+    dans [2^(k-1), 2^k) µs, le premier regroupant tout ce qui est sous 1 µs
+    """
+    latences_us = np.asarray(latences_ns, dtype=np.float64) / 1000.0
+    if not len(latences_us):
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    compartiments = np.where(latences_us < 1.0, 0,
+                             np.floor(np.log2(np.maximum(latences_us, 1.0))) + 1).astype(np.int64)
+    effectifs = np.bincount(compartiments)
+    return 2.0 ** np.arange(len(effectifs)), effectifs
+
+
+def statistiques_latence(latences_ns, percentiles=PERCENTILES_LATENCE):
+    """Percentiles, moyenne et maximum des latences (µs)"""
+    latences_us = np.asarray(latences_ns, dtype=np.float64) / 1000.0
+    if not len(latences_us):
+        return {'barres': 0}
+    statistiques = {'barres': len(latences_us)}
+    for p, valeur in zip(percentiles, np.percentile(latences_us, percentiles)):
+        statistiques[f"p{p}_us"] = float(valeur)
+    statistiques['moyenne_us'] = float(latences_us.mean())
+    statistiques['max_us'] = float(latences_us.max())
+    return statistiques
+
+
+class RejeuBarres:
+    """
+    Rejoue une série de barres dans `strategie` (interface `on_bar`). Les
+    `echauffement` premières barres ne servent qu'aux indicateurs. `rappel(k,
+    decision)`, appelé après chaque barre hors chronométrage, permet un
+    affichage sans fausser les latences.
+    """
+
+    def __init__(self, strategie, echauffement=0, rappel=None, horloge=time.perf_counter_ns):
+        self.strategie = strategie
+        self.echauffement = echauffement
+        self.rappel = rappel
+        self.horloge = horloge
+        self.latences = np.zeros(0, dtype=np.int64)
+        self.decisions = []
+
+    def executer(self, barres):
+        """
+        Rejoue `barres` (DataFrame OHLCV ou liste d'arguments de on_bar) et
+        renvoie le rapport : statistiques de latence, débit, décisions
+        """
+        if hasattr(barres, 'columns'):
+            barres = evenements_barres(barres)
+        strategie, horloge, rappel = self.strategie, self.horloge, self.rappel
+        n_chauffe = min(self.echauffement, len(barres))
+        latences = np.empty(len(barres) - n_chauffe, dtype=np.int64)
+        decisions = []
+
+        debut_rejeu = horloge()
+        for barre in barres[:n_chauffe]:
+            strategie.update_indicators(*barre)
+        for k, barre in enumerate(barres[n_chauffe:]):
+            debut = horloge()
+            decision = strategie.on_bar(*barre)
+            latences[k] = horloge() - debut
+            if decision is not None:
+                decisions.append((n_chauffe + k, decision))
+            if rappel is not None:
+                rappel(n_chauffe + k, decision)
+        duree = (horloge() - debut_rejeu) / 1e9
+
+        self.latences = latences
+        self.decisions = decisions
+        rapport = statistiques_latence(latences)
+        rapport.update({
+            'barres_total': len(barres),
+            'duree_s': duree,
+            'barres_par_s': len(barres) / duree if duree > 0 else float('inf'),
+            'decisions': len(decisions),
+        })
+        return rapport
+
+    def histogramme(self):
+        """Histogramme des latences du dernier rejeu (voir histogramme_latences)"""
+        return histogramme_latences(self.latences)
@@ -0,0 +1,102 @@
+"""
+Points de reprise des optimisations longues
+Une boucle d'optimisation (générations d'un GA, épisodes d'un RL) écrit tous
+les `intervalle` pas l'état nécessaire pour continuer : population, fitness,
+meilleur individu, Q-table... ainsi que l'état des générateurs aléatoires
+(`random` et `np.random`). Repris depuis ce fichier, le calcul suit exactement
+le même chemin qu'une exécution sans interruption (résultats identiques au bit
+près) ; un arrêt (timeout, redémarrage) ne coûte que les pas depuis le dernier
+point de reprise.
+
+- fichier binaire compact (pickle compressé), écrit de façon atomique ;
+- une signature (optimiseur, série, taille de population...) écarte un point
+  de reprise qui ne correspond pas à l'optimisation lancée ;
+- le fichier est supprimé quand l'optimisation se termine.
+"""
+
+import os
+import pickle
+import random
+import zlib
+
+import numpy as np
+
+VERSION_REPRISE = 1
+
+# Dossier des points de reprise (results/ est relatif à la racine du dépôt)
+DOSSIER_REPRISE = 'results/checkpoints'
+
+
+def chemin_reprise(nom, symbol, timeframe):
+    """Chemin par défaut du point de reprise d'un optimiseur sur une série"""
+    return os.path.join(DOSSIER_REPRISE, f"{nom}_{symbol}_{timeframe}.ckpt")
+
+
+def etat_aleatoire():
+    """États des générateurs `random` et `np.random`"""
+    return {'random': random.getstate(), 'numpy': np.random.get_state()}
+
+
+def restaurer_aleatoire(etat):
+    random.setstate(etat['random'])
+    np.random.set_state(etat['numpy'])
+
+
+class PointReprise:
+    """
+    Point de reprise d'une boucle d'optimisation, écrit tous les `intervalle`
+    pas (0 : jamais). Avec `reprendre=False`, un fichier existant est ignoré
+    puis remplacé par la nouvelle exécution.
+    """
+
+    def __init__(self, chemin, intervalle=10, reprendre=False):
+        self.chemin = chemin
+        self.intervalle = intervalle
+        self.reprendre = reprendre
+
+    def echeance(self, pas):
+        """Vrai si l'état atteint après `pas` pas doit être écrit"""
+        return self.intervalle > 0 and pas > 0 and pas % self.intervalle == 0
+
+    def sauvegarder(self, etat, signature=None):
+        """Écrit `etat` et l'état des générateurs aléatoires (écriture atomique)"""
+        contenu = {
+            'version': VERSION_REPRISE,
+            'signature': signature,
+            'aleatoire': etat_aleatoire(),
+            'etat': etat,
+        }
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{self.chemin}.{os.getpid()}.tmp"
+        with open(temporaire, 'wb') as f:
+            f.write(zlib.compress(pickle.dumps(contenu, protocol=pickle.HIGHEST_PROTOCOL)))
+        os.replace(temporaire, self.chemin)
+        return self.chemin
+
+    def charger(self, signature=None):
+        """
+        État sauvegardé, None si la reprise n'est pas demandée, si le fichier
+        manque, est illisible, d'une autre version ou d'une autre signature.
+        Les générateurs aléatoires sont restaurés avec l'état.
+        """
+        if not self.reprendre or not os.path.exists(self.chemin):
+            return None
+        try:
+            with open(self.chemin, 'rb') as f:
+                contenu = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(contenu, dict) or contenu.get('version') != VERSION_REPRISE:
+            return None
+        if contenu['signature'] != signature:
+            print(f"⚠️ Point de reprise ignoré (autre optimisation): {self.chemin}")
+            return None
+        restaurer_aleatoire(contenu['aleatoire'])
+        return contenu['etat']
+
+    def terminer(self):
+        """Supprime le point de reprise d'une optimisation menée à son terme"""
+        if os.path.exists(self.chemin):
+            os.remove(self.chemin)
@@ -0,0 +1,216 @@
+"""
+Optimisation bayésienne par modèle de substitution
+Un processus gaussien (noyau de Matérn 5/2, en NumPy) est ajusté aux jeux de
+paramètres déjà backtestés ; les candidats suivants sont ceux qui maximisent
+l'amélioration espérée (Expected Improvement). Chaque backtest est ainsi
+choisi là où le modèle prévoit un meilleur score ou connaît mal la surface,
+au lieu d'être tiré au hasard.
+
+- espace mixte : chaque paramètre est ramené à [0, 1] ; les entiers sont
+  arrondis au décodage, les réels à 2 décimales (comme le GA) ;
+- propositions par lots (« kriging believer ») : après chaque candidat
+  retenu, le modèle suppose son score égal à la prédiction, ce qui écarte
+  les suivants du même point ; le lot s'évalue ensuite en parallèle ;
+- une longueur de corrélation par paramètre (ARD), choisie par vraisemblance ;
+- le modèle est ajusté sur des scores bornés et compressés (voir `_cibles`) :
+  les jeux sans score (trop peu de trades, -inf) et les fortes pénalités ne
+  déforment plus la surface ;
+- les tirages passent par `np.random` (repris par les points de reprise).
+"""
+
+import math
+
+import numpy as np
+
+# Longueurs de corrélation essayées (espace normalisé) : la plus vraisemblable est retenue
+LONGUEURS_CORRELATION = (0.1, 0.2, 0.35, 0.5, 0.8, 1.2)
+
+# Les scores sous ce quantile sont ramenés à sa valeur avant l'ajustement
+QUANTILE_PLANCHER = 0.25
+
+# Longueur d'un paramètre jugé sans effet, et passes de la descente coordonnée
+LONGUEUR_INACTIVE = 10.0
+PASSES_LONGUEURS = 2
+
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+def _repartition_normale(z):
+    return 0.5 * (1.0 + _erf(z / math.sqrt(2.0)).astype(np.float64))
+
+
+def _densite_normale(z):
+    return np.exp(-0.5 * z * z) / math.sqrt(2.0 * math.pi)
+
+
+def noyau_matern52(a, b, longueur):
+    """
+    Covariance de Matérn 5/2 entre les lignes de `a` et de `b` ; `longueur`
+    est un scalaire ou une longueur par dimension
+    """
+    a, b = a / longueur, b / longueur
+    carres = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * a @ b.T
+    distance = np.sqrt(np.maximum(carres, 0.0))
+    racine5 = math.sqrt(5.0) * distance
+    return (1.0 + racine5 + racine5 * racine5 / 3.0) * np.exp(-racine5)
+
+
+class ProcessusGaussien:
+    """
+    Régression par processus gaussien sur des scores centrés réduits, avec une
+    longueur de corrélation par dimension (ARD) : les paramètres sans effet
+    sur le score reçoivent une grande longueur et ne diluent plus les distances
+    """
+
+    def __init__(self, bruit=1e-4, longueurs=LONGUEURS_CORRELATION, passes=PASSES_LONGUEURS):
+        self.bruit = bruit
+        self.longueurs = longueurs
+        self.passes = passes
+        self.longueur = None
+
+    def ajuster(self, x, y, optimiser=True):
+        """
+        Ajuste le modèle ; `optimiser` choisit les longueurs de corrélation par
+        vraisemblance (longueur commune, puis descente coordonnée par dimension)
+        """
+        self.x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.moyenne_y = y.mean()
+        self.echelle_y = y.std() or 1.0
+        self.y = (y - self.moyenne_y) / self.echelle_y
+        if optimiser or self.longueur is None:
+            self._optimiser_longueurs()
+        self._factoriser(self.longueur)
+        return self
+
+    def _optimiser_longueurs(self):
+        dimensions = self.x.shape[1]
+        commune = max(self.longueurs, key=lambda l: self._log_vraisemblance(np.full(dimensions, l)))
+        longueur = np.full(dimensions, commune)
+        for _ in range(self.passes):
+            for d in range(dimensions):
+                essais = []
+                for l in self.longueurs + (LONGUEUR_INACTIVE,):
+                    longueur[d] = l
+                    essais.append((self._log_vraisemblance(longueur), l))
+                longueur[d] = max(essais)[1]
+        self.longueur = longueur
+
+    def _factoriser(self, longueur):
+        covariance = noyau_matern52(self.x, self.x, longueur) + self.bruit * np.eye(len(self.x))
+        self.cholesky = np.linalg.cholesky(covariance)
+        self.alpha = np.linalg.solve(self.cholesky.T, np.linalg.solve(self.cholesky, self.y))
+
+    def _log_vraisemblance(self, longueur):
+        try:
+            self._factoriser(longueur)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        return -0.5 * self.y @ self.alpha - np.log(np.diag(self.cholesky)).sum()
+
+    def predire(self, x):
+        """(moyenne, écart-type) prédits aux points `x`, dans l'échelle des scores"""
+        covariance = noyau_matern52(np.asarray(x, dtype=np.float64), self.x, self.longueur)
+        moyenne = covariance @ self.alpha
+        v = np.linalg.solve(self.cholesky, covariance.T)
+        variance = np.maximum(1.0 - (v * v).sum(axis=0), 1e-12)
+        return moyenne * self.echelle_y + self.moyenne_y, np.sqrt(variance) * self.echelle_y
+
+
+def amelioration_esperee(moyenne, ecart_type, meilleur):
+    """Expected Improvement (maximisation) par rapport au meilleur score observé"""
+    z = (moyenne - meilleur) / ecart_type
+    return (moyenne - meilleur) * _repartition_normale(z) + ecart_type * _densite_normale(z)
+
+
+class OptimiseurSubstitut:
+    """
+    Boucle proposer / observer sur l'espace `param_ranges` ({nom: (min, max)},
+    entier si min est un entier). Les `initiaux` premiers points sont tirés
+    au hasard, les suivants maximisent l'amélioration espérée parmi
+    `candidats` points (tirages uniformes et perturbations des meilleurs).
+    """
+
+    def __init__(self, param_ranges, initiaux=20, candidats=2000, bruit=1e-4):
+        self.param_ranges = dict(param_ranges)
+        self.noms = list(self.param_ranges)
+        self.bornes = np.array([self.param_ranges[nom] for nom in self.noms], dtype=np.float64)
+        self.entiers = np.array([isinstance(self.param_ranges[nom][0], int) for nom in self.noms])
+        self.initiaux = initiaux
+        self.candidats = candidats
+        self.modele = ProcessusGaussien(bruit)
+        self.observes = []   # paramètres évalués
+        self.scores = []
+
+    def encoder(self, params):
+        minimum, maximum = self.bornes[:, 0], self.bornes[:, 1]
+        valeurs = np.array([params[nom] for nom in self.noms], dtype=np.float64)
+        return (valeurs - minimum) / np.where(maximum > minimum, maximum - minimum, 1.0)
+
+    def decoder(self, x):
+        minimum, maximum = self.bornes[:, 0], self.bornes[:, 1]
+        valeurs = minimum + np.clip(x, 0.0, 1.0) * (maximum - minimum)
+        params = {}
+        for nom, valeur, entier in zip(self.noms, valeurs, self.entiers):
+            params[nom] = int(round(valeur)) if entier else round(float(valeur), 2)
+        return params
+
+    def aleatoires(self, n):
+        return [self.decoder(x) for x in np.random.random_sample((n, len(self.noms)))]
+
+    def observer(self, params, scores):
+        """Ajoute des points évalués (scores -inf acceptés)"""
+        self.observes.extend(dict(p) for p in params)
+        self.scores.extend(float(s) for s in scores)
+
+    def meilleur(self):
+        """(paramètres, score) du meilleur point observé"""
+        k = int(np.argmax(self.scores))
+        return self.observes[k], self.scores[k]
+
+    def _cibles(self):
+        """
+        Scores ajustés par le modèle : les -inf et la queue basse sont ramenés
+        au quartile inférieur, puis l'échelle est compressée (sign·log1p|s|) :
+        une pénalité de drawdown de plusieurs milliers de points ne doit pas
+        écraser les écarts de quelques points entre bons jeux
+        """
+        scores = np.array(self.scores)
+        finis = scores[np.isfinite(scores)]
+        cibles = np.maximum(np.where(np.isfinite(scores), scores, finis.min()), np.quantile(finis, QUANTILE_PLANCHER))
+        return np.sign(cibles) * np.log1p(np.abs(cibles))
+
+    def _candidats(self):
+        """Tirages uniformes et perturbations gaussiennes des meilleurs points (espace normalisé)"""
+        n_locaux = self.candidats // 2
+        meilleurs = np.argsort(self.scores)[::-1][:5]
+        centres = np.array([self.encoder(self.observes[k]) for k in meilleurs])
+        locaux = centres[np.random.randint(len(centres), size=n_locaux)]
+        locaux = locaux + np.random.normal(0.0, 0.08, size=locaux.shape)
+        uniformes = np.random.random_sample((self.candidats - n_locaux, len(self.noms)))
+        candidats = np.clip(np.vstack([locaux, uniformes]), 0.0, 1.0)
+        # Grille effective : celle des paramètres décodés
+        return np.array([self.encoder(self.decoder(x)) for x in candidats])
+
+    def proposer(self, n):
+        """Lot de `n` jeux de paramètres à évaluer"""
+        scores = np.array(self.scores)
+        if len(self.observes) < self.initiaux or not np.isfinite(scores).any():
+            return self.aleatoires(n)
+
+        x = np.array([self.encoder(p) for p in self.observes])
+        y = self._cibles()
+        self.modele.ajuster(x, y)
+        candidats = self._candidats()
+        lot = []
+        for _ in range(n):
+            moyenne, ecart_type = self.modele.predire(candidats)
+            gain = amelioration_esperee(moyenne, ecart_type, y.max())
+            k = int(np.argmax(gain))
+            lot.append(self.decoder(candidats[k]))
+            # Kriging believer : le point retenu est supposé valoir sa prédiction
+            x = np.vstack([x, candidats[k]])
+            y = np.append(y, moyenne[k])
+            self.modele.ajuster(x, y, optimiser=False)
+            candidats = np.delete(candidats, k, axis=0)
+        return lot
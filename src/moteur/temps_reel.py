@@ -0,0 +1,296 @@
+"""
+Moteur temps réel multi-symboles (asyncio)
+Une seule boucle d'événements alimente N instances de stratégies (interface
+`on_bar` de moteur.rejeu), chacune abonnée à une série (symbole, timeframe) :
+
+- un flux produit des ticks : toutes les barres clôturées à une même date,
+  toutes séries confondues. `FluxRejeu` rejoue les CSV de data/raw en
+  parallèle (fusion par date) à la place du flux MT5 ; `FluxTicks` agrège
+  des flux de ticks de plusieurs symboles (donnees.AgregateurTicks) et émet
+  les barres M5 ... D1 au fil de leurs clôtures ;
+- chaque instance a sa file et sa tâche : une stratégie lente n'attend que
+  ses propres barres. Un handler synchrone tourne dans un thread et
+  l'attente de sa décision est bornée par `delai` : au-delà, le tick est
+  clos sans elle et la décision, si elle arrive, part avec le lot suivant
+  (la barre suivante de l'instance attend la fin du calcul en cours).
+  `isoler=False` appelle les handlers synchrones dans la boucle (sans le
+  coût d'un thread par barre) : un dépassement est alors seulement compté ;
+- `capacite_file` borne les files : le flux attend l'instance la plus en
+  retard au lieu d'accumuler les barres (rejeu à vitesse maximale) ;
+- les décisions (intentions d'ordre) d'un même tick sont regroupées et
+  transmises en un seul lot à `executer_ordres(date, intentions)` ;
+- `etat()` donne par instance la profondeur de file, le retard (temps
+  entre l'arrivée d'une barre et sa décision), les dépassements de délai
+  et les erreurs, chauffe comprise (`update_indicators` est isolé comme
+  `on_bar` : une exception est comptée sans bloquer le tick).
+"""
+
+import asyncio
+import heapq
+import inspect
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from donnees.ticks import TIMEFRAMES_AGREGES, AgregateurTicks
+
+from .rejeu import evenements_barres
+
+# Délai (s) accordé à une stratégie pour décider d'une barre
+DELAI_DECISION = 0.5
+
+# Capacité des files pour un rejeu à vitesse maximale (retard borné à quelques barres)
+CAPACITE_REJEU = 64
+
+
+def _horodater(rang, cle, barres):
+    """(date, rang de la série, série, barre) : clés de fusion d'une série"""
+    for barre in barres:
+        yield barre[0], rang, cle, barre
+
+
+class FluxRejeu:
+    """
+    Flux local : rejoue des séries (dict {(symbole, timeframe): DataFrame
+    OHLCV}) fusionnées par date. `intervalle` : pause (s) entre deux ticks ;
+    0 rejoue à vitesse maximale en rendant la main à la boucle à chaque tick.
+    """
+
+    def __init__(self, series, intervalle=0.0):
+        self.series = {cle: evenements_barres(df) for cle, df in series.items()}
+        self.intervalle = intervalle
+
+    @classmethod
+    def depuis_store(cls, store, couples, intervalle=0.0):
+        """Flux des couples (symbole, timeframe) lus dans un MarketDataStore"""
+        return cls({couple: store.dataframe(*couple) for couple in couples}, intervalle)
+
+    async def ticks(self):
+        """(date, [(série, barre), ...]) dans l'ordre chronologique"""
+        fusion = heapq.merge(*(_horodater(rang, cle, barres) for rang, (cle, barres) in enumerate(self.series.items())))
+        for date, groupe in itertools.groupby(fusion, key=lambda element: element[0]):
+            yield date, [(cle, barre) for _, _, cle, barre in groupe]
+            await asyncio.sleep(self.intervalle)
+
+
+def _ticks_symbole(rang, symbole, ticks):
+    """(horodatage, rang, symbole, bid, ask, volume) : clés de fusion des ticks d'un symbole"""
+    horodatages, bids, asks, volumes = (np.asarray(colonne).tolist() for colonne in ticks)
+    for tick in zip(horodatages, bids, asks, volumes):
+        yield (tick[0], rang, symbole) + tick[1:]
+
+
+class FluxTicks:
+    """
+    Flux de barres agrégées depuis des ticks ({symbole: (horodatages ns,
+    bid, ask, volume)}, voir donnees.ticks_synthetiques) : les séries sont
+    les couples (symbole, timeframe), un tick du flux regroupe les barres
+    clôturées par un même tick de marché
+    """
+
+    def __init__(self, ticks, timeframes=TIMEFRAMES_AGREGES, prix='bid', intervalle=0.0):
+        self.flux_ticks = ticks
+        self.agregateurs = {symbole: AgregateurTicks(timeframes, prix) for symbole in ticks}
+        self.intervalle = intervalle
+
+    async def ticks(self):
+        """(instant du tick, [((symbole, timeframe), barre), ...]) au fil des clôtures"""
+        fusion = heapq.merge(*(_ticks_symbole(rang, symbole, ticks)
+                               for rang, (symbole, ticks) in enumerate(self.flux_ticks.items())))
+        for horodatage, _, symbole, bid, ask, volume in fusion:
+            clotures = self.agregateurs[symbole].ajouter(horodatage, bid, ask, volume)
+            if clotures:
+                yield pd.Timestamp(horodatage), [((symbole, tf), barre) for tf, barre in clotures]
+                await asyncio.sleep(self.intervalle)
+        for symbole, agregateur in self.agregateurs.items():
+            clotures = agregateur.cloturer()
+            if clotures:
+                yield clotures[0][1][0], [((symbole, tf), barre) for tf, barre in clotures]
+
+
+class InstanceStrategie:
+    """Une stratégie abonnée à une série, avec sa file de barres et ses compteurs"""
+
+    def __init__(self, nom, serie, strategie, echauffement=0, capacite_file=0):
+        self.nom = nom
+        self.serie = serie
+        self.strategie = strategie
+        self.echauffement = echauffement
+        self.asynchrone = inspect.iscoroutinefunction(strategie.on_bar)
+        self.chauffe_asynchrone = inspect.iscoroutinefunction(getattr(strategie, 'update_indicators', None))
+        self.file = asyncio.Queue(capacite_file)
+        self.barres = 0
+        self.decisions = 0
+        self.depassements = 0
+        self.erreurs = 0
+        self.retard = 0.0
+        self.retard_max = 0.0
+        self.en_cours = None  # calcul d'une décision qui a dépassé le délai
+
+    def etat(self):
+        return {
+            'serie': self.serie,
+            'file': self.file.qsize(),
+            'barres': self.barres,
+            'decisions': self.decisions,
+            'retard_ms': self.retard * 1000,
+            'retard_max_ms': self.retard_max * 1000,
+            'depassements': self.depassements,
+            'erreurs': self.erreurs,
+        }
+
+
+class MoteurTempsReel:
+    """
+    Multiplexe les ticks de `flux` vers les instances enregistrées par
+    `ajouter`. `executer_ordres(date, intentions)` (fonction ou coroutine)
+    reçoit une fois par tick la liste des (nom d'instance, décision).
+    `capacite_file` : 0 pour des files non bornées.
+    """
+
+    def __init__(self, flux, executer_ordres=None, delai=DELAI_DECISION, isoler=True, capacite_file=0):
+        self.flux = flux
+        self.executer_ordres = executer_ordres
+        self.delai = delai
+        self.isoler = isoler
+        self.capacite_file = capacite_file
+        self.instances = {}
+        self.abonnes = {}
+        self.tardives = []
+        self.lots = 0
+
+    def ajouter(self, nom, serie, strategie, echauffement=0):
+        """Abonne `strategie` aux barres de `serie` (symbole, timeframe)"""
+        if nom in self.instances:
+            raise ValueError(f"Instance déjà enregistrée: {nom}")
+        instance = InstanceStrategie(nom, serie, strategie, echauffement, self.capacite_file)
+        self.instances[nom] = instance
+        self.abonnes.setdefault(serie, []).append(instance)
+        return instance
+
+    def etat(self):
+        """Profondeur de file, retard et incidents de chaque instance"""
+        return {nom: instance.etat() for nom, instance in self.instances.items()}
+
+    async def _decider(self, instance, barre):
+        """Décision de l'instance pour une barre, None pendant la chauffe, après un dépassement ou une erreur"""
+        if instance.en_cours is not None:
+            # La barre précédente est encore en calcul : la stratégie n'est pas réentrante
+            await asyncio.wait({instance.en_cours})
+        # Les barres de chauffe (update_indicators) sont isolées comme on_bar, sans décision
+        chauffe = instance.barres < instance.echauffement
+        if chauffe:
+            rappel, asynchrone = instance.strategie.update_indicators, instance.chauffe_asynchrone
+        else:
+            rappel, asynchrone = instance.strategie.on_bar, instance.asynchrone
+        if asynchrone:
+            calcul = asyncio.ensure_future(rappel(*barre))
+        elif not self.isoler:
+            debut = time.perf_counter()
+            try:
+                decision = rappel(*barre)
+            except Exception:
+                instance.erreurs += 1
+                return None
+            if time.perf_counter() - debut > self.delai:
+                instance.depassements += 1
+            return None if chauffe else decision
+        else:
+            calcul = asyncio.ensure_future(asyncio.to_thread(rappel, *barre))
+        termine, _ = await asyncio.wait({calcul}, timeout=self.delai)
+        if not termine:
+            instance.depassements += 1
+            instance.en_cours = calcul
+            calcul.add_done_callback(lambda tache: self._decision_tardive(instance, tache, chauffe))
+            return None
+        decision = self._resultat(instance, calcul)
+        return None if chauffe else decision
+
+    def _resultat(self, instance, calcul):
+        try:
+            return calcul.result()
+        except Exception:
+            instance.erreurs += 1
+            return None
+
+    def _decision_tardive(self, instance, calcul, chauffe=False):
+        instance.en_cours = None
+        decision = self._resultat(instance, calcul)
+        if decision is not None and not chauffe:
+            instance.decisions += 1
+            self.tardives.append((instance.nom, decision))
+
+    async def _servir(self, instance):
+        """Tâche d'une instance : traite sa file dans l'ordre jusqu'à None"""
+        while True:
+            element = await instance.file.get()
+            if element is None:
+                if instance.en_cours is not None:
+                    await asyncio.wait({instance.en_cours})
+                return
+            tick, barre, arrivee = element
+            decision = await self._decider(instance, barre)
+            instance.barres += 1
+            instance.retard = time.perf_counter() - arrivee
+            instance.retard_max = max(instance.retard_max, instance.retard)
+            if decision is not None:
+                instance.decisions += 1
+                tick['intentions'].append((instance.nom, decision))
+            tick['restants'] -= 1
+            if tick['restants'] == 0:
+                tick['complet'].set()
+
+    async def _transmettre(self, date, intentions):
+        intentions = self.tardives + intentions
+        self.tardives = []
+        if not intentions or self.executer_ordres is None:
+            return
+        self.lots += 1
+        resultat = self.executer_ordres(date, intentions)
+        if inspect.isawaitable(resultat):
+            await resultat
+
+    async def _regrouper(self, attente):
+        """Transmet les lots d'intentions dans l'ordre des ticks, dès qu'un tick est complet"""
+        while True:
+            element = await attente.get()
+            if element is None:
+                break
+            date, tick = element
+            await tick['complet'].wait()
+            await self._transmettre(date, tick['intentions'])
+        # Décisions tardives arrivées après le dernier tick
+        if self.tardives:
+            await self._transmettre(None, [])
+
+    async def executer(self):
+        """Rejoue le flux jusqu'au bout ; renvoie l'état final des instances"""
+        attente = asyncio.Queue()
+        taches = [asyncio.create_task(self._servir(instance)) for instance in self.instances.values()]
+        regroupement = asyncio.create_task(self._regrouper(attente))
+        try:
+            async for date, barres in self.flux.ticks():
+                destinataires = [(instance, barre) for serie, barre in barres
+                                 for instance in self.abonnes.get(serie, ())]
+                if not destinataires:
+                    continue
+                tick = {'restants': len(destinataires), 'intentions': [], 'complet': asyncio.Event()}
+                arrivee = time.perf_counter()
+                for instance, barre in destinataires:
+                    await instance.file.put((tick, barre, arrivee))
+                attente.put_nowait((date, tick))
+            for instance in self.instances.values():
+                await instance.file.put(None)
+            await asyncio.gather(*taches)
+            attente.put_nowait(None)
+            await regroupement
+        finally:
+            for tache in taches + [regroupement]:
+                tache.cancel()
+        return self.etat()
+
+    def lancer(self):
+        """executer() dans une nouvelle boucle d'événements"""
+        return asyncio.run(self.executer())
@@ -0,0 +1,54 @@
+"""
+Walk-forward
+Découpage d'une série en folds successifs (fenêtre d'entraînement suivie d'une
+fenêtre de test) et assemblage des résultats hors échantillon :
+- glissant : l'entraînement garde une taille fixe et avance d'un test par fold ;
+- ancré : l'entraînement part toujours de la même barre et s'allonge.
+Les fenêtres de test se suivent sans chevauchement et se terminent sur la
+dernière barre : mises bout à bout, elles forment une seule période hors
+échantillon.
+"""
+
+import numpy as np
+
+from .journal_trades import TradeLog
+
+
+def fenetres_walk_forward(n_barres, n_folds, ratio_train=3.0, taille_test=None, ancre=False, debut=0):
+    """
+    Folds [{'fold', 'train': (debut, fin), 'test': (debut, fin)}] en indices de barres.
+    Sans `taille_test`, la série (à partir de `debut`) est partagée pour que
+    l'entraînement glissant fasse `ratio_train` fois la taille d'un test.
+    """
+    if n_folds < 1:
+        raise ValueError("Au moins un fold est nécessaire")
+    disponibles = n_barres - debut
+    if taille_test is None:
+        taille_test = int(disponibles // (n_folds + ratio_train))
+    taille_train = int(round(ratio_train * taille_test))
+    origine = n_barres - taille_train - n_folds * taille_test
+    if taille_test < 1 or taille_train < 1 or origine < debut:
+        raise ValueError(f"Série trop courte ({n_barres} barres) pour {n_folds} folds "
+                         f"(test: {taille_test}, entraînement: {taille_train})")
+
+    folds = []
+    for k in range(n_folds):
+        fin_train = origine + taille_train + k * taille_test
+        debut_train = debut if ancre else fin_train - taille_train
+        folds.append({
+            'fold': k + 1,
+            'train': (debut_train, fin_train),
+            'test': (fin_train, fin_train + taille_test),
+        })
+    return folds
+
+
+def assembler_hors_echantillon(resultats_folds, cle_trades='trades_test'):
+    """
+    Trades hors échantillon de tous les folds, dans l'ordre des folds, et
+    rendement cumulé (%) trade après trade (PnL additionnés, comme calculate_metrics).
+    Les journaux (TradeLog) des folds sont réunis en un seul TradeLog.
+    """
+    trades = TradeLog.concatener(resultat[cle_trades] for resultat in sorted(resultats_folds, key=lambda r: r['fold']))
+    pnl = trades.colonne('pnl') if len(trades) else np.zeros(0)
+    return trades, np.cumsum(pnl)
@@ -1,20 +1,32 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import random
+from functools import partial
 from deap import base, creator, tools, algorithms
 from rich import print
-import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import IndicatorCache
+from moteur import LONG, OPPOSE_INVERSION, simuler_positions, croisement_haussier, croisement_baissier
+from moteur import ParallelEvaluator, FitnessCache, empreinte_donnees
+from moteur import TradeLog, dataframe_trades, dates_ns
+from moteur import PointReprise, chemin_reprise
+from donnees import MarketDataStore
+
 # === Configuration de l'algorithme génétique ===
 POPULATION_SIZE = 50
 GENERATIONS = 30
 CROSSOVER_PROB = 0.7
 MUTATION_PROB = 0.3
 
+# === Évaluation des populations ===
+MODE_EVALUATION = 'process'  # 'serial', 'thread' ou 'process'
+WORKERS = None               # None = tous les cœurs
+
 # === Paramètres à optimiser ===
 PARAM_RANGES = {
     'PERIODE_EMA': (20, 100),
@@ -26,44 +38,46 @@ PARAM_RANGES = {
     'TRAILING_STOP': (0.8, 2.0)
 }
 
-# === Fonctions indicateurs (copiées de la stratégie) ===
-def compute_ema(series, window):
-    return series.ewm(span=window, adjust=False).mean()
+# Journal de trades renvoyé par backtest_with_params (dates en index de barre sans colonne Date)
+COLONNES_BACKTEST = {
+    'Type': 'sens',
+    'Entry': 'reel',
+    'Exit': 'reel',
+    'PnL': 'reel',
+    'EntryDate': 'date',
+    'ExitDate': 'date',
+    'Fib_1.618': 'reel',
+    'Fib_2.618': 'reel',
+}
+
+# Données lues une seule fois puis servies depuis le cache binaire de datas/ (racine du dépôt)
+DOSSIER_DATAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'datas')
+STORE_DATAS = MarketDataStore(DOSSIER_DATAS)
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
+# Fitness déjà calculées (clé : données + vecteur de paramètres ; gènes continus non arrondis)
+CACHE_FITNESS = FitnessCache(decimales=10)
 
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
+# Indicateurs de chaque série, calculés une fois par processus (clé : symbole, timeframe)
+INDICATEURS_SERIES = {}
 
 def calc_fib_extensions(entry, swing_high, swing_low, direction):
-    fibs = {}
-    if direction == 'Long':
-        range_ = swing_high - swing_low
-        fibs['Fib_1.618'] = swing_high + 1.618 * range_
-        fibs['Fib_2.618'] = swing_high + 2.618 * range_
-    else:
-        range_ = swing_high - swing_low
-        fibs['Fib_1.618'] = swing_low - 1.618 * range_
-        fibs['Fib_2.618'] = swing_low - 2.618 * range_
-    return fibs
+    """Extensions de Fibonacci du swing (scalaires, ou tableaux avec une direction par trade)"""
+    long = np.asarray(direction) == 'Long'
+    range_ = swing_high - swing_low
+    return {
+        'Fib_1.618': np.where(long, swing_high + 1.618 * range_, swing_low - 1.618 * range_),
+        'Fib_2.618': np.where(long, swing_high + 2.618 * range_, swing_low - 2.618 * range_),
+    }
 
 # === Fonction de backtest avec paramètres variables ===
-def backtest_with_params(df, params):
-    df = df.copy()
+def backtest_with_params(df, params, indicateurs=None):
+    """
+    Journal de trades pour un jeu de paramètres. `df` : DataFrame ou colonnes
+    du stockage (STORE_DATAS.colonnes) ; les données sont lues sans copie et
+    jamais modifiées.
+    """
+    if indicateurs is None:
+        indicateurs = IndicatorCache.depuis_df(df)
     
     # Extraction des paramètres
     PERIODE_EMA = int(params['PERIODE_EMA'])
@@ -75,173 +89,52 @@ def backtest_with_params(df, params):
     PROFIT_TARGET = params['PROFIT_TARGET']
     TRAILING_STOP = params['TRAILING_STOP']
     
-    # Calcul des indicateurs
-    df['EMA'] = compute_ema(df['Close'], PERIODE_EMA)
-    df['ATR'] = compute_atr(df, PERIODE_ATR)
-    df['ADX'] = compute_adx(df, PERIODE_ADX)
-    df['High_Break'] = df['High'].rolling(window=PERIODE_BREAKOUT).max()
-    df['Low_Break'] = df['Low'].rolling(window=PERIODE_BREAKOUT).min()
-    df = df.dropna().reset_index(drop=True)
+    # Calcul des indicateurs (vues en lecture seule du cache d'indicateurs)
+    colonnes = {nom: np.asarray(df[nom], dtype=np.float64)
+                for nom in ('Open', 'High', 'Low', 'Close', 'Volume') if nom in df}
+    colonnes['EMA'] = indicateurs.ema(PERIODE_EMA, adjust=False)
+    colonnes['ATR'] = indicateurs.atr(PERIODE_ATR)
+    colonnes['ADX'] = indicateurs.adx(PERIODE_ADX)
+    colonnes['High_Break'] = indicateurs.plus_haut(PERIODE_BREAKOUT)
+    colonnes['Low_Break'] = indicateurs.plus_bas(PERIODE_BREAKOUT)
 
-    position = 0
-    entry_price = 0
-    stop_loss = 0
-    profit_target_price = 0
-    trailing_stop = 0
-    trades = []
+    # Barres complètes (équivalent d'un dropna) : une tranche sans copie si elles sont contiguës
+    valide = np.logical_and.reduce([~np.isnan(valeurs) for valeurs in colonnes.values()])
+    lignes = np.flatnonzero(valide)
+    if len(lignes) and lignes[-1] - lignes[0] + 1 == len(lignes):
+        lignes = slice(lignes[0], lignes[-1] + 1)
+    colonnes = {nom: valeurs[lignes] for nom, valeurs in colonnes.items()}
 
-    for i in range(1, len(df)):
-        ema_long = df.loc[i, 'Close'] > df.loc[i, 'EMA']
-        ema_short = df.loc[i, 'Close'] < df.loc[i, 'EMA']
-        breakout_long = (df.loc[i-1, 'High'] < df.loc[i-1, 'High_Break'] and 
-                        df.loc[i, 'High'] >= df.loc[i, 'High_Break'])
-        breakout_short = (df.loc[i-1, 'Low'] > df.loc[i-1, 'Low_Break'] and 
-                         df.loc[i, 'Low'] <= df.loc[i, 'Low_Break'])
-        adx_ok = df.loc[i, 'ADX'] > SEUIL_ADX
-        
-        long_cond = ema_long and breakout_long and adx_ok
-        short_cond = ema_short and breakout_short and adx_ok
+    close = colonnes['Close']
+    ema = colonnes['EMA']
+    adx_ok = colonnes['ADX'] > SEUIL_ADX
+    long_cond = (close > ema) & croisement_haussier(colonnes['High'], colonnes['High_Break']) & adx_ok
+    short_cond = (close < ema) & croisement_baissier(colonnes['Low'], colonnes['Low_Break']) & adx_ok
 
-        if position == 0:
-            if long_cond:
-                position = 1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price - RISK_ATR * df.loc[i, 'ATR']
-                profit_target_price = entry_price + PROFIT_TARGET * df.loc[i, 'ATR']
-                trailing_stop = entry_price - TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Long')
-                
-            elif short_cond:
-                position = -1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price + RISK_ATR * df.loc[i, 'ATR']
-                profit_target_price = entry_price - PROFIT_TARGET * df.loc[i, 'ATR']
-                trailing_stop = entry_price + TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Short')
-
-        elif position == 1:  # Position Long
-            new_trailing_stop = df.loc[i, 'Close'] - TRAILING_STOP * df.loc[i, 'ATR']
-            if new_trailing_stop > trailing_stop:
-                trailing_stop = new_trailing_stop
-            
-            if df.loc[i, 'Low'] <= stop_loss:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': stop_loss,
-                    'PnL': (stop_loss - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 0
-            elif df.loc[i, 'High'] >= profit_target_price:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': profit_target_price,
-                    'PnL': (profit_target_price - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 0
-            elif df.loc[i, 'Low'] <= trailing_stop:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': trailing_stop,
-                    'PnL': (trailing_stop - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 0
-            elif short_cond:
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': df.loc[i, 'Close'],
-                    'PnL': (df.loc[i, 'Close'] - entry_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = -1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price + RISK_ATR * df.loc[i, 'ATR']
-                profit_target_price = entry_price - PROFIT_TARGET * df.loc[i, 'ATR']
-                trailing_stop = entry_price + TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Short')
+    # Stop fixe + trailing stop séparé testés sur les extrêmes, inversion sur signal opposé
+    journal = simuler_positions(
+        close, colonnes['High'], colonnes['Low'], colonnes['ATR'], long_cond, short_cond,
+        stop_atr=RISK_ATR, cible_atr=PROFIT_TARGET, trailing_atr=TRAILING_STOP,
+        signal_oppose=OPPOSE_INVERSION
+    )
 
-        elif position == -1:  # Position Short
-            new_trailing_stop = df.loc[i, 'Close'] + TRAILING_STOP * df.loc[i, 'ATR']
-            if new_trailing_stop < trailing_stop:
-                trailing_stop = new_trailing_stop
-            
-            if df.loc[i, 'High'] >= stop_loss:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': stop_loss,
-                    'PnL': (entry_price - stop_loss) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 0
-            elif df.loc[i, 'Low'] <= profit_target_price:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': profit_target_price,
-                    'PnL': (entry_price - profit_target_price) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 0
-            elif df.loc[i, 'High'] >= trailing_stop:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': trailing_stop,
-                    'PnL': (entry_price - trailing_stop) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 0
-            elif long_cond:
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': df.loc[i, 'Close'],
-                    'PnL': (entry_price - df.loc[i, 'Close']) / entry_price,
-                    'EntryDate': entry_date,
-                    'ExitDate': df.loc[i, 'Date'] if 'Date' in df.columns else i,
-                    **fibs
-                })
-                position = 1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price - RISK_ATR * df.loc[i, 'ATR']
-                profit_target_price = entry_price + PROFIT_TARGET * df.loc[i, 'ATR']
-                trailing_stop = entry_price - TRAILING_STOP * df.loc[i, 'ATR']
-                entry_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-                swing_high = df.loc[i-1, 'High_Break']
-                swing_low = df.loc[i-1, 'Low_Break']
-                fibs = calc_fib_extensions(entry_price, swing_high, swing_low, 'Long')
+    if 'Date' in df:
+        dates, type_date = dates_ns(np.asarray(df['Date'])[lignes]), 'date'
+    else:
+        dates, type_date = np.arange(len(close)), 'entier'
+    entree = journal['entree_idx']
+    direction = np.where(journal['sens'] == LONG, 'Long', 'Short')
+    fibs = calc_fib_extensions(journal['prix_entree'], colonnes['High_Break'][entree - 1],
+                               colonnes['Low_Break'][entree - 1], direction)
+    trades = TradeLog.depuis_colonnes({
+        'Type': journal['sens'],
+        'Entry': journal['prix_entree'],
+        'Exit': journal['prix_sortie'],
+        'PnL': journal['rendement'],
+        'EntryDate': dates[entree],
+        'ExitDate': dates[journal['sortie_idx']],
+        **fibs
+    }, dict(COLONNES_BACKTEST, EntryDate=type_date, ExitDate=type_date))
 
     return trades
 
@@ -258,25 +151,24 @@ def evaluate_fitness(individual, symbol, timeframe):
                 params[param_name] = min_val + individual[i] * (max_val - min_val)
         
         # Chargement des données
-        filename = f"datas/{symbol}_{timeframe}_mt5.csv"
-        if not os.path.exists(filename):
+        if not STORE_DATAS.existe(symbol, timeframe):
             return -1000,  # Pénalité si fichier inexistant
         
-        df = pd.read_csv(filename)
-        df['Date'] = pd.to_datetime(df['Date'])
+        # Vues en lecture seule du cache mappé, partagées par tous les individus
+        colonnes = STORE_DATAS.colonnes(symbol, timeframe)
         
         # Backtest
-        trades = backtest_with_params(df, params)
+        trades = backtest_with_params(colonnes, params, indicateurs_serie(symbol, timeframe))
         
         if not trades:
-            return -1000  # Pénalité si aucun trade
+            return -1000,  # Pénalité si aucun trade
         
         # Calcul des métriques
-        df_trades = pd.DataFrame(trades)
+        df_trades = dataframe_trades(trades)
         total_pnl = df_trades['PnL'].sum()
         
         if total_pnl <= 0:
-            return total_pnl * 100  # Pénalité forte pour pertes
+            return total_pnl * 100,  # Pénalité forte pour pertes
         
         # Calcul du Sharpe Ratio
         returns = df_trades['PnL']
@@ -293,13 +185,50 @@ def evaluate_fitness(individual, symbol, timeframe):
         fitness = (performance * 100 + sharpe * 10 + win_rate * 50 - 
                   max(0, len(trades) - 200) * 0.1)  # Pénalité pour sur-trading
         
-        return fitness
+        return fitness,
         
     except Exception as e:
-        return -1000  # Pénalité en cas d'erreur
+        return -1000,  # Pénalité en cas d'erreur
+
+def indicateurs_serie(symbol, timeframe):
+    """Cache d'indicateurs de la série, partagé par toutes les évaluations du processus"""
+    cle = (symbol, timeframe)
+    if cle not in INDICATEURS_SERIES:
+        INDICATEURS_SERIES[cle] = IndicatorCache.depuis_df(STORE_DATAS.colonnes(symbol, timeframe))
+    return INDICATEURS_SERIES[cle]
+
+def precharger_donnees(symbol, timeframe):
+    """
+    Initialisation des workers : ouvre une fois le cache mappé de la série
+    évaluée et calcule en un seul lot l'EMA de toutes les périodes explorées
+    """
+    if STORE_DATAS.existe(symbol, timeframe):
+        STORE_DATAS.colonnes(symbol, timeframe)
+        ema_min, ema_max = PARAM_RANGES['PERIODE_EMA']
+        indicateurs_serie(symbol, timeframe).banque_ema(range(ema_min, ema_max + 1), adjust=False)
+
+def empreinte_serie(symbol, timeframe):
+    """Empreinte des données évaluées (les fitness en cache n'en sont valables que pour elles)"""
+    if not STORE_DATAS.existe(symbol, timeframe):
+        return 'absent'
+    return empreinte_donnees(STORE_DATAS.colonnes(symbol, timeframe))
+
+def enregistrer_map(toolbox, evaluateur, cache=None, empreinte=None):
+    """
+    Évaluation DEAP via l'évaluateur : seuls les vecteurs de paramètres partent
+    vers les workers, et seulement ceux absents du cache de fitness
+    """
+    def evaluer(fonction, individus):
+        vecteurs = [list(ind) for ind in individus]
+        if cache is None:
+            return evaluateur.map(fonction, vecteurs)
+        return cache.evaluer('ema_adx_breakout', empreinte, vecteurs,
+                             lambda manquants: evaluateur.map(fonction, manquants))
+    
+    toolbox.register("map", evaluer)
 
 # === Configuration DEAP ===
-def setup_genetic_algorithm():
+def setup_genetic_algorithm(symbol, timeframe, evaluateur=None, cache=None):
     # Création des types
     creator.create("FitnessMax", base.Fitness, weights=(1.0,))
     creator.create("Individual", list, fitness=creator.FitnessMax)
@@ -313,22 +242,75 @@ def setup_genetic_algorithm():
     toolbox.register("population", tools.initRepeat, list, toolbox.individual)
     
     # Opérateurs génétiques
-    toolbox.register("evaluate", evaluate_fitness)
+    toolbox.register("evaluate", partial(evaluate_fitness, symbol=symbol, timeframe=timeframe))
     toolbox.register("mate", tools.cxTwoPoint)
     toolbox.register("mutate", tools.mutGaussian, mu=0, sigma=0.1, indpb=0.2)
     toolbox.register("select", tools.selTournament, tournsize=3)
     
+    if evaluateur is not None:
+        enregistrer_map(toolbox, evaluateur, cache, empreinte_serie(symbol, timeframe) if cache is not None else None)
+    
     return toolbox
 
+def evaluer_invalides(toolbox, individus):
+    """Évalue les individus sans fitness valide ; renvoie leur nombre"""
+    invalides = [ind for ind in individus if not ind.fitness.valid]
+    for ind, fit in zip(invalides, toolbox.map(toolbox.evaluate, invalides)):
+        ind.fitness.values = fit
+    return len(invalides)
+
+def evoluer(pop, toolbox, generations, stats, hof, reprise=None, signature=None):
+    """
+    Boucle de `algorithms.eaSimple` (mêmes opérateurs, même ordre des tirages
+    aléatoires) avec un point de reprise toutes les `reprise.intervalle`
+    générations : population et fitness, hall of fame, logbook et cache de
+    fitness. Reprise comprise, le résultat est celui d'une exécution sans arrêt.
+    """
+    etat = reprise.charger(signature) if reprise is not None else None
+    if etat is None:
+        logbook = tools.Logbook()
+        logbook.header = ['gen', 'nevals'] + stats.fields
+        nevals = evaluer_invalides(toolbox, pop)
+        hof.update(pop)
+        logbook.record(gen=0, nevals=nevals, **stats.compile(pop))
+        print(logbook.stream)
+        debut = 1
+    else:
+        pop, hof, logbook = etat['population'], etat['hof'], etat['logbook']
+        CACHE_FITNESS.restaurer(etat['cache'])
+        debut = etat['generation'] + 1
+        print(f"♻️ Reprise à la génération {debut}: {reprise.chemin}")
+    
+    for gen in range(debut, generations + 1):
+        offspring = algorithms.varAnd(toolbox.select(pop, len(pop)), toolbox, CROSSOVER_PROB, MUTATION_PROB)
+        nevals = evaluer_invalides(toolbox, offspring)
+        hof.update(offspring)
+        pop[:] = offspring
+        logbook.record(gen=gen, nevals=nevals, **stats.compile(pop))
+        print(logbook.stream)
+        if reprise is not None and reprise.echeance(gen):
+            reprise.sauvegarder({
+                'generation': gen,
+                'population': pop,
+                'hof': hof,
+                'logbook': logbook,
+                'cache': CACHE_FITNESS.instantane(),
+            }, signature)
+    
+    if reprise is not None:
+        reprise.terminer()
+    return pop, logbook, hof
+
 # === Fonction d'optimisation principale ===
-def optimize_strategy(symbol, timeframe):
+def optimize_strategy(symbol, timeframe, population_size=POPULATION_SIZE, generations=GENERATIONS, reprise=None):
     print(f"🧬 Optimisation génétique pour {symbol} {timeframe}")
     print("=" * 50)
     
-    toolbox = setup_genetic_algorithm()
+    evaluateur = ParallelEvaluator(MODE_EVALUATION, WORKERS, fabrique=precharger_donnees, args=(symbol, timeframe))
+    toolbox = setup_genetic_algorithm(symbol, timeframe, evaluateur, CACHE_FITNESS)
     
-    # Population initiale
-    pop = toolbox.population(n=POPULATION_SIZE)
+    # Population initiale (remplacée par celle du point de reprise s'il y en a un)
+    pop = toolbox.population(n=population_size)
     
     # Statistiques
     stats = tools.Statistics(lambda ind: ind.fitness.values)
@@ -336,18 +318,17 @@ def optimize_strategy(symbol, timeframe):
     stats.register("std", np.std)
     stats.register("min", np.min)
     stats.register("max", np.max)
+    stats.register("cache", lambda _: f"{CACHE_FITNESS.statistiques_generation()['taux_hit']:.0%}")
     
     # Hall of fame pour garder le meilleur
     hof = tools.HallOfFame(1)
     
     # Algorithme génétique
-    pop, logbook = algorithms.eaSimple(pop, toolbox, 
-                                      cxpb=CROSSOVER_PROB, 
-                                      mutpb=MUTATION_PROB, 
-                                      ngen=GENERATIONS, 
-                                      stats=stats, 
-                                      halloffame=hof, 
-                                      verbose=True)
+    signature = ('deap', symbol, timeframe, empreinte_serie(symbol, timeframe), population_size)
+    try:
+        pop, logbook, hof = evoluer(pop, toolbox, generations, stats, hof, reprise, signature)
+    finally:
+        evaluateur.fermer()
     
     # Meilleur individu
     best_individual = hof[0]
@@ -368,19 +349,19 @@ def optimize_strategy(symbol, timeframe):
     
     return best_params, best_fitness
 
-def main():
+def main(symbols=('XAUUSD', 'US30.cash'), timeframes=('D1', 'H1'), population_size=POPULATION_SIZE,
+         generations=GENERATIONS, reprendre=False, intervalle_reprise=5):
+    """Par défaut, focus sur les instruments problématiques et les timeframes principaux (CLI `trading.py optimize deap`)"""
     print("🧬 Optimisation génétique de la stratégie EMA/ADX/ATR/Breakout")
     print("=" * 60)
     
-    SYMBOLS = ['XAUUSD', 'US30.cash']  # Focus sur les instruments problématiques
-    TIMEFRAMES = ['D1', 'H1']  # Focus sur les timeframes principaux
-    
     results = {}
     
-    for symbol in SYMBOLS:
-        for timeframe in TIMEFRAMES:
+    for symbol in symbols:
+        for timeframe in timeframes:
             print(f"\n🎯 Optimisation de {symbol} {timeframe}...")
-            best_params, fitness = optimize_strategy(symbol, timeframe)
+            reprise = PointReprise(chemin_reprise('deap', symbol, timeframe), intervalle_reprise, reprendre)
+            best_params, fitness = optimize_strategy(symbol, timeframe, population_size, generations, reprise)
             results[f"{symbol}_{timeframe}"] = {
                 'params': best_params,
                 'fitness': fitness
@@ -412,14 +393,11 @@ def test_optimized_strategy(results):
         symbol, timeframe = key.split('_')
         params = result['params']
         
-        filename = f"datas/{symbol}_{timeframe}_mt5.csv"
-        if os.path.exists(filename):
-            df = pd.read_csv(filename)
-            df['Date'] = pd.to_datetime(df['Date'])
-            trades = backtest_with_params(df, params)
+        if STORE_DATAS.existe(symbol, timeframe):
+            trades = backtest_with_params(STORE_DATAS.colonnes(symbol, timeframe), params)
             
             if trades:
-                df_trades = pd.DataFrame(trades)
+                df_trades = dataframe_trades(trades)
                 total_pnl = df_trades['PnL'].sum()
                 performance = (1 + total_pnl) ** (252 / len(trades)) - 1
                 returns = df_trades['PnL']
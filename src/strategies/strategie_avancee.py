@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
@@ -6,32 +7,9 @@ from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_adx(df, window):
-    plus_dm = df['High'].diff()
-    minus_dm = df['Low'].diff().abs()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm < 0] = 0
-    trur = compute_atr(df, window)
-    plus_di = 100 * (plus_dm.rolling(window=window).sum() / trur)
-    minus_di = 100 * (minus_dm.rolling(window=window).sum() / trur)
-    dx = 100 * (np.abs(plus_di - minus_di) / (plus_di + minus_di))
-    adx = dx.rolling(window=window).mean()
-    return adx
-
-def compute_rsi(df, window=14):
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_adx, compute_ema, rolling_max, rolling_min, rolling_mean
+from moteur import metriques_lot, TradeLog, colonne_trades
 
 def strategie_avancee(df, symbol, timeframe):
     """Stratégie avancée avec tous les indicateurs et gestion du risque optimisée"""
@@ -86,16 +64,16 @@ def strategie_avancee(df, symbol, timeframe):
     df['ATR'] = compute_atr(df, 14)
     df['ADX'] = compute_adx(df, 14)
     df['RSI'] = compute_rsi(df, 14)
-    df['EMA20'] = df['Close'].ewm(span=20).mean()
-    df['EMA50'] = df['Close'].ewm(span=50).mean()
-    df['EMA200'] = df['Close'].ewm(span=200).mean()
+    df['EMA20'] = compute_ema(df['Close'], 20, adjust=True)
+    df['EMA50'] = compute_ema(df['Close'], 50, adjust=True)
+    df['EMA200'] = compute_ema(df['Close'], 200, adjust=True)
     
     # Breakouts
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
     
     # Volume
-    df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
+    df['Volume_MA'] = rolling_mean(df['Volume'], 20)
     df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.8
     
     # Conditions avancées
@@ -135,7 +113,7 @@ def strategie_avancee(df, symbol, timeframe):
     stop_loss = 0
     profit_target = 0
     trailing_stop = 0
-    trades = []
+    trades = TradeLog()
     cumulative_pnl = 0
     max_cumulative = 0
 
@@ -284,38 +262,34 @@ def calculate_advanced_metrics(trades):
             'Calmar_Ratio': 0
         }
     
-    df_trades = pd.DataFrame(trades)
-    total_pnl = df_trades['PnL'].sum()
-    returns = df_trades['PnL']
-    
-    # Métriques de base
+    # Métriques de base (noyau vectorisé, PnL en fraction)
+    pnl = colonne_trades(trades, 'PnL')
+    base = metriques_lot(pnl, [0, len(pnl)])
+    total_pnl = float(base['total_return'][0])
     total_trades = len(trades)
-    winning_trades = len(df_trades[df_trades['PnL'] > 0])
-    losing_trades = len(df_trades[df_trades['PnL'] < 0])
-    win_rate = winning_trades / total_trades * 100 if total_trades > 0 else 0
+    winning_trades = int(base['winning_trades'][0])
+    losing_trades = int(base['losing_trades'][0])
+    win_rate = float(base['win_rate'][0])
     
     # Performance annualisée
     performance = (1 + total_pnl) ** (252 / total_trades) - 1 if total_trades > 0 else 0
     
     # Sharpe Ratio
-    sharpe = returns.mean() / returns.std() * np.sqrt(252) if returns.std() > 0 else 0
+    ecart_type = base['ecart_type'][0]
+    sharpe = total_pnl / total_trades / ecart_type * np.sqrt(252) if ecart_type > 0 else 0
     
     # Ratio risque/récompense
-    avg_win = df_trades[df_trades['PnL'] > 0]['PnL'].mean() if winning_trades > 0 else 0
-    avg_loss = abs(df_trades[df_trades['PnL'] < 0]['PnL'].mean()) if losing_trades > 0 else 0
+    avg_win = float(base['avg_win'][0])
+    avg_loss = abs(float(base['avg_loss'][0]))
     risk_reward = avg_win / avg_loss if avg_loss > 0 else 0
     
     # Drawdown
-    cumulative = df_trades['PnL'].cumsum()
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
-    max_drawdown = abs(drawdown.min()) * 100 if len(drawdown) > 0 else 0
-    avg_drawdown = abs(df_trades['Drawdown'].mean()) * 100 if 'Drawdown' in df_trades.columns else 0
-    
-    # Profit Factor
-    gross_profit = df_trades[df_trades['PnL'] > 0]['PnL'].sum() if winning_trades > 0 else 0
-    gross_loss = abs(df_trades[df_trades['PnL'] < 0]['PnL'].sum()) if losing_trades > 0 else 0
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
+    max_drawdown = float(base['max_drawdown'][0])
+    drawdowns = colonne_trades(trades, 'Drawdown')
+    avg_drawdown = abs(np.mean(drawdowns)) * 100 if len(drawdowns) else 0
+    
+    # Profit Factor (nul sans perte)
+    profit_factor = float(base['profit_factor'][0]) if losing_trades > 0 else 0
     
     # Calmar Ratio (Performance / Max Drawdown)
     calmar_ratio = performance / (max_drawdown / 100) if max_drawdown > 0 else 0
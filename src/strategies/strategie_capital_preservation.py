@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
@@ -6,20 +7,13 @@ from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_ema, rolling_max, rolling_min, rolling_mean
+from moteur import SORTIE_STOP, SORTIE_CIBLE, simuler_positions, croisement_haussier, croisement_baissier
+from moteur import metriques_lot, TradeLog, colonne_trades
 
-def compute_rsi(df, window=14):
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+COLONNES_PRESERVATION = {'Type': 'sens', 'Entry': 'reel', 'Exit': 'reel', 'PnL': 'reel', 'Reason': 'code'}
+RAISONS_PRESERVATION = {SORTIE_STOP: 'Stop Loss', SORTIE_CIBLE: 'Take Profit'}
 
 def strategie_capital_preservation(df, symbol, timeframe):
     """Stratégie qui priorise la préservation du capital"""
@@ -69,167 +63,85 @@ def strategie_capital_preservation(df, symbol, timeframe):
     # Indicateurs
     df['ATR'] = compute_atr(df, 14)
     df['RSI'] = compute_rsi(df, 14)
-    df['EMA20'] = df['Close'].ewm(span=20).mean()
-    df['EMA50'] = df['Close'].ewm(span=50).mean()
-    df['EMA200'] = df['Close'].ewm(span=200).mean()
+    df['EMA20'] = compute_ema(df['Close'], 20, adjust=True)
+    df['EMA50'] = compute_ema(df['Close'], 50, adjust=True)
+    df['EMA200'] = compute_ema(df['Close'], 200, adjust=True)
     
     # Breakouts
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
     
     # Volume
-    df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
+    df['Volume_MA'] = rolling_mean(df['Volume'], 20)
     df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.8
     
     df = df.dropna().reset_index(drop=True)
 
-    position = 0
-    entry_price = 0
-    stop_loss = 0
-    profit_target = 0
-    trades = []
-    
-    # Gestion du risque strict
-    consecutive_losses = 0
-    daily_pnl = 0
-    weekly_pnl = 0
-    last_date = None
-    last_week = None
-    
     # Contraintes de drawdown
     max_daily_dd = 0.02  # 2% max par jour
     max_weekly_dd = 0.05  # 5% max par semaine
     max_total_dd = 0.10   # 10% max total
 
-    for i in range(1, len(df)):
-        current_date = df.loc[i, 'Date'] if 'Date' in df.columns else i
-        
-        # Reset quotidien
-        if last_date is None or str(current_date)[:10] != str(last_date)[:10]:
-            daily_pnl = 0
-            last_date = current_date
-        
-        # Reset hebdomadaire
-        if last_week is None or pd.to_datetime(current_date).isocalendar()[1] != last_week:
-            weekly_pnl = 0
-            last_week = pd.to_datetime(current_date).isocalendar()[1]
-        
-        # Vérification des contraintes de drawdown
-        if (abs(daily_pnl) > max_daily_dd or 
-            abs(weekly_pnl) > max_weekly_dd or
-            consecutive_losses >= max_consecutive_losses):
-            continue  # Skip trades si contraintes dépassées
-        
-        # Conditions d'entrée RENFORCÉES
-        ema_trend = df.loc[i, 'Close'] > df.loc[i, 'EMA50']
-        ema200_trend = df.loc[i, 'Close'] > df.loc[i, 'EMA200']
-        volume_ok = df.loc[i, 'Volume_OK']
-        
-        # Breakouts
-        breakout_up = (df.loc[i-1, 'High'] < df.loc[i-1, 'High_Break'] and 
-                      df.loc[i, 'High'] >= df.loc[i, 'High_Break'])
-        breakout_down = (df.loc[i-1, 'Low'] > df.loc[i-1, 'Low_Break'] and 
-                        df.loc[i, 'Low'] <= df.loc[i, 'Low_Break'])
-        
-        # RSI avec zones plus strictes
-        rsi_ok_long = 30 < df.loc[i, 'RSI'] < rsi_overbought
-        rsi_ok_short = rsi_oversold < df.loc[i, 'RSI'] < 70
-        
-        # Conditions d'entrée TRÈS STRICTES
-        long_signal = (
-            breakout_up and 
-            ema_trend and 
-            ema200_trend and  # Tendance principale
-            volume_ok and 
-            rsi_ok_long and
-            df.loc[i, 'RSI'] > 40  # Pas de surachat
-        )
-        
-        short_signal = (
-            breakout_down and 
-            not ema_trend and 
-            not ema200_trend and  # Tendance baissière
-            volume_ok and 
-            rsi_ok_short and
-            df.loc[i, 'RSI'] < 60  # Pas de survente
-        )
+    # Périodes pour le reset quotidien / hebdomadaire des pertes
+    if 'Date' in df.columns:
+        dates = pd.to_datetime(df['Date'])
+        jours = dates.dt.normalize().to_numpy()
+        semaines = dates.dt.isocalendar().week.to_numpy()
+    else:
+        jours = np.arange(len(df))
+        semaines = np.ones(len(df), dtype=np.int64)
 
-        if position == 0:
-            # Entrée Long
-            if long_signal:
-                position = 1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price - risk_atr * df.loc[i, 'ATR']
-                profit_target = entry_price + profit_atr * df.loc[i, 'ATR']
-                
-            # Entrée Short
-            elif short_signal:
-                position = -1
-                entry_price = df.loc[i, 'Close']
-                stop_loss = entry_price + risk_atr * df.loc[i, 'ATR']
-                profit_target = entry_price - profit_atr * df.loc[i, 'ATR']
+    # Conditions d'entrée RENFORCÉES
+    close = df['Close'].to_numpy()
+    rsi = df['RSI'].to_numpy()
+    ema_trend = close > df['EMA50'].to_numpy()
+    ema200_trend = close > df['EMA200'].to_numpy()
+    volume_ok = df['Volume_OK'].to_numpy(dtype=bool)
 
-        elif position == 1:  # Position Long
-            # Sorties avec gestion du risque
-            if df.loc[i, 'Low'] <= stop_loss:
-                pnl = (stop_loss - entry_price) / entry_price
-                daily_pnl += pnl
-                weekly_pnl += pnl
-                consecutive_losses += 1
-                
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': stop_loss,
-                    'PnL': pnl,
-                    'Reason': 'Stop Loss'
-                })
-                position = 0
-            elif df.loc[i, 'High'] >= profit_target:
-                pnl = (profit_target - entry_price) / entry_price
-                daily_pnl += pnl
-                weekly_pnl += pnl
-                consecutive_losses = 0  # Reset des pertes consécutives
-                
-                trades.append({
-                    'Type': 'Long',
-                    'Entry': entry_price,
-                    'Exit': profit_target,
-                    'PnL': pnl,
-                    'Reason': 'Take Profit'
-                })
-                position = 0
+    # Breakouts
+    breakout_up = croisement_haussier(df['High'], df['High_Break'])
+    breakout_down = croisement_baissier(df['Low'], df['Low_Break'])
 
-        elif position == -1:  # Position Short
-            # Sorties avec gestion du risque
-            if df.loc[i, 'High'] >= stop_loss:
-                pnl = (entry_price - stop_loss) / entry_price
-                daily_pnl += pnl
-                weekly_pnl += pnl
-                consecutive_losses += 1
-                
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': stop_loss,
-                    'PnL': pnl,
-                    'Reason': 'Stop Loss'
-                })
-                position = 0
-            elif df.loc[i, 'Low'] <= profit_target:
-                pnl = (entry_price - profit_target) / entry_price
-                daily_pnl += pnl
-                weekly_pnl += pnl
-                consecutive_losses = 0  # Reset des pertes consécutives
-                
-                trades.append({
-                    'Type': 'Short',
-                    'Entry': entry_price,
-                    'Exit': profit_target,
-                    'PnL': pnl,
-                    'Reason': 'Take Profit'
-                })
-                position = 0
+    # RSI avec zones plus strictes
+    rsi_ok_long = (30 < rsi) & (rsi < rsi_overbought)
+    rsi_ok_short = (rsi_oversold < rsi) & (rsi < 70)
+
+    # Conditions d'entrée TRÈS STRICTES
+    long_signal = (
+        breakout_up &
+        ema_trend &
+        ema200_trend &  # Tendance principale
+        volume_ok &
+        rsi_ok_long &
+        (rsi > 40)  # Pas de surachat
+    )
+
+    short_signal = (
+        breakout_down &
+        ~ema_trend &
+        ~ema200_trend &  # Tendance baissière
+        volume_ok &
+        rsi_ok_short &
+        (rsi < 60)  # Pas de survente
+    )
+
+    # Stop et objectif fixes testés sur les extrêmes ; barres ignorées tant que
+    # les contraintes de drawdown / pertes consécutives sont dépassées
+    journal = simuler_positions(
+        close, df['High'], df['Low'], df['ATR'], long_signal, short_signal,
+        stop_atr=risk_atr, cible_atr=profit_atr,
+        jours=jours, semaines=semaines,
+        max_perte_jour=max_daily_dd, max_perte_semaine=max_weekly_dd,
+        max_pertes_consecutives=max_consecutive_losses
+    )
+
+    trades = TradeLog.depuis_colonnes({
+        'Type': journal['sens'],
+        'Entry': journal['prix_entree'],
+        'Exit': journal['prix_sortie'],
+        'PnL': journal['rendement'],
+        'Reason': np.where(journal['code_sortie'] == SORTIE_STOP, SORTIE_STOP, SORTIE_CIBLE),
+    }, COLONNES_PRESERVATION, {'Reason': RAISONS_PRESERVATION})
 
     return trades
 
@@ -249,35 +161,30 @@ def calculate_capital_metrics(trades):
             'Risk_Adjusted_Return': 0
         }
     
-    df_trades = pd.DataFrame(trades)
-    total_pnl = df_trades['PnL'].sum()
-    returns = df_trades['PnL']
-    
-    # Métriques de base
+    # Métriques de base (noyau vectorisé, PnL en fraction)
+    pnl = colonne_trades(trades, 'PnL')
+    base = metriques_lot(pnl, [0, len(pnl)])
+    total_pnl = float(base['total_return'][0])
     total_trades = len(trades)
-    winning_trades = len(df_trades[df_trades['PnL'] > 0])
-    losing_trades = len(df_trades[df_trades['PnL'] < 0])
-    win_rate = winning_trades / total_trades * 100 if total_trades > 0 else 0
+    win_rate = float(base['win_rate'][0])
     
     # Performance annualisée
     performance = (1 + total_pnl) ** (252 / total_trades) - 1 if total_trades > 0 else 0
     
     # Sharpe Ratio
-    sharpe = returns.mean() / returns.std() * np.sqrt(252) if returns.std() > 0 else 0
+    ecart_type = base['ecart_type'][0]
+    sharpe = total_pnl / total_trades / ecart_type * np.sqrt(252) if ecart_type > 0 else 0
     
     # Drawdown maximum
-    cumulative = df_trades['PnL'].cumsum()
-    running_max = cumulative.expanding().max()
-    drawdown = (cumulative - running_max) / running_max
-    max_drawdown = abs(drawdown.min()) * 100 if len(drawdown) > 0 else 0
+    max_drawdown = float(base['max_drawdown'][0])
     
     # Calcul des drawdowns quotidiens et hebdomadaires (simulation)
     daily_pnl_sim = []
     weekly_pnl_sim = []
     
     # Simulation de répartition temporelle
-    for i, pnl in enumerate(df_trades['PnL']):
-        daily_pnl_sim.append(pnl)
+    for i, pnl_trade in enumerate(pnl.tolist()):
+        daily_pnl_sim.append(pnl_trade)
         if i % 5 == 4:  # 5 trades par semaine
             weekly_pnl_sim.append(sum(daily_pnl_sim[-5:]))
     
@@ -1,51 +1,15 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import warnings
 from datetime import datetime, timedelta
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window=14):
-    """Calcule l'ATR (Average True Range)"""
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_rsi(df, window=14):
-    """Calcule le RSI (Relative Strength Index)"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-def compute_adx(df, window=14):
-    """Calcule l'ADX (Average Directional Index)"""
-    # True Range
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    
-    # Directional Movement
-    up_move = df['High'] - df['High'].shift(1)
-    down_move = df['Low'].shift(1) - df['Low']
-    
-    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-    
-    # Smoothed values
-    tr_smooth = tr.rolling(window=window).mean()
-    plus_di = 100 * pd.Series(plus_dm).rolling(window=window).mean() / tr_smooth
-    minus_di = 100 * pd.Series(minus_dm).rolling(window=window).mean() / tr_smooth
-    
-    # ADX
-    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-    adx = dx.rolling(window=window).mean()
-    
-    return adx
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_adx_dm, compute_ema, ema, atr, adx_dm, rolling_max, rolling_min, rolling_mean
+from moteur import TradeLog, dataframe_trades
+from donnees import aligner
 
 def get_timeframe_params(timeframe):
     """Retourne les paramètres optimisés selon le timeframe"""
@@ -127,14 +91,40 @@ def get_symbol_adjustments(symbol):
             'adx_adjustment': 0
         }
 
-def strategie_multitimeframe(df, symbol, timeframe):
+def contexte_superieur(df_long, timeframe_long):
+    """Tendance EMA (+1 / -1), ADX et ATR d'un timeframe long, par barre longue"""
+    params = get_timeframe_params(timeframe_long)
+    close = df_long['Close'].to_numpy(dtype=np.float64)
+    high = df_long['High'].to_numpy(dtype=np.float64)
+    low = df_long['Low'].to_numpy(dtype=np.float64)
+    return {
+        'Tendance': np.sign(close - ema(close, params['ema_long'])),
+        'ADX': adx_dm(high, low, close, 14),
+        'ATR': atr(high, low, close, 14),
+    }
+
+def strategie_multitimeframe(df, symbol, timeframe, superieurs=None):
     """
     Stratégie multitimeframe optimisée pour Pine Script v6
     Compatible avec XAUUSD et GER40.cash sur tous timeframes
+    `superieurs` : {timeframe long: DataFrame OHLCV} ; chaque barre ne voit que
+    les barres longues déjà clôturées (colonnes Tendance_H4, ADX_H4, ATR_H4...)
+    et n'entre que dans le sens de toutes leurs tendances
     """
     
     df = df.copy()
     
+    # Contexte des timeframes longs : dernière barre close, sans lookahead
+    df['MTF_Long'] = True
+    df['MTF_Short'] = True
+    for timeframe_long, df_long in (superieurs or {}).items():
+        alignes = aligner(df['Date'], timeframe, df_long['Date'], timeframe_long,
+                          contexte_superieur(df_long, timeframe_long))
+        for nom, valeurs in alignes.items():
+            df[f'{nom}_{timeframe_long}'] = valeurs
+        df['MTF_Long'] &= alignes['Tendance'] > 0
+        df['MTF_Short'] &= alignes['Tendance'] < 0
+    
     # Paramètres de base selon timeframe
     base_params = get_timeframe_params(timeframe)
     symbol_adjustments = get_symbol_adjustments(symbol)
@@ -154,24 +144,24 @@ def strategie_multitimeframe(df, symbol, timeframe):
     # Calcul des indicateurs
     df['ATR'] = compute_atr(df, 14)
     df['RSI'] = compute_rsi(df, 14)
-    df['ADX'] = compute_adx(df, 14)
-    df['EMA_Short'] = df['Close'].ewm(span=params['ema_short']).mean()
-    df['EMA_Long'] = df['Close'].ewm(span=params['ema_long']).mean()
+    df['ADX'] = compute_adx_dm(df, 14)
+    df['EMA_Short'] = compute_ema(df['Close'], params['ema_short'], adjust=True)
+    df['EMA_Long'] = compute_ema(df['Close'], params['ema_long'], adjust=True)
     
     # Breakouts dynamiques
-    df['High_Break'] = df['High'].rolling(window=params['breakout_period']).max()
-    df['Low_Break'] = df['Low'].rolling(window=params['breakout_period']).min()
+    df['High_Break'] = rolling_max(df['High'], params['breakout_period'])
+    df['Low_Break'] = rolling_min(df['Low'], params['breakout_period'])
     
     # Volume (si disponible)
     if 'Volume' in df.columns:
-        df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
+        df['Volume_MA'] = rolling_mean(df['Volume'], 20)
         df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.7
     else:
         df['Volume_OK'] = True
     
     # Filtres supplémentaires pour Pine Script v6
     df['Trend_Strength'] = abs(df['EMA_Short'] - df['EMA_Long']) / df['ATR']
-    df['Volatility_OK'] = df['ATR'] > df['ATR'].rolling(window=50).mean() * 0.8
+    df['Volatility_OK'] = df['ATR'] > rolling_mean(df['ATR'], 50) * 0.8
     
     df = df.dropna().reset_index(drop=True)
 
@@ -179,7 +169,7 @@ def strategie_multitimeframe(df, symbol, timeframe):
     entry_price = 0
     stop_loss = 0
     profit_target = 0
-    trades = []
+    trades = TradeLog()
     
     # Compteurs pour debug
     signals_long = 0
@@ -212,6 +202,7 @@ def strategie_multitimeframe(df, symbol, timeframe):
             adx_strong and
             volatility_ok and
             trend_strong and
+            df.loc[i, 'MTF_Long'] and
             rsi_ok_long and
             df.loc[i, 'RSI'] > 35 and  # Pas en survente extrême
             df.loc[i, 'Close'] > df.loc[i, 'EMA_Short']  # Confirmation court terme
@@ -225,6 +216,7 @@ def strategie_multitimeframe(df, symbol, timeframe):
             adx_strong and
             volatility_ok and
             trend_strong and
+            df.loc[i, 'MTF_Short'] and
             rsi_ok_short and
             df.loc[i, 'RSI'] < 65 and  # Pas en surachat extrême
             df.loc[i, 'Close'] < df.loc[i, 'EMA_Short']  # Confirmation court terme
@@ -338,7 +330,7 @@ def calculate_metrics(trades):
             'Sharpe_Ratio': 0
         }
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     total_trades = len(trades)
     winning_trades = len(df_trades[df_trades['PnL'] > 0])
     losing_trades = len(df_trades[df_trades['PnL'] < 0])
@@ -473,17 +465,21 @@ def main():
     print("\n📊 EXEMPLE DE CODE:")
     print("""
 # Test sur tous les timeframes
+from donnees import StoreReechantillonne
+
 timeframes = ['M15', 'M30', 'H1', 'H4', 'D1']
 symbols = ['XAUUSD', 'GER40.cash']
+store = StoreReechantillonne()  # timeframes construits depuis M5 : historique aligné
 
 all_results = {}
 for symbol in symbols:
     for tf in timeframes:
         # Chargez vos données
-        df = pd.read_csv(f'{symbol}_{tf}_data.csv')
+        df = store.dataframe(symbol, tf)
         
-        # Appliquez la stratégie
-        trades = strategie_multitimeframe(df, symbol, tf)
+        # Appliquez la stratégie (filtre de tendance H4 / D1 pour les timeframes courts)
+        superieurs = {long: store.dataframe(symbol, long) for long in ('H4', 'D1') if timeframes.index(long) > timeframes.index(tf)}
+        trades = strategie_multitimeframe(df, symbol, tf, superieurs)
         metrics = calculate_metrics(trades)
         
         all_results[f'{symbol}_{tf}'] = {
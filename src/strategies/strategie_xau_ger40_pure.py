@@ -1,50 +1,13 @@
+import os
+import sys
 import pandas as pd
 import numpy as np
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window=14):
-    """Calcule l'ATR (Average True Range)"""
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_rsi(df, window=14):
-    """Calcule le RSI (Relative Strength Index)"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-def compute_adx(df, window=14):
-    """Calcule l'ADX (Average Directional Index)"""
-    # True Range
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    
-    # Directional Movement
-    up_move = df['High'] - df['High'].shift(1)
-    down_move = df['Low'].shift(1) - df['Low']
-    
-    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-    
-    # Smoothed values
-    tr_smooth = tr.rolling(window=window).mean()
-    plus_di = 100 * pd.Series(plus_dm).rolling(window=window).mean() / tr_smooth
-    minus_di = 100 * pd.Series(minus_dm).rolling(window=window).mean() / tr_smooth
-    
-    # ADX
-    dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
-    adx = dx.rolling(window=window).mean()
-    
-    return adx
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_adx_dm, compute_ema, rolling_max, rolling_min, rolling_mean
+from moteur import TradeLog, dataframe_trades
 
 def strategie_xau_ger40(df, symbol, timeframe):
     """
@@ -103,17 +66,17 @@ def strategie_xau_ger40(df, symbol, timeframe):
     # Calcul des indicateurs
     df['ATR'] = compute_atr(df, 14)
     df['RSI'] = compute_rsi(df, 14)
-    df['ADX'] = compute_adx(df, 14)
-    df['EMA_Short'] = df['Close'].ewm(span=ema_short).mean()
-    df['EMA_Long'] = df['Close'].ewm(span=ema_long).mean()
+    df['ADX'] = compute_adx_dm(df, 14)
+    df['EMA_Short'] = compute_ema(df['Close'], ema_short, adjust=True)
+    df['EMA_Long'] = compute_ema(df['Close'], ema_long, adjust=True)
     
     # Breakouts
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
     
     # Volume (si disponible)
     if 'Volume' in df.columns:
-        df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
+        df['Volume_MA'] = rolling_mean(df['Volume'], 20)
         df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.8
     else:
         df['Volume_OK'] = True  # Si pas de volume, on accepte tous les trades
@@ -124,7 +87,7 @@ def strategie_xau_ger40(df, symbol, timeframe):
     entry_price = 0
     stop_loss = 0
     profit_target = 0
-    trades = []
+    trades = TradeLog()
     
     # Compteurs pour debug
     signals_long = 0
@@ -266,7 +229,7 @@ def calculate_metrics(trades):
             'Sharpe_Ratio': 0
         }
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     total_trades = len(trades)
     winning_trades = len(df_trades[df_trades['PnL'] > 0])
     losing_trades = len(df_trades[df_trades['PnL'] < 0])
@@ -6,31 +6,26 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    """Calcule l'Average True Range (ATR)"""
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_ema, rolling_max, rolling_min, rolling_mean
+from indicators import ATRStream, RSIStream, EMAStream, RollingExtremeStream, RollingMeanStream
+from donnees import charger_ohlcv, store_defaut, ticks_synthetiques
+from moteur import RejeuBarres, FluxRejeu, FluxTicks, MoteurTempsReel, CAPACITE_REJEU
 
-def compute_rsi(df, window=14):
-    """Calcule le Relative Strength Index (RSI)"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+NAN = float('nan')
 
 class XAUUSDSharpe1LiveStrategy:
     """
     Stratégie XAUUSD D1 Sharpe 1 Simple adaptée pour le trading en temps réel
+    Les indicateurs sont tenus en flux (O(1) par barre) : la stratégie ne garde
+    que leur état et les valeurs de la barre précédente, pas l'historique.
+    Avec `verbose=False`, rien n'est affiché (rejeu et mesures de latence).
     """
     
-    def __init__(self, symbol="XAUUSD", timeframe="D1"):
+    def __init__(self, symbol="XAUUSD", timeframe="D1", verbose=True):
         self.symbol = symbol
         self.timeframe = timeframe
+        self.verbose = verbose
         
         # Paramètres de la stratégie
         self.breakout_period = 2
@@ -64,8 +59,16 @@ class XAUUSDSharpe1LiveStrategy:
         self.trailing_stop = 0
         self.trades_history = []
         
-        print(f"[green]Stratégie initialisée pour {symbol} {timeframe}[/green]")
-        print(f"Paramètres: Breakout={self.breakout_period}, Profit ATR={self.profit_atr}, Trail ATR={self.trail_atr}")
+        # État des indicateurs en flux
+        self.reset_indicators()
+        
+        self.afficher(f"[green]Stratégie initialisée pour {symbol} {timeframe}[/green]")
+        self.afficher(f"Paramètres: Breakout={self.breakout_period}, Profit ATR={self.profit_atr}, Trail ATR={self.trail_atr}")
+    
+    def afficher(self, message):
+        """Message de suivi, affiché seulement en mode verbeux"""
+        if self.verbose:
+            print(message)
     
     def calculate_indicators(self, df):
         """Calcule tous les indicateurs nécessaires"""
@@ -74,17 +77,17 @@ class XAUUSDSharpe1LiveStrategy:
         # Indicateurs de base
         df['ATR'] = compute_atr(df, self.atr_period)
         df['RSI'] = compute_rsi(df, 8)
-        df['EMA_Short'] = df['Close'].ewm(span=self.ema_short).mean()
-        df['EMA_Long'] = df['Close'].ewm(span=self.ema_long).mean()
-        df['High_Break'] = df['High'].rolling(window=self.breakout_period).max()
-        df['Low_Break'] = df['Low'].rolling(window=self.breakout_period).min()
+        df['EMA_Short'] = compute_ema(df['Close'], self.ema_short, adjust=True)
+        df['EMA_Long'] = compute_ema(df['Close'], self.ema_long, adjust=True)
+        df['High_Break'] = rolling_max(df['High'], self.breakout_period)
+        df['Low_Break'] = rolling_min(df['Low'], self.breakout_period)
         
         # Filtres
         df['Uptrend'] = (df['EMA_Short'] > df['EMA_Long']) & (df['Close'] > df['EMA_Short'])
         df['Downtrend'] = (df['EMA_Short'] < df['EMA_Long']) & (df['Close'] < df['EMA_Short'])
         
         # Volatilité
-        df['ATR_MA'] = df['ATR'].rolling(window=15).mean()
+        df['ATR_MA'] = rolling_mean(df['ATR'], 15)
         df['Volatility_OK'] = df['ATR'] > df['ATR_MA'] * 0.3
         
         # Momentum
@@ -92,45 +95,100 @@ class XAUUSDSharpe1LiveStrategy:
         df['Momentum_Down'] = df['Close'] < df['Close'].shift(1)
         
         # Volume
-        df['Volume_MA'] = df['Volume'].rolling(window=10).mean()
+        df['Volume_MA'] = rolling_mean(df['Volume'], 10)
         df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.5
         
         return df
     
-    def check_entry_signals(self, df, current_index):
-        """Vérifie les signaux d'entrée"""
-        if current_index < 1:
-            return None, None
-        
-        current_price = df.loc[current_index, 'Close']
-        current_atr = df.loc[current_index, 'ATR']
-        
+    def reset_indicators(self):
+        """Réinitialise l'état des indicateurs en flux (aucune barre reçue)"""
+        self.flux = {
+            'ATR': ATRStream(self.atr_period),
+            'RSI': RSIStream(8),
+            'EMA_Short': EMAStream(self.ema_short, adjust=True),
+            'EMA_Long': EMAStream(self.ema_long, adjust=True),
+            'High_Break': RollingExtremeStream(self.breakout_period, maximum=True),
+            'Low_Break': RollingExtremeStream(self.breakout_period, maximum=False),
+            'ATR_MA': RollingMeanStream(15),
+            'Volume_MA': RollingMeanStream(10),
+        }
+        self.bars_count = 0
+        self.previous_bar = None
+        self.current_bar = None
+    
+    def update_indicators(self, date, open_price, high, low, close, volume):
+        """Intègre une nouvelle barre dans les indicateurs en flux (O(1))"""
+        flux = self.flux
+        atr = flux['ATR'].update(high, low, close)
+        ema_short = flux['EMA_Short'].update(close)
+        ema_long = flux['EMA_Long'].update(close)
+        close_precedent = self.current_bar['Close'] if self.current_bar is not None else NAN
+        
+        barre = {
+            'Date': date,
+            'Open': open_price,
+            'High': high,
+            'Low': low,
+            'Close': close,
+            'Volume': volume,
+            'ATR': atr,
+            'RSI': flux['RSI'].update(close),
+            'EMA_Short': ema_short,
+            'EMA_Long': ema_long,
+            'High_Break': flux['High_Break'].update(high),
+            'Low_Break': flux['Low_Break'].update(low),
+            'Uptrend': ema_short > ema_long and close > ema_short,
+            'Downtrend': ema_short < ema_long and close < ema_short,
+            'Momentum_Up': close > close_precedent,
+            'Momentum_Down': close < close_precedent,
+        }
+        atr_ma = flux['ATR_MA'].update(atr)
+        volume_ma = flux['Volume_MA'].update(volume)
+        barre['ATR_MA'] = atr_ma
+        barre['Volatility_OK'] = atr > atr_ma * 0.3
+        barre['Volume_MA'] = volume_ma
+        barre['Volume_OK'] = volume > volume_ma * 0.5
+        
+        self.previous_bar = self.current_bar
+        self.current_bar = barre
+        self.bars_count += 1
+        return barre
+    
+    def entry_signals(self, previous, current):
+        """Signaux d'entrée à partir des valeurs de la barre précédente et de la barre courante"""
         # Conditions LONG
-        breakout_up = (df.loc[current_index-1, 'High'] < df.loc[current_index-1, 'High_Break'] and 
-                      df.loc[current_index, 'High'] >= df.loc[current_index, 'High_Break'])
-        rsi_ok_long = (df.loc[current_index, 'RSI'] < self.rsi_overbought and df.loc[current_index, 'RSI'] > 20)
+        breakout_up = (previous['High'] < previous['High_Break'] and 
+                      current['High'] >= current['High_Break'])
+        rsi_ok_long = (current['RSI'] < self.rsi_overbought and current['RSI'] > 20)
         
         long_condition = (breakout_up and 
-                         df.loc[current_index, 'Uptrend'] and 
-                         df.loc[current_index, 'Volatility_OK'] and 
-                         df.loc[current_index, 'Momentum_Up'] and 
+                         current['Uptrend'] and 
+                         current['Volatility_OK'] and 
+                         current['Momentum_Up'] and 
                          rsi_ok_long and 
-                         df.loc[current_index, 'Volume_OK'])
+                         current['Volume_OK'])
         
         # Conditions SHORT
-        breakout_down = (df.loc[current_index-1, 'Low'] > df.loc[current_index-1, 'Low_Break'] and 
-                        df.loc[current_index, 'Low'] <= df.loc[current_index, 'Low_Break'])
-        rsi_ok_short = (df.loc[current_index, 'RSI'] > self.rsi_oversold and df.loc[current_index, 'RSI'] < 80)
+        breakout_down = (previous['Low'] > previous['Low_Break'] and 
+                        current['Low'] <= current['Low_Break'])
+        rsi_ok_short = (current['RSI'] > self.rsi_oversold and current['RSI'] < 80)
         
         short_condition = (breakout_down and 
-                          df.loc[current_index, 'Downtrend'] and 
-                          df.loc[current_index, 'Volatility_OK'] and 
-                          df.loc[current_index, 'Momentum_Down'] and 
+                          current['Downtrend'] and 
+                          current['Volatility_OK'] and 
+                          current['Momentum_Down'] and 
                           rsi_ok_short and 
-                          df.loc[current_index, 'Volume_OK'])
+                          current['Volume_OK'])
         
         return long_condition, short_condition
     
+    def check_entry_signals(self, df, current_index):
+        """Vérifie les signaux d'entrée sur un DataFrame issu de calculate_indicators"""
+        if current_index < 1:
+            return None, None
+        
+        return self.entry_signals(df.loc[current_index - 1], df.loc[current_index])
+    
     def enter_position(self, position_type, entry_price, atr, entry_date):
         """Entre en position"""
         if position_type == "LONG":
@@ -166,10 +224,10 @@ class XAUUSDSharpe1LiveStrategy:
             }
         
         self.trades_history.append(trade)
-        print(f"[green]🎯 Position {position_type} ouverte à {entry_price:.2f}[/green]")
-        print(f"   Stop Loss: {self.stop_loss:.2f}")
-        print(f"   Profit Target: {self.profit_target:.2f}")
-        print(f"   Trailing Stop: {self.trailing_stop:.2f}")
+        self.afficher(f"[green]🎯 Position {position_type} ouverte à {entry_price:.2f}[/green]")
+        self.afficher(f"   Stop Loss: {self.stop_loss:.2f}")
+        self.afficher(f"   Profit Target: {self.profit_target:.2f}")
+        self.afficher(f"   Trailing Stop: {self.trailing_stop:.2f}")
         
         return trade
     
@@ -180,14 +238,14 @@ class XAUUSDSharpe1LiveStrategy:
             if new_trailing_stop > self.trailing_stop:
                 self.trailing_stop = new_trailing_stop
                 self.stop_loss = self.trailing_stop
-                print(f"[blue]📈 Trailing stop mis à jour: {self.trailing_stop:.2f}[/blue]")
+                self.afficher(f"[blue]📈 Trailing stop mis à jour: {self.trailing_stop:.2f}[/blue]")
         
         elif self.position == -1:  # SHORT
             new_trailing_stop = current_price + self.trail_atr * current_atr
             if new_trailing_stop < self.trailing_stop:
                 self.trailing_stop = new_trailing_stop
                 self.stop_loss = self.trailing_stop
-                print(f"[blue]📉 Trailing stop mis à jour: {self.trailing_stop:.2f}[/blue]")
+                self.afficher(f"[blue]📉 Trailing stop mis à jour: {self.trailing_stop:.2f}[/blue]")
     
     def check_exit_conditions(self, current_price, long_signal, short_signal):
         """Vérifie les conditions de sortie"""
@@ -248,25 +306,39 @@ class XAUUSDSharpe1LiveStrategy:
         self.trailing_stop = 0
         
         status = "✅" if pnl > 0 else "❌"
-        print(f"[yellow]{status} Position {old_position} fermée à {exit_price:.2f}[/yellow]")
-        print(f"   P&L: {pnl:.2f}% - Raison: {exit_reason}")
+        self.afficher(f"[yellow]{status} Position {old_position} fermée à {exit_price:.2f}[/yellow]")
+        self.afficher(f"   P&L: {pnl:.2f}% - Raison: {exit_reason}")
         
         return current_trade
     
     def process_new_data(self, df, current_index):
-        """Traite les nouvelles données et prend les décisions de trading"""
-        if current_index < 1:
+        """
+        Traite les nouvelles données et prend les décisions de trading.
+        Seules les barres pas encore reçues sont intégrées aux indicateurs en flux
+        (celles antérieures à `current_index` sans décision de trading).
+        """
+        if current_index < self.bars_count:
+            # Retour en arrière dans l'historique : on rejoue depuis le début
+            self.reset_indicators()
+        
+        colonnes = [df[nom] for nom in ('Date', 'Open', 'High', 'Low', 'Close', 'Volume')]
+        for i in range(self.bars_count, current_index):
+            self.update_indicators(*(colonne.iat[i] for colonne in colonnes))
+        
+        return self.on_bar(*(colonne.iat[current_index] for colonne in colonnes))
+    
+    def on_bar(self, date, open_price, high, low, close, volume):
+        """Nouvelle barre clôturée : mise à jour des indicateurs en O(1) puis décision de trading"""
+        self.update_indicators(date, open_price, high, low, close, volume)
+        if self.previous_bar is None:
             return None
         
-        # Calcul des indicateurs
-        df = self.calculate_indicators(df)
-        
         # Vérification des signaux d'entrée
-        long_signal, short_signal = self.check_entry_signals(df, current_index)
+        long_signal, short_signal = self.entry_signals(self.previous_bar, self.current_bar)
         
-        current_price = df.loc[current_index, 'Close']
-        current_atr = df.loc[current_index, 'ATR']
-        current_date = df.loc[current_index, 'Date']
+        current_price = self.current_bar['Close']
+        current_atr = self.current_bar['ATR']
+        current_date = self.current_bar['Date']
         
         # Mise à jour du trailing stop si en position
         if self.position != 0:
@@ -325,29 +397,42 @@ class XAUUSDSharpe1LiveStrategy:
             'avg_loss': np.mean([t['pnl'] for t in completed_trades if t['pnl'] < 0]) if losing_trades > 0 else 0
         }
 
-def main():
-    """Test de la stratégie en temps réel"""
+# Symboles suivis ensemble par main_multi
+SYMBOLES_LIVE = ("XAUUSD", "GER40.cash", "US30.cash", "US500.cash", "EURUSD")
+
+def afficher_rapport_rejeu(rapport, histogramme=None):
+    """Latences par barre (p50 / p99 / max), débit et histogramme d'un rejeu"""
+    print(f"⏱️ Décision par barre: p50 {rapport['p50_us']:.1f} µs | p99 {rapport['p99_us']:.1f} µs | "
+          f"max {rapport['max_us']:.1f} µs")
+    print(f"🚀 Débit: {rapport['barres_par_s']:,.0f} barres/s ({rapport['barres_total']} barres, "
+          f"{rapport['duree_s'] * 1000:.1f} ms, {rapport['decisions']} décisions)")
+    if histogramme is not None:
+        bornes, effectifs = histogramme
+        for borne, effectif in zip(bornes, effectifs):
+            if effectif:
+                print(f"   < {borne:>8.0f} µs: {effectif}")
+
+def main(symbol="XAUUSD", timeframe="D1", headless=False):
+    """
+    Test de la stratégie en temps réel : rejeu des barres du stockage de
+    données par moteur.RejeuBarres. `headless` : aucun suivi des trades,
+    seulement les latences et le débit.
+    """
     print("[bold blue]🤖 Test Stratégie XAUUSD Sharpe 1 Live[/bold blue]")
     
     # Initialisation de la stratégie
-    strategy = XAUUSDSharpe1LiveStrategy("XAUUSD", "D1")
+    strategy = XAUUSDSharpe1LiveStrategy(symbol, timeframe, verbose=not headless)
     
     # Chargement des données de test
-    csv_path = "data/raw/XAUUSD_D1_mt5.csv"
-    
-    if not os.path.exists(csv_path):
-        print(f"[red]Fichier non trouvé: {csv_path}[/red]")
+    try:
+        df = charger_ohlcv(symbol, timeframe)
+    except FileNotFoundError as e:
+        print(f"[red]{e}[/red]")
         return
     
-    df = pd.read_csv(csv_path)
-    df['Date'] = pd.to_datetime(df['Date'])
-    
     print(f"[green]Données chargées: {len(df)} bougies[/green]")
     
-    # Simulation du trading en temps réel
-    for i in range(20, len(df)):  # Commence après les premières bougies pour avoir assez d'historique
-        result = strategy.process_new_data(df, i)
-        
+    def suivi(i, result):
         if result:
             print(f"📊 Trade exécuté: {result}")
         
@@ -360,6 +445,10 @@ def main():
             print(f"Stop Loss: {status['stop_loss']:.2f}")
             print(f"Profit Target: {status['profit_target']:.2f}")
     
+    # Simulation du trading en temps réel (les premières bougies servent d'historique)
+    rejeu = RejeuBarres(strategy, echauffement=20, rappel=None if headless else suivi)
+    rapport = rejeu.executer(df)
+    
     # Résumé final
     performance = strategy.get_performance_summary()
     if performance:
@@ -369,6 +458,59 @@ def main():
         print(f"Retour total: {performance['total_return']:.2f}%")
         print(f"Gain moyen: {performance['avg_win']:.2f}%")
         print(f"Perte moyenne: {performance['avg_loss']:.2f}%")
+    
+    afficher_rapport_rejeu(rapport, rejeu.histogramme())
+    return rapport
+
+def main_multi(symbols=SYMBOLES_LIVE, timeframe="D1", headless=False, ticks=False):
+    """
+    Les stratégies de plusieurs symboles dans une seule boucle asyncio
+    (moteur.MoteurTempsReel) : rejeu concurrent des séries du stockage à la
+    place du flux MT5, intentions d'ordre regroupées par tick. `ticks` : les
+    barres du timeframe sont agrégées depuis des ticks synthétiques tirés des
+    barres M5 (moteur.FluxTicks)
+    """
+    print(f"[bold blue]🤖 Test Stratégie Sharpe 1 Live - {len(symbols)} symboles {timeframe}[/bold blue]")
+    
+    store = store_defaut()
+    disponibles = set(store.disponibles())
+    source = "M5" if ticks else timeframe
+    manquants = [s for s in symbols if (s, source) not in disponibles]
+    if manquants:
+        print(f"[red]Données absentes pour {source}: {', '.join(manquants)}[/red]")
+        symbols = [s for s in symbols if s not in manquants]
+    if not symbols:
+        return
+    
+    def executer_ordres(date, intentions):
+        if not headless:
+            for nom, ordre in intentions:
+                print(f"📊 {date} {nom}: {ordre}")
+    
+    if ticks:
+        flux = FluxTicks({s: ticks_synthetiques(store.colonnes(s, "M5")) for s in symbols}, timeframes=("M5", timeframe))
+    else:
+        flux = FluxRejeu.depuis_store(store, [(s, timeframe) for s in symbols])
+    moteur = MoteurTempsReel(flux, executer_ordres, capacite_file=CAPACITE_REJEU)
+    strategies = {}
+    for symbol in symbols:
+        strategies[symbol] = XAUUSDSharpe1LiveStrategy(symbol, timeframe, verbose=False)
+        moteur.ajouter(symbol, (symbol, timeframe), strategies[symbol], echauffement=20)
+    
+    debut = datetime.now()
+    etat = moteur.lancer()
+    duree = (datetime.now() - debut).total_seconds()
+    
+    print(f"\n[bold green]=== RÉSUMÉ PAR SYMBOLE ===[/bold green]")
+    for symbol, instance in etat.items():
+        performance = strategies[symbol].get_performance_summary() or {'total_trades': 0, 'total_return': 0.0}
+        print(f"{symbol:<12} {instance['barres']:>6} barres | {performance['total_trades']:>4} trades | "
+              f"retour {performance['total_return']:>8.2f}% | retard max {instance['retard_max_ms']:.1f} ms | "
+              f"file {instance['file']} | dépassements {instance['depassements']} | erreurs {instance['erreurs']}")
+    barres = sum(instance['barres'] for instance in etat.values())
+    print(f"🚀 {barres} barres en {duree:.2f} s ({barres / max(duree, 1e-9):,.0f} barres/s), "
+          f"{moteur.lots} lots d'ordres")
+    return etat
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
@@ -6,22 +7,33 @@ from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    """Calcule l'Average True Range (ATR)"""
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_ema, rolling_max, rolling_min, rolling_mean
+from moteur import (LONG, SHORT, SORTIE_STOP, SORTIE_CIBLE, SORTIE_SIGNAL, SORTIE_FIN, OPPOSE_SORTIE,
+                    simuler_positions, croisement_haussier, croisement_baissier, metriques_pnl,
+                    TradeLog, NAT, colonne_trades, dates_ns)
 
-def compute_rsi(df, window=14):
-    """Calcule le Relative Strength Index (RSI)"""
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+RAISONS_SORTIE = {
+    SORTIE_STOP: 'Stop Loss',
+    SORTIE_CIBLE: 'Profit Target',
+    SORTIE_SIGNAL: 'Signal Opposé',
+    SORTIE_FIN: 'Fin de période',
+}
+
+SENS_SHARPE1 = {LONG: 'LONG', SHORT: 'SHORT'}
+
+COLONNES_SHARPE1 = {
+    'entry_date': 'date',
+    'entry_price': 'reel',
+    'position': 'sens',
+    'stop_loss': 'reel',
+    'profit_target': 'reel',
+    'trailing_stop': 'reel',
+    'exit_date': 'date',
+    'exit_price': 'reel',
+    'pnl': 'reel',
+    'exit_reason': 'code',
+}
 
 def strategie_xauusd_sharpe1_simple(df, symbol, timeframe):
     """
@@ -58,17 +70,17 @@ def strategie_xauusd_sharpe1_simple(df, symbol, timeframe):
     # === INDICATEURS ===
     df['ATR'] = compute_atr(df, atr_period)
     df['RSI'] = compute_rsi(df, 8)
-    df['EMA_Short'] = df['Close'].ewm(span=ema_short).mean()
-    df['EMA_Long'] = df['Close'].ewm(span=ema_long).mean()
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+    df['EMA_Short'] = compute_ema(df['Close'], ema_short, adjust=True)
+    df['EMA_Long'] = compute_ema(df['Close'], ema_long, adjust=True)
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
     
     # === FILTRES ===
     df['Uptrend'] = (df['EMA_Short'] > df['EMA_Long']) & (df['Close'] > df['EMA_Short'])
     df['Downtrend'] = (df['EMA_Short'] < df['EMA_Long']) & (df['Close'] < df['EMA_Short'])
     
     # Volatilité
-    df['ATR_MA'] = df['ATR'].rolling(window=15).mean()
+    df['ATR_MA'] = rolling_mean(df['ATR'], 15)
     df['Volatility_OK'] = df['ATR'] > df['ATR_MA'] * 0.3
     
     # Momentum
@@ -76,246 +88,72 @@ def strategie_xauusd_sharpe1_simple(df, symbol, timeframe):
     df['Momentum_Down'] = df['Close'] < df['Close'].shift(1)
     
     # Volume
-    df['Volume_MA'] = df['Volume'].rolling(window=10).mean()
+    df['Volume_MA'] = rolling_mean(df['Volume'], 10)
     df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.5
     
     df = df.dropna().reset_index(drop=True)
 
-    position = 0
-    entry_price = 0
-    stop_loss = 0
-    profit_target = 0
-    trailing_stop = 0
-    trades = []
+    # === SIGNAUX (vectorisés) ===
+    rsi = df['RSI'].to_numpy()
+    breakout_up = croisement_haussier(df['High'], df['High_Break'])
+    rsi_ok_long = (rsi < rsi_overbought) & (rsi > 20)
+    simple_long_condition = (breakout_up &
+                             df['Uptrend'].to_numpy() &
+                             df['Volatility_OK'].to_numpy() &
+                             df['Momentum_Up'].to_numpy() &
+                             rsi_ok_long &
+                             df['Volume_OK'].to_numpy())
 
-    for i in range(1, len(df)):
-        current_price = df.loc[i, 'Close']
-        current_atr = df.loc[i, 'ATR']
-        
-        # === CONDITIONS LONG ===
-        breakout_up = (df.loc[i-1, 'High'] < df.loc[i-1, 'High_Break'] and 
-                      df.loc[i, 'High'] >= df.loc[i, 'High_Break'])
-        rsi_ok_long = (df.loc[i, 'RSI'] < rsi_overbought and df.loc[i, 'RSI'] > 20)
-        
-        simple_long_condition = (breakout_up and 
-                               df.loc[i, 'Uptrend'] and 
-                               df.loc[i, 'Volatility_OK'] and 
-                               df.loc[i, 'Momentum_Up'] and 
-                               rsi_ok_long and 
-                               df.loc[i, 'Volume_OK'])
-        
-        # === CONDITIONS SHORT ===
-        breakout_down = (df.loc[i-1, 'Low'] > df.loc[i-1, 'Low_Break'] and 
-                        df.loc[i, 'Low'] <= df.loc[i, 'Low_Break'])
-        rsi_ok_short = (df.loc[i, 'RSI'] > rsi_oversold and df.loc[i, 'RSI'] < 80)
-        
-        simple_short_condition = (breakout_down and 
-                                df.loc[i, 'Downtrend'] and 
-                                df.loc[i, 'Volatility_OK'] and 
-                                df.loc[i, 'Momentum_Down'] and 
-                                rsi_ok_short and 
-                                df.loc[i, 'Volume_OK'])
-        
-        # === GESTION DES POSITIONS ===
-        
-        # Entrée en position LONG
-        if position == 0 and simple_long_condition:
-            position = 1
-            entry_price = current_price
-            profit_target = entry_price + profit_atr * current_atr
-            trailing_stop = entry_price - trail_atr * current_atr
-            stop_loss = trailing_stop
-            
-            trades.append({
-                'entry_date': df.loc[i, 'Date'],
-                'entry_price': entry_price,
-                'position': 'LONG',
-                'stop_loss': stop_loss,
-                'profit_target': profit_target,
-                'trailing_stop': trailing_stop
-            })
-        
-        # Entrée en position SHORT
-        elif position == 0 and simple_short_condition:
-            position = -1
-            entry_price = current_price
-            profit_target = entry_price - profit_atr * current_atr
-            trailing_stop = entry_price + trail_atr * current_atr
-            stop_loss = trailing_stop
-            
-            trades.append({
-                'entry_date': df.loc[i, 'Date'],
-                'entry_price': entry_price,
-                'position': 'SHORT',
-                'stop_loss': stop_loss,
-                'profit_target': profit_target,
-                'trailing_stop': trailing_stop
-            })
-        
-        # Gestion des positions ouvertes
-        elif position != 0:
-            # Mise à jour du trailing stop
-            if position == 1:  # LONG
-                new_trailing_stop = current_price - trail_atr * current_atr
-                if new_trailing_stop > trailing_stop:
-                    trailing_stop = new_trailing_stop
-                    stop_loss = trailing_stop
-                
-                # Vérification des conditions de sortie
-                if (current_price <= stop_loss or 
-                    current_price >= profit_target or
-                    simple_short_condition):  # Signal opposé
-                    
-                    exit_price = current_price
-                    if current_price <= stop_loss:
-                        exit_price = stop_loss
-                    elif current_price >= profit_target:
-                        exit_price = profit_target
-                    
-                    # Calcul du P&L
-                    pnl = (exit_price - entry_price) / entry_price * 100
-                    if position == -1:  # SHORT
-                        pnl = -pnl
-                    
-                    trades[-1].update({
-                        'exit_date': df.loc[i, 'Date'],
-                        'exit_price': exit_price,
-                        'pnl': pnl,
-                        'exit_reason': 'Stop Loss' if current_price <= stop_loss else 
-                                      'Profit Target' if current_price >= profit_target else 'Signal Opposé'
-                    })
-                    
-                    position = 0
-                    entry_price = 0
-                    stop_loss = 0
-                    profit_target = 0
-                    trailing_stop = 0
-            
-            elif position == -1:  # SHORT
-                new_trailing_stop = current_price + trail_atr * current_atr
-                if new_trailing_stop < trailing_stop:
-                    trailing_stop = new_trailing_stop
-                    stop_loss = trailing_stop
-                
-                # Vérification des conditions de sortie
-                if (current_price >= stop_loss or 
-                    current_price <= profit_target or
-                    simple_long_condition):  # Signal opposé
-                    
-                    exit_price = current_price
-                    if current_price >= stop_loss:
-                        exit_price = stop_loss
-                    elif current_price <= profit_target:
-                        exit_price = profit_target
-                    
-                    # Calcul du P&L
-                    pnl = (entry_price - exit_price) / entry_price * 100
-                    
-                    trades[-1].update({
-                        'exit_date': df.loc[i, 'Date'],
-                        'exit_price': exit_price,
-                        'pnl': pnl,
-                        'exit_reason': 'Stop Loss' if current_price >= stop_loss else 
-                                      'Profit Target' if current_price <= profit_target else 'Signal Opposé'
-                    })
-                    
-                    position = 0
-                    entry_price = 0
-                    stop_loss = 0
-                    profit_target = 0
-                    trailing_stop = 0
-    
-    # Fermeture de la dernière position si elle est encore ouverte
-    if position != 0 and len(trades) > 0:
-        last_trade = trades[-1]
-        if 'exit_date' not in last_trade:
-            exit_price = df.iloc[-1]['Close']
-            pnl = (exit_price - last_trade['entry_price']) / last_trade['entry_price'] * 100
-            if position == -1:  # SHORT
-                pnl = -pnl
-            
-            last_trade.update({
-                'exit_date': df.iloc[-1]['Date'],
-                'exit_price': exit_price,
-                'pnl': pnl,
-                'exit_reason': 'Fin de période'
-            })
+    breakout_down = croisement_baissier(df['Low'], df['Low_Break'])
+    rsi_ok_short = (rsi > rsi_oversold) & (rsi < 80)
+    simple_short_condition = (breakout_down &
+                              df['Downtrend'].to_numpy() &
+                              df['Volatility_OK'].to_numpy() &
+                              df['Momentum_Down'].to_numpy() &
+                              rsi_ok_short &
+                              df['Volume_OK'].to_numpy())
+
+    # === GESTION DES POSITIONS ===
+    # Stop suiveur testé sur la clôture, sortie sur signal opposé,
+    # dernière position fermée en fin de période
+    journal = simuler_positions(
+        df['Close'], df['High'], df['Low'], df['ATR'],
+        simple_long_condition, simple_short_condition,
+        stop_atr=trail_atr, cible_atr=profit_atr, stop_suiveur=True,
+        sur_cloture=True, signal_oppose=OPPOSE_SORTIE, cloturer_fin=True
+    )
+
+    dates = dates_ns(df['Date'])
+    trades = TradeLog.depuis_colonnes({
+        'entry_date': dates[journal['entree_idx']],
+        'entry_price': journal['prix_entree'],
+        'position': journal['sens'],
+        'stop_loss': journal['stop_initial'],
+        'profit_target': journal['cible'],
+        'trailing_stop': journal['stop_initial'],
+        'exit_date': dates[journal['sortie_idx']],
+        'exit_price': journal['prix_sortie'],
+        'pnl': journal['rendement'] * 100,
+        'exit_reason': journal['code_sortie'],
+    }, COLONNES_SHARPE1, {'position': SENS_SHARPE1, 'exit_reason': RAISONS_SORTIE})
     
     return trades, df
 
 def calculate_metrics(trades):
-    """Calcule les métriques de performance de la stratégie"""
-    if not trades:
-        return {
-            'total_trades': 0,
-            'winning_trades': 0,
-            'losing_trades': 0,
-            'win_rate': 0,
-            'total_return': 0,
-            'avg_win': 0,
-            'avg_loss': 0,
-            'profit_factor': 0,
-            'max_drawdown': 0,
-            'sharpe_ratio': 0
-        }
-    
-    df_trades = pd.DataFrame(trades)
-    
-    # Filtrage des trades complets
-    complete_trades = df_trades[df_trades['exit_date'].notna()].copy()
-    
-    if len(complete_trades) == 0:
-        return {
-            'total_trades': len(trades),
-            'winning_trades': 0,
-            'losing_trades': 0,
-            'win_rate': 0,
-            'total_return': 0,
-            'avg_win': 0,
-            'avg_loss': 0,
-            'profit_factor': 0,
-            'max_drawdown': 0,
-            'sharpe_ratio': 0
-        }
-    
-    # Calculs de base
-    total_trades = len(complete_trades)
-    winning_trades = len(complete_trades[complete_trades['pnl'] > 0])
-    losing_trades = len(complete_trades[complete_trades['pnl'] < 0])
-    win_rate = winning_trades / total_trades * 100 if total_trades > 0 else 0
-    
-    # Retours
-    total_return = complete_trades['pnl'].sum()
-    avg_win = complete_trades[complete_trades['pnl'] > 0]['pnl'].mean() if winning_trades > 0 else 0
-    avg_loss = complete_trades[complete_trades['pnl'] < 0]['pnl'].mean() if losing_trades > 0 else 0
-    
-    # Profit Factor
-    gross_profit = complete_trades[complete_trades['pnl'] > 0]['pnl'].sum()
-    gross_loss = abs(complete_trades[complete_trades['pnl'] < 0]['pnl'].sum())
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
-    
-    # Drawdown
-    cumulative_returns = complete_trades['pnl'].cumsum()
-    running_max = cumulative_returns.expanding().max()
-    drawdown = (cumulative_returns - running_max) / running_max * 100
-    max_drawdown = abs(drawdown.min())
-    
-    # Sharpe Ratio (simplifié)
-    returns_std = complete_trades['pnl'].std()
-    sharpe_ratio = total_return / returns_std if returns_std > 0 else 0
-    
-    return {
-        'total_trades': total_trades,
-        'winning_trades': winning_trades,
-        'losing_trades': losing_trades,
-        'win_rate': win_rate,
-        'total_return': total_return,
-        'avg_win': avg_win,
-        'avg_loss': avg_loss,
-        'profit_factor': profit_factor,
-        'max_drawdown': max_drawdown,
-        'sharpe_ratio': sharpe_ratio
-    }
+    """
+    Calcule les métriques de performance de la stratégie sur les trades
+    clôturés (noyau vectorisé moteur.metriques_pnl sur la colonne des PnL,
+    lue sans copie dans un TradeLog)
+    """
+    pnl = colonne_trades(trades, 'pnl')
+    if isinstance(trades, TradeLog):
+        clotures = trades.colonne('exit_date') != NAT
+    else:
+        clotures = pd.notna([trade['exit_date'] for trade in trades])
+    metrics = metriques_pnl(pnl[clotures])
+    if not clotures.any():
+        metrics['total_trades'] = len(trades)
+    return metrics
 
 def main():
     """Fonction principale pour tester la stratégie"""
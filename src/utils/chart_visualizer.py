@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
@@ -8,20 +9,9 @@ from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
-
-def compute_rsi(df, window=14):
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_ema, rolling_max, rolling_min, rolling_mean
+from moteur import TradeLog, dataframe_trades
 
 def simple_breakout_strategy_with_signals(df, symbol, timeframe):
     """Stratégie avec génération des signaux pour visualisation"""
@@ -58,16 +48,16 @@ def simple_breakout_strategy_with_signals(df, symbol, timeframe):
     
     # Calcul des indicateurs
     df['ATR'] = compute_atr(df, 14)
-    df['EMA20'] = df['Close'].ewm(span=20).mean()
-    df['EMA50'] = df['Close'].ewm(span=50).mean()
+    df['EMA20'] = compute_ema(df['Close'], 20, adjust=True)
+    df['EMA50'] = compute_ema(df['Close'], 50, adjust=True)
     df['RSI'] = compute_rsi(df, 14)
     
     # Breakouts
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
     
     # Volume
-    df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
+    df['Volume_MA'] = rolling_mean(df['Volume'], 20)
     df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.8
     
     # Signaux
@@ -86,7 +76,7 @@ def simple_breakout_strategy_with_signals(df, symbol, timeframe):
     entry_price = 0
     stop_loss = 0
     profit_target = 0
-    trades = []
+    trades = TradeLog()
     entry_index = 0
     
     for i in range(1, len(df)):
@@ -366,7 +356,7 @@ def create_performance_dashboard(trades, symbol, timeframe):
     if not trades:
         return None
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     
     # Calculs de performance
     total_pnl = df_trades['PnL'].sum()
@@ -1,9 +1,13 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from glob import glob
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_rsi, compute_ema, rolling_max, rolling_min, rolling_mean
+
 # Liste des fichiers CSV à traiter
 def get_csv_files():
     return [f for f in os.listdir('.') if f.endswith('.csv')]
@@ -16,17 +20,13 @@ def read_csv_file(filename):
 # Calcul des indicateurs de base (RSI, MACD, etc.)
 def compute_indicators(df):
     # RSI
-    delta = df['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
+    df['RSI'] = compute_rsi(df, 14)
 
     # MACD
-    ema12 = df['Close'].ewm(span=12, adjust=False).mean()
-    ema26 = df['Close'].ewm(span=26, adjust=False).mean()
+    ema12 = compute_ema(df['Close'], 12)
+    ema26 = compute_ema(df['Close'], 26)
     df['MACD'] = ema12 - ema26
-    df['MACD_signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    df['MACD_signal'] = compute_ema(df['MACD'], 9)
     df['MACD_hist'] = df['MACD'] - df['MACD_signal']
 
     # Momentum
@@ -34,7 +34,7 @@ def compute_indicators(df):
 
     # CCI
     tp = (df['High'] + df['Low'] + df['Close']) / 3
-    ma = tp.rolling(window=10).mean()
+    ma = rolling_mean(tp, 10)
     md = tp.rolling(window=10).apply(lambda x: np.mean(np.abs(x - np.mean(x))))
     df['CCI'] = (tp - ma) / (0.015 * md)
 
@@ -50,17 +50,13 @@ def compute_indicators(df):
     df['OBV'] = obv
 
     # Stochastique
-    low_min = df['Low'].rolling(window=14).min()
-    high_max = df['High'].rolling(window=14).max()
+    low_min = rolling_min(df['Low'], 14)
+    high_max = rolling_max(df['High'], 14)
     df['Stoch'] = 100 * (df['Close'] - low_min) / (high_max - low_min)
-    df['Stoch_K'] = df['Stoch'].rolling(window=3).mean()
+    df['Stoch_K'] = rolling_mean(df['Stoch'], 3)
 
     # ATR
-    df['H-L'] = df['High'] - df['Low']
-    df['H-PC'] = abs(df['High'] - df['Close'].shift(1))
-    df['L-PC'] = abs(df['Low'] - df['Close'].shift(1))
-    tr = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-    df['ATR'] = tr.rolling(window=14).mean()
+    df['ATR'] = compute_atr(df, 14)
 
     # MFI, CMF, VW-MACD, DIOSC, etc. peuvent être ajoutés ici
     # ...
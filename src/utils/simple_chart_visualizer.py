@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
@@ -6,12 +7,9 @@ from rich import print
 import warnings
 warnings.filterwarnings('ignore')
 
-def compute_atr(df, window):
-    high_low = df['High'] - df['Low']
-    high_close = np.abs(df['High'] - df['Close'].shift(1))
-    low_close = np.abs(df['Low'] - df['Close'].shift(1))
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    return tr.rolling(window=window).mean()
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from indicators import compute_atr, compute_ema, rolling_max, rolling_min, rolling_mean
+from moteur import TradeLog, dataframe_trades
 
 def simple_breakout_strategy_with_signals(df, symbol, timeframe):
     """Stratégie avec génération des signaux pour visualisation"""
@@ -48,15 +46,15 @@ def simple_breakout_strategy_with_signals(df, symbol, timeframe):
     
     # Calcul des indicateurs
     df['ATR'] = compute_atr(df, 14)
-    df['EMA20'] = df['Close'].ewm(span=20).mean()
-    df['EMA50'] = df['Close'].ewm(span=50).mean()
+    df['EMA20'] = compute_ema(df['Close'], 20, adjust=True)
+    df['EMA50'] = compute_ema(df['Close'], 50, adjust=True)
     
     # Breakouts
-    df['High_Break'] = df['High'].rolling(window=breakout_period).max()
-    df['Low_Break'] = df['Low'].rolling(window=breakout_period).min()
+    df['High_Break'] = rolling_max(df['High'], breakout_period)
+    df['Low_Break'] = rolling_min(df['Low'], breakout_period)
     
     # Volume
-    df['Volume_MA'] = df['Volume'].rolling(window=20).mean()
+    df['Volume_MA'] = rolling_mean(df['Volume'], 20)
     df['Volume_OK'] = df['Volume'] > df['Volume_MA'] * 0.8
     
     # Signaux
@@ -75,7 +73,7 @@ def simple_breakout_strategy_with_signals(df, symbol, timeframe):
     entry_price = 0
     stop_loss = 0
     profit_target = 0
-    trades = []
+    trades = TradeLog()
     entry_index = 0
     
     for i in range(1, len(df)):
@@ -291,7 +289,7 @@ def create_performance_chart(trades, symbol, timeframe):
     if not trades:
         return None
     
-    df_trades = pd.DataFrame(trades)
+    df_trades = dataframe_trades(trades)
     df_trades['Cumulative_PnL'] = df_trades['PnL'].cumsum()
     df_trades['Trade_Number'] = range(1, len(df_trades) + 1)
     
@@ -352,7 +350,7 @@ def main():
                         perf_chart.write_html(f"charts/{symbol}_{timeframe}_performance.html")
                     
                     # Calcul des statistiques
-                    df_trades = pd.DataFrame(trades)
+                    df_trades = dataframe_trades(trades)
                     total_pnl = df_trades['PnL'].sum()
                     trades_gagnants = len(df_trades[df_trades['PnL'] > 0])
                     win_rate = trades_gagnants / len(trades) * 100
@@ -0,0 +1,46 @@
+"""
+Régressions de moteur.journal_trades : une vue (tranche d'un TradeLog) est
+copiée à la première écriture, schéma compris
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from moteur import TradeLog
+
+
+def journal():
+    trades = TradeLog()
+    trades.append({'pnl': 1.0, 'n': 3})
+    trades.append({'pnl': -0.5, 'n': 4})
+    return trades
+
+
+def test_nouveau_champ_ecrit_dans_une_vue():
+    trades = journal()
+    vue = trades[0:1]
+    vue[0]['nouveau'] = 5
+    assert list(trades) == [{'pnl': 1.0, 'n': 3}, {'pnl': -0.5, 'n': 4}]
+    assert list(trades.dataframe().columns) == ['pnl', 'n']
+    assert list(vue) == [{'pnl': 1.0, 'n': 3, 'nouveau': 5}]
+
+
+def test_elargissement_ecrit_dans_une_vue():
+    trades = journal()
+    vue = trades[0:1]
+    vue[0]['n'] = 2.5
+    assert trades.types['n'] == 'entier'
+    assert trades.colonne('n').dtype.kind == 'i'
+    assert list(trades)[0]['n'] == 3
+    assert vue.types['n'] == 'reel'
+    assert list(vue) == [{'pnl': 1.0, 'n': 2.5}]
+
+
+def test_ecriture_du_parent_apres_creation_d_une_vue():
+    trades = journal()
+    vue = trades[0:1]
+    trades.append({'pnl': 2.0, 'n': 1.5, 'sens': 'long'})
+    assert vue.types == {'pnl': 'reel', 'n': 'entier'}
+    assert list(vue) == [{'pnl': 1.0, 'n': 3}]
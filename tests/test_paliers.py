@@ -0,0 +1,45 @@
+"""
+Régressions de moteur.paliers : un individu dont le résultat complet est
+connu (élite recopiée) n'est pas éliminé sur un préfixe de la série
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from moteur import Elimine, FitnessCache, elimination_successive, evaluer_avec_elimination, resultats_acquis
+
+
+def evaluer(individus, barres):
+    # Score de préfixe trompeur : l'élite (x = 0) y est la pire
+    if barres is None:
+        return [(10.0 - individu['x'], {'x': individu['x']}) for individu in individus]
+    return [(float(individu['x']), None) for individu in individus]
+
+
+def test_elite_exemptee_des_paliers():
+    population = [{'x': 0, 'fitness': 10.0, 'metrics': {'x': 0}}] + [{'x': x} for x in range(1, 9)]
+    acquis = resultats_acquis(population)
+    assert acquis == {0: (10.0, {'x': 0})}
+    resultats, atteints = elimination_successive([{'x': ind['x']} for ind in population], evaluer,
+                                                 [300, None], eta=3, acquis=acquis)
+    assert resultats[0] == (10.0, {'x': 0})
+    assert atteints[0] == 1
+    # La cohorte (8 nouveaux individus) est réduite à ⌈8 / 3⌉ = 3 survivants
+    assert sum(not isinstance(resultat, Elimine) for resultat in resultats[1:]) == 3
+
+
+def test_elite_non_reevaluee():
+    population = [{'x': 0, 'fitness': 10.0, 'metrics': {'x': 0}}, {'x': 1}, {'x': 2}]
+    evalues = []
+
+    def evaluer_barres(individus, barres):
+        evalues.extend(individu['x'] for individu in individus)
+        return evaluer(individus, barres)
+
+    resultats = evaluer_avec_elimination(FitnessCache(), 's', 'e', [{'x': ind['x']} for ind in population],
+                                         evaluer_barres, 10000, paliers=(0.1, 1.0),
+                                         acquis=resultats_acquis(population))
+    assert resultats[0] == (10.0, {'x': 0})
+    assert 0 not in evalues
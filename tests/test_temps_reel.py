@@ -0,0 +1,52 @@
+"""
+Régressions de moteur.temps_reel : une instance dont la chauffe
+(`update_indicators`) lève une exception ne bloque pas le moteur
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from moteur import FluxRejeu, MoteurTempsReel
+
+
+def barres(n=6):
+    return pd.DataFrame({
+        'Date': pd.date_range('2024-01-01', periods=n, freq='D'),
+        'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 10.0,
+    })
+
+
+class ChauffeDefaillante:
+    def update_indicators(self, *barre):
+        raise RuntimeError("indicateurs indisponibles")
+
+    def on_bar(self, *barre):
+        return 'achat'
+
+
+class Fiable:
+    def update_indicators(self, *barre):
+        pass
+
+    def on_bar(self, date, *prix):
+        return 'vente'
+
+
+@pytest.mark.parametrize('isoler', [True, False])
+def test_exception_de_chauffe_comptee(isoler):
+    lots = []
+    moteur = MoteurTempsReel(FluxRejeu({('XAUUSD', 'D1'): barres()}),
+                             executer_ordres=lambda date, intentions: lots.append(intentions),
+                             delai=5.0, isoler=isoler)
+    moteur.ajouter('defaillante', ('XAUUSD', 'D1'), ChauffeDefaillante(), echauffement=2)
+    moteur.ajouter('fiable', ('XAUUSD', 'D1'), Fiable(), echauffement=2)
+    etat = moteur.lancer()
+    assert etat['defaillante']['erreurs'] == 2
+    assert etat['defaillante']['barres'] == etat['fiable']['barres'] == 6
+    # Après la chauffe, les deux instances décident à chaque barre
+    assert lots == [[('defaillante', 'achat'), ('fiable', 'vente')]] * 4
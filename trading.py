@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Interface en ligne de commande unique du projet
+Chaque sous-commande s'exécute dans ce processus (pas de nouvel interpréteur
+par choix de menu) et n'importe les modules lourds (pandas, plotly, deap,
+rich) qu'au moment où elle en a besoin : `--help`, les erreurs d'arguments
+et la première ligne de chaque commande ne coûtent que le démarrage de
+Python et d'argparse. Le temps jusqu'à la première sortie est mesuré par
+benchmarks/suite.py (section cli) et doit rester sous BUDGET_PREMIERE_SORTIE.
+
+Usage :
+    python trading.py optimize {drawdown,agressif,rl,complet,walk-forward,deap} [options] [--resume]
+    python trading.py backtest [sharpe1|demo|timeframes] [--symbol XAUUSD] [--timeframe D1]
+    python trading.py live-replay [--symbol XAUUSD | --symbols XAUUSD,EURUSD [--ticks]] [--timeframe D1] [--headless]
+    python trading.py report {comparaison,optimisations,multitimeframes,auto}
+    python trading.py models {enregistrer,lister,comparer,exporter,strategie} [--type rl --timeframe H4]
+"""
+
+import os
+import sys
+import argparse
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+# Temps maximal (s) entre le lancement et la première ligne affichée
+BUDGET_PREMIERE_SORTIE = 0.25
+
+OPTIMISEURS_CLI = ('drawdown', 'agressif', 'rl', 'complet', 'walk-forward', 'deap')
+MODES_COMPLET = ('genetique', 'agressive', 'rl', 'fusion', 'continu', 'complet', 'rapide', 'intensif', 'pareto', 'bayesien', 'aleatoire')
+RAPPORTS = ('comparaison', 'optimisations', 'multitimeframes', 'auto')
+ACTIONS_MODELES = ('enregistrer', 'lister', 'comparer', 'exporter', 'strategie')
+
+# Options des points de reprise (tous les optimiseurs sauf le walk-forward)
+REPRISE = ('reprendre', 'intervalle_reprise')
+
+
+def preparer_chemins():
+    """Répertoire de travail à la racine du projet et chemins d'import des scripts"""
+    os.chdir(RACINE)
+    for chemin in ('scripts', 'src', os.path.join('src', 'strategies'), os.path.join('src', 'backtesting'),
+                   os.path.join('src', 'optimization')):
+        chemin = os.path.join(RACINE, chemin)
+        if chemin not in sys.path:
+            sys.path.append(chemin)
+
+
+def annoncer(message):
+    """Première ligne d'une commande, affichée avant tout import lourd"""
+    print(message, flush=True)
+
+
+def liste_virgules(valeur):
+    return tuple(tf.strip() for tf in valeur.split(',') if tf.strip())
+
+
+def options(args, *noms):
+    """Arguments fournis sur la ligne de commande (les autres gardent les défauts du script)"""
+    return {nom: getattr(args, nom) for nom in noms if getattr(args, nom) is not None}
+
+
+# === Sous-commandes ===
+
+def commande_optimize(args):
+    annoncer(f"🧬 Optimisation {args.optimiseur} - {args.symbol}")
+    if args.optimiseur == 'drawdown':
+        import optimisation_genetique_drawdown as module
+        module.main(**options(args, 'symbol', 'timeframes', 'population_size', 'generations', 'elimination',
+                              *REPRISE))
+    elif args.optimiseur == 'agressif':
+        import optimisation_agressive_gains as module
+        module.main(**options(args, 'symbol', 'timeframes', 'population_size', 'generations', 'elimination',
+                              *REPRISE))
+    elif args.optimiseur == 'rl':
+        import reinforcement_learning_optimizer as module
+        timeframe = {'timeframe': args.timeframes[0]} if args.timeframes else {}
+        module.main(**options(args, 'symbol', 'episodes', *REPRISE), **timeframe)
+    elif args.optimiseur == 'complet':
+        import systeme_optimisation_complet as module
+        timeframe = {'timeframe': args.timeframes[0]} if args.timeframes else {}
+        module.main(**options(args, 'symbol', 'mode', 'elimination', *REPRISE), **timeframe)
+    elif args.optimiseur == 'deap':
+        import genetic_optimizer as module
+        module.main(symbols=(args.symbol,), **options(args, 'timeframes', 'population_size', 'generations',
+                                                      *REPRISE))
+    else:
+        import walk_forward as module
+        module.main(**options(args, 'symbol', 'timeframes', 'n_folds', 'population_size', 'generations'),
+                    optimiseur=args.base)
+
+
+def commande_backtest(args):
+    annoncer(f"📊 Backtest {args.cible} - {args.symbol} {args.timeframe}")
+    if args.cible == 'sharpe1':
+        import backtest_xauusd_sharpe1_simple as module
+        module.main(args.symbol, args.timeframe, args.source)
+    elif args.cible == 'demo':
+        import demo_strategie_xauusd as module
+        module.main()
+    else:
+        import test_all_timeframes_xauusd as module
+        module.main(args.aligne)
+
+
+def commande_live_replay(args):
+    symboles = ', '.join(args.symbols) if args.symbols else args.symbol
+    annoncer(f"🤖 Rejeu temps réel - {symboles} {args.timeframe}")
+    import strategie_xauusd_sharpe1_mt5_live as module
+    if args.symbols:
+        module.main_multi(args.symbols, args.timeframe, args.headless, args.ticks)
+    else:
+        module.main(args.symbol, args.timeframe, args.headless)
+
+
+def commande_report(args):
+    annoncer(f"📋 Rapport {args.rapport}")
+    if args.rapport == 'comparaison':
+        import comparaison_optimisation as module
+    elif args.rapport == 'optimisations':
+        import comparaison_optimisations as module
+    elif args.rapport == 'multitimeframes':
+        import afficher_resultats_multitimeframes as module
+    else:
+        import analyse_strategie_auto as module
+    module.main()
+
+
+def commande_models(args):
+    annoncer(f"💾 Modèles optimaux - {args.action}")
+    import gestion_modeles_optimaux as module
+    if args.action == 'enregistrer':
+        module.auto_register_from_optimization_results()
+        return
+    manager = module.ModelManager()
+    if args.action == 'lister':
+        manager.list_models()
+    elif args.action == 'comparer':
+        manager.compare_models()
+    elif args.action == 'exporter':
+        manager.export_model(args.type, args.timeframe)
+    else:
+        manager.create_strategy_file(args.type, args.timeframe)
+
+
+def construire_parser():
+    """Parser des sous-commandes (n'importe aucun module lourd)"""
+    parser = argparse.ArgumentParser(prog='trading', description="Optimisation, backtests et rapports du projet")
+    sous = parser.add_subparsers(dest='commande', required=True)
+
+    optimize = sous.add_parser('optimize', help="optimisation des paramètres")
+    optimize.add_argument('optimiseur', choices=OPTIMISEURS_CLI)
+    optimize.add_argument('--symbol', default='XAUUSD')
+    optimize.add_argument('--timeframes', type=liste_virgules,
+                          help="ex. H4,D1 (rl et complet : le premier seulement ; défaut: celui du script)")
+    optimize.add_argument('--population', dest='population_size', type=int)
+    optimize.add_argument('--generations', type=int)
+    optimize.add_argument('--episodes', type=int, help="épisodes du RL")
+    optimize.add_argument('--mode', choices=MODES_COMPLET, help="option du système complet (défaut: menu)")
+    optimize.add_argument('--resume', dest='reprendre', action='store_true',
+                          help="reprendre depuis le dernier point de reprise (results/checkpoints)")
+    optimize.add_argument('--checkpoint-interval', dest='intervalle_reprise', type=int,
+                          help="générations (RL : épisodes, complet : pas de chaque phase) entre deux "
+                               "points de reprise ; 0 : aucun")
+    optimize.add_argument('--halving', dest='elimination', action='store_true',
+                          help="drawdown, agressif, complet : élimination successive des nouveaux jeux "
+                               "sur des préfixes de la série (complet : phases génétique et agressive)")
+    optimize.add_argument('--folds', dest='n_folds', type=int, help="folds du walk-forward")
+    optimize.add_argument('--base', default='drawdown', choices=('drawdown', 'agressif', 'complet'),
+                          help="optimiseur entraîné à chaque fold du walk-forward")
+    optimize.set_defaults(fonction=commande_optimize)
+
+    backtest = sous.add_parser('backtest', help="backtest de la stratégie Sharpe 1")
+    backtest.add_argument('cible', nargs='?', default='sharpe1', choices=('sharpe1', 'demo', 'timeframes'))
+    backtest.add_argument('--symbol', default='XAUUSD')
+    backtest.add_argument('--timeframe', default='D1')
+    backtest.add_argument('--source', default='csv', choices=('csv', 'mt5'))
+    backtest.add_argument('--aligne', action='store_true',
+                          help="timeframes : séries rééchantillonnées depuis M5 (historique commun)")
+    backtest.set_defaults(fonction=commande_backtest)
+
+    live = sous.add_parser('live-replay', help="rejeu barre par barre de la stratégie temps réel")
+    live.add_argument('--symbol', default='XAUUSD')
+    live.add_argument('--symbols', type=liste_virgules, default=None,
+                      help="plusieurs symboles dans un seul moteur asyncio (ex: XAUUSD,GER40.cash,EURUSD)")
+    live.add_argument('--timeframe', default='D1')
+    live.add_argument('--ticks', action='store_true',
+                      help="avec --symbols : barres agrégées depuis des ticks synthétiques tirés des barres M5")
+    live.add_argument('--headless', action='store_true',
+                      help="sans suivi des trades : latences de décision et débit seulement")
+    live.set_defaults(fonction=commande_live_replay)
+
+    report = sous.add_parser('report', help="rapports et comparaisons")
+    report.add_argument('rapport', choices=RAPPORTS)
+    report.set_defaults(fonction=commande_report)
+
+    models = sous.add_parser('models', help="gestion des modèles optimaux")
+    models.add_argument('action', choices=ACTIONS_MODELES)
+    models.add_argument('--type', default='genetique', help="genetique, agressive ou rl (exporter, strategie)")
+    models.add_argument('--timeframe', default='H4', help="(exporter, strategie)")
+    models.set_defaults(fonction=commande_models)
+    return parser
+
+
+def main(argv=None):
+    """Point d'entrée ; `argv` permet aux menus d'appeler une commande dans leur processus"""
+    args = construire_parser().parse_args(argv)
+    preparer_chemins()
+    args.fonction(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())